@@ -1,10 +1,15 @@
 from jobspy import scrape_jobs
-import pandas as pd
 import time
 import subprocess
 import shutil
 from datetime import datetime
 import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from scrape_state import (PAGE_SIZE, RawJobWriter, cutoff_for, is_exhausted, open_state,
+                          query_plan, record_query, seed_from_raw, seen_count)
+from scrape_telemetry import log_query, new_query_metrics, new_run_id, print_summary
 
 # ============================================================
 # EXPANDED CONFIGURATION - Maximum Coverage
@@ -45,75 +50,158 @@ SITES = ["indeed"]
 # GitHub repo location - UPDATE THIS TO YOUR PATH
 GITHUB_REPO = os.path.expanduser("~/Downloads/croreport-github")
 
+# Wait between searches, between pages of one search, and after an error
+SEARCH_WAIT = 120
+PAGE_WAIT = 30
+ERROR_WAIT = 180
+# Extra attempts for a failed page before the search is given up
+MAX_RETRIES = 1
+
+
+def fetch_page(site, term, location, hours_old, offset, metrics):
+    """One page of results, retried after ERROR_WAIT; timings go into metrics."""
+    for attempt in range(MAX_RETRIES + 1):
+        # jobspy walks pages 1..k to return page k
+        metrics['requests'] += offset // PAGE_SIZE + 1
+        request_started = time.perf_counter()
+        try:
+            return scrape_jobs(
+                site_name=[site],
+                search_term=term,
+                location=location,
+                results_wanted=PAGE_SIZE,
+                offset=offset,
+                hours_old=hours_old,
+                country_indeed='USA'
+            )
+        except Exception as e:
+            if attempt == MAX_RETRIES:
+                raise
+            metrics['retries'] += 1
+            print(f"   🔁 {type(e).__name__}: retrying in {ERROR_WAIT} seconds...")
+            time.sleep(ERROR_WAIT)
+        finally:
+            metrics['request_latency_s'].append(round(time.perf_counter() - request_started, 3))
+
+
+def scrape_query(site, term, location, hours_old, cap, writer, metrics):
+    """
+    Page through one search until the cap, a short page, or a page where
+    every posting is older than the window, streaming its postings to the writer and counts into metrics.
+    Returns (new postings, rows returned, hit cap).
+    """
+    cutoff = cutoff_for(datetime.now(), hours_old)
+    for offset in range(0, cap, PAGE_SIZE):
+        if offset:
+            print(f"   ⏳ Page {offset // PAGE_SIZE + 1}: waiting {PAGE_WAIT} seconds...")
+            time.sleep(PAGE_WAIT)
+        page = fetch_page(site, term, location, hours_old, offset, metrics)
+        known, duplicates = writer.known, writer.duplicates
+        new = writer.write(page)
+        metrics['pages'] += 1
+        metrics['rows_returned'] += len(page)
+        metrics['new_rows'] += int(new.sum())
+        metrics['known_rows'] += writer.known - known
+        metrics['duplicate_rows'] += writer.duplicates - duplicates
+        if len(page) < PAGE_SIZE or is_exhausted(page, cutoff):
+            break
+    else:
+        metrics['capped'] = True
+    return metrics['new_rows'], metrics['rows_returned'], metrics['capped']
+
+
 # ============================================================
 # SCRAPING LOOP
 # ============================================================
 
-all_jobs = []
 total_searches = len(SEARCH_TERMS) * len(LOCATIONS) * len(SITES)
 current_search = 0
+run_started = datetime.now()
+run_id = new_run_id(run_started)
+raw_filename = f"raw_jobs_{run_started.strftime('%Y%m%d_%H%M')}.csv"
+
+state = open_state()
+if seen_count(state) == 0:
+    seeded = seed_from_raw(state, os.path.join(GITHUB_REPO, "data"))
+    print(f"🌱 Seeded {seeded} known job URLs from previous raw files")
+writer = RawJobWriter(raw_filename, state)
 
 print("="*70)
 print("🚀 EXECUTIVE SALES JOB SCRAPER - MAXIMUM COVERAGE EDITION")
 print("="*70)
 print(f"📊 {len(SEARCH_TERMS)} search terms × {len(LOCATIONS)} locations")
 print(f"🔍 Total searches: {total_searches}")
-print(f"⏰ Estimated time: {(total_searches * 2) // 60} hours {(total_searches * 2) % 60} minutes")
-print(f"📅 Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-print("\n⚠️  NOTE: 2-minute waits between searches (safe for Indeed)")
+print(f"🧠 Known job URLs: {seen_count(state)}")
+print(f"📅 Started: {run_started.strftime('%Y-%m-%d %H:%M:%S')}")
+print(f"💾 Streaming to: {raw_filename}")
+print(f"\n⚠️  NOTE: {SEARCH_WAIT // 60}-minute waits between searches (safe for Indeed)")
+print("   Window and result cap per search adapt to its last successful run")
 print("="*70)
 
-site_stats = {site: {'attempted': 0, 'successful': 0, 'jobs': 0} for site in SITES}
+site_stats = {site: {'attempted': 0, 'successful': 0, 'jobs': 0, 'returned': 0} for site in SITES}
+completed_queries = []
 
 for site in SITES:
     for location in LOCATIONS:
         for term in SEARCH_TERMS:
             current_search += 1
             site_stats[site]['attempted'] += 1
-            
+            query_started = datetime.now()
+            hours_old, cap = query_plan(state, site, term, location, query_started)
+            metrics = new_query_metrics(run_id, site, term, location, query_started, hours_old, cap)
+
             print(f"\n[{current_search}/{total_searches}] 🔎 {term}")
-            print(f"   📍 {location}")
-            
+            print(f"   📍 {location}  (last {hours_old}h, up to {cap} results)")
+
             try:
-                jobs = scrape_jobs(
-                    site_name=[site],
-                    search_term=term,
-                    location=location,
-                    results_wanted=300,
-                    hours_old=168,  # 7 days only
-                    country_indeed='USA'
-                )
-                
-                if len(jobs) > 0:
-                    all_jobs.append(jobs)
-                    site_stats[site]['successful'] += 1
-                    site_stats[site]['jobs'] += len(jobs)
-                    print(f"   ✅ Found {len(jobs)} jobs")
+                new_jobs, returned, capped = scrape_query(site, term, location, hours_old, cap, writer, metrics)
+                log_query(metrics)
+                site_stats[site]['successful'] += 1
+                site_stats[site]['jobs'] += new_jobs
+                site_stats[site]['returned'] += returned
+                # Committed to the state only once the raw file is saved
+                completed_queries.append((site, term, location, query_started, hours_old, returned, new_jobs, capped))
+
+                if returned > 0:
+                    print(f"   ✅ Found {returned} jobs, {new_jobs} new" + (" (hit cap)" if capped else ""))
                 else:
                     print(f"   ⚠️  No results")
-                
+                print(f"   💾 {writer.rows} unique so far "
+                      f"({writer.new} new, {writer.known} seen in earlier runs, {writer.duplicates} duplicates skipped)")
+
                 # Wait between searches
                 if current_search < total_searches:
-                    wait_time = 120
-                    print(f"   ⏳ Waiting {wait_time} seconds...")
-                    time.sleep(wait_time)
-                    
+                    print(f"   ⏳ Waiting {SEARCH_WAIT} seconds...")
+                    time.sleep(SEARCH_WAIT)
+
             except Exception as e:
                 print(f"   ❌ Error: {str(e)[:100]}")
+                metrics.update(status='error', error_class=type(e).__name__, error=str(e)[:200])
+                log_query(metrics)
                 if current_search < total_searches:
-                    time.sleep(180)
+                    time.sleep(ERROR_WAIT)
                 continue
 
 # ============================================================
-# COMBINE AND SAVE RESULTS
+# SAVE RESULTS
 # ============================================================
 
+print_summary(run_id)
+
 print("\n" + "="*70)
 print("📊 SCRAPING SUMMARY")
 print("="*70)
 
-if all_jobs:
-    combined = pd.concat(all_jobs, ignore_index=True)
+if writer.close():
+    # The run is on disk: mark its searches complete and its URLs as known
+    for query in completed_queries:
+        record_query(state, *query)
+    writer.remember(run_started)
+elif completed_queries:
+    print("✅ Searches returned no postings - nothing to push")
+    for query in completed_queries:
+        record_query(state, *query)
+    exit(0)
 else:
     print("❌ No jobs found! Check your internet connection.")
     exit(1)
@@ -123,22 +211,18 @@ for site, stats in site_stats.items():
     print(f"\n{site.upper()}:")
     print(f"  Searches attempted: {stats['attempted']}")
     print(f"  Searches successful: {stats['successful']} ({success_rate:.1f}%)")
-    print(f"  Jobs found: {stats['jobs']}")
-
-# Save RAW data locally
-raw_filename = f"raw_jobs_{datetime.now().strftime('%Y%m%d_%H%M')}.csv"
-combined.to_csv(raw_filename, index=False)
-
-# Quick stats
-unique_count = combined['job_url'].nunique()
-duplicate_count = len(combined) - unique_count
+    print(f"  Jobs returned: {stats['returned']}")
+    print(f"  New jobs: {stats['jobs']}")
 
 print(f"\n" + "="*70)
 print("✅ SCRAPING COMPLETE!")
 print("="*70)
-print(f"📈 Total raw results: {len(combined)}")
-print(f"🔗 Unique job URLs: {unique_count}")
-print(f"🗑️  Duplicates removed: {duplicate_count}")
+print(f"📈 Total raw results: {sum(stats['returned'] for stats in site_stats.values())}")
+print(f"🔗 Unique job URLs written: {writer.rows}")
+print(f"🆕 New since earlier runs: {writer.new}")
+print(f"🔁 Seen in earlier runs (still live): {writer.known}")
+print(f"🗑️  Duplicates skipped: {writer.duplicates}")
+print(f"🧠 Known job URLs: {seen_count(state)}")
 print(f"📁 Saved to: {raw_filename}")
 print(f"📅 Completed: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
 
@@ -0,0 +1,236 @@
+"""
+Incremental scrape state for scrape_jobs_maximum_coverage.py
+
+Kept in scrape_state.db next to the scraper (local only, never pushed):
+- queries: last successful completion per (site, term, location), with the
+  window and yield of that run
+- seen_urls: every job_url captured by earlier runs
+
+query_plan() turns a query's history into the hours_old window and result
+cap for the next run; is_exhausted() decides when to stop paging. Known URLs
+never stop paging: a page of postings seen before is followed by more
+still-open ones, and the raw file needs all of them.
+RawJobWriter streams each page's postings straight to the raw CSV, tagging
+the ones captured by an earlier run (seen_before).
+
+Usage:
+    from scrape_state import open_state, query_plan, record_query, RawJobWriter
+    conn = open_state()
+    hours_old, cap = query_plan(conn, site, term, location, started)
+    writer = RawJobWriter(raw_filename, conn)
+    writer.write(page)                    # returns the page's new-posting mask
+    writer.close(); writer.remember(started)
+"""
+
+import glob
+import hashlib
+import math
+import os
+import sqlite3
+from datetime import datetime, timedelta
+from typing import Iterable, Set, Tuple
+
+import pandas as pd
+
+SCRAPER_DIR = os.path.dirname(os.path.abspath(__file__))
+STATE_DB = os.path.join(SCRAPER_DIR, 'scrape_state.db')
+
+# Indeed serves 100 postings per search page; jobspy re-walks earlier pages
+# for an offset, so page k of a query costs k requests
+PAGE_SIZE = 100
+MAX_RESULTS = 300
+# Full window for a query with no successful run yet (the old fixed setting).
+# Also the floor: the raw file is the week's snapshot of open postings, so a
+# run never looks back less than this, only further after a missed run
+DEFAULT_HOURS_OLD = 168
+MIN_HOURS_OLD = DEFAULT_HOURS_OLD
+MAX_HOURS_OLD = 720
+# Extra lookback on top of the time since the last run: date_posted is a
+# date, and postings can surface on Indeed a while after they were posted
+OVERLAP_HOURS = 24
+# Cap = expected postings (new or still open) x headroom, rounded up to whole pages
+CAP_HEADROOM = 1.5
+
+LOOKUP_BATCH = 900
+
+
+def url_key(url: str) -> str:
+    return hashlib.sha1(str(url).strip().encode('utf-8')).hexdigest()[:16]
+
+
+def open_state(db_path: str = STATE_DB) -> sqlite3.Connection:
+    conn = sqlite3.connect(db_path)
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS queries (
+            site TEXT,
+            term TEXT,
+            location TEXT,
+            last_success TEXT,
+            window_hours REAL,
+            rows INTEGER,
+            new_rows INTEGER,
+            capped INTEGER,
+            PRIMARY KEY (site, term, location)
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS seen_urls (
+            url_key TEXT PRIMARY KEY,
+            first_seen TEXT
+        ) WITHOUT ROWID
+    ''')
+    return conn
+
+
+def seen_count(conn: sqlite3.Connection) -> int:
+    return conn.execute('SELECT COUNT(*) FROM seen_urls').fetchone()[0]
+
+
+def seed_from_raw(conn: sqlite3.Connection, raw_dir: str) -> int:
+    """Fill an empty seen_urls table from the raw_jobs_*.csv files already pushed."""
+    added = 0
+    for path in sorted(glob.glob(os.path.join(raw_dir, 'raw_jobs_*.csv'))):
+        if 'job_url' in pd.read_csv(path, nrows=0).columns:
+            urls = pd.read_csv(path, usecols=['job_url'])['job_url'].dropna()
+            added += remember_urls(conn, urls, datetime.fromtimestamp(os.path.getmtime(path)))
+    return added
+
+
+def query_plan(conn: sqlite3.Connection, site: str, term: str, location: str,
+               started: datetime) -> Tuple[int, int]:
+    """
+    (hours_old, results cap) for the next run of a query.
+
+    The window covers the time since the last successful run plus
+    OVERLAP_HOURS, and never less than DEFAULT_HOURS_OLD. The cap scales
+    the postings last run returned (new or still open; every one goes into
+    the raw file) per hour to that window; a run that hit its cap gets the
+    full MAX_RESULTS next time.
+    """
+    row = conn.execute('SELECT last_success, window_hours, rows, capped FROM queries '
+                       'WHERE site = ? AND term = ? AND location = ?', (site, term, location)).fetchone()
+    if row is None or row[0] is None:
+        return DEFAULT_HOURS_OLD, MAX_RESULTS
+
+    last_success, window_hours, rows, capped = row
+    elapsed = (started - datetime.fromisoformat(last_success)).total_seconds() / 3600
+    hours_old = int(min(max(math.ceil(elapsed + OVERLAP_HOURS), MIN_HOURS_OLD), MAX_HOURS_OLD))
+    if capped or not window_hours:
+        return hours_old, MAX_RESULTS
+    expected = rows / window_hours * hours_old * CAP_HEADROOM
+    cap = min(max(math.ceil(expected / PAGE_SIZE), 1) * PAGE_SIZE, MAX_RESULTS)
+    return hours_old, cap
+
+
+def known_urls(conn: sqlite3.Connection, urls: Iterable[str]) -> Set[str]:
+    """The subset of urls captured by an earlier run."""
+    by_key = {url_key(url): url for url in urls if pd.notna(url)}
+    keys = list(by_key)
+    found = set()
+    for start in range(0, len(keys), LOOKUP_BATCH):
+        batch = keys[start:start + LOOKUP_BATCH]
+        placeholders = ','.join('?' * len(batch))
+        for (key,) in conn.execute(f'SELECT url_key FROM seen_urls WHERE url_key IN ({placeholders})', batch):
+            found.add(by_key[key])
+    return found
+
+
+def remember_keys(conn: sqlite3.Connection, keys: Iterable[str], seen_at: datetime) -> int:
+    """Add url_keys to the known set. Returns how many were new."""
+    before = seen_count(conn)
+    first_seen = seen_at.isoformat(timespec='seconds')
+    conn.executemany('INSERT OR IGNORE INTO seen_urls (url_key, first_seen) VALUES (?, ?)',
+                     [(key, first_seen) for key in keys])
+    conn.commit()
+    return seen_count(conn) - before
+
+
+def remember_urls(conn: sqlite3.Connection, urls: Iterable[str], seen_at: datetime) -> int:
+    """Add urls to the known set. Returns how many were new."""
+    return remember_keys(conn, (url_key(url) for url in urls if pd.notna(url)), seen_at)
+
+
+def is_exhausted(page: pd.DataFrame, cutoff: datetime) -> bool:
+    """True when every posting on a page is older than cutoff."""
+    if page.empty:
+        return True
+    posted = pd.to_datetime(page['date_posted'], errors='coerce') if 'date_posted' in page.columns \
+        else pd.Series(pd.NaT, index=page.index)
+    old = posted < pd.Timestamp(cutoff.date())
+    return bool(old.all())
+
+
+class RawJobWriter:
+    """
+    Appends every live posting to the raw CSV as each page arrives.
+
+    The raw file is the week's snapshot of open postings, so postings
+    captured by an earlier run (seen_urls) are written too, with
+    seen_before=True; only rows already written earlier in this run are
+    counted and skipped. Rows are written in the first page's column order
+    (plus seen_before), so the file reads back like a single to_csv. The
+    file is written as PATH.partial and renamed by close(); the run's keys
+    reach seen_urls only via remember().
+    """
+
+    def __init__(self, path: str, conn: sqlite3.Connection):
+        self.path = path
+        self.partial = f'{path}.partial'
+        self.conn = conn
+        self.columns = None
+        self.keys = set()
+        self.rows = 0
+        self.new = 0
+        self.known = 0
+        self.duplicates = 0
+        if os.path.exists(self.partial):
+            os.remove(self.partial)
+
+    def _classify(self, page: pd.DataFrame) -> Tuple[pd.Series, pd.Series, pd.Series]:
+        """(write mask, seen-in-earlier-run mask, url_keys) for one page."""
+        keys = page['job_url'].map(lambda url: url_key(url) if pd.notna(url) else None)
+        in_db = page['job_url'].isin(known_urls(self.conn, page['job_url']))
+        in_run = keys.isin(self.keys) | keys.duplicated()
+        return keys.notna() & ~in_run, in_db, keys
+
+    def write(self, page: pd.DataFrame) -> pd.Series:
+        """Write a page's postings not yet written this run; returns the page's new-posting mask."""
+        if page.empty:
+            return pd.Series(False, index=page.index)
+        write, in_db, keys = self._classify(page)
+        new = write & ~in_db
+        self.new += int(new.sum())
+        self.known += int((write & in_db).sum())
+        self.duplicates += int(len(page) - write.sum())
+        if write.any():
+            if self.columns is None:
+                self.columns = list(page.columns) + ['seen_before']
+            page[write].assign(seen_before=in_db[write]).reindex(columns=self.columns).to_csv(
+                self.partial, mode='a', header=self.rows == 0, index=False)
+            self.rows += int(write.sum())
+            self.keys.update(keys[write])
+        return new
+
+    def close(self) -> bool:
+        """Publish the raw file. False when nothing was written."""
+        if not self.rows:
+            return False
+        os.replace(self.partial, self.path)
+        return True
+
+    def remember(self, seen_at: datetime) -> int:
+        return remember_keys(self.conn, self.keys, seen_at)
+
+
+def record_query(conn: sqlite3.Connection, site: str, term: str, location: str, started: datetime,
+                 window_hours: int, rows: int, new_rows: int, capped: bool):
+    """Mark a query as completed successfully as of its start time."""
+    conn.execute('INSERT OR REPLACE INTO queries (site, term, location, last_success, window_hours, '
+                 'rows, new_rows, capped) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                 (site, term, location, started.isoformat(timespec='seconds'), window_hours,
+                  rows, new_rows, int(capped)))
+    conn.commit()
+
+
+def cutoff_for(started: datetime, hours_old: int) -> datetime:
+    return started - timedelta(hours=hours_old)
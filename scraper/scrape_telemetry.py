@@ -0,0 +1,195 @@
+"""
+Per-search telemetry for scrape_jobs_maximum_coverage.py
+
+Every search appends one JSON line to scrape_metrics.jsonl next to the
+scraper (local only, like scrape_state.db), as soon as it finishes:
+
+    run_id, site, term, location, started, hours_old, cap, status,
+    error_class, error, retries, pages, requests, latency_s,
+    request_latency_s, rows_returned, new_rows, known_rows,
+    duplicate_rows, duplicate_ratio, capped
+
+`requests` counts the API calls jobspy makes (its indeed offset re-walks
+earlier pages). The end-of-run summary compares the run with the previous
+one and the median of earlier runs, and lists the searches that keep
+returning nothing new - candidates to drop from the term/location grid.
+
+Usage:
+    from scrape_telemetry import new_query_metrics, log_query, print_summary
+    python scrape_telemetry.py              # summary of the latest run
+    python scrape_telemetry.py --run RUN_ID
+"""
+
+import json
+import os
+from datetime import datetime
+from typing import Dict, Optional
+
+import pandas as pd
+
+SCRAPER_DIR = os.path.dirname(os.path.abspath(__file__))
+METRICS_LOG = os.path.join(SCRAPER_DIR, 'scrape_metrics.jsonl')
+
+# Runs compared against in the summary (median of these, before this run)
+HISTORY_RUNS = 5
+# A search is "dead" after this many consecutive successful runs with no new postings
+DEAD_SEARCH_RUNS = 3
+
+
+def new_run_id(started: datetime) -> str:
+    return started.strftime('%Y%m%d_%H%M%S')
+
+
+def new_query_metrics(run_id: str, site: str, term: str, location: str, started: datetime,
+                      hours_old: int, cap: int) -> Dict:
+    return {
+        'run_id': run_id,
+        'site': site,
+        'term': term,
+        'location': location,
+        'started': started.isoformat(timespec='seconds'),
+        'hours_old': hours_old,
+        'cap': cap,
+        'status': 'ok',
+        'error_class': None,
+        'error': None,
+        'retries': 0,
+        'pages': 0,
+        'requests': 0,
+        'latency_s': 0.0,
+        'request_latency_s': [],
+        'rows_returned': 0,
+        'new_rows': 0,
+        'known_rows': 0,
+        'duplicate_rows': 0,
+        'duplicate_ratio': None,
+        'capped': False,
+    }
+
+
+def log_query(metrics: Dict, path: str = METRICS_LOG):
+    """Append one search's metrics (written immediately, so a crashed run keeps its lines)."""
+    returned = metrics['rows_returned']
+    if returned:
+        metrics['duplicate_ratio'] = round((metrics['known_rows'] + metrics['duplicate_rows']) / returned, 4)
+    metrics['latency_s'] = round(sum(metrics['request_latency_s']), 3)
+    with open(path, 'a') as f:
+        f.write(json.dumps(metrics) + '\n')
+
+
+def load_metrics(path: str = METRICS_LOG) -> pd.DataFrame:
+    if not os.path.exists(path):
+        return pd.DataFrame()
+    with open(path) as f:
+        return pd.DataFrame([json.loads(line) for line in f if line.strip()])
+
+
+def summarize_runs(df: pd.DataFrame) -> pd.DataFrame:
+    """One row per run, oldest first."""
+    latencies = df.explode('request_latency_s').groupby('run_id')['request_latency_s']
+    runs = df.groupby('run_id').agg(
+        searches=('term', 'size'),
+        errors=('status', lambda s: int((s != 'ok').sum())),
+        retries=('retries', 'sum'),
+        requests=('requests', 'sum'),
+        latency_s=('latency_s', 'sum'),
+        rows_returned=('rows_returned', 'sum'),
+        new_rows=('new_rows', 'sum'),
+        known_rows=('known_rows', 'sum'),
+        duplicate_rows=('duplicate_rows', 'sum'),
+        capped=('capped', 'sum'),
+    )
+    runs['p50_request_s'] = latencies.apply(lambda s: pd.to_numeric(s, errors='coerce').median())
+    runs['p95_request_s'] = latencies.apply(lambda s: pd.to_numeric(s, errors='coerce').quantile(0.95))
+    runs['duplicate_ratio'] = ((runs['known_rows'] + runs['duplicate_rows'])
+                               / runs['rows_returned'].where(runs['rows_returned'] > 0))
+    runs['new_per_request'] = runs['new_rows'] / runs['requests'].where(runs['requests'] > 0)
+    return runs.sort_index()
+
+
+def dead_searches(df: pd.DataFrame, runs: int = DEAD_SEARCH_RUNS) -> pd.DataFrame:
+    """Searches whose last `runs` successful runs all returned no new postings."""
+    ok = df[df['status'] == 'ok'].sort_values('run_id')
+    recent = ok.groupby(['site', 'term', 'location']).tail(runs)
+    grouped = recent.groupby(['site', 'term', 'location']).agg(
+        runs=('run_id', 'size'), new_rows=('new_rows', 'sum'), requests=('requests', 'sum'))
+    return grouped[(grouped['runs'] >= runs) & (grouped['new_rows'] == 0)].reset_index()
+
+
+def _change(current, baseline) -> str:
+    if baseline is None or pd.isna(baseline) or pd.isna(current):
+        return ''
+    if baseline == 0:
+        return '' if current == 0 else '  (new)'
+    return f"  ({(current - baseline) / baseline * 100:+.0f}%)"
+
+
+def print_summary(run_id: Optional[str] = None, path: str = METRICS_LOG):
+    df = load_metrics(path)
+    if df.empty:
+        print("📉 No scrape telemetry yet")
+        return
+    runs = summarize_runs(df)
+    run_id = run_id or runs.index[-1]
+    if run_id not in runs.index:
+        print(f"📉 No telemetry for run {run_id}")
+        return
+    current = runs.loc[run_id]
+    earlier = runs.loc[runs.index < run_id]
+    previous = earlier.iloc[-1] if len(earlier) else None
+    median = earlier.tail(HISTORY_RUNS).median() if len(earlier) else None
+
+    print("\n" + "="*70)
+    print(f"📉 SCRAPE TELEMETRY - run {run_id}")
+    print("="*70)
+    if previous is not None:
+        print(f"   compared with previous run {earlier.index[-1]} and median of last {min(len(earlier), HISTORY_RUNS)}")
+
+    rows = [
+        ('Searches', 'searches', '{:.0f}'),
+        ('Errors', 'errors', '{:.0f}'),
+        ('Retries', 'retries', '{:.0f}'),
+        ('API requests', 'requests', '{:.0f}'),
+        ('Request time (s)', 'latency_s', '{:.0f}'),
+        ('p50 request (s)', 'p50_request_s', '{:.2f}'),
+        ('p95 request (s)', 'p95_request_s', '{:.2f}'),
+        ('Rows returned', 'rows_returned', '{:.0f}'),
+        ('New unique rows', 'new_rows', '{:.0f}'),
+        ('Duplicate ratio', 'duplicate_ratio', '{:.1%}'),
+        ('New per request', 'new_per_request', '{:.1f}'),
+        ('Searches at cap', 'capped', '{:.0f}'),
+    ]
+    print(f"   {'':<18} {'This run':>10} {'Previous':>10} {'Median':>10}")
+    for label, key, fmt in rows:
+        def cell(series):
+            if series is None or pd.isna(series[key]):
+                return '-'
+            return fmt.format(series[key])
+        print(f"   {label:<18} {cell(current):>10} {cell(previous):>10} {cell(median):>10}"
+              f"{_change(current[key], median[key] if median is not None else None)}")
+
+    this_run = df[df['run_id'] == run_id]
+    errors = this_run.loc[this_run['status'] != 'ok', 'error_class'].value_counts()
+    if len(errors):
+        print("\n   Errors by class: " + ", ".join(f"{name} ×{count}" for name, count in errors.items()))
+
+    by_term = this_run.groupby('term')['new_rows'].sum().sort_values(ascending=False)
+    by_location = this_run.groupby('location')['new_rows'].sum().sort_values(ascending=False)
+    print("\n   New rows by term:     " + ", ".join(f"{name} {count}" for name, count in by_term.head(5).items()))
+    print("   New rows by location: " + ", ".join(f"{name} {count}" for name, count in by_location.head(5).items()))
+
+    dead = dead_searches(df)
+    if len(dead):
+        print(f"\n   🪦 {len(dead)} searches with no new postings in their last {DEAD_SEARCH_RUNS} runs:")
+        for _, search in dead.head(10).iterrows():
+            print(f"      {search['term']} / {search['location']} ({search['requests']} requests)")
+    print(f"\n   📄 Log: {path}")
+
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description='Summarize scraper telemetry')
+    parser.add_argument('--run', help='Run id (default: latest)')
+    parser.add_argument('--log', default=METRICS_LOG)
+    args = parser.parse_args()
+    print_summary(args.run, args.log)
@@ -0,0 +1,462 @@
+#!/usr/bin/env python3
+"""
+Build profiler for the CRO Report site pipeline.
+
+Every workflow step runs its script through this wrapper, which records per
+stage: wall time, CPU time (including worker processes), peak RSS, files
+opened for reading/writing and bytes written. Generators mark their major
+phases with phase('load') / phase('render') / ... (or `with stage(...)` for
+nested work); outside the wrapper both are no-ops.
+
+At the end of the build, `report` turns the records into:
+- data/build_profile.json    per-stage metrics, committed with the data so
+                             the next build has a baseline
+- data/build_profile.folded  flamegraph.pl / speedscope input (self time, ms)
+and flags stages that got slower than the previous build's report.
+
+Usage (CI):
+    python scripts/build_profiler.py run scripts/generate_job_board.py [args]
+    python scripts/build_profiler.py report [--threshold 0.25] [--fail-on-regression]
+
+In a generator:
+    from build_profiler import phase, stage
+    phase('load')
+    df = load_jobs(...)
+    phase('render')
+    with stage('stale_pages'):
+        ...
+"""
+
+import argparse
+import json
+import os
+import runpy
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+RECORDS_PATH = 'data/build_profile_records.jsonl'
+REPORT_PATH = 'data/build_profile.json'
+FOLDED_PATH = 'data/build_profile.folded'
+
+# A stage is a regression when it is this much slower than last build...
+REGRESSION_THRESHOLD = 0.25
+# ...and by at least this many seconds (sub-second stages are mostly noise)
+REGRESSION_MIN_SECONDS = 1.0
+
+WRITE_FLAGS = os.O_WRONLY | os.O_RDWR | os.O_APPEND | os.O_CREAT | os.O_TRUNC
+# Imports go through open() too; they are not the build's I/O
+CODE_SUFFIXES = ('.py', '.pyc', '.so', '.pyd')
+# Nor are the profiler's own /proc/self/io reads (one per snapshot)
+PROC_PREFIX = '/proc/'
+
+
+# =============================================================================
+# COUNTERS
+# =============================================================================
+
+class _FileCounter:
+    """Counts open() calls by direction via an audit hook (installed once)."""
+
+    def __init__(self):
+        self.read = 0
+        self.written = 0
+        self.installed = False
+
+    def install(self):
+        if not self.installed:
+            sys.addaudithook(self._hook)
+            self.installed = True
+
+    def _hook(self, event, args):
+        if event != 'open' or not args or isinstance(args[0], int):
+            return
+        path = str(args[0])
+        if path.endswith(CODE_SUFFIXES) or path.startswith(PROC_PREFIX):
+            return
+        mode, flags = args[1], args[2]
+        if mode:
+            writing = any(c in mode for c in 'wax+')
+        else:
+            writing = bool(flags & WRITE_FLAGS)
+        if writing:
+            self.written += 1
+        else:
+            self.read += 1
+
+
+_files = _FileCounter()
+
+
+def _bytes_written():
+    """Bytes this process has written (Linux /proc), or None elsewhere."""
+    try:
+        with open('/proc/self/io', 'rb') as f:
+            for line in f:
+                if line.startswith(b'wchar:'):
+                    return int(line.split()[1])
+    except OSError:
+        return None
+    return None
+
+
+def _rss_mb(usage):
+    # Linux reports KB, macOS reports bytes
+    return usage.ru_maxrss / (1024 * 1024) if sys.platform == 'darwin' else usage.ru_maxrss / 1024
+
+
+def _snapshot():
+    if resource is not None:
+        self_usage = resource.getrusage(resource.RUSAGE_SELF)
+        child_usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+        cpu = self_usage.ru_utime + self_usage.ru_stime + child_usage.ru_utime + child_usage.ru_stime
+        rss = max(_rss_mb(self_usage), _rss_mb(child_usage))
+    else:
+        cpu, rss = time.process_time(), 0.0
+    return {
+        'time': time.time(),
+        'wall': time.perf_counter(),
+        'cpu': cpu,
+        'rss': rss,
+        'read': _files.read,
+        'written': _files.written,
+        'bytes': _bytes_written(),
+    }
+
+
+# =============================================================================
+# STAGES
+# =============================================================================
+
+class _Session:
+    """Open stages for the script being profiled, plus finished records."""
+
+    def __init__(self, script):
+        self.script = script
+        self.stack = []      # [(path tuple, start snapshot)]
+        self.phase = None    # stack depth of the current phase(), if one is open
+        self.records = {}    # path -> record; a stage entered per page merges into one
+
+    def begin(self, name):
+        parent = self.stack[-1][0] if self.stack else ()
+        self.stack.append((parent + (name,), _snapshot()))
+
+    def end(self, status='ok'):
+        path, start = self.stack.pop()
+        record = _record(path, start, _snapshot(), status)
+        if path in self.records:
+            record = _merge(self.records[path], record)
+        self.records[path] = record
+
+
+_session = None
+
+
+def _record(path, start, end, status):
+    bytes_written = None
+    if start['bytes'] is not None and end['bytes'] is not None:
+        bytes_written = end['bytes'] - start['bytes']
+    return {
+        'stage': ';'.join(path),
+        'depth': len(path),
+        'started_at': start['time'],
+        'wall_s': round(end['wall'] - start['wall'], 4),
+        'cpu_s': round(end['cpu'] - start['cpu'], 4),
+        # ru_maxrss is a high-water mark, so this is the peak up to the stage's end
+        'peak_rss_mb': round(end['rss'], 1),
+        'files_read': end['read'] - start['read'],
+        'files_written': end['written'] - start['written'],
+        'bytes_written': bytes_written,
+        'status': status,
+        'runs': 1,
+    }
+
+
+def _merge(total, record):
+    """Combine two records for the same stage path."""
+    merged = dict(total)
+    for key in ('wall_s', 'cpu_s'):
+        merged[key] = round(total[key] + record[key], 4)
+    for key in ('files_read', 'files_written', 'runs'):
+        merged[key] = total[key] + record[key]
+    if record['bytes_written'] is not None:
+        merged['bytes_written'] = (total['bytes_written'] or 0) + record['bytes_written']
+    merged['peak_rss_mb'] = max(total['peak_rss_mb'], record['peak_rss_mb'])
+    if record['status'] != 'ok':
+        merged['status'] = record['status']
+    return merged
+
+
+@contextmanager
+def stage(name):
+    """
+    Time a block as a sub-stage of whatever is running (no-op when not profiling).
+
+    Cheap enough to enter once per page: repeated entries of the same stage
+    are merged, with 'runs' counting them.
+    """
+    if _session is None:
+        yield
+        return
+    _session.begin(name)
+    status = 'ok'
+    try:
+        yield
+    except BaseException:
+        status = 'error'
+        raise
+    finally:
+        _session.end(status)
+
+
+def phase(name):
+    """
+    End the current phase and start the next one.
+
+    For top-level generator scripts, where wrapping each block in `with`
+    would re-indent the whole file. Phases end at the next phase() call or
+    when the script exits.
+    """
+    if _session is None:
+        return
+    end_phase()
+    _session.begin(name)
+    _session.phase = len(_session.stack)
+
+
+def end_phase():
+    """Close the open phase(), if any (and anything left open inside it)."""
+    if _session is None or _session.phase is None:
+        return
+    while len(_session.stack) >= _session.phase:
+        _session.end()
+    _session.phase = None
+
+
+# =============================================================================
+# RUNNER
+# =============================================================================
+
+def run_script(script, args, records_path=RECORDS_PATH):
+    """Run a script in this process under the profiler and append its records."""
+    global _session
+    name = Path(script).stem
+    # Generators import this module by name; make that the running instance
+    sys.modules['build_profiler'] = sys.modules[__name__]
+    _files.install()
+    _session = _Session(name)
+
+    sys.argv = [script] + list(args)
+    sys.path.insert(0, str(Path(script).parent))
+    exit_code = 0
+    _session.begin(name)
+    try:
+        runpy.run_path(script, run_name='__main__')
+    except SystemExit as e:
+        exit_code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    except BaseException:
+        exit_code = 1
+        raise
+    finally:
+        status = 'ok' if exit_code == 0 else 'error'
+        end_phase()
+        while _session.stack:
+            _session.end(status)
+        _write_records(list(_session.records.values()), records_path)
+        total = _session.records[(name,)]
+        print(f"⏱️  {name}: {total['wall_s']:.1f}s wall, {total['cpu_s']:.1f}s CPU, "
+              f"{total['peak_rss_mb']:.0f} MB peak")
+        _session = None
+    return exit_code
+
+
+def _write_records(records, records_path):
+    os.makedirs(os.path.dirname(records_path) or '.', exist_ok=True)
+    recorded_at = datetime.now().isoformat()
+    with open(records_path, 'a') as f:
+        for record in records:
+            f.write(json.dumps(dict(record, recorded_at=recorded_at)) + '\n')
+
+
+# =============================================================================
+# REPORT
+# =============================================================================
+
+def load_records(records_path=RECORDS_PATH):
+    if not os.path.exists(records_path):
+        return []
+    with open(records_path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def aggregate(records):
+    """
+    Merge records by stage path (a script run twice, e.g. the comp
+    aggregator's --add/--analyze/--newsletter, sums into one stage).
+    """
+    stages = {}
+    for record in records:
+        record = {key: value for key, value in record.items() if key != 'recorded_at'}
+        if record['stage'] in stages:
+            merged = _merge(stages[record['stage']], record)
+            merged['started_at'] = min(stages[record['stage']]['started_at'], record['started_at'])
+            record = merged
+        stages[record['stage']] = record
+    return stages
+
+
+def self_times(stages):
+    """Wall time not covered by a stage's direct children (what a flamegraph needs)."""
+    child_wall = {}
+    for name, stats in stages.items():
+        if ';' in name:
+            parent = name.rsplit(';', 1)[0]
+            child_wall[parent] = child_wall.get(parent, 0.0) + stats['wall_s']
+    return {name: max(0.0, stats['wall_s'] - child_wall.get(name, 0.0)) for name, stats in stages.items()}
+
+
+def write_folded(stages, path=FOLDED_PATH):
+    """Folded stacks ("a;b;c <ms>"), the input format of flamegraph.pl and speedscope."""
+    with open(path, 'w') as f:
+        for name, seconds in self_times(stages).items():
+            if seconds > 0:
+                f.write(f"{name} {round(seconds * 1000)}\n")
+
+
+def find_regressions(stages, previous, threshold=REGRESSION_THRESHOLD, min_seconds=REGRESSION_MIN_SECONDS):
+    """Stages slower than the previous report by > threshold and > min_seconds."""
+    before = {s['stage']: s for s in previous.get('stages', [])}
+    regressions = []
+    for name, stats in stages.items():
+        old = before.get(name)
+        if not old or not old['wall_s']:
+            continue
+        delta = stats['wall_s'] - old['wall_s']
+        if delta > min_seconds and delta / old['wall_s'] > threshold:
+            regressions.append({
+                'stage': name,
+                'previous_s': old['wall_s'],
+                'current_s': stats['wall_s'],
+                'slowdown': round(delta / old['wall_s'], 3),
+            })
+    return sorted(regressions, key=lambda r: -(r['current_s'] - r['previous_s']))
+
+
+def pipeline_order(stages):
+    """
+    Scripts in the order they started, each followed by its own stages.
+
+    Scheduler runs overlap, so start times alone interleave one script's
+    phases with another's. Each stage sorts by the start times along its
+    path instead: its script's, then its parent's, ..., then its own.
+    """
+    def key(stats):
+        names = stats['stage'].split(';')
+        prefixes = [';'.join(names[:i + 1]) for i in range(len(names))]
+        return [(stages[p]['started_at'], p) if p in stages else (stats['started_at'], p) for p in prefixes]
+    return sorted(stages.values(), key=key)
+
+
+def build_wall_time(records):
+    """
+    First script start to last script end. Scheduler runs overlap, so
+    summing the scripts' wall times would overstate the build.
+    """
+    scripts = [r for r in records if r['depth'] == 1]
+    if not scripts:
+        return 0.0
+    end = max(r['started_at'] + r['wall_s'] for r in scripts)
+    return round(end - min(r['started_at'] for r in scripts), 3)
+
+
+def print_report(report):
+    def mb(n):
+        return f"{n / (1024 * 1024):,.1f}" if n else '-'
+
+    print(f"\n⏱️  Build Profile")
+    print(f"   {'Stage':<48} {'Wall (s)':>9} {'CPU (s)':>8} {'RSS (MB)':>9} "
+          f"{'Read':>6} {'Wrote':>6} {'MB out':>8}")
+    for stats in report['stages']:
+        label = '  ' * (stats['depth'] - 1) + stats['stage'].rsplit(';', 1)[-1]
+        flag = ' ❌' if stats['status'] != 'ok' else ''
+        print(f"   {label[:48]:<48} {stats['wall_s']:>9.2f} {stats['cpu_s']:>8.2f} {stats['peak_rss_mb']:>9.0f} "
+              f"{stats['files_read']:>6} {stats['files_written']:>6} {mb(stats['bytes_written']):>8}{flag}")
+    print(f"   {'total':<48} {report['total_wall_s']:>9.2f}")
+
+    if report['regressions']:
+        print(f"\n⚠️  {len(report['regressions'])} stage(s) slower than the previous build:")
+        for r in report['regressions']:
+            print(f"   {r['stage']}: {r['previous_s']:.1f}s -> {r['current_s']:.1f}s (+{r['slowdown']:.0%})")
+            if os.environ.get('GITHUB_ACTIONS'):
+                print(f"::warning title=Build stage slowed down::{r['stage']} took {r['current_s']:.1f}s "
+                      f"(was {r['previous_s']:.1f}s, +{r['slowdown']:.0%})")
+    elif report['baseline']:
+        print(f"\n✓ No stage slowed by more than {report['threshold']:.0%} since {report['baseline']}")
+
+
+def build_report(threshold=REGRESSION_THRESHOLD, records_path=RECORDS_PATH, report_path=REPORT_PATH,
+                 folded_path=FOLDED_PATH):
+    """Aggregate this build's records, compare with the last report, and replace it."""
+    records = load_records(records_path)
+    if not records:
+        print(f"No profile records in {records_path}")
+        return None
+
+    previous = {}
+    if os.path.exists(report_path):
+        with open(report_path) as f:
+            previous = json.load(f)
+
+    stages = aggregate(records)
+    report = {
+        'generated_at': datetime.now().isoformat(),
+        'commit': os.environ.get('GITHUB_SHA'),
+        'baseline': previous.get('generated_at'),
+        'threshold': threshold,
+        'total_wall_s': build_wall_time(records),
+        'stages': pipeline_order(stages),
+        'regressions': find_regressions(stages, previous, threshold),
+    }
+
+    with open(report_path, 'w') as f:
+        json.dump(report, f, indent=2)
+    write_folded(stages, folded_path)
+    os.remove(records_path)
+
+    print_report(report)
+    print(f"\nReport: {report_path}")
+    print(f"Flamegraph input: {folded_path}")
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Profile the site build')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run = subparsers.add_parser('run', help='Run a script under the profiler')
+    run.add_argument('script')
+    run.add_argument('args', nargs=argparse.REMAINDER)
+
+    report = subparsers.add_parser('report', help='Write the build report and check for regressions')
+    report.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD,
+                        help=f'Slowdown ratio that counts as a regression (default {REGRESSION_THRESHOLD})')
+    report.add_argument('--fail-on-regression', action='store_true', help='Exit 1 if any stage regressed')
+
+    args = parser.parse_args()
+    if args.command == 'run':
+        sys.exit(run_script(args.script, args.args))
+
+    result = build_report(args.threshold)
+    if args.fail_on_regression and result and result['regressions']:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+Local build orchestrator: runs the build-site.yml stages as a DAG.
+
+The workflow runs every step in sequence. Here each stage declares the
+files and directories it reads and writes, and a stage waits only for the
+earlier stages it conflicts with (one writes what the other reads or
+writes, matching on whole path components). Everything else runs in
+parallel, so the result is the same as the workflow's order:
+- the comp aggregator rewrites the master database, so the salary,
+  company and insights stages that read it wait for it
+- charts, the job board's search index, image_pipeline and the insights
+  charts all write site/assets and keep their workflow order; the tools
+  pages read its image manifest
+- the sitemap reads and nav/footer rewrites all of site/, so they run last
+
+STAGES mirrors the workflow steps; keep the two in sync. Each stage runs
+under build_profiler.py (as in CI) with output in build_logs/<stage>.log.
+The first failure stops the build: running stages are terminated and the
+tail of the failed stage's log is printed. At the end the scheduler
+reports each stage's timing and the critical path (the chain of
+dependent stages that bounds the build's wall time).
+
+Usage:
+    python scripts/build_scheduler.py                # all cores
+    python scripts/build_scheduler.py --jobs 4
+    python scripts/build_scheduler.py --dry-run      # dependencies and waves only
+"""
+
+import argparse
+import glob
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+LOG_DIR = 'build_logs'
+PROFILER = 'scripts/build_profiler.py'
+LOG_TAIL_LINES = 30
+
+# Shared inputs and outputs (file or directory paths)
+RAW = 'data/raw_jobs_*.csv'
+SNAPSHOTS = 'data/executive_sales_jobs_*.csv'
+STORE = 'data/snapshots'
+MASTER = 'data/master_jobs_database.csv'
+STATS = 'data/snapshot_stats.json'
+DIFF = 'data/snapshot_diff.json'
+JOB_INDEX = 'data/job_index.db'
+FEATURES = 'data/job_features.db'
+TRACKING = 'data/Sales_Exec_Openings.csv'
+SIGNALS = 'data/signal_config.json'
+TOOLS = 'data/tools.json'
+ASSETS = 'site/assets'
+# Logo variants recorded by image_pipeline.py, read by templates.picture_html()
+IMAGE_MANIFEST = 'site/assets/image-manifest.json'
+
+
+def _enrich_commands():
+    return [['scripts/enrich_and_analyze.py']] if glob.glob(RAW) else []
+
+
+def _comp_commands():
+    # Latest on-disk CSV, like the workflow's `ls | sort | tail -1`
+    files = sorted(glob.glob(SNAPSHOTS))
+    if not files:
+        return []
+    return [
+        ['scripts/cro_comp_aggregator.py', '--add', files[-1]],
+        ['scripts/cro_comp_aggregator.py', '--analyze'],
+        ['scripts/cro_comp_aggregator.py', '--newsletter', files[-1]],
+    ]
+
+
+# In workflow order. 'run' is a list of commands (script + args), or a
+# function returning one when run; an empty list skips the stage.
+STAGES = [
+    {'name': 'enrich', 'run': _enrich_commands,
+     'reads': [RAW, SIGNALS], 'writes': [SNAPSHOTS, STATS]},
+    {'name': 'merge_to_master', 'run': [['scripts/merge_to_master.py']],
+     'reads': [SNAPSHOTS, STORE], 'writes': [MASTER, JOB_INDEX, TRACKING, STATS]},
+    {'name': 'snapshot_diff', 'run': [['scripts/snapshot_diff.py']],
+     'reads': [SNAPSHOTS, STORE, JOB_INDEX], 'writes': [DIFF]},
+    {'name': 'company_intel', 'run': [['scripts/generate_company_intel.py']],
+     'reads': [MASTER, SIGNALS, TOOLS], 'writes': ['data/company_intelligence.db', FEATURES]},
+    # Backfilling snapshot stats can write the manifest
+    {'name': 'graphs', 'run': [['scripts/generate_graphs.py']],
+     'reads': [TRACKING, SNAPSHOTS, STORE], 'writes': [ASSETS, STATS]},
+    {'name': 'comp_aggregator', 'run': _comp_commands,
+     'reads': [SNAPSHOTS], 'writes': [MASTER, 'data/comp_analysis.json', 'data/comp_newsletter_section.md', ASSETS]},
+    {'name': 'job_board', 'run': [['scripts/generate_job_board.py']],
+     'reads': [SNAPSHOTS, STORE, MASTER], 'writes': ['site/jobs/index.html', 'site/assets/jobs-index']},
+    {'name': 'salary_pages', 'run': [['scripts/generate_salary_pages.py']],
+     'reads': [MASTER], 'writes': ['site/salaries']},
+    # Without a current diff it lists every directory in site/jobs
+    {'name': 'job_pages', 'run': [['scripts/generate_job_pages.py']],
+     'reads': [SNAPSHOTS, STORE, DIFF, 'site/jobs'], 'writes': ['site/jobs']},
+    {'name': 'category_pages', 'run': [['scripts/generate_category_pages.py']],
+     'reads': [SNAPSHOTS, STORE], 'writes': ['site/jobs']},
+    {'name': 'company_pages', 'run': [['scripts/generate_company_pages.py']],
+     'reads': [SNAPSHOTS, STORE, MASTER], 'writes': ['site/companies']},
+    {'name': 'image_pipeline', 'run': [['scripts/image_pipeline.py']],
+     'reads': [TOOLS], 'writes': [ASSETS, 'data/image_size_report.json']},
+    {'name': 'tools_pages', 'run': [['scripts/generate_tools_pages.py']],
+     'reads': [TOOLS, IMAGE_MANIFEST], 'writes': ['site/tools']},
+    {'name': 'insights_page', 'run': [['scripts/generate_insights_page.py']],
+     'reads': [MASTER, SNAPSHOTS, STORE, SIGNALS], 'writes': ['data/market_intelligence.json', FEATURES, 'site/insights']},
+    {'name': 'insights_charts', 'run': [['scripts/generate_insights_charts.py']],
+     'reads': ['data/market_intelligence.json'], 'writes': [ASSETS]},
+    {'name': 'sync_moves', 'run': [['scripts/sync_moves_from_newsletters.py']],
+     'reads': ['newsletters'], 'writes': ['data/moves.json']},
+    {'name': 'homepage', 'run': [['scripts/generate_homepage.py']],
+     'reads': [SNAPSHOTS, STORE, DIFF, 'data/moves.json'], 'writes': ['site/index.html', STATS]},
+    {'name': 'newsletter_archive', 'run': [['scripts/generate_newsletter_archive.py']],
+     'reads': ['newsletters'], 'writes': ['site/newsletter']},
+    {'name': 'sitemap', 'run': [['scripts/generate_sitemap.py']],
+     'reads': ['site'], 'writes': ['site/sitemaps', 'site/sitemap.xml', 'site/robots.txt']},
+    {'name': 'nav_footer', 'run': [['scripts/update_nav_footer.py']],
+     'reads': ['templates/includes'], 'writes': ['site']},
+    {'name': 'snapshot_store', 'run': [['scripts/snapshot_store.py', '--ingest', '--prune']],
+     'reads': [], 'writes': [SNAPSHOTS, STORE]},
+]
+
+
+# =============================================================================
+# DEPENDENCIES
+# =============================================================================
+
+def _overlaps(a, b):
+    """True if a and b are the same path or one contains the other."""
+    return a == b or a.startswith(b.rstrip('/') + '/') or b.startswith(a.rstrip('/') + '/')
+
+
+def _conflicts(first, second):
+    return any(_overlaps(w, p) for w in first['writes'] for p in second['reads'] + second['writes']) or \
+        any(_overlaps(r, w) for r in first['reads'] for w in second['writes'])
+
+
+def dependencies(stages=STAGES):
+    """Stage name -> names of the earlier stages it must wait for (transitively reduced)."""
+    deps = {stage['name']: [] for stage in stages}
+    for j, later in enumerate(stages):
+        for earlier in stages[:j]:
+            if _conflicts(earlier, later):
+                deps[later['name']].append(earlier['name'])
+
+    # Drop edges implied by another dependency
+    reach = {}
+    for stage in stages:
+        name = stage['name']
+        reach[name] = set(deps[name]).union(*(reach[d] for d in deps[name]))
+    return {name: [d for d in direct if not any(d in reach[other] for other in direct if other != d)]
+            for name, direct in deps.items()}
+
+
+def waves(deps):
+    """Stages grouped by depth: each wave depends only on earlier waves."""
+    depth = {}
+    for name, direct in deps.items():
+        depth[name] = 1 + max((depth[d] for d in direct), default=-1)
+    grouped = {}
+    for name, level in depth.items():
+        grouped.setdefault(level, []).append(name)
+    return [grouped[level] for level in sorted(grouped)]
+
+
+def critical_path(deps, durations):
+    """(length in seconds, chain of stage names) of the longest dependent chain."""
+    finish, via = {}, {}
+    for name, direct in deps.items():
+        before = max(direct, key=lambda d: finish[d], default=None)
+        finish[name] = (finish[before] if before else 0) + durations.get(name, 0)
+        via[name] = before
+    end = max(finish, key=finish.get)
+    chain = [end]
+    while via[chain[-1]]:
+        chain.append(via[chain[-1]])
+    return finish[end], list(reversed(chain))
+
+
+# =============================================================================
+# RUNNER
+# =============================================================================
+
+class _Build:
+    """Running processes and the stop flag shared by the stage threads."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.processes = {}
+        self.stopping = False
+
+    def stop(self):
+        with self.lock:
+            self.stopping = True
+            for process in self.processes.values():
+                if process.poll() is None:
+                    process.terminate()
+
+
+def _run_stage(stage, commands, build, started_at, log_dir, profile):
+    name = stage['name']
+    log_path = os.path.join(log_dir, f'{name}.log')
+    start = time.perf_counter()
+    status = 'ok'
+    env = dict(os.environ, PYTHONUNBUFFERED='1')
+    with open(log_path, 'w') as log:
+        for command in commands:
+            argv = [sys.executable] + ([PROFILER, 'run'] if profile else []) + command
+            log.write(f"$ {' '.join(argv)}\n")
+            log.flush()
+            with build.lock:
+                if build.stopping:
+                    status = 'cancelled'
+                    break
+                process = subprocess.Popen(argv, stdout=log, stderr=subprocess.STDOUT, env=env)
+                build.processes[name] = process
+            code = process.wait()
+            with build.lock:
+                build.processes.pop(name, None)
+                stopping = build.stopping
+            if code != 0:
+                status = 'cancelled' if stopping else 'failed'
+                break
+    end = time.perf_counter()
+    return {'name': name, 'status': status, 'log': log_path,
+            'start_s': round(start - started_at, 2), 'end_s': round(end - started_at, 2),
+            'wall_s': round(end - start, 2)}
+
+
+def _tail(path, lines=LOG_TAIL_LINES):
+    with open(path, errors='replace') as f:
+        return f.readlines()[-lines:]
+
+
+def run_build(stages=STAGES, jobs=None, log_dir=LOG_DIR, profile=True):
+    """Run every stage as soon as its dependencies finish. Returns the stage results."""
+    jobs = jobs or os.cpu_count() or 1
+    deps = dependencies(stages)
+    by_name = {stage['name']: stage for stage in stages}
+    os.makedirs(log_dir, exist_ok=True)
+
+    build = _Build()
+    started_at = time.perf_counter()
+    results, finished, pending, running = {}, set(), [stage['name'] for stage in stages], {}
+    failed = None
+
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        while pending or running:
+            for name in list(pending):
+                if failed or len(running) >= jobs:
+                    break
+                if not all(d in finished for d in deps[name]):
+                    continue
+                pending.remove(name)
+                stage = by_name[name]
+                commands = stage['run']() if callable(stage['run']) else stage['run']
+                if not commands:
+                    print(f"⏭️  {name}: nothing to do")
+                    results[name] = {'name': name, 'status': 'skipped', 'log': None,
+                                     'start_s': 0, 'end_s': 0, 'wall_s': 0}
+                    finished.add(name)
+                    continue
+                print(f"▶️  {name}")
+                running[executor.submit(_run_stage, stage, commands, build, started_at, log_dir, profile)] = name
+
+            if not running:
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                result = future.result()
+                results[name] = result
+                if result['status'] == 'ok':
+                    finished.add(name)
+                    print(f"✅ {name} ({result['wall_s']:.1f}s)")
+                elif result['status'] == 'failed' and not failed:
+                    failed = name
+                    print(f"❌ {name} failed after {result['wall_s']:.1f}s - stopping the build")
+                    build.stop()
+
+    for name in pending:
+        results[name] = {'name': name, 'status': 'not run', 'log': None, 'start_s': 0, 'end_s': 0, 'wall_s': 0}
+    return [results[stage['name']] for stage in stages]
+
+
+def print_report(results, deps, total_s):
+    print("\n" + "="*70)
+    print("🗓️  BUILD SCHEDULE")
+    print("="*70)
+    print(f"{'Stage':<20} {'Status':<10} {'Start':>8} {'End':>8} {'Wall':>8}")
+    for result in sorted(results, key=lambda r: (r['status'] in ('skipped', 'not run'), r['start_s'])):
+        print(f"{result['name']:<20} {result['status']:<10} {result['start_s']:>7.1f}s "
+              f"{result['end_s']:>7.1f}s {result['wall_s']:>7.1f}s")
+
+    serial_s = sum(result['wall_s'] for result in results)
+    length, chain = critical_path(deps, {result['name']: result['wall_s'] for result in results})
+    print(f"\n⏱️  Wall time: {total_s:.1f}s (stages sum to {serial_s:.1f}s, "
+          f"{serial_s / total_s if total_s else 0:.1f}x parallelism)")
+    print(f"🧵 Critical path: {length:.1f}s")
+    durations = {result['name']: result['wall_s'] for result in results}
+    print("   " + " → ".join(f"{name} ({durations[name]:.1f}s)" for name in chain if durations[name]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the site build stages in parallel where independent')
+    parser.add_argument('--jobs', '-j', type=int, default=os.cpu_count(), help='Stages to run at once (default: cores)')
+    parser.add_argument('--dry-run', action='store_true', help='Print dependencies and waves without running')
+    parser.add_argument('--no-profile', action='store_true', help='Run scripts directly, not under build_profiler.py')
+    parser.add_argument('--logs', default=LOG_DIR, help=f'Per-stage log directory (default {LOG_DIR})')
+    args = parser.parse_args()
+
+    deps = dependencies()
+    if args.dry_run:
+        for number, wave in enumerate(waves(deps), 1):
+            print(f"Wave {number}:")
+            for name in wave:
+                print(f"   {name:<20} after {', '.join(deps[name]) or '-'}")
+        return
+
+    print("="*70)
+    print(f"🏗️  SITE BUILD - {len(STAGES)} stages, up to {args.jobs} at a time")
+    print("="*70)
+    started = time.perf_counter()
+    results = run_build(jobs=args.jobs, log_dir=args.logs, profile=not args.no_profile)
+    total_s = time.perf_counter() - started
+    print_report(results, deps, total_s)
+
+    failed = [result for result in results if result['status'] == 'failed']
+    for result in failed:
+        print(f"\n❌ {result['name']} - last lines of {result['log']}:")
+        print(''.join('   ' + line for line in _tail(result['log'])), end='')
+    if failed:
+        sys.exit(1)
+
+    if not args.no_profile:
+        subprocess.run([sys.executable, PROFILER, 'report'], check=False)
+
+
+if __name__ == '__main__':
+    main()
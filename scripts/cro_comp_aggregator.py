@@ -25,6 +25,12 @@ from pathlib import Path
 import argparse
 import json
 import warnings
+
+sys.path.insert(0, 'scripts')
+from image_pipeline import save_chart
+from job_dedupe import collapse_reposts, count_roles
+from data_quality import plausible_comp
+
 warnings.filterwarnings('ignore')
 
 # ============================================================
@@ -36,6 +42,11 @@ MASTER_DB = DATA_DIR / "master_jobs_database.csv"
 ANALYSIS_OUTPUT = DATA_DIR / "comp_analysis.json"
 NEWSLETTER_OUTPUT = DATA_DIR / "comp_newsletter_section.md"
 
+# Salary cube: every seniority x company stage x metro combination ('*' = all)
+CUBE_DIMENSIONS = ['seniority', 'company_stage', 'metro']
+CUBE_ALL = '*'
+CUBE_MIN_COUNT = 3
+
 # Chart output paths - save to site/assets for web display
 CHART_SENIORITY = SITE_ASSETS / "comp_by_seniority.png"
 CHART_STAGE = SITE_ASSETS / "comp_by_stage.png"
@@ -117,7 +128,7 @@ def generate_seniority_chart(analysis):
     ax.legend(handles=[min_patch, max_patch], loc='lower right', facecolor='#FFFFFF', edgecolor=GRID_COLOR, fontsize=18)
     
     plt.tight_layout()
-    plt.savefig(CHART_SENIORITY, dpi=150, facecolor='#FFFFFF', edgecolor='none', bbox_inches='tight')
+    save_chart(CHART_SENIORITY, dpi=150, facecolor='#FFFFFF', edgecolor='none', bbox_inches='tight')
     plt.close()
     print(f"  📊 Saved: {CHART_SENIORITY}")
 
@@ -190,7 +201,7 @@ def generate_stage_chart(analysis):
     ax.legend(handles=[min_patch, max_patch], loc='lower right', facecolor='#FFFFFF', edgecolor=GRID_COLOR, fontsize=18)
     
     plt.tight_layout()
-    plt.savefig(CHART_STAGE, dpi=150, facecolor='#FFFFFF', edgecolor='none', bbox_inches='tight')
+    save_chart(CHART_STAGE, dpi=150, facecolor='#FFFFFF', edgecolor='none', bbox_inches='tight')
     plt.close()
     print(f"  📊 Saved: {CHART_STAGE}")
 
@@ -242,7 +253,7 @@ def generate_location_chart(analysis):
     ax.legend(handles=[min_patch, max_patch], loc='lower right', facecolor='#FFFFFF', edgecolor=GRID_COLOR, fontsize=18)
     
     plt.tight_layout()
-    plt.savefig(CHART_LOCATION, dpi=150, facecolor='#FFFFFF', edgecolor='none', bbox_inches='tight')
+    save_chart(CHART_LOCATION, dpi=150, facecolor='#FFFFFF', edgecolor='none', bbox_inches='tight')
     plt.close()
     print(f"  📊 Saved: {CHART_LOCATION}")
 
@@ -577,18 +588,69 @@ def revalidate_master_database():
 # ============================================================
 # COMPENSATION ANALYSIS
 # ============================================================
+def build_salary_cube(executive_df):
+    """
+    Salary aggregates for every combination of CUBE_DIMENSIONS, including
+    roll-ups (CUBE_ALL) and the overall total, one groupby per dimension subset.
+
+    Cells with fewer than CUBE_MIN_COUNT roles or an Unknown value are dropped.
+    """
+    from itertools import combinations
+
+    df = executive_df[['min_amount', 'max_amount', 'midpoint']].copy()
+    for dim in CUBE_DIMENSIONS:
+        df[dim] = executive_df[dim].astype(object).fillna('Unknown') if dim in executive_df.columns else 'Unknown'
+
+    stats = dict(
+        count=('min_amount', 'size'),
+        min_base_avg=('min_amount', 'mean'),
+        max_base_avg=('max_amount', 'mean'),
+        min_base_median=('min_amount', 'median'),
+        max_base_median=('max_amount', 'median'),
+        midpoint_avg=('midpoint', 'mean'),
+    )
+    cells = []
+    for size in range(len(CUBE_DIMENSIONS) + 1):
+        for dims in combinations(CUBE_DIMENSIONS, size):
+            if dims:
+                grouped = df.groupby(list(dims)).agg(**stats).reset_index()
+            else:
+                grouped = df.groupby(lambda _: 0).agg(**stats).reset_index(drop=True)
+            for dim in CUBE_DIMENSIONS:
+                if dim not in dims:
+                    grouped[dim] = CUBE_ALL
+            cells.append(grouped)
+
+    cube = pd.concat(cells, ignore_index=True)
+    cube = cube[(cube['count'] >= CUBE_MIN_COUNT) & cube['max_base_avg'].notna()
+                & ~cube[CUBE_DIMENSIONS].isin(['Unknown']).any(axis=1)]
+    for col in ['min_base_avg', 'max_base_avg', 'min_base_median', 'max_base_median', 'midpoint_avg']:
+        cube[col] = cube[col].round().astype(int)
+    return cube[CUBE_DIMENSIONS + list(stats)].to_dict('records')
+
+
 def analyze_compensation(df):
     """Generate comprehensive compensation analysis."""
     
-    # Filter to records with salary data
-    salary_df = df[
+    # Filter to records with salary data, one per role (reposts share a canonical_job_id)
+    salary_df = collapse_reposts(df[
         (df['min_amount'].notna()) & 
         (df['min_amount'] != '') &
         (pd.to_numeric(df['min_amount'], errors='coerce') > 0)
-    ].copy()
+    ]).copy()
     
     salary_df['min_amount'] = pd.to_numeric(salary_df['min_amount'], errors='coerce')
     salary_df['max_amount'] = pd.to_numeric(salary_df['max_amount'], errors='coerce')
+    # Disclosure is counted before the plausibility filter (implausible pay
+    # was still disclosed), in roles like its denominator
+    disclosed_df = salary_df
+
+    # Drop unit/parsing errors (hourly-as-yearly, inverted or absurd ranges) before averaging
+    plausible = plausible_comp(salary_df)
+    implausible_count = int((~plausible).sum())
+    if implausible_count:
+        print(f"Dropped {implausible_count} rows with implausible comp")
+    salary_df = salary_df[plausible].copy()
     salary_df['midpoint'] = (salary_df['min_amount'] + salary_df['max_amount']) / 2
     
     # Filter out non-executive roles from seniority analysis
@@ -598,9 +660,11 @@ def analyze_compensation(df):
     analysis = {
         'generated_at': datetime.now().isoformat(),
         'total_records': len(df),
+        'total_roles': count_roles(df),
         'records_with_salary': len(salary_df),
+        'implausible_comp_dropped': implausible_count,
         'executive_records': len(executive_df),
-        'disclosure_rate': round(len(salary_df) / len(df) * 100, 1) if len(df) > 0 else 0,
+        'disclosure_rate': round(len(disclosed_df) / count_roles(df) * 100, 1) if len(df) > 0 else 0,
         'date_range': {
             'earliest': df['date_posted'].min() if 'date_posted' in df.columns else None,
             'latest': df['date_posted'].max() if 'date_posted' in df.columns else None
@@ -685,6 +749,9 @@ def analyze_compensation(df):
                     'max_base_avg': round(remote_df['max_amount'].mean())
                 }
     
+    # Every seniority x stage x metro combination, for the salary page engine
+    analysis['salary_cube'] = build_salary_cube(executive_df)
+
     # Top Paying Roles (from executive roles only)
     top_roles = executive_df.nlargest(10, 'max_amount')[['title', 'company', 'min_amount', 'max_amount', 'seniority', 'company_stage']]
     analysis['top_paying_roles'] = top_roles.to_dict('records')
@@ -698,7 +765,8 @@ def analyze_compensation(df):
                     'count': len(week_df),
                     'avg_min': round(week_df['min_amount'].mean()),
                     'avg_max': round(week_df['max_amount'].mean()),
-                    'disclosure_rate': round(len(week_df) / len(df[df['import_week'] == week]) * 100, 1)
+                    'disclosure_rate': round((disclosed_df['import_week'] == week).sum()
+                                             / count_roles(df[df['import_week'] == week]) * 100, 1)
                 }
     
     # Save analysis
@@ -716,7 +784,7 @@ def generate_newsletter_section(analysis, current_week_csv=None):
     
     md = f"""# 💰 Compensation Benchmarking
 
-**Data as of {datetime.now().strftime('%B %d, %Y')}** | {analysis['executive_records']} executive roles with disclosed salary out of {analysis['total_records']} total ({analysis['disclosure_rate']}% disclosure rate)
+**Data as of {datetime.now().strftime('%B %d, %Y')}** | {analysis['executive_records']} executive roles with disclosed salary out of {analysis.get('total_roles', analysis['total_records'])} total roles ({analysis['disclosure_rate']}% disclosure rate)
 
 """
     
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Column-wise data quality scoring for job rows.
+
+Scores every row in a few vectorized expressions instead of a per-row apply:
+- Field completeness masks (description, salary, location, company)
+- Comp sanity bounds on annualized salary (floor, ceiling, inverted or
+  implausibly wide ranges)
+- Description length
+
+The same pass returns per-field completeness and comp outlier counts for the
+weekly summary. plausible_comp() is the filter cro_comp_aggregator.py uses
+to keep broken salary rows out of the comp analysis.
+
+Usage:
+    from data_quality import assess_quality, plausible_comp
+    quality, report = assess_quality(df)
+    df[quality.columns] = quality
+    salary_df = df[plausible_comp(df)]
+"""
+
+from typing import Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Points per complete field (sum = 100)
+QUALITY_WEIGHTS = {'description': 40, 'salary': 30, 'location': 15, 'company': 15}
+# (minimum score, label), highest first; anything lower is 'Basic'
+QUALITY_TIERS = [(85, 'Premium'), (55, 'Good')]
+MIN_DESCRIPTION_CHARS = 100
+
+# Annualized base pay outside these bounds is a parsing or unit error for VP+ roles
+COMP_FLOOR = 50_000
+COMP_CEILING = 1_500_000
+MAX_RANGE_RATIO = 3.0
+
+# Multipliers to annualize jobspy's salary intervals
+INTERVAL_FACTORS = {'yearly': 1, 'monthly': 12, 'weekly': 52, 'daily': 260, 'hourly': 2080}
+
+
+def _present(df: pd.DataFrame, col: str) -> pd.Series:
+    """True where col has a non-empty value (missing columns are all False)."""
+    if col not in df.columns:
+        return pd.Series(False, index=df.index)
+    values = df[col]
+    text = values.astype(str).str.strip()
+    return values.notna() & (text != '') & (text.str.lower() != 'nan')
+
+
+def annualized_comp(df: pd.DataFrame) -> Tuple[pd.Series, pd.Series]:
+    """(min, max) salary per year, using the interval column when there is one."""
+    min_amount = pd.to_numeric(df['min_amount'], errors='coerce') if 'min_amount' in df.columns \
+        else pd.Series(np.nan, index=df.index)
+    max_amount = pd.to_numeric(df['max_amount'], errors='coerce') if 'max_amount' in df.columns \
+        else pd.Series(np.nan, index=df.index)
+    if 'interval' in df.columns:
+        factor = df['interval'].astype(str).str.lower().map(INTERVAL_FACTORS).fillna(1)
+        min_amount, max_amount = min_amount * factor, max_amount * factor
+    return min_amount, max_amount
+
+
+def comp_flags(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Boolean comp outlier flags per row (all False where there is no salary).
+
+    Columns: comp_below_floor, comp_above_ceiling, comp_inverted, comp_wide_range
+    """
+    min_amount, max_amount = annualized_comp(df)
+    low = min_amount.fillna(max_amount)
+    high = max_amount.fillna(min_amount)
+    return pd.DataFrame({
+        'comp_below_floor': low < COMP_FLOOR,
+        'comp_above_ceiling': high > COMP_CEILING,
+        'comp_inverted': max_amount < min_amount,
+        'comp_wide_range': (min_amount > 0) & (max_amount > min_amount * MAX_RANGE_RATIO),
+    }, index=df.index)
+
+
+def plausible_comp(df: pd.DataFrame) -> pd.Series:
+    """True where the row has a salary that passes every comp sanity check."""
+    min_amount, max_amount = annualized_comp(df)
+    has_salary = (min_amount > 0) | (max_amount > 0)
+    return has_salary & ~comp_flags(df).any(axis=1)
+
+
+def assess_quality(df: pd.DataFrame) -> Tuple[pd.DataFrame, Dict]:
+    """
+    Score every row and summarize completeness in one pass.
+
+    Salary points need a plausible salary; a listed but implausible salary
+    still sets has_salary, and is counted under comp outliers.
+
+    Returns:
+        (DataFrame with data_quality_score, data_quality, has_description,
+         has_salary and comp_outlier columns aligned to df.index,
+         report dict with rows, completeness, comp_outliers and tiers)
+    """
+    description_chars = df['description'].astype(str).where(df['description'].notna(), '').str.len() \
+        if 'description' in df.columns else pd.Series(0, index=df.index)
+    masks = pd.DataFrame({
+        'description': description_chars > MIN_DESCRIPTION_CHARS,
+        'salary': _present(df, 'min_amount'),
+        'location': _present(df, 'location'),
+        'company': _present(df, 'company'),
+    }, index=df.index)
+    flags = comp_flags(df)
+    comp_outlier = masks['salary'] & flags.any(axis=1)
+
+    earned = masks.copy()
+    earned['salary'] = masks['salary'] & ~comp_outlier
+    score = sum(earned[field].astype(int) * weight for field, weight in QUALITY_WEIGHTS.items())
+    label = pd.Series(np.select([score >= threshold for threshold, _ in QUALITY_TIERS],
+                                [name for _, name in QUALITY_TIERS], 'Basic'), index=df.index)
+
+    quality = pd.DataFrame({
+        'data_quality_score': score,
+        'data_quality': label,
+        'has_description': masks['description'],
+        'has_salary': masks['salary'],
+        'comp_outlier': comp_outlier,
+    }, index=df.index)
+
+    rows = len(df)
+    complete = masks.sum()
+    report = {
+        'rows': rows,
+        'completeness': {field: {'count': int(complete[field]),
+                                 'pct': round(complete[field] / rows * 100, 1) if rows else 0.0}
+                         for field in masks.columns},
+        'comp_outliers': {name: int(count) for name, count in flags[masks['salary']].sum().items()},
+        'comp_outlier_rows': int(comp_outlier.sum()),
+        'tiers': {name: int((label == name).sum()) for name in [n for _, n in QUALITY_TIERS] + ['Basic']},
+        'description_chars_median': int(description_chars.median()) if rows else 0,
+    }
+    return quality, report
+
+
+def format_report(report: Dict) -> str:
+    """Text block for the console and the weekly summary file."""
+    rows = report['rows'] or 1
+    lines = ["Field completeness:"]
+    for field, stats in report['completeness'].items():
+        lines.append(f"  {field:.<36} {stats['count']:>6} ({stats['pct']:>5.1f}%)")
+    lines.append(f"Median description length: {report['description_chars_median']:,} chars")
+    lines.append(f"Comp outliers: {report['comp_outlier_rows']} rows")
+    for name, count in report['comp_outliers'].items():
+        if count:
+            lines.append(f"  {name.replace('comp_', '').replace('_', ' '):.<36} {count:>6} ({count / rows * 100:>5.1f}%)")
+    return '\n'.join(lines)
@@ -1,6 +1,11 @@
 import pandas as pd
 from datetime import datetime
 import glob
+import sys
+
+sys.path.insert(0, 'scripts')
+from data_quality import assess_quality, format_report
+from snapshot_stats import record_snapshot
 
 # ============================================================
 # LOAD MOST RECENT RAW DATA
@@ -180,27 +185,9 @@ df_executive['is_tech'] = df_executive['company'].str.lower().str.contains(
     '|'.join(tech_keywords), na=False
 ).fillna(False)
 
-# Data quality scoring
-def calculate_data_quality(row):
-    score = 0
-    if pd.notna(row['description']) and len(str(row['description'])) > 100:
-        score += 40
-    if pd.notna(row['min_amount']):
-        score += 30
-    if pd.notna(row['location']) and str(row['location']) not in ['', 'nan']:
-        score += 15
-    if pd.notna(row['company']) and str(row['company']) not in ['', 'nan']:
-        score += 15
-    return score
-
-df_executive['data_quality_score'] = df_executive.apply(calculate_data_quality, axis=1)
-df_executive['data_quality'] = df_executive['data_quality_score'].apply(
-    lambda x: 'Premium' if x >= 85 else 'Good' if x >= 55 else 'Basic'
-)
-
-# Key field indicators
-df_executive['has_description'] = df_executive['description'].notna() & (df_executive['description'].str.len() > 100)
-df_executive['has_salary'] = df_executive['min_amount'].notna()
+# Data quality scoring (vectorized; also flags implausible comp)
+quality, quality_report = assess_quality(df_executive)
+df_executive[quality.columns] = quality
 
 # Week identifier
 df_executive['week_added'] = datetime.now().strftime('%Y-%m-%d')
@@ -231,6 +218,8 @@ print(f"\n{'STEP 5: SAVING':-^70}")
 enriched_filename = f"data/executive_sales_jobs_{datetime.now().strftime('%Y%m%d')}.csv"
 df_executive.to_csv(enriched_filename, index=False)
 print(f"✅ Saved enriched data: {enriched_filename}")
+record_snapshot(enriched_filename, df_executive)
+print(f"✅ Recorded snapshot stats: data/snapshot_stats.json")
 
 # ============================================================
 # STEP 6: GENERATE COMPREHENSIVE SUMMARY
@@ -254,17 +243,16 @@ for level in ['C-Level', 'EVP', 'SVP', 'VP', 'Head of']:
     print(f"{level:.<45} {count:>5} ({pct:>5.1f}%)")
 
 print(f"\n{'DATA QUALITY':-^70}")
-quality_counts = df_executive['data_quality'].value_counts()
-for quality in ['Premium', 'Good', 'Basic']:
-    count = quality_counts.get(quality, 0)
+for tier, count in quality_report['tiers'].items():
     pct = (count / len(df_executive) * 100) if len(df_executive) > 0 else 0
-    print(f"{quality:.<45} {count:>5} ({pct:>5.1f}%)")
+    print(f"{tier:.<45} {count:>5} ({pct:>5.1f}%)")
+print(format_report(quality_report))
 
 print(f"\n{'JOB CHARACTERISTICS':-^70}")
-tech_count = len(df_executive[df_executive['is_tech'] == True])
-remote_count = len(df_executive[df_executive['is_remote'] == True])
-desc_count = len(df_executive[df_executive['has_description'] == True])
-salary_count = len(df_executive[df_executive['has_salary'] == True])
+tech_count = int((df_executive['is_tech'] == True).sum())
+remote_count = int((df_executive['is_remote'] == True).sum())
+desc_count = int(df_executive['has_description'].sum())
+salary_count = int(df_executive['has_salary'].sum())
 
 print(f"Tech companies........................ {tech_count:>6} ({tech_count/len(df_executive)*100:.1f}%)")
 print(f"Remote positions...................... {remote_count:>6} ({remote_count/len(df_executive)*100:.1f}%)")
@@ -315,7 +303,11 @@ with open(summary_filename, 'w') as f:
     f.write("-" * 70 + "\n")
     f.write(f"With Salary: {salary_count} ({salary_count/len(df_executive)*100:.1f}%)\n")
     f.write(f"Tech Companies: {tech_count} ({tech_count/len(df_executive)*100:.1f}%)\n")
-    f.write(f"Remote: {remote_count} ({remote_count/len(df_executive)*100:.1f}%)\n")
+    f.write(f"Remote: {remote_count} ({remote_count/len(df_executive)*100:.1f}%)\n\n")
+
+    f.write("DATA QUALITY\n")
+    f.write("-" * 70 + "\n")
+    f.write(format_report(quality_report) + "\n")
 
 print("\n" + "="*70)
 print("✅ ANALYSIS COMPLETE!")
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+Job Feature Store for CRO Report
+
+Persistent per-job cache of description-derived features:
+- Technographics and business signals from signal_config.json
+- Market intel patterns (tools, methodologies, trends, industries, red flags)
+
+Each job is keyed by its URL plus a hash of its text, and its matches are
+stored as a packed bitset. Only new or changed descriptions are regex-scanned
+on a build; every aggregate downstream is a column sum over the bit matrix.
+
+Usage:
+    from feature_store import load_feature_matrix
+    features = load_feature_matrix(df)
+    features.counts('insights:tools:')   # {'Salesforce': 412, ...}
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+DATA_DIR = "data"
+CONFIG_FILE = f"{DATA_DIR}/signal_config.json"
+FEATURE_DB = f"{DATA_DIR}/job_features.db"
+
+# Text fields combined for technographics/signals (matches company intel)
+TEXT_COLUMNS = ['description', 'title', 'company_description', 'skills']
+
+# Columns tried in order for the job key
+KEY_COLUMNS = ['job_url_direct', 'job_url']
+
+
+# =============================================================================
+# FEATURE CATALOG
+# =============================================================================
+
+# Market intel patterns (scanned against the description only).
+# Order matters - it is the display order before sorting by count.
+INSIGHT_PATTERNS = {
+    'tools': {
+        'Salesforce': r'\bsalesforce\b',
+        'HubSpot': r'\bhubspot\b',
+        'Gong': r'\bgong\b',
+        'Outreach': r'\boutreach\b',
+        'ZoomInfo': r'\bzoominfo\b',
+        'Clari': r'\bclari\b',
+        'Tableau': r'\btableau\b',
+        'LinkedIn Sales Nav': r'\blinkedin\s*(?:sales)?\s*nav',
+    },
+    'methodologies': {
+        'Enterprise Sales': r'\benterprise\s*sales',
+        'Consultative Selling': r'\bconsultative\b',
+        'Channel/Partner': r'\bchannel\s*(?:sales|partner)|partner\s*(?:sales|channel)',
+        'Value Selling': r'\bvalue\s*sell',
+        'MEDDIC/MEDDPICC': r'\bmedd[ip]*i?c+\b',
+        'PLG/Product-Led': r'\bplg\b|product.led',
+        'Challenger': r'\bchallenger\b',
+        'Account-Based (ABM)': r'\baccount.based|abm\b',
+    },
+    'trends': {
+        'AI / Machine Learning': r'\bartificial\s*intelligence|\bai\b|machine\s*learning',
+        'Go-to-Market / GTM': r'\bgo.to.market|\bgtm\b',
+        'Scale / Scalable': r'\bscalab|\bscale\b',
+        'SaaS': r'\bsaas\b',
+        'Data-Driven': r'\bdata.driven\b',
+        'Cloud': r'\bcloud\b',
+        'Series A-D (Startup)': r'\bseries\s*[a-d]\b',
+        'Customer Success': r'\bcustomer\s*success\b',
+        'Recurring Revenue/ARR': r'\brecurring\s*revenue|arr\b|mrr\b',
+        'GenAI': r'\bgenai|generative\s*ai|gen\s*ai|llm\b',
+    },
+    'industries': {
+        'Technology/Software': r'\btechnology|software|tech\s*companies',
+        'Healthcare': r'\bhealthcare|health\s*tech|medical|pharma|biotech',
+        'Financial Services': r'\bfinancial\s*services|fintech|banking|insurance',
+        'Education': r'\beducation|edtech|learning',
+        'Government': r'\bgovernment|public\s*sector|federal',
+        'Cybersecurity': r'\bcyber|security|infosec',
+        'Retail/E-commerce': r'\bretail|e.commerce|ecommerce',
+        'Real Estate': r'\breal\s*estate|proptech',
+        'Energy': r'\benergy|utilities|renewable',
+        'Manufacturing': r'\bmanufacturing|industrial',
+    },
+    'red_flags': {
+        '"Competitive compensation" (vague)': r'\bcompetitive\s*(?:salary|compensation|pay)',
+        '"Fast-paced environment"': r'\bfast.paced\b',
+        'Travel 50%+': r'\b(?:5[0-9]|[6-9][0-9]|100)\s*%\s*travel',
+        '"Self-starter" required': r'\bself.starter\b',
+        '"Wear many hats"': r'\bwear\s*many\s*hats|wear\s*multiple\s*hats',
+        '"Scrappy"': r'\bscrappy\b',
+    },
+}
+
+
+def load_signal_config(config_file: str = CONFIG_FILE) -> Dict:
+    """Load signal configuration, or an empty config if the file is missing."""
+    if not os.path.exists(config_file):
+        return {}
+    with open(config_file, 'r') as f:
+        return json.load(f)
+
+
+def build_catalog(config: Dict) -> List[Tuple[str, str, str]]:
+    """
+    Build the ordered feature catalog.
+
+    Returns:
+        List of (feature_key, pattern, scope) tuples. Scope is 'description'
+        for market intel patterns and 'all_text' for signal_config entries.
+        Bit positions follow list order.
+    """
+    catalog = []
+    for group, patterns in INSIGHT_PATTERNS.items():
+        for label, pattern in patterns.items():
+            catalog.append((f"insights:{group}:{label}", pattern, 'description'))
+    for category, tools in config.get('technographics', {}).items():
+        for tool_id, pattern in tools.items():
+            catalog.append((f"tool:{category}:{tool_id}", pattern, 'all_text'))
+    for signal_type, signals in config.get('signals', {}).items():
+        for signal_id, pattern in signals.items():
+            catalog.append((f"signal:{signal_type}:{signal_id}", pattern, 'all_text'))
+    return catalog
+
+
+def catalog_version(catalog: List[Tuple[str, str, str]]) -> str:
+    """Fingerprint the catalog so stored bitsets are dropped when it changes."""
+    return hashlib.sha1(json.dumps(catalog).encode('utf-8')).hexdigest()
+
+
+def _compile(pattern: str) -> Optional[re.Pattern]:
+    """Compile a catalog pattern; invalid patterns never match."""
+    try:
+        return re.compile(pattern, re.IGNORECASE)
+    except re.error:
+        return None
+
+
+# =============================================================================
+# FEATURE MATRIX
+# =============================================================================
+
+class FeatureMatrix:
+    """Packed per-row feature bits aligned with the input DataFrame rows."""
+
+    def __init__(self, keys: List[str], bits: np.ndarray):
+        self.keys = keys
+        self.bits = bits
+        self._index = {key: i for i, key in enumerate(keys)}
+
+    def __len__(self):
+        return len(self.bits)
+
+    def _unpack(self, rows: np.ndarray) -> np.ndarray:
+        return np.unpackbits(rows, axis=1, count=len(self.keys), bitorder='little')
+
+    def column(self, key: str) -> np.ndarray:
+        """Boolean array: which rows have the feature."""
+        pos = self._index[key]
+        return (self.bits[:, pos // 8] >> (pos % 8)) & 1 == 1
+
+    def counts(self, prefix: str, mask: Optional[np.ndarray] = None) -> Dict[str, int]:
+        """
+        Count rows per feature for every key starting with prefix.
+
+        Returns:
+            Dict mapping the key suffix (after prefix) to its row count,
+            in catalog order.
+        """
+        rows = self.bits if mask is None else self.bits[np.asarray(mask, dtype=bool)]
+        totals = self._unpack(rows).sum(axis=0) if len(rows) else np.zeros(len(self.keys), dtype=int)
+        return {
+            key[len(prefix):]: int(totals[i])
+            for i, key in enumerate(self.keys) if key.startswith(prefix)
+        }
+
+    def row_keys(self, position: int, prefix: str = '') -> List[str]:
+        """Feature keys set on one row (by position), in catalog order."""
+        row_bits = self._unpack(self.bits[position:position + 1])[0]
+        return [self.keys[i] for i in np.flatnonzero(row_bits) if self.keys[i].startswith(prefix)]
+
+
+# =============================================================================
+# STORE
+# =============================================================================
+
+def _row_texts(df: pd.DataFrame) -> Tuple[pd.Series, pd.Series]:
+    """Return (description, combined lowercase text) per row."""
+    all_text = pd.Series('', index=df.index, dtype=object)
+    for col in TEXT_COLUMNS:
+        if col in df.columns:
+            values = df[col]
+            all_text = all_text + (' ' + values.astype(str)).where(values.notna(), '')
+    all_text = all_text.str.lower()
+
+    if 'description' in df.columns:
+        description = df['description'].astype(str).where(df['description'].notna(), '')
+    else:
+        description = pd.Series('', index=df.index, dtype=object)
+    return description, all_text
+
+
+def _job_keys(df: pd.DataFrame, text_hashes: List[str]) -> List[str]:
+    """Job URL per row, falling back to the text hash when no URL exists."""
+    keys = pd.Series([None] * len(df), index=df.index, dtype=object)
+    for col in KEY_COLUMNS:
+        if col in df.columns:
+            keys = keys.where(keys.notna(), df[col])
+    return [
+        str(key) if pd.notna(key) and str(key) else f"sha1:{text_hash}"
+        for key, text_hash in zip(keys, text_hashes)
+    ]
+
+
+def _open_store(db_path: str, version: str) -> sqlite3.Connection:
+    """Open the feature database, clearing it if the catalog changed."""
+    os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    conn.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS job_features (
+            job_key TEXT,
+            text_hash TEXT,
+            bits BLOB,
+            scanned_at TEXT,
+            PRIMARY KEY (job_key, text_hash)
+        )
+    ''')
+    row = conn.execute("SELECT value FROM meta WHERE key = 'catalog_version'").fetchone()
+    if not row or row[0] != version:
+        conn.execute('DELETE FROM job_features')
+        conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('catalog_version', ?)", (version,))
+        conn.commit()
+    return conn
+
+
+def load_feature_matrix(df: pd.DataFrame, config: Dict = None, db_path: str = FEATURE_DB,
+                        verbose: bool = True) -> FeatureMatrix:
+    """
+    Return the feature matrix for df, scanning only unseen job texts.
+
+    Args:
+        df: Jobs DataFrame (raw, enriched, or master)
+        config: signal_config dict (loaded from CONFIG_FILE if None)
+        db_path: SQLite feature store path
+        verbose: Print scan statistics
+
+    Returns:
+        FeatureMatrix with one row per df row, in df order
+    """
+    if config is None:
+        config = load_signal_config()
+    catalog = build_catalog(config)
+    keys = [key for key, _, _ in catalog]
+    n_bytes = (len(catalog) + 7) // 8
+
+    description, all_text = _row_texts(df)
+    text_hashes = [hashlib.sha1(text.encode('utf-8')).hexdigest() for text in all_text]
+    job_keys = _job_keys(df, text_hashes)
+
+    conn = _open_store(db_path, catalog_version(catalog))
+    stored = {
+        (job_key, text_hash): bits
+        for job_key, text_hash, bits in conn.execute('SELECT job_key, text_hash, bits FROM job_features')
+    }
+
+    compiled = [(_compile(pattern), scope) for _, pattern, scope in catalog]
+    bits = np.zeros((len(df), n_bytes), dtype=np.uint8)
+    new_rows = {}
+    scanned = 0
+
+    for pos, (job_key, text_hash) in enumerate(zip(job_keys, text_hashes)):
+        cache_key = (job_key, text_hash)
+        packed = stored.get(cache_key) or new_rows.get(cache_key)
+        if packed is None:
+            texts = {'description': description.iat[pos], 'all_text': all_text.iat[pos]}
+            matches = np.array([
+                regex is not None and regex.search(texts[scope]) is not None
+                for regex, scope in compiled
+            ], dtype=np.uint8)
+            packed = np.packbits(matches, bitorder='little').tobytes()
+            new_rows[cache_key] = packed
+            scanned += 1
+        bits[pos] = np.frombuffer(packed, dtype=np.uint8, count=n_bytes)
+
+    if new_rows:
+        scanned_at = datetime.now().isoformat()
+        conn.executemany(
+            'INSERT OR REPLACE INTO job_features (job_key, text_hash, bits, scanned_at) VALUES (?, ?, ?, ?)',
+            [(job_key, text_hash, packed, scanned_at) for (job_key, text_hash), packed in new_rows.items()]
+        )
+        conn.commit()
+    conn.close()
+
+    if verbose:
+        print(f"  Feature store: {len(df)} jobs, {scanned} scanned, {len(df) - scanned} cached "
+              f"({len(catalog)} features)")
+
+    return FeatureMatrix(keys, bits)
@@ -5,11 +5,14 @@ Creates pages like /jobs/vp-sales/, /jobs/remote/, /jobs/new-york/, etc.
 """
 
 import pandas as pd
+import numpy as np
 from datetime import datetime
-import glob
 import os
 import sys
 sys.path.insert(0, 'scripts')
+from job_data import load_jobs, snapshot_paths
+from job_records import job_records
+from build_profiler import phase, stage
 try:
     from tracking_config import get_tracking_code
     TRACKING_CODE = get_tracking_code()
@@ -66,46 +69,49 @@ print("📁 GENERATING CATEGORY JOB PAGES")
 print("="*70)
 
 # Find most recent enriched data
-files = glob.glob(f"{DATA_DIR}/executive_sales_jobs_*.csv")
+phase('load')
+files = snapshot_paths()
 if not files:
     print("❌ No enriched data found")
     exit(1)
 
-latest_file = max(files)
-df = pd.read_csv(latest_file)
+latest_file = files[-1]
+df = load_jobs(latest_file)
 print(f"📂 Loaded {len(df)} jobs from {latest_file}")
 
 update_date = datetime.now().strftime('%B %d, %Y')
 
 # Category definitions
+# 'facets' is a list of (column, op, value) conditions; a job belongs to the
+# category if ANY condition matches. ops: eq, in, matches (regex, case-insensitive), gt, gte
 CATEGORIES = {
     # By Seniority
     'vp-sales': {
         'title': 'VP Sales Jobs',
         'h1': 'VP of Sales Jobs',
         'description': 'Find VP of Sales and Vice President of Sales positions at top companies.',
-        'filter': lambda df: df[df['seniority'] == 'VP'],
+        'facets': [('seniority', 'eq', 'VP')],
         'keywords': 'VP Sales jobs, Vice President of Sales positions, VP Sales careers'
     },
     'svp-sales': {
         'title': 'SVP Sales Jobs',
         'h1': 'SVP of Sales Jobs',
         'description': 'Senior Vice President of Sales opportunities at leading companies.',
-        'filter': lambda df: df[df['seniority'] == 'SVP'],
+        'facets': [('seniority', 'eq', 'SVP')],
         'keywords': 'SVP Sales jobs, Senior Vice President Sales, SVP Sales positions'
     },
     'cro-jobs': {
         'title': 'CRO Jobs',
         'h1': 'Chief Revenue Officer Jobs',
         'description': 'Chief Revenue Officer and CRO positions at growth companies.',
-        'filter': lambda df: df[df['seniority'] == 'C-Level'],
+        'facets': [('seniority', 'eq', 'C-Level')],
         'keywords': 'CRO jobs, Chief Revenue Officer positions, CRO careers'
     },
     'evp-sales': {
         'title': 'EVP Sales Jobs',
         'h1': 'EVP of Sales Jobs',
         'description': 'Executive Vice President of Sales roles at enterprise companies.',
-        'filter': lambda df: df[df['seniority'] == 'EVP'],
+        'facets': [('seniority', 'eq', 'EVP')],
         'keywords': 'EVP Sales jobs, Executive Vice President Sales positions'
     },
     
@@ -114,70 +120,70 @@ CATEGORIES = {
         'title': 'Remote VP Sales & CRO Jobs',
         'h1': 'Remote Executive Sales Jobs',
         'description': 'Work-from-home VP Sales and CRO positions. Remote executive sales opportunities.',
-        'filter': lambda df: df[df['is_remote'] == True],
+        'facets': [('is_remote', 'eq', True)],
         'keywords': 'remote VP Sales jobs, remote CRO jobs, work from home sales executive'
     },
     'new-york': {
         'title': 'VP Sales & CRO Jobs in New York',
         'h1': 'New York Executive Sales Jobs',
         'description': 'VP Sales and CRO positions in New York City and the NYC metro area.',
-        'filter': lambda df: df[df['location'].str.contains('New York|NYC|Manhattan|Brooklyn', case=False, na=False)],
+        'facets': [('location', 'matches', 'New York|NYC|Manhattan|Brooklyn')],
         'keywords': 'VP Sales jobs NYC, CRO jobs New York, sales executive jobs Manhattan'
     },
     'san-francisco': {
         'title': 'VP Sales & CRO Jobs in San Francisco',
         'h1': 'San Francisco Executive Sales Jobs',
         'description': 'VP Sales and CRO positions in San Francisco and the Bay Area.',
-        'filter': lambda df: df[df['location'].str.contains('San Francisco|SF|Bay Area|Palo Alto|Mountain View|San Jose', case=False, na=False)],
+        'facets': [('location', 'matches', 'San Francisco|SF|Bay Area|Palo Alto|Mountain View|San Jose')],
         'keywords': 'VP Sales jobs San Francisco, CRO jobs Bay Area, sales executive jobs SF'
     },
     'boston': {
         'title': 'VP Sales & CRO Jobs in Boston',
         'h1': 'Boston Executive Sales Jobs',
         'description': 'VP Sales and CRO positions in Boston and the Greater Boston area.',
-        'filter': lambda df: df[df['location'].str.contains('Boston|Cambridge, MA|Massachusetts', case=False, na=False)],
+        'facets': [('location', 'matches', 'Boston|Cambridge, MA|Massachusetts')],
         'keywords': 'VP Sales jobs Boston, CRO jobs Massachusetts, sales executive jobs Boston'
     },
     'los-angeles': {
         'title': 'VP Sales & CRO Jobs in Los Angeles',
         'h1': 'Los Angeles Executive Sales Jobs',
         'description': 'VP Sales and CRO positions in Los Angeles and Southern California.',
-        'filter': lambda df: df[df['location'].str.contains('Los Angeles|LA|Santa Monica|Irvine|Orange County', case=False, na=False)],
+        'facets': [('location', 'matches', 'Los Angeles|LA|Santa Monica|Irvine|Orange County')],
         'keywords': 'VP Sales jobs Los Angeles, CRO jobs LA, sales executive jobs Southern California'
     },
     'chicago': {
         'title': 'VP Sales & CRO Jobs in Chicago',
         'h1': 'Chicago Executive Sales Jobs',
         'description': 'VP Sales and CRO positions in Chicago and the Midwest.',
-        'filter': lambda df: df[df['location'].str.contains('Chicago|Illinois|IL', case=False, na=False)],
+        'facets': [('location', 'matches', 'Chicago|Illinois|IL')],
         'keywords': 'VP Sales jobs Chicago, CRO jobs Illinois, sales executive jobs Midwest'
     },
     'texas': {
         'title': 'VP Sales & CRO Jobs in Texas',
         'h1': 'Texas Executive Sales Jobs',
         'description': 'VP Sales and CRO positions in Texas including Austin, Dallas, and Houston.',
-        'filter': lambda df: df[df['location'].str.contains('Texas|TX|Austin|Dallas|Houston|San Antonio', case=False, na=False)],
+        'facets': [('location', 'matches', 'Texas|TX|Austin|Dallas|Houston|San Antonio')],
         'keywords': 'VP Sales jobs Texas, CRO jobs Austin, sales executive jobs Dallas Houston'
     },
     'atlanta': {
         'title': 'VP Sales & CRO Jobs in Atlanta',
         'h1': 'Atlanta Executive Sales Jobs',
         'description': 'VP Sales and CRO positions in Atlanta and Georgia.',
-        'filter': lambda df: df[df['location'].str.contains('Atlanta|Georgia|GA', case=False, na=False)],
+        'facets': [('location', 'matches', 'Atlanta|Georgia|GA')],
         'keywords': 'VP Sales jobs Atlanta, CRO jobs Georgia, sales executive jobs Atlanta'
     },
     'seattle': {
         'title': 'VP Sales & CRO Jobs in Seattle',
         'h1': 'Seattle Executive Sales Jobs',
         'description': 'VP Sales and CRO positions in Seattle and the Pacific Northwest.',
-        'filter': lambda df: df[df['location'].str.contains('Seattle|Washington|WA|Portland', case=False, na=False)],
+        'facets': [('location', 'matches', 'Seattle|Washington|WA|Portland')],
         'keywords': 'VP Sales jobs Seattle, CRO jobs Washington, sales executive jobs Pacific Northwest'
     },
     'denver': {
         'title': 'VP Sales & CRO Jobs in Denver',
         'h1': 'Denver Executive Sales Jobs',
         'description': 'VP Sales and CRO positions in Denver and Colorado.',
-        'filter': lambda df: df[df['location'].str.contains('Denver|Colorado|CO|Boulder', case=False, na=False)],
+        'facets': [('location', 'matches', 'Denver|Colorado|CO|Boulder')],
         'keywords': 'VP Sales jobs Denver, CRO jobs Colorado, sales executive jobs Denver'
     },
     
@@ -186,21 +192,21 @@ CATEGORIES = {
         'title': 'VP Sales Jobs at Startups',
         'h1': 'Startup VP Sales & CRO Jobs',
         'description': 'VP Sales and CRO positions at seed, Series A, and Series B startups.',
-        'filter': lambda df: df[df['company_stage'].isin(['Seed/Series A', 'Series A/B', 'Series B/C'])] if 'company_stage' in df.columns else df.head(0),
+        'facets': [('company_stage', 'in', ['Seed/Series A', 'Series A/B', 'Series B/C'])],
         'keywords': 'startup VP Sales jobs, Series A CRO jobs, early stage sales executive'
     },
     'growth-stage': {
         'title': 'VP Sales Jobs at Growth Companies',
         'h1': 'Growth Stage VP Sales & CRO Jobs',
         'description': 'VP Sales and CRO positions at Series C, D, and late-stage growth companies.',
-        'filter': lambda df: df[df['company_stage'].isin(['Series C/D', 'Late Stage'])] if 'company_stage' in df.columns else df.head(0),
+        'facets': [('company_stage', 'in', ['Series C/D', 'Late Stage'])],
         'keywords': 'growth stage VP Sales jobs, Series C CRO jobs, scale-up sales executive'
     },
     'enterprise-jobs': {
         'title': 'VP Sales Jobs at Enterprise Companies',
         'h1': 'Enterprise VP Sales & CRO Jobs',
         'description': 'VP Sales and CRO positions at public companies and large enterprises.',
-        'filter': lambda df: df[df['company_stage'] == 'Enterprise/Public'] if 'company_stage' in df.columns else df.head(0),
+        'facets': [('company_stage', 'eq', 'Enterprise/Public')],
         'keywords': 'enterprise VP Sales jobs, public company CRO jobs, Fortune 500 sales executive'
     },
     
@@ -209,21 +215,21 @@ CATEGORIES = {
         'title': 'SaaS VP Sales & CRO Jobs',
         'h1': 'SaaS Sales Executive Jobs',
         'description': 'VP Sales and CRO positions at SaaS and software companies.',
-        'filter': lambda df: df[df['description'].str.contains('SaaS|software|platform|cloud', case=False, na=False) | df['title'].str.contains('SaaS|Software', case=False, na=False)],
+        'facets': [('description', 'matches', 'SaaS|software|platform|cloud'), ('title', 'matches', 'SaaS|Software')],
         'keywords': 'SaaS VP Sales jobs, software CRO jobs, B2B SaaS sales executive'
     },
     'healthcare-sales': {
         'title': 'Healthcare VP Sales & CRO Jobs',
         'h1': 'Healthcare Sales Executive Jobs',
         'description': 'VP Sales and CRO positions in healthcare, healthtech, and life sciences.',
-        'filter': lambda df: df[df['description'].str.contains('healthcare|health care|medical|pharma|biotech|life science', case=False, na=False) | df['company'].str.contains('Health|Medical|Pharma|Bio', case=False, na=False)],
+        'facets': [('description', 'matches', 'healthcare|health care|medical|pharma|biotech|life science'), ('company', 'matches', 'Health|Medical|Pharma|Bio')],
         'keywords': 'healthcare VP Sales jobs, healthtech CRO jobs, medical sales executive'
     },
     'fintech-sales': {
         'title': 'Fintech VP Sales & CRO Jobs',
         'h1': 'Fintech Sales Executive Jobs',
         'description': 'VP Sales and CRO positions at fintech and financial services companies.',
-        'filter': lambda df: df[df['description'].str.contains('fintech|financial|banking|payments|insurance', case=False, na=False) | df['company'].str.contains('Bank|Financial|Capital', case=False, na=False)],
+        'facets': [('description', 'matches', 'fintech|financial|banking|payments|insurance'), ('company', 'matches', 'Bank|Financial|Capital')],
         'keywords': 'fintech VP Sales jobs, financial services CRO jobs, banking sales executive'
     },
     
@@ -232,33 +238,81 @@ CATEGORIES = {
         'title': 'High-Paying VP Sales & CRO Jobs',
         'h1': 'Highest Paying Sales Executive Jobs',
         'description': 'VP Sales and CRO positions paying $300K+ base salary.',
-        'filter': lambda df: df[df['max_amount'] >= 300000],
+        'facets': [('max_amount', 'gte', 300000)],
         'keywords': '$300K VP Sales jobs, high paying CRO jobs, top sales executive salaries'
     },
     'with-salary': {
         'title': 'VP Sales & CRO Jobs with Disclosed Salary',
         'h1': 'Executive Sales Jobs with Salary Transparency',
         'description': 'VP Sales and CRO positions with disclosed compensation ranges.',
-        'filter': lambda df: df[df['max_amount'].notna() & (df['max_amount'] > 0)],
+        'facets': [('max_amount', 'gt', 0)],
         'keywords': 'VP Sales jobs with salary, CRO jobs compensation disclosed'
     },
 }
 
 
+def evaluate_facet(values, op, value):
+    """Evaluate one facet condition over an array of distinct column values"""
+    values = pd.Series(values)
+    if op == 'eq':
+        result = values == value
+    elif op == 'in':
+        result = values.isin(value)
+    elif op == 'matches':
+        result = values.astype(str).str.contains(value, case=False, na=False)
+    elif op == 'gt':
+        result = pd.to_numeric(values, errors='coerce') > value
+    elif op == 'gte':
+        result = pd.to_numeric(values, errors='coerce') >= value
+    else:
+        raise ValueError(f"Unknown facet op: {op}")
+    return result.fillna(False).to_numpy(dtype=bool)
+
+
+def build_facet_index(df, categories):
+    """
+    Map every job to all of its categories in one pass.
+
+    Each column is factorized once; every condition on it is evaluated against
+    the distinct values only and broadcast back to rows through the codes.
+
+    Returns:
+        Dict of category slug -> array of row positions in df (df order)
+    """
+    factorized = {}
+    condition_masks = {}
+    index = {}
+
+    for slug, config in categories.items():
+        category_mask = np.zeros(len(df), dtype=bool)
+        for column, op, value in config['facets']:
+            if column not in df.columns:
+                continue
+            key = (column, op, repr(value))
+            if key not in condition_masks:
+                if column not in factorized:
+                    factorized[column] = pd.factorize(df[column])
+                codes, uniques = factorized[column]
+                # Code -1 (missing value) maps to the trailing False
+                lookup = np.append(evaluate_facet(uniques, op, value), False)
+                condition_masks[key] = lookup[codes]
+            category_mask |= condition_masks[key]
+        index[slug] = np.flatnonzero(category_mask)
+
+    return index
+
+
 def generate_job_card(job):
-    """Generate HTML for a single job card"""
-    title = job.get('title', 'Unknown Title')
-    company = job.get('company', 'Unknown Company')
-    location = job.get('location', 'Location not specified')
+    """Generate HTML for a single job card (a job_records Job)"""
+    title = job.title or 'Unknown Title'
+    company = job.company or 'Unknown Company'
     
     # Salary display
-    min_sal = job.get('min_amount')
-    max_sal = job.get('max_amount')
-    if pd.notna(max_sal) and max_sal > 0:
-        if pd.notna(min_sal) and min_sal > 0:
-            salary = f"${min_sal/1000:.0f}K - ${max_sal/1000:.0f}K"
+    if job.max_amount > 0:
+        if job.min_amount > 0:
+            salary = f"${job.min_amount/1000:.0f}K - ${job.max_amount/1000:.0f}K"
         else:
-            salary = f"Up to ${max_sal/1000:.0f}K"
+            salary = f"Up to ${job.max_amount/1000:.0f}K"
     else:
         salary = "Salary not disclosed"
     
@@ -266,20 +320,20 @@ def generate_job_card(job):
     slug = f"{company}-{title}".lower()
     slug = ''.join(c if c.isalnum() or c == '-' else '-' for c in slug)
     slug = '-'.join(filter(None, slug.split('-')))[:60]
-    job_id = job.get('id', '')[-6:] if job.get('id') else ''
+    job_id = job.id[-6:]
     job_url = f"/jobs/{slug}-{job_id}/" if job_id else "#"
     
     # Remote badge
-    remote_badge = '<span class="badge remote">Remote</span>' if job.get('is_remote') else ''
+    remote_badge = '<span class="badge remote">Remote</span>' if job.is_remote else ''
     
     return f'''
     <div class="job-card">
         <div class="job-header">
-            <h3><a href="{job_url}">{title}</a></h3>
-            <div class="company">{company}</div>
+            <h3><a href="{job_url}">{job.title_html or 'Unknown Title'}</a></h3>
+            <div class="company">{job.company_html or 'Unknown Company'}</div>
         </div>
         <div class="job-meta">
-            <span class="location">📍 {location}</span>
+            <span class="location">📍 {job.location_html or 'Location not specified'}</span>
             <span class="salary">💰 {salary}</span>
             {remote_badge}
         </div>
@@ -287,27 +341,17 @@ def generate_job_card(job):
     '''
 
 
-def generate_category_page(slug, config, df):
-    """Generate a category page with filtered jobs"""
-    
-    try:
-        filtered_df = config['filter'](df)
-    except Exception as e:
-        print(f"  ⚠️  Filter error for {slug}: {e}")
-        return False
+def generate_category_page(slug, config, filtered_df, jobs):
+    """Generate a category page from its precomputed (already sorted) job subset and its records"""
     
     if len(filtered_df) < 1:
         print(f"  ⚠️  No jobs for {slug}, skipping")
         return False
     
-    # Sort by salary (highest first) then by date
-    if 'max_amount' in filtered_df.columns:
-        filtered_df = filtered_df.sort_values('max_amount', ascending=False, na_position='last')
-    
     job_count = len(filtered_df)
     
     # Generate job cards
-    job_cards = '\n'.join(generate_job_card(row) for _, row in filtered_df.head(100).iterrows())
+    job_cards = '\n'.join(generate_job_card(job) for job in jobs[:100])
     
     # Salary stats if available
     salary_df = filtered_df[filtered_df['max_amount'].notna() & (filtered_df['max_amount'] > 0)]
@@ -784,20 +828,30 @@ def generate_category_page(slug, config, df):
     page_dir = f"{JOBS_DIR}/{slug}"
     os.makedirs(page_dir, exist_ok=True)
     
-    with open(f"{page_dir}/index.html", 'w') as f:
+    with stage('write'), open(f"{page_dir}/index.html", 'w') as f:
         f.write(html)
     
     return True
 
 
+# Sort once (highest salary first) so every membership list is already in display order
+phase('transform')
+if 'max_amount' in df.columns:
+    df = df.sort_values('max_amount', ascending=False, na_position='last', kind='stable').reset_index(drop=True)
+
+# Build the facet index and the card records once for all categories
+facet_index = build_facet_index(df, CATEGORIES)
+jobs = job_records(df)
+
 # Generate all category pages
+phase('render')
 print(f"\n📄 Generating {len(CATEGORIES)} category pages...")
 
 success_count = 0
 for slug, config in CATEGORIES.items():
-    if generate_category_page(slug, config, df):
-        filtered_count = len(config['filter'](df))
-        print(f"  ✅ /jobs/{slug}/ ({filtered_count} jobs)")
+    members = facet_index[slug]
+    if generate_category_page(slug, config, df.iloc[members], [jobs[i] for i in members]):
+        print(f"  ✅ /jobs/{slug}/ ({len(members)} jobs)")
         success_count += 1
 
 print(f"\n{'='*70}")
@@ -18,6 +18,12 @@ import argparse
 from collections import defaultdict
 from datetime import datetime
 import os
+import sys
+
+sys.path.insert(0, 'scripts')
+from feature_store import load_feature_matrix
+from job_data import load_jobs
+from build_profiler import phase
 
 DATA_DIR = "data"
 CONFIG_FILE = f"{DATA_DIR}/signal_config.json"
@@ -25,6 +31,12 @@ DB_FILE = f"{DATA_DIR}/company_intelligence.db"
 MASTER_CSV = f"{DATA_DIR}/master_jobs_database.csv"
 DISCOVERED_FILE = f"{DATA_DIR}/discovered_tools.json"
 
+TEXT_COLUMNS = ['description', 'title', 'company_description', 'skills']
+COMPANY_COLUMNS = [
+    'company', 'date_posted', 'import_date', 'company_url_direct', 'company_url', 'company_industry',
+    'company_stage', 'company_num_employees', 'company_revenue', 'min_amount', 'max_amount',
+]
+
 
 def load_config():
     """Load signal configuration from JSON file."""
@@ -32,47 +44,20 @@ def load_config():
         return json.load(f)
 
 
-def get_all_text(row):
-    """Combine all text fields for analysis."""
-    text = ""
-    for col in ['description', 'title', 'company_description', 'skills']:
-        if col in row.index and pd.notna(row[col]):
-            text += " " + str(row[col])
-    return text.lower()
+def get_all_text(df):
+    """Combine all text fields for analysis, one lowercased string per row."""
+    text = pd.Series('', index=df.index, dtype=object)
+    for col in TEXT_COLUMNS:
+        if col in df.columns:
+            values = df[col]
+            text = text + (' ' + values.astype(str)).where(values.notna(), '')
+    return text.str.lower()
 
 
-def extract_tools(text, config):
-    """Extract all matching tools from text."""
-    matches = []
-    for category, tools in config.get('technographics', {}).items():
-        for tool_id, pattern in tools.items():
-            try:
-                if re.search(pattern, text, re.IGNORECASE):
-                    matches.append({
-                        'tool_id': tool_id,
-                        'tool_name': tool_id.replace('_', ' ').title(),
-                        'category': category.replace('_', ' ')
-                    })
-            except re.error:
-                continue
-    return matches
-
-
-def extract_signals(text, config):
-    """Extract all matching signals from text."""
-    matches = []
-    for signal_type, signals in config.get('signals', {}).items():
-        for signal_id, pattern in signals.items():
-            try:
-                if re.search(pattern, text, re.IGNORECASE):
-                    matches.append({
-                        'signal_type': signal_type,
-                        'signal_id': signal_id,
-                        'signal_value': signal_id.replace('_', ' ').title()
-                    })
-            except re.error:
-                continue
-    return matches
+def company_rows(df):
+    """One namedtuple of COMPANY_COLUMNS per job, missing values as None."""
+    rows = df.reindex(columns=COMPANY_COLUMNS).astype(object)
+    return rows.where(rows.notna(), None).itertuples(index=False, name='CompanyRow')
 
 
 def process_companies(df, config):
@@ -81,24 +66,25 @@ def process_companies(df, config):
     company_tools = defaultdict(lambda: defaultdict(lambda: {'count': 0, 'last_seen': None, 'category': None}))
     company_signals = defaultdict(lambda: defaultdict(lambda: {'count': 0, 'last_seen': None, 'type': None}))
 
-    for idx, row in df.iterrows():
-        company_name = row.get('company')
-        if pd.isna(company_name) or not company_name:
+    # Tool/signal matches come from the feature store (only new postings are scanned)
+    features = load_feature_matrix(df, config)
+
+    for pos, row in enumerate(company_rows(df)):
+        if not row.company:
             continue
 
-        company_name = str(company_name).strip()
-        all_text = get_all_text(row)
-        date_posted = row.get('date_posted') or row.get('import_date')
+        company_name = str(row.company).strip()
+        date_posted = row.date_posted or row.import_date
 
         # Initialize or update company record
         if company_name not in companies:
             companies[company_name] = {
                 'name': company_name,
-                'url': row.get('company_url_direct') or row.get('company_url'),
-                'industry': row.get('company_industry'),
-                'stage': row.get('company_stage'),
-                'size': row.get('company_num_employees'),
-                'revenue': row.get('company_revenue'),
+                'url': row.company_url_direct or row.company_url,
+                'industry': row.company_industry,
+                'stage': row.company_stage,
+                'size': row.company_num_employees,
+                'revenue': row.company_revenue,
                 'total_job_postings': 0,
                 'salary_min_sum': 0,
                 'salary_max_sum': 0,
@@ -109,32 +95,31 @@ def process_companies(df, config):
         companies[company_name]['total_job_postings'] += 1
 
         # Track salary data
-        if pd.notna(row.get('min_amount')) and pd.notna(row.get('max_amount')):
-            companies[company_name]['salary_min_sum'] += float(row['min_amount'])
-            companies[company_name]['salary_max_sum'] += float(row['max_amount'])
+        if row.min_amount is not None and row.max_amount is not None:
+            companies[company_name]['salary_min_sum'] += float(row.min_amount)
+            companies[company_name]['salary_max_sum'] += float(row.max_amount)
             companies[company_name]['salary_count'] += 1
 
         # Update last_seen
         if date_posted and (not companies[company_name]['last_seen'] or date_posted > companies[company_name]['last_seen']):
             companies[company_name]['last_seen'] = date_posted
 
-        # Extract and count tools
-        tools = extract_tools(all_text, config)
-        for tool in tools:
-            key = tool['tool_id']
+        # Count tools (feature key: tool:<category>:<tool_id>)
+        for feature_key in features.row_keys(pos, 'tool:'):
+            _, category, key = feature_key.split(':', 2)
             company_tools[company_name][key]['count'] += 1
-            company_tools[company_name][key]['category'] = tool['category']
-            company_tools[company_name][key]['name'] = tool['tool_name']
+            company_tools[company_name][key]['category'] = category.replace('_', ' ')
+            company_tools[company_name][key]['name'] = key.replace('_', ' ').title()
             if date_posted:
                 company_tools[company_name][key]['last_seen'] = date_posted
 
-        # Extract and count signals
-        signals = extract_signals(all_text, config)
-        for signal in signals:
-            key = f"{signal['signal_type']}:{signal['signal_id']}"
+        # Count signals (feature key: signal:<signal_type>:<signal_id>)
+        for feature_key in features.row_keys(pos, 'signal:'):
+            _, signal_type, signal_id = feature_key.split(':', 2)
+            key = f"{signal_type}:{signal_id}"
             company_signals[company_name][key]['count'] += 1
-            company_signals[company_name][key]['type'] = signal['signal_type']
-            company_signals[company_name][key]['value'] = signal['signal_value']
+            company_signals[company_name][key]['type'] = signal_type
+            company_signals[company_name][key]['value'] = signal_id.replace('_', ' ').title()
             if date_posted:
                 company_signals[company_name][key]['last_seen'] = date_posted
 
@@ -297,9 +282,7 @@ def discover_new_tools(df, config):
 
     potential_tools = defaultdict(int)
 
-    for idx, row in df.iterrows():
-        all_text = get_all_text(row)
-
+    for all_text in get_all_text(df):
         for pattern in tool_patterns:
             matches = re.findall(pattern, all_text, re.IGNORECASE)
             for match in matches:
@@ -345,8 +328,9 @@ def main():
     print(f"  Configured signals: {signal_count}")
 
     # Load data
+    phase('load')
     print(f"\nLoading data from {MASTER_CSV}...")
-    df = pd.read_csv(MASTER_CSV)
+    df = load_jobs(MASTER_CSV)
     print(f"  Total records: {len(df)}")
     print(f"  Unique companies: {df['company'].nunique()}")
 
@@ -361,6 +345,7 @@ def main():
         return
 
     # Process companies
+    phase('analyze')
     print("\nProcessing companies...")
     companies, company_tools, company_signals = process_companies(df, config)
 
@@ -377,6 +362,7 @@ def main():
     print(f"  Total signal mentions: {total_signals_found}")
 
     # Write to database
+    phase('write')
     print(f"\nWriting to {DB_FILE}...")
     num_companies = write_database(companies, company_tools, company_signals)
 
@@ -6,17 +6,19 @@ Only generates pages for companies with 2+ open roles.
 """
 
 import pandas as pd
-from datetime import datetime
-import glob
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
 import os
 
+from job_data import load_jobs, snapshot_paths
+from job_records import job_records
+from build_profiler import phase, stage
 from templates import (
     get_html_head,
     get_nav_html,
     get_footer_html,
     slugify,
     format_salary,
-    is_remote,
     BASE_URL,
     CSS_VARIABLES,
     CSS_NAV,
@@ -30,26 +32,14 @@ from templates import (
 DATA_DIR = 'data'
 SITE_DIR = 'site'
 COMPANIES_DIR = f'{SITE_DIR}/companies'
+MASTER_CSV = f'{DATA_DIR}/master_jobs_database.csv'
 
-print("="*70)
-print("GENERATING COMPANY PAGES")
-print("="*70)
-
-# Find most recent enriched data
-files = glob.glob(f"{DATA_DIR}/executive_sales_jobs_*.csv")
-if not files:
-    print("No enriched data found")
-    exit(1)
-
-latest_file = max(files)
-df = pd.read_csv(latest_file)
-print(f"Loaded {len(df)} jobs from {latest_file}")
+MIN_COMPANY_JOBS = 2
+VELOCITY_WINDOW_DAYS = 90
+MAX_WORKERS = os.cpu_count() or 1
 
 update_date = datetime.now().strftime('%B %d, %Y')
 
-# Create companies directory
-os.makedirs(COMPANIES_DIR, exist_ok=True)
-
 
 # =============================================================================
 # COMPANY-SPECIFIC CSS
@@ -239,13 +229,12 @@ def get_company_styles():
 
 
 def generate_job_card(job):
-    """Generate HTML for a single job card"""
-    title = job.get('title', 'Unknown Title')
-    company = job.get('company', 'Unknown Company')
-    location = job.get('location', 'Location not specified')
+    """Generate HTML for a single job card (a job_records Job)"""
+    title = job.title or 'Unknown Title'
+    company = job.company or 'Unknown Company'
 
     # Salary display
-    salary = format_salary(job.get('min_amount'), job.get('max_amount'))
+    salary = format_salary(job.min_amount, job.max_amount)
     if not salary:
         salary = "Salary not disclosed"
 
@@ -253,23 +242,22 @@ def generate_job_card(job):
     slug = f"{company}-{title}".lower()
     slug = ''.join(c if c.isalnum() or c == '-' else '-' for c in slug)
     slug = '-'.join(filter(None, slug.split('-')))[:60]
-    job_id = str(job.get('id', ''))[-6:] if job.get('id') else ''
+    job_id = job.id[-6:]
     job_url = f"/jobs/{slug}-{job_id}/" if job_id else "#"
 
     # Remote badge
-    remote_badge = '<span class="badge remote">Remote</span>' if is_remote(job) else ''
+    remote_badge = '<span class="badge remote">Remote</span>' if job.remote else ''
 
     # Seniority badge
-    seniority = job.get('seniority', '')
-    seniority_badge = f'<span class="badge seniority">{seniority}</span>' if seniority else ''
+    seniority_badge = f'<span class="badge seniority">{job.seniority}</span>' if job.seniority else ''
 
     return f'''
     <div class="job-card">
         <div class="job-header">
-            <h3><a href="{job_url}">{title}</a></h3>
+            <h3><a href="{job_url}">{job.title_html or 'Unknown Title'}</a></h3>
         </div>
         <div class="job-meta">
-            <span class="location">📍 {location}</span>
+            <span class="location">📍 {job.location_html or 'Location not specified'}</span>
             <span class="salary">💰 {salary}</span>
             {remote_badge}
             {seniority_badge}
@@ -278,72 +266,79 @@ def generate_job_card(job):
     '''
 
 
-def generate_company_stats(company_df, company_name):
+def generate_company_stats(stats, company_name):
     """Generate stats section for a company"""
-    job_count = len(company_df)
-    remote_count = company_df['is_remote'].sum() if 'is_remote' in company_df.columns else 0
-    salary_df = company_df[company_df['max_amount'].notna() & (company_df['max_amount'] > 0)]
+    job_count = stats['count']
+    velocity = stats.get('velocity')
+
+    velocity_text = ''
+    velocity_stat = ''
+    if velocity:
+        velocity_text = (f" {velocity['total']} executive sales role{'s' if velocity['total'] > 1 else ''} "
+                         f"tracked since {velocity['first_seen']}.")
+        velocity_stat = f'''
+                <div class="stat-item">
+                    <div class="stat-value">{velocity['recent']}</div>
+                    <div class="stat-label-small">Posted ({VELOCITY_WINDOW_DAYS} Days)</div>
+                </div>'''
 
     return f'''
         <div class="company-info">
             <h3>🏢 {company_name} Sales Leadership Roles</h3>
-            <p>Currently hiring for {job_count} VP Sales and executive sales position{'s' if job_count > 1 else ''}.</p>
+            <p>Currently hiring for {job_count} VP Sales and executive sales position{'s' if job_count > 1 else ''}.{velocity_text}</p>
             <div class="company-stats">
                 <div class="stat-item">
                     <div class="stat-value">{job_count}</div>
                     <div class="stat-label-small">Open Roles</div>
                 </div>
                 <div class="stat-item">
-                    <div class="stat-value">{remote_count}</div>
+                    <div class="stat-value">{stats['remote']}</div>
                     <div class="stat-label-small">Remote</div>
                 </div>
                 <div class="stat-item">
-                    <div class="stat-value">{len(salary_df)}</div>
+                    <div class="stat-value">{stats['salary_count']}</div>
                     <div class="stat-label-small">With Salary</div>
-                </div>
+                </div>{velocity_stat}
             </div>
         </div>
     '''
 
 
-def generate_salary_summary(company_df, company_name):
+def generate_salary_summary(stats, company_name):
     """Generate salary summary section if data available"""
-    salary_df = company_df[company_df['max_amount'].notna() & (company_df['max_amount'] > 0)]
-    if len(salary_df) < 1:
+    salary_count = stats['salary_count']
+    if salary_count < 1:
         return ''
 
-    avg_min = salary_df['min_amount'].mean()
-    avg_max = salary_df['max_amount'].mean()
-
     return f'''
         <div class="salary-summary">
             <h3>💰 Compensation at {company_name}</h3>
-            <p>Based on {len(salary_df)} role{'s' if len(salary_df) > 1 else ''} with disclosed compensation:</p>
+            <p>Based on {salary_count} role{'s' if salary_count > 1 else ''} with disclosed compensation:</p>
             <div class="salary-range">
-                <strong>Average Range:</strong> ${avg_min/1000:.0f}K - ${avg_max/1000:.0f}K base
+                <strong>Average Range:</strong> ${stats['avg_min']/1000:.0f}K - ${stats['avg_max']/1000:.0f}K base
             </div>
         </div>
     '''
 
 
-def generate_company_page(company_name, company_df):
-    """Generate a page for a specific company"""
+def generate_company_page(company_name, jobs, stats):
+    """Generate a page for a specific company
+
+    Args:
+        company_name: Company display name
+        jobs: List of job_records Jobs, already sorted by salary (highest first)
+        stats: Precomputed aggregates from build_company_tasks()
+    """
     slug = slugify(company_name)
     if not slug:
         return False
 
-    job_count = len(company_df)
-
-    # Sort by salary (highest first)
-    if 'max_amount' in company_df.columns:
-        company_df = company_df.sort_values('max_amount', ascending=False, na_position='last')
+    job_count = stats['count']
 
     # Generate job cards
-    job_cards = '\n'.join(generate_job_card(row) for _, row in company_df.iterrows())
+    job_cards = '\n'.join(generate_job_card(job) for job in jobs)
 
-    # Seniority breakdown
-    seniority_counts = company_df['seniority'].value_counts().to_dict()
-    seniority_summary = ' | '.join([f"{k}: {v}" for k, v in seniority_counts.items() if pd.notna(k)])
+    seniority_summary = stats['seniority_summary']
 
     description = f"{company_name} has {job_count} open VP Sales and executive sales positions. {seniority_summary}."
 
@@ -378,9 +373,9 @@ def generate_company_page(company_name, company_df):
             <a href="/">Home</a> → <a href="/jobs/">Jobs</a> → <a href="/companies/">Companies</a> → {company_name}
         </nav>
 
-        {generate_company_stats(company_df, company_name)}
+        {generate_company_stats(stats, company_name)}
 
-        {generate_salary_summary(company_df, company_name)}
+        {generate_salary_summary(stats, company_name)}
 
         <h2 style="margin-bottom: 20px; color: var(--navy-medium);">Open Positions</h2>
 
@@ -408,7 +403,7 @@ def generate_company_page(company_name, company_df):
     page_dir = f"{COMPANIES_DIR}/{slug}"
     os.makedirs(page_dir, exist_ok=True)
 
-    with open(f"{page_dir}/index.html", 'w') as f:
+    with stage('write'), open(f"{page_dir}/index.html", 'w') as f:
         f.write(html)
 
     return True
@@ -471,36 +466,156 @@ def generate_companies_index(companies_data):
     print(f"  /companies/ index ({len(sorted_companies)} companies)")
 
 
-# Find companies with 2+ roles
-company_counts = df['company'].value_counts()
-companies_with_multiple = company_counts[company_counts >= 2]
+def load_hiring_velocity(master_file=MASTER_CSV):
+    """
+    Per-company hiring history from the master database in one groupby pass.
+
+    Returns:
+        Dict of company -> {'total', 'recent', 'first_seen'}; empty if no master file
+    """
+    if not os.path.exists(master_file):
+        return {}
+
+    header = pd.read_csv(master_file, nrows=0).columns
+    date_cols = [col for col in ['date_posted', 'import_date'] if col in header]
+    if 'company' not in header or not date_cols:
+        return {}
+
+    master_df = pd.read_csv(master_file, usecols=['company'] + date_cols)
+    seen = pd.to_datetime(master_df[date_cols[0]], errors='coerce')
+    for col in date_cols[1:]:
+        seen = seen.fillna(pd.to_datetime(master_df[col], errors='coerce'))
+
+    cutoff = pd.Timestamp(datetime.now() - timedelta(days=VELOCITY_WINDOW_DAYS))
+    history = pd.DataFrame({
+        'company': master_df['company'],
+        'seen': seen,
+        'recent': seen >= cutoff,
+    }).groupby('company').agg(
+        total=('seen', 'size'),
+        recent=('recent', 'sum'),
+        first_seen=('seen', 'min'),
+    )
+    print(f"Loaded hiring history for {len(history)} companies from {master_file}")
+
+    return {
+        company: {
+            'total': int(row.total),
+            'recent': int(row.recent),
+            'first_seen': row.first_seen.strftime('%B %Y'),
+        }
+        for company, row in history.iterrows() if pd.notna(row.first_seen)
+    }
 
-print(f"\nFound {len(companies_with_multiple)} companies with 2+ open roles")
 
-# Generate pages for each company
-companies_data = []
-success_count = 0
+def build_company_tasks(df, velocity):
+    """
+    Group jobs by company once and precompute each page's aggregates.
+
+    Returns:
+        List of (company_name, jobs, stats) tuples for companies with
+        MIN_COMPANY_JOBS+ roles, ordered by job count (highest first)
+    """
+    company_counts = df['company'].value_counts()
+
+    # Sort once so every company's jobs are already highest-salary first
+    if 'max_amount' in df.columns:
+        df = df.sort_values('max_amount', ascending=False, na_position='last', kind='stable')
+
+    has_salary = df['max_amount'].notna() & (df['max_amount'] > 0)
+    remote = df['is_remote'] if 'is_remote' in df.columns else pd.Series(0, index=df.index)
+    aggregates = df.assign(
+        _remote=remote,
+        _has_salary=has_salary,
+        _salary_min=df['min_amount'].where(has_salary),
+        _salary_max=df['max_amount'].where(has_salary),
+    ).groupby('company').agg(
+        count=('company', 'size'),
+        remote=('_remote', 'sum'),
+        salary_count=('_has_salary', 'sum'),
+        avg_min=('_salary_min', 'mean'),
+        avg_max=('_salary_max', 'mean'),
+    )
+    aggregates = aggregates.loc[company_counts[company_counts >= MIN_COMPANY_JOBS].index]
+
+    listed = df[df['company'].isin(aggregates.index)]
+    groups = listed.groupby('company', sort=False)
+    company_jobs = {}
+    for job in job_records(listed):
+        company_jobs.setdefault(job.company, []).append(job)
+
+    tasks = []
+    for company_name, row in aggregates.iterrows():
+        company_df = groups.get_group(company_name)
+        seniority_counts = company_df['seniority'].astype(object).value_counts().to_dict()
+        stats = {
+            'count': int(row['count']),
+            'remote': int(row['remote']),
+            'salary_count': int(row['salary_count']),
+            'avg_min': row['avg_min'],
+            'avg_max': row['avg_max'],
+            'seniority_summary': ' | '.join([f"{k}: {v}" for k, v in seniority_counts.items() if pd.notna(k)]),
+            'velocity': velocity.get(company_name),
+        }
+        tasks.append((company_name, company_jobs[str(company_name)], stats))
+
+    return tasks
+
+
+def render_company_page(task):
+    """Worker entry point: render one company page, return its index entry or None"""
+    company_name, jobs, stats = task
+    slug = slugify(company_name)
+    if slug and generate_company_page(company_name, jobs, stats):
+        return {'name': company_name, 'slug': slug, 'count': stats['count']}
+    return None
 
-for company_name, job_count in companies_with_multiple.items():
-    if pd.isna(company_name):
-        continue
 
-    company_df = df[df['company'] == company_name].copy()
-    slug = slugify(company_name)
+def main():
+    print("="*70)
+    print("GENERATING COMPANY PAGES")
+    print("="*70)
+
+    # Find most recent enriched data
+    phase('load')
+    files = snapshot_paths()
+    if not files:
+        print("No enriched data found")
+        exit(1)
+
+    latest_file = files[-1]
+    df = load_jobs(latest_file, description=False)
+    print(f"Loaded {len(df)} jobs from {latest_file}")
+
+    # Create companies directory
+    os.makedirs(COMPANIES_DIR, exist_ok=True)
+
+    phase('transform')
+    velocity = load_hiring_velocity()
+    tasks = build_company_tasks(df, velocity)
+
+    print(f"\nFound {len(tasks)} companies with {MIN_COMPANY_JOBS}+ open roles")
+
+    # Render pages across worker processes
+    phase('render')
+    with ProcessPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        results = list(executor.map(render_company_page, tasks, chunksize=8))
+
+    companies_data = []
+    for entry in results:
+        if entry:
+            print(f"  /companies/{entry['slug']}/ ({entry['count']} jobs)")
+            companies_data.append(entry)
+    success_count = len(companies_data)
+
+    # Generate index page
+    if companies_data:
+        generate_companies_index(companies_data)
+
+    print(f"\n{'='*70}")
+    print(f"Generated {success_count} company pages + index")
+    print(f"{'='*70}")
+
 
-    if slug and generate_company_page(company_name, company_df):
-        print(f"  /companies/{slug}/ ({job_count} jobs)")
-        companies_data.append({
-            'name': company_name,
-            'slug': slug,
-            'count': job_count
-        })
-        success_count += 1
-
-# Generate index page
-if companies_data:
-    generate_companies_index(companies_data)
-
-print(f"\n{'='*70}")
-print(f"Generated {success_count} company pages + index")
-print(f"{'='*70}")
+if __name__ == "__main__":
+    main()
@@ -10,7 +10,10 @@ import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
 from datetime import datetime, timedelta
 import os
-import glob
+import sys
+sys.path.insert(0, 'scripts')
+from snapshot_stats import latest_snapshots
+from image_pipeline import save_chart
 
 # ============================================================
 # GITHUB ACTIONS CONFIGURATION
@@ -115,7 +118,7 @@ def create_graph(df_subset, title, filename, show_annotations=True):
     
     # Save to site/assets/
     output_path = f"{SITE_ASSETS}/{filename}"
-    plt.savefig(output_path, dpi=150, bbox_inches='tight', facecolor=colors['bg'], edgecolor='none')
+    save_chart(output_path, dpi=150, bbox_inches='tight', facecolor=colors['bg'], edgecolor='none')
     print(f"✅ Saved: {output_path}")
     plt.close()
 
@@ -163,30 +166,22 @@ if len(df_30d) > 0:
 
 def create_social_preview():
     """Create social preview image with highest paying job this week"""
-    job_files = glob.glob(f'{DATA_DIR}/executive_sales_jobs_*.csv')
-    if not job_files:
+    snapshots = latest_snapshots(1)
+    if not snapshots:
         print(f"\n⚠️  No jobs file found - skipping social preview")
         return
     
-    latest_file = sorted(job_files)[-1]
+    latest = snapshots[0]
     print(f"\n6. Social Preview")
-    print(f"   Loading: {latest_file}")
+    print(f"   Snapshot: {latest['file']}")
     
     try:
-        jobs_df = pd.read_csv(latest_file)
-        
-        if 'max_amount' not in jobs_df.columns:
-            print("   ⚠️  No max_amount column found")
-            return
-        
-        valid_jobs = jobs_df[jobs_df['max_amount'].notna() & (jobs_df['max_amount'] > 0)]
-        
-        if valid_jobs.empty:
+        top_job = latest.get('top_salary')
+        if not top_job:
             print("   ⚠️  No jobs with valid salary data")
             return
         
-        top_job = valid_jobs.loc[valid_jobs['max_amount'].idxmax()]
-        max_salary = int(top_job['max_amount'])
+        max_salary = top_job['max_amount']
         salary_k = f"${max_salary // 1000}k"
         
         print(f"   Found top salary: {salary_k}")
@@ -219,7 +214,7 @@ def create_social_preview():
         
         plt.tight_layout(pad=0)
         output_path = f"{SITE_ASSETS}/social_preview.png"
-        plt.savefig(output_path, dpi=100, bbox_inches='tight', 
+        save_chart(output_path, dpi=100, bbox_inches='tight',
                    facecolor=colors['bg'], edgecolor='none', pad_inches=0)
         print(f"✅ Saved: {output_path}")
         plt.close()
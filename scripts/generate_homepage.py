@@ -5,12 +5,13 @@ Includes Market Pulse, Who's Moving teasers, and newsletter signup
 """
 
 import json
-import pandas as pd
 import os
-import glob
 from datetime import datetime
 import sys
 sys.path.insert(0, 'scripts')
+from snapshot_diff import load_diff
+from snapshot_stats import avg_max_salary, latest_snapshots, remote_pct, wow_change_pct
+from build_profiler import phase
 try:
     from tracking_config import get_tracking_code
     TRACKING_CODE = get_tracking_code()
@@ -20,60 +21,41 @@ except:
 DATA_DIR = 'data'
 SITE_DIR = 'site'
 
-def get_jobs_files():
-    """Find the two most recent executive_sales_jobs CSV files"""
-    pattern = f"{DATA_DIR}/executive_sales_jobs_*.csv"
-    files = sorted(glob.glob(pattern))  # YYYYMMDD format sorts correctly
-    if not files:
-        return None, None
-    current = files[-1]
-    previous = files[-2] if len(files) >= 2 else None
-    return current, previous
-
 print("="*70)
 print("🏠 GENERATING HOMEPAGE")
 print("="*70)
 
-# Calculate stats from CSV directly
-current_file, previous_file = get_jobs_files()
-if current_file:
-    df = pd.read_csv(current_file)
-    total_roles = len(df)
+# Stats come from the per-snapshot manifest, not the CSVs themselves
+phase('load')
+snapshots = latest_snapshots(2)
+if snapshots:
+    current = snapshots[0]
+    previous = snapshots[1] if len(snapshots) > 1 else None
+    total_roles = current['rows']
 
     # Calculate WoW change by comparing to previous week
-    wow_change = 0
-    if previous_file:
-        prev_df = pd.read_csv(previous_file)
-        prev_roles = len(prev_df)
-        if prev_roles > 0:
-            wow_change = ((total_roles - prev_roles) / prev_roles) * 100
-            print(f"📊 WoW: {prev_roles} → {total_roles} ({wow_change:+.0f}%)")
-
-    # Calculate remote percentage
-    remote_pct = 0
-    if 'is_remote' in df.columns:
-        remote_pct = (df['is_remote'].sum() / total_roles * 100) if total_roles > 0 else 0
-    elif 'location' in df.columns:
-        remote_count = df['location'].str.lower().str.contains('remote', na=False).sum()
-        remote_pct = (remote_count / total_roles * 100) if total_roles > 0 else 0
-
-    # Calculate average max salary
-    avg_max_salary = 0
-    if 'max_amount' in df.columns:
-        salary_data = pd.to_numeric(df['max_amount'], errors='coerce')
-        salary_data = salary_data[salary_data > 0]
-        if len(salary_data) > 0:
-            avg_max_salary = int(salary_data.mean())
+    wow_change = wow_change_pct(current, previous)
+    if previous and previous['rows'] > 0:
+        print(f"📊 WoW: {previous['rows']} → {total_roles} ({wow_change:+.0f}%)")
 
     stats = {
         'date': datetime.now().strftime('%Y-%m-%d'),
         'total_roles': total_roles,
         'wow_change': wow_change,
         'vs_peak_pct': 0,
-        'remote_pct': remote_pct,
-        'avg_max_salary': avg_max_salary
+        'remote_pct': remote_pct(current),
+        'avg_max_salary': avg_max_salary(current),
+        'new_roles': None,
+        'closed_roles': None
     }
-    print(f"✅ Loaded {total_roles} jobs from {current_file}")
+    print(f"✅ Loaded stats for {total_roles} jobs from {current['file']}")
+
+    # New/closed counts from the snapshot diff, when it covers this snapshot
+    diff = load_diff(current['file'])
+    if diff:
+        stats['new_roles'] = diff['counts']['added']
+        stats['closed_roles'] = diff['counts']['removed']
+        print(f"🔀 New this week: {stats['new_roles']}, closed: {stats['closed_roles']}")
 else:
     stats = {
         'date': datetime.now().strftime('%Y-%m-%d'),
@@ -81,7 +63,9 @@ else:
         'wow_change': 0,
         'vs_peak_pct': 0,
         'remote_pct': 0,
-        'avg_max_salary': 0
+        'avg_max_salary': 0,
+        'new_roles': None,
+        'closed_roles': None
     }
     print("⚠️  No job data found, using defaults")
 
@@ -100,6 +84,7 @@ else:
 update_date = datetime.strptime(stats['date'], '%Y-%m-%d').strftime('%B %d, %Y')
 
 # Generate moves HTML
+phase('render')
 if moves:
     moves_html = ''
     for move in moves:
@@ -125,6 +110,9 @@ else:
 # Determine WoW direction
 wow_direction = 'up' if stats['wow_change'] >= 0 else 'down'
 wow_arrow = '↑' if stats['wow_change'] >= 0 else '↓'
+new_this_week = ''
+if stats['new_roles'] is not None:
+    new_this_week = f" · {stats['new_roles']} new roles, {stats['closed_roles']} closed"
 
 html = f'''<!DOCTYPE html>
 <html lang="en">
@@ -489,7 +477,7 @@ html = f'''<!DOCTYPE html>
             <div class="container">
                 <div class="pulse-header">
                     <h2>This Week's Market</h2>
-                    <p>Week of {update_date}</p>
+                    <p>Week of {update_date}{new_this_week}</p>
                 </div>
                 
                 <div class="pulse-grid">
@@ -610,6 +598,7 @@ html = f'''<!DOCTYPE html>
 </html>'''
 
 # Save homepage
+phase('write')
 with open(f'{SITE_DIR}/index.html', 'w') as f:
     f.write(html)
 
@@ -5,10 +5,14 @@ Reads from market_intelligence.json and creates clean bar charts.
 """
 
 import json
+import sys
 import matplotlib.pyplot as plt
 import numpy as np
 from pathlib import Path
 
+sys.path.insert(0, 'scripts')
+from image_pipeline import save_chart
+
 DATA_DIR = Path("data")
 SITE_ASSETS = Path("site/assets")
 
@@ -66,7 +70,7 @@ def create_horizontal_bar_chart(data, title, color, output_path, max_items=10):
     ax.xaxis.set_visible(False)
     
     plt.tight_layout()
-    plt.savefig(output_path, dpi=150, bbox_inches='tight', facecolor='white')
+    save_chart(output_path, dpi=150, bbox_inches='tight', facecolor='white')
     plt.close()
     print(f"📊 Saved: {output_path}")
 
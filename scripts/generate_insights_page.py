@@ -7,14 +7,15 @@ Uses master_jobs_database.csv for historical analysis.
 """
 
 import pandas as pd
-import re
 import json
 from collections import Counter
 from datetime import datetime, timedelta
-import glob
 import os
 import sys
 sys.path.insert(0, 'scripts')
+from feature_store import load_feature_matrix
+from job_data import load_jobs, snapshot_paths
+from build_profiler import phase
 try:
     from tracking_config import get_tracking_code
     TRACKING_CODE = get_tracking_code()
@@ -73,18 +74,19 @@ print("="*70)
 os.makedirs(INSIGHTS_DIR, exist_ok=True)
 
 # Try master database first for historical analysis
+phase('load')
 master_file = f'{DATA_DIR}/master_jobs_database.csv'
 if os.path.exists(master_file):
-    df = pd.read_csv(master_file)
+    df = load_jobs(master_file)
     print(f"[FILE] Loaded master database: {len(df)} total jobs")
 else:
     # Fall back to weekly file
-    files = glob.glob(f"{DATA_DIR}/executive_sales_jobs_*.csv")
+    files = snapshot_paths()
     if not files:
         print("[ERROR] No job data found")
         exit(1)
-    latest_file = max(files)
-    df = pd.read_csv(latest_file)
+    latest_file = files[-1]
+    df = load_jobs(latest_file)
     print(f"[FILE] Loaded weekly file: {len(df)} jobs")
 
 # Filter to jobs with descriptions for analysis
@@ -96,93 +98,30 @@ update_date = datetime.now().strftime('%B %d, %Y')
 
 # === ANALYSIS FUNCTIONS ===
 
-def count_jobs_with_pattern(pattern):
-    """Count how many JOBS mention the pattern (not total occurrences)"""
-    count = 0
-    for desc in df_with_desc['description'].dropna():
-        if re.search(pattern, str(desc), re.IGNORECASE):
-            count += 1
-    return count
-
 def pct(count):
     """Calculate percentage of jobs"""
     if total_jobs == 0:
         return 0
     return round(count / total_jobs * 100, 1)
 
+def ranked(counts):
+    """Sort pattern counts descending, dropping patterns with no matches"""
+    return {k: v for k, v in sorted(counts.items(), key=lambda x: -x[1]) if v > 0}
+
 # === RUN ANALYSIS ===
+phase('analyze')
 
-print("[ANALYSIS] Counting tools...")
-# Tools - count jobs that mention each tool
-tools_analysis = {
-    'Salesforce': count_jobs_with_pattern(r'\bsalesforce\b'),
-    'HubSpot': count_jobs_with_pattern(r'\bhubspot\b'),
-    'Gong': count_jobs_with_pattern(r'\bgong\b'),
-    'Outreach': count_jobs_with_pattern(r'\boutreach\b'),
-    'ZoomInfo': count_jobs_with_pattern(r'\bzoominfo\b'),
-    'Clari': count_jobs_with_pattern(r'\bclari\b'),
-    'Tableau': count_jobs_with_pattern(r'\btableau\b'),
-    'LinkedIn Sales Nav': count_jobs_with_pattern(r'\blinkedin\s*(?:sales)?\s*nav'),
-}
-tools_analysis = {k: v for k, v in sorted(tools_analysis.items(), key=lambda x: -x[1]) if v > 0}
-
-print("[ANALYSIS] Counting methodologies...")
-# Methodologies
-methods_analysis = {
-    'Enterprise Sales': count_jobs_with_pattern(r'\benterprise\s*sales'),
-    'Consultative Selling': count_jobs_with_pattern(r'\bconsultative\b'),
-    'Channel/Partner': count_jobs_with_pattern(r'\bchannel\s*(?:sales|partner)|partner\s*(?:sales|channel)'),
-    'Value Selling': count_jobs_with_pattern(r'\bvalue\s*sell'),
-    'MEDDIC/MEDDPICC': count_jobs_with_pattern(r'\bmedd[ip]*i?c+\b'),
-    'PLG/Product-Led': count_jobs_with_pattern(r'\bplg\b|product.led'),
-    'Challenger': count_jobs_with_pattern(r'\bchallenger\b'),
-    'Account-Based (ABM)': count_jobs_with_pattern(r'\baccount.based|abm\b'),
-}
-methods_analysis = {k: v for k, v in sorted(methods_analysis.items(), key=lambda x: -x[1]) if v > 0}
-
-print("[ANALYSIS] Counting trends...")
-# Buzzwords/Trends
-trends_analysis = {
-    'AI / Machine Learning': count_jobs_with_pattern(r'\bartificial\s*intelligence|\bai\b|machine\s*learning'),
-    'Go-to-Market / GTM': count_jobs_with_pattern(r'\bgo.to.market|\bgtm\b'),
-    'Scale / Scalable': count_jobs_with_pattern(r'\bscalab|\bscale\b'),
-    'SaaS': count_jobs_with_pattern(r'\bsaas\b'),
-    'Data-Driven': count_jobs_with_pattern(r'\bdata.driven\b'),
-    'Cloud': count_jobs_with_pattern(r'\bcloud\b'),
-    'Series A-D (Startup)': count_jobs_with_pattern(r'\bseries\s*[a-d]\b'),
-    'Customer Success': count_jobs_with_pattern(r'\bcustomer\s*success\b'),
-    'Recurring Revenue/ARR': count_jobs_with_pattern(r'\brecurring\s*revenue|arr\b|mrr\b'),
-    'GenAI': count_jobs_with_pattern(r'\bgenai|generative\s*ai|gen\s*ai|llm\b'),
-}
-trends_analysis = {k: v for k, v in sorted(trends_analysis.items(), key=lambda x: -x[1]) if v > 0}
-
-print("[ANALYSIS] Counting industries...")
-# Industries
-industries_analysis = {
-    'Technology/Software': count_jobs_with_pattern(r'\btechnology|software|tech\s*companies'),
-    'Healthcare': count_jobs_with_pattern(r'\bhealthcare|health\s*tech|medical|pharma|biotech'),
-    'Financial Services': count_jobs_with_pattern(r'\bfinancial\s*services|fintech|banking|insurance'),
-    'Education': count_jobs_with_pattern(r'\beducation|edtech|learning'),
-    'Government': count_jobs_with_pattern(r'\bgovernment|public\s*sector|federal'),
-    'Cybersecurity': count_jobs_with_pattern(r'\bcyber|security|infosec'),
-    'Retail/E-commerce': count_jobs_with_pattern(r'\bretail|e.commerce|ecommerce'),
-    'Real Estate': count_jobs_with_pattern(r'\breal\s*estate|proptech'),
-    'Energy': count_jobs_with_pattern(r'\benergy|utilities|renewable'),
-    'Manufacturing': count_jobs_with_pattern(r'\bmanufacturing|industrial'),
-}
-industries_analysis = {k: v for k, v in sorted(industries_analysis.items(), key=lambda x: -x[1]) if v > 0}
-
-print("[ANALYSIS] Counting red flags...")
-# Red Flags
-red_flags_analysis = {
-    '"Competitive compensation" (vague)': count_jobs_with_pattern(r'\bcompetitive\s*(?:salary|compensation|pay)'),
-    '"Fast-paced environment"': count_jobs_with_pattern(r'\bfast.paced\b'),
-    'Travel 50%+': count_jobs_with_pattern(r'\b(?:5[0-9]|[6-9][0-9]|100)\s*%\s*travel'),
-    '"Self-starter" required': count_jobs_with_pattern(r'\bself.starter\b'),
-    '"Wear many hats"': count_jobs_with_pattern(r'\bwear\s*many\s*hats|wear\s*multiple\s*hats'),
-    '"Scrappy"': count_jobs_with_pattern(r'\bscrappy\b'),
-}
-red_flags_analysis = {k: v for k, v in sorted(red_flags_analysis.items(), key=lambda x: -x[1]) if v > 0}
+# Count how many JOBS mention each pattern (not total occurrences).
+# Matches are cached per job in the feature store; only new descriptions are scanned.
+print("[ANALYSIS] Loading job features...")
+features = load_feature_matrix(df_with_desc)
+
+print("[ANALYSIS] Counting tools, methodologies, trends, industries, red flags...")
+tools_analysis = ranked(features.counts('insights:tools:'))
+methods_analysis = ranked(features.counts('insights:methodologies:'))
+trends_analysis = ranked(features.counts('insights:trends:'))
+industries_analysis = ranked(features.counts('insights:industries:'))
+red_flags_analysis = ranked(features.counts('insights:red_flags:'))
 
 # Save analysis to JSON for other uses
 analysis_data = {
@@ -200,6 +139,7 @@ with open(f'{DATA_DIR}/market_intelligence.json', 'w') as f:
 print(f"[FILE] Saved analysis to {DATA_DIR}/market_intelligence.json")
 
 # === GENERATE HTML ===
+phase('render')
 
 def generate_bar_chart(data, max_val=None, color='#1e3a5f'):
     """Generate HTML for a horizontal bar chart"""
@@ -713,6 +653,7 @@ html = f'''<!DOCTYPE html>
 </html>'''
 
 # Save the page
+phase('write')
 with open(f'{INSIGHTS_DIR}/index.html', 'w') as f:
     f.write(html)
 
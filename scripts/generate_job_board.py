@@ -11,11 +11,20 @@ SEO FEATURES:
 """
 
 import os
+import re
 import glob
+import json
+import time
+import argparse
+import tempfile
 import pandas as pd
 from datetime import datetime
 import sys
 sys.path.insert(0, 'scripts')
+from cro_comp_aggregator import extract_metro
+from job_data import load_jobs, snapshot_paths
+from job_records import job_records
+from build_profiler import phase
 try:
     from tracking_config import get_tracking_code
     TRACKING_CODE = get_tracking_code()
@@ -65,16 +74,33 @@ FOOTER_LINKS_HTML = build_footer_links_html()
 
 BASE_URL = 'https://thecroreport.com'
 
+# Only the first page of cards is inlined; the rest of the board is served
+# from compact JSON index shards that the browser filters client-side.
+JOBS_DIR = "site/jobs"
+# Outside site/jobs/, where every directory is a job or category page
+# (generate_job_pages.py treats unknown ones as stale job pages)
+INDEX_DIR = "site/assets/jobs-index"
+INDEX_URL = "/assets/jobs-index/"
+FIRST_PAGE_SIZE = 25
+SHARD_SIZE = 250
+
+# Sidebar filter slugs -> index values
+ROLE_FILTERS = {'vp-of-sales': 'VP', 'cro': 'C-Level', 'svp-sales': 'SVP'}
+SALARY_FILTERS = {'200k': 200, '300k': 300}  # minimum salary bucket ($K)
+
+# Column order of each record in the index shards
+INDEX_FIELDS = ['title', 'company', 'location', 'url', 'salary', 'remote',
+                'seniority', 'metro', 'salary_bucket', 'tokens']
+
 def get_latest_jobs_file():
     """Find the most recent executive_sales_jobs CSV file"""
-    pattern = "data/executive_sales_jobs_*.csv"
-    files = glob.glob(pattern)
+    files = snapshot_paths()
     if not files:
         # Fallback to master database
         if os.path.exists("data/master_jobs_database.csv"):
             return "data/master_jobs_database.csv"
         return None
-    return max(files)  # YYYYMMDD format sorts correctly alphabetically
+    return files[-1]  # YYYYMMDD format sorts correctly alphabetically
 
 def calculate_stats(df):
     """Calculate summary statistics for the hero section"""
@@ -101,17 +127,9 @@ def calculate_stats(df):
         'avg_salary': avg_max_salary
     }
 
-def format_salary(row):
+def format_salary(job):
     """Format salary display"""
-    min_sal = row.get('min_amount', 0)
-    max_sal = row.get('max_amount', 0)
-    
-    try:
-        min_sal = float(min_sal) if pd.notna(min_sal) else 0
-        max_sal = float(max_sal) if pd.notna(max_sal) else 0
-    except:
-        return ""
-    
+    min_sal, max_sal = job.min_amount, job.max_amount
     if min_sal > 0 and max_sal > 0:
         return f"${int(min_sal/1000)}K - ${int(max_sal/1000)}K"
     elif max_sal > 0:
@@ -120,49 +138,93 @@ def format_salary(row):
         return f"${int(min_sal/1000)}K+"
     return ""
 
-def is_remote(row):
-    """Check if job is remote"""
-    if 'is_remote' in row and row['is_remote']:
-        return True
-    if 'location' in row and pd.notna(row['location']):
-        return 'remote' in str(row['location']).lower()
-    return False
+def display_location(location):
+    """Location without the trailing country"""
+    return location.replace(', US', '').replace(', USA', '').strip()
 
-def generate_job_card(row):
+def generate_job_card(job):
     """Generate HTML for a single job card"""
-    title = row.get('title', 'Untitled Position')
-    company = row.get('company', 'Company')
-    location = row.get('location', '')
-    job_url = row.get('job_url_direct', row.get('job_url', '#'))
-    salary = format_salary(row)
-    remote = is_remote(row)
-    
-    # Clean up location display
-    location_display = str(location) if pd.notna(location) else ''
-    location_display = location_display.replace(', US', '').replace(', USA', '').strip()
-    
-    # Skip if company is nan
-    if company == 'nan' or pd.isna(company):
-        company = 'Company'
-    
-    remote_badge = '<span class="badge-remote">Remote</span>' if remote else ''
+    salary = format_salary(job)
+    remote_badge = '<span class="badge-remote">Remote</span>' if job.remote else ''
     salary_display = f'<span class="salary">{salary}</span>' if salary else ''
     
     return f'''
                 <div class="job-card">
                     <div class="job-info">
-                        <h3 class="job-title">{title}</h3>
-                        <p class="job-company">{company}</p>
+                        <h3 class="job-title">{job.title_html or 'Untitled Position'}</h3>
+                        <p class="job-company">{job.company_html or 'Company'}</p>
                         <div class="job-meta">
-                            <span class="job-location">{location_display}</span>
+                            <span class="job-location">{display_location(job.location_html)}</span>
                             {remote_badge}
                             {salary_display}
                         </div>
                     </div>
-                    <a href="{job_url}" target="_blank" rel="noopener" class="btn-apply">Apply &rarr;</a>
+                    <a href="{job.job_url or '#'}" target="_blank" rel="noopener" class="btn-apply">Apply &rarr;</a>
                 </div>
     '''
 
+def salary_bucket(job):
+    """Max salary floored to $100K steps, in $K (0 if not disclosed)"""
+    amount = job.max_amount or job.min_amount
+    return amount // 100000 * 100
+
+def build_index_record(job):
+    """Build one compact index record (ordered as INDEX_FIELDS)"""
+    title = job.title or 'Untitled Position'
+    metro = job.metro or extract_metro(job.location or None)
+    tokens = list(dict.fromkeys(re.findall(r'[a-z0-9]+', title.lower())))
+
+    return [
+        title,
+        job.company or 'Company',
+        display_location(job.location),
+        job.job_url or '#',
+        format_salary(job),
+        1 if job.remote else 0,
+        job.seniority,
+        metro.lower().replace(' ', '-'),
+        salary_bucket(job),
+        tokens,
+    ]
+
+def write_search_index(jobs, index_dir=INDEX_DIR, index_url=INDEX_URL):
+    """Write the manifest and JSON index shards from job records, return a size report"""
+    os.makedirs(index_dir, exist_ok=True)
+    for old_file in glob.glob(f"{index_dir}/shard-*.json"):
+        os.remove(old_file)
+
+    records = [build_index_record(job) for job in jobs]
+    shard_files = []
+    shard_bytes = 0
+    for i in range(0, len(records), SHARD_SIZE):
+        name = f"shard-{i // SHARD_SIZE:03d}.json"
+        payload = json.dumps(records[i:i + SHARD_SIZE], separators=(',', ':'))
+        with open(f"{index_dir}/{name}", 'w', encoding='utf-8') as f:
+            f.write(payload)
+        shard_files.append(f"{index_url}{name}")
+        shard_bytes += len(payload.encode('utf-8'))
+
+    manifest = {
+        'generated_at': datetime.now().isoformat(),
+        'total': len(records),
+        'page_size': FIRST_PAGE_SIZE,
+        'shard_size': SHARD_SIZE,
+        'fields': INDEX_FIELDS,
+        'roles': ROLE_FILTERS,
+        'salaries': SALARY_FILTERS,
+        'shards': shard_files,
+    }
+    manifest_payload = json.dumps(manifest, separators=(',', ':'))
+    with open(f"{index_dir}/manifest.json", 'w', encoding='utf-8') as f:
+        f.write(manifest_payload)
+
+    return {
+        'jobs': len(records),
+        'shards': len(shard_files),
+        'shard_bytes': shard_bytes,
+        'manifest_bytes': len(manifest_payload.encode('utf-8')),
+    }
+
 def generate_filter_boxes(df):
     """Generate sidebar filter box sections"""
     
@@ -204,15 +266,121 @@ def generate_filter_boxes(df):
             </div>
     '''
 
-def generate_html(df, stats):
-    """Generate the complete HTML page"""
+# Client-side search/filter over the JSON index shards (see write_search_index)
+JOB_BOARD_SCRIPT = """    <script>
+        (function() {
+            const list = document.querySelector('.jobs-list');
+            const status = document.querySelector('.jobs-status');
+            const moreBtn = document.querySelector('.btn-more');
+            const searchInput = document.querySelector('.job-search input');
+            const params = new URLSearchParams(window.location.search);
+            const filters = {
+                role: params.get('role'),
+                location: params.get('location'),
+                salary: params.get('salary'),
+                q: (params.get('q') || '').toLowerCase().trim()
+            };
+            const pageSize = Number(list.dataset.pageSize);
+            const shards = [];
+            let manifest = null;
+            let visible = pageSize;
+
+            function esc(value) {
+                return String(value).replace(/[&<>"']/g, c => ({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'}[c]));
+            }
+
+            function card(job) {
+                return '<div class="job-card"><div class="job-info">' +
+                    '<h3 class="job-title">' + esc(job.title) + '</h3>' +
+                    '<p class="job-company">' + esc(job.company) + '</p>' +
+                    '<div class="job-meta"><span class="job-location">' + esc(job.location) + '</span>' +
+                    (job.remote ? '<span class="badge-remote">Remote</span>' : '') +
+                    (job.salary ? '<span class="salary">' + esc(job.salary) + '</span>' : '') +
+                    '</div></div><a href="' + esc(job.url) + '" target="_blank" rel="noopener" class="btn-apply">Apply &rarr;</a></div>';
+            }
+
+            function getManifest() {
+                return manifest || (manifest = fetch(list.dataset.index).then(r => r.json()));
+            }
+
+            function getShard(m, i) {
+                return shards[i] || (shards[i] = fetch(m.shards[i]).then(r => r.json()).then(rows => rows.map(row => {
+                    const job = {};
+                    m.fields.forEach((field, j) => { job[field] = row[j]; });
+                    return job;
+                })));
+            }
+
+            // Load only the shards needed for the first `limit` jobs (all shards if no limit)
+            function getJobs(limit) {
+                return getManifest().then(m => {
+                    const count = limit ? Math.min(m.shards.length, Math.ceil(limit / m.shard_size)) : m.shards.length;
+                    const wanted = [];
+                    for (let i = 0; i < count; i++) wanted.push(getShard(m, i));
+                    return Promise.all(wanted).then(parts => ({m: m, jobs: [].concat(...parts)}));
+                });
+            }
+
+            function isFiltered() {
+                return Boolean(filters.role || filters.location || filters.salary || filters.q);
+            }
+
+            function matches(job, m) {
+                if (filters.role && job.seniority !== m.roles[filters.role]) return false;
+                if (filters.location && (filters.location === 'remote' ? !job.remote : job.metro !== filters.location)) return false;
+                if (filters.salary && !(job.salary_bucket >= m.salaries[filters.salary])) return false;
+                if (filters.q) {
+                    const terms = filters.q.split(/[^a-z0-9]+/).filter(Boolean);
+                    if (!terms.every(term => job.tokens.some(token => token.startsWith(term)))) return false;
+                }
+                return true;
+            }
+
+            function render() {
+                const filtered = isFiltered();
+                getJobs(filtered ? 0 : visible).then(({m, jobs}) => {
+                    const results = filtered ? jobs.filter(job => matches(job, m)) : jobs;
+                    const total = filtered ? results.length : m.total;
+                    list.innerHTML = results.slice(0, visible).map(card).join('') ||
+                        '<p class="jobs-empty">No roles match these filters.</p>';
+                    status.textContent = filtered ? total + ' matching role' + (total === 1 ? '' : 's') : '';
+                    moreBtn.hidden = visible >= total;
+                });
+            }
+
+            let searchTimer = null;
+            searchInput.value = params.get('q') || '';
+            searchInput.addEventListener('input', () => {
+                clearTimeout(searchTimer);
+                searchTimer = setTimeout(() => {
+                    filters.q = searchInput.value.toLowerCase().trim();
+                    if (filters.q) params.set('q', filters.q); else params.delete('q');
+                    history.replaceState(null, '', '?' + params.toString());
+                    visible = pageSize;
+                    render();
+                }, 150);
+            });
+            searchInput.form.addEventListener('submit', e => e.preventDefault());
+
+            moreBtn.addEventListener('click', () => {
+                visible += pageSize;
+                render();
+            });
+
+            if (isFiltered()) render();
+        })();
+    </script>"""
+
+def generate_html(df, jobs, stats, max_cards=FIRST_PAGE_SIZE):
+    """Generate the complete HTML page
+
+    Only the first max_cards jobs (records from job_records) are inlined so
+    the page stays a fixed size; search, sidebar filters and "show more"
+    read the JSON index shards.
+    """
     
     # Generate job cards
-    job_cards = []
-    for _, row in df.iterrows():
-        job_cards.append(generate_job_card(row))
-    
-    job_cards_html = '\n'.join(job_cards)
+    job_cards_html = '\n'.join(generate_job_card(job) for job in jobs[:max_cards])
     filter_boxes_html = generate_filter_boxes(df)
     
     current_year = datetime.now().year
@@ -597,6 +765,52 @@ def generate_html(df, stats):
             color: #fff;
         }}
         
+        /* Search & Pagination */
+        .job-search {{
+            padding: 1rem 1.5rem;
+            border-bottom: 1px solid #e2e8f0;
+        }}
+        
+        .job-search input {{
+            width: 100%;
+            padding: 0.6rem 0.85rem;
+            border: 1px solid #cbd5e0;
+            border-radius: 6px;
+            font-size: 0.95rem;
+        }}
+        
+        .jobs-status {{
+            padding: 0.75rem 1.5rem 0;
+            color: #718096;
+            font-size: 0.875rem;
+        }}
+        
+        .jobs-status:empty {{
+            display: none;
+        }}
+        
+        .jobs-empty {{
+            padding: 1.25rem 1.5rem;
+            color: #718096;
+        }}
+        
+        .btn-more {{
+            display: block;
+            width: 100%;
+            padding: 1rem;
+            background: none;
+            border: none;
+            border-top: 1px solid #e2e8f0;
+            color: #1a365d;
+            font-weight: 600;
+            font-size: 0.95rem;
+            cursor: pointer;
+        }}
+        
+        .btn-more:hover {{
+            color: #d69e2e;
+        }}
+        
         /* Sidebar */
         .sidebar {{
             display: flex;
@@ -758,9 +972,14 @@ def generate_html(df, stats):
     
     <main class="main-container">
         <div class="jobs-container">
-            <div class="jobs-list">
+            <form class="job-search" action="/jobs/" method="get" role="search">
+                <input type="search" name="q" placeholder="Search {stats['total']} roles by title..." aria-label="Search jobs">
+            </form>
+            <p class="jobs-status" aria-live="polite"></p>
+            <div class="jobs-list" data-index="{INDEX_URL}manifest.json" data-page-size="{max_cards}">
 {job_cards_html}
             </div>
+            <button type="button" class="btn-more"{'' if stats['total'] > max_cards else ' hidden'}>Show more roles</button>
         </div>
         
         <aside class="sidebar">
@@ -778,15 +997,53 @@ def generate_html(df, stats):
         <p>{FOOTER_LINKS_HTML}</p>
         <p style="margin-top: 8px; font-size: 0.8rem; color: #94a3b8;">Updated {update_date}</p>
     </footer>
+{JOB_BOARD_SCRIPT}
 </body>
 </html>
 '''
     return html
 
 
+def run_benchmark(df, scales=(1, 10, 100)):
+    """Compare inlining every card with the first page + index shards"""
+    print(f"\n{'JOB BOARD BUILD BENCHMARK':-^78}")
+    print(f"{'Jobs':>8} {'Inline time':>12} {'Inline size':>12} {'Shard time':>10} {'First page':>12} {'Index size':>12}")
+    for scale in scales:
+        scaled = pd.concat([df] * scale, ignore_index=True)
+        stats = calculate_stats(scaled)
+        jobs = job_records(scaled)
+
+        start = time.perf_counter()
+        legacy_html = generate_html(scaled, jobs, stats, max_cards=len(scaled))
+        legacy_time = time.perf_counter() - start
+
+        with tempfile.TemporaryDirectory() as index_dir:
+            start = time.perf_counter()
+            page_html = generate_html(scaled, jobs, stats)
+            report = write_search_index(jobs, index_dir)
+            sharded_time = time.perf_counter() - start
+
+        print(f"{len(scaled):>8} {legacy_time:>11.2f}s {len(legacy_html.encode('utf-8')) / 1024:>10.0f}KB "
+              f"{sharded_time:>9.2f}s {len(page_html.encode('utf-8')) / 1024:>10.0f}KB "
+              f"{(report['shard_bytes'] + report['manifest_bytes']) / 1024:>10.0f}KB")
+
+
+def print_size_report(html, report):
+    """Print the size of the first page and the search index"""
+    print(f"\n📦 Size Report:")
+    print(f"   - First page (index.html): {len(html.encode('utf-8')) / 1024:.1f} KB ({FIRST_PAGE_SIZE} cards inline)")
+    print(f"   - Index manifest: {report['manifest_bytes'] / 1024:.1f} KB")
+    print(f"   - Index shards: {report['shards']} files, {report['shard_bytes'] / 1024:.1f} KB for {report['jobs']} jobs")
+
+
 def main():
     """Main entry point"""
+    parser = argparse.ArgumentParser(description='Generate the /jobs/ board and its search index')
+    parser.add_argument('--benchmark', action='store_true', help='Benchmark build time and payload size at 1x/10x/100x')
+    args = parser.parse_args()
+
     # Find the jobs data file
+    phase('load')
     jobs_file = get_latest_jobs_file()
     
     if not jobs_file:
@@ -796,25 +1053,38 @@ def main():
     print(f"Reading jobs from: {jobs_file}")
     
     # Load the data
-    df = pd.read_csv(jobs_file)
-    print(f"Loaded {len(df)} jobs")
+    df = load_jobs(jobs_file, description=False)
+
+    if args.benchmark:
+        run_benchmark(df)
+        return
     
     # Calculate stats
+    phase('transform')
     stats = calculate_stats(df)
+    jobs = job_records(df)
     print(f"Stats: {stats['total']} total, {stats['remote']} remote, ${stats['avg_salary']}K avg")
     
     # Generate HTML
-    html = generate_html(df, stats)
+    phase('render')
+    html = generate_html(df, jobs, stats)
     
     # Ensure output directory exists
-    os.makedirs("site/jobs", exist_ok=True)
+    phase('write')
+    os.makedirs(JOBS_DIR, exist_ok=True)
     
     # Write the file
-    output_path = "site/jobs/index.html"
+    output_path = f"{JOBS_DIR}/index.html"
     with open(output_path, 'w', encoding='utf-8') as f:
         f.write(html)
     
     print(f"Generated: {output_path}")
+
+    # Write the client-side search index
+    report = write_search_index(jobs)
+    print(f"Generated: {INDEX_DIR}/manifest.json + {report['shards']} index shards")
+    print_size_report(html, report)
+
     print(f"\n📊 SEO Features Added:")
     print(f"   - Tracking code (GA4 + Clarity)")
     print(f"   - Open Graph tags")
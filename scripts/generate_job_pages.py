@@ -14,13 +14,17 @@ SEO FEATURES:
 
 import pandas as pd
 from datetime import datetime
-import glob
 import os
 import re
 import hashlib
+import functools
 import json
 import sys
 sys.path.insert(0, 'scripts')
+from job_data import load_jobs, snapshot_paths
+from job_records import job_records
+from snapshot_diff import DIFF_FILE, load_diff
+from build_profiler import phase, stage
 try:
     from tracking_config import get_tracking_code
     TRACKING_CODE = get_tracking_code()
@@ -71,22 +75,6 @@ SITE_DIR = 'site'
 JOBS_DIR = f'{SITE_DIR}/jobs'
 BASE_URL = 'https://thecroreport.com'
 
-print("="*70)
-print("📄 GENERATING INDIVIDUAL JOB PAGES")
-print("="*70)
-
-os.makedirs(JOBS_DIR, exist_ok=True)
-
-# Find most recent enriched data
-files = glob.glob(f"{DATA_DIR}/executive_sales_jobs_*.csv")
-if not files:
-    print("❌ No enriched data found")
-    exit(1)
-
-latest_file = max(files)
-df = pd.read_csv(latest_file)
-print(f"📂 Loaded {len(df)} jobs from {latest_file}")
-
 update_date = datetime.now().strftime('%B %d, %Y')
 iso_date = datetime.now().strftime('%Y-%m-%d')
 
@@ -100,6 +88,11 @@ def slugify(text):
     text = re.sub(r'-+', '-', text)
     return text.strip('-')[:50]
 
+@functools.lru_cache(maxsize=None)
+def company_slug(company):
+    """slugify() for company names, cached (stale-page scoring slugs every live job)"""
+    return slugify(company)
+
 def escape_html(text):
     """Escape HTML special characters"""
     if pd.isna(text):
@@ -112,49 +105,60 @@ def escape_json(text):
         return ''
     return str(text).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n').replace('\r', '\\r').replace('\t', '\\t')
 
-def create_job_page(job, idx):
-    """Generate an individual job page with full SEO optimization"""
-    
+def job_slug(job, idx):
+    """Page slug for a job dict (company-title-hash)"""
     company = str(job.get('company', 'Unknown'))
     title = str(job.get('title', 'Sales Executive'))
     location = str(job.get('location', '')) if pd.notna(job.get('location')) else ''
-    
+    return page_slug(company, title, location, idx)
+
+def page_slug(company, title, location, idx):
+    """Page slug from a job's company, title and location strings"""
     # Create unique slug
     slug = f"{slugify(company)}-{slugify(title)}"
     if not slug or len(slug) < 5:
         slug = f"job-{idx}"
-    
+
     # Add hash suffix for uniqueness
     hash_suffix = hashlib.md5(f"{company}{title}{location}".encode()).hexdigest()[:6]
-    slug = f"{slug}-{hash_suffix}"
+    return f"{slug}-{hash_suffix}"
+
+def create_job_page(job):
+    """Generate an individual job page (from a job_records Job) with full SEO optimization"""
+    
+    company = job.company
+    title = job.title
+    location = job.location
+    
+    slug = page_slug(company, title, location, job.index)
     
     # Format salary
-    min_sal = job.get('min_amount')
-    max_sal = job.get('max_amount')
-    if pd.notna(min_sal) and pd.notna(max_sal) and float(min_sal) > 0 and float(max_sal) > 0:
-        salary_display = f"${int(min_sal):,} - ${int(max_sal):,}"
-        salary_short = f"${int(min_sal)//1000}K-${int(max_sal)//1000}K"
-        salary_schema_min = int(min_sal)
-        salary_schema_max = int(max_sal)
-    elif pd.notna(max_sal) and float(max_sal) > 0:
-        salary_display = f"Up to ${int(max_sal):,}"
-        salary_short = f"Up to ${int(max_sal)//1000}K"
+    min_sal = job.min_amount
+    max_sal = job.max_amount
+    if min_sal > 0 and max_sal > 0:
+        salary_display = f"${min_sal:,} - ${max_sal:,}"
+        salary_short = f"${min_sal//1000}K-${max_sal//1000}K"
+        salary_schema_min = min_sal
+        salary_schema_max = max_sal
+    elif max_sal > 0:
+        salary_display = f"Up to ${max_sal:,}"
+        salary_short = f"Up to ${max_sal//1000}K"
         salary_schema_min = None
-        salary_schema_max = int(max_sal)
+        salary_schema_max = max_sal
     else:
         salary_display = "Not disclosed"
         salary_short = ""
         salary_schema_min = None
         salary_schema_max = None
     
-    seniority = job.get('seniority', 'VP') if pd.notna(job.get('seniority')) else 'VP'
-    is_remote = job.get('is_remote') == True or str(job.get('is_remote')).lower() == 'true'
-    job_url = job.get('job_url_direct', '#') if pd.notna(job.get('job_url_direct')) else '#'
+    seniority = job.seniority or 'VP'
+    is_remote = job.is_remote
+    job_url = job.job_url_direct or '#'
     
-    # Escape for HTML
-    company_escaped = escape_html(company)
-    title_escaped = escape_html(title)
-    location_escaped = escape_html(location)
+    # Escaped for HTML
+    company_escaped = job.company_html
+    title_escaped = job.title_html
+    location_escaped = job.location_html
     
     # === SEO-OPTIMIZED TITLE ===
     # Format: "VP Sales at Acme Corp - $200K-$300K (Remote) | CRO"
@@ -701,87 +705,64 @@ def create_job_page(job, idx):
     # Create directory and save
     page_dir = f'{JOBS_DIR}/{slug}'
     os.makedirs(page_dir, exist_ok=True)
-    with open(f'{page_dir}/index.html', 'w') as f:
+    with stage('write'), open(f'{page_dir}/index.html', 'w') as f:
         f.write(html)
     
     return slug
 
-# Generate individual job pages
-print(f"\nGenerating individual job pages...")
-job_slugs = []
-for idx, row in df.iterrows():
-    if pd.notna(row.get('title')) and pd.notna(row.get('company')):
-        slug = create_job_page(row, idx)
-        job_slugs.append(slug)
-        if len(job_slugs) % 50 == 0:
-            print(f"  Generated {len(job_slugs)} pages...")
-
-print(f"\n✅ Generated {len(job_slugs)} individual job pages")
-
-# Save job index for linking
-with open(f'{DATA_DIR}/job_slugs.txt', 'w') as f:
-    f.write('\n'.join(job_slugs))
-
-print(f"✅ Saved job slug index")
 
 # ============================================================================
 # STALE JOB HANDLING - Find expired jobs and show similar recommendations
 # ============================================================================
-print("\n" + "="*70)
-print("🔄 HANDLING STALE JOB PAGES")
-print("="*70)
 
-def find_similar_jobs(stale_slug, current_jobs_df, num_recommendations=5):
-    """Find similar live jobs based on the stale job's characteristics"""
+def find_similar_jobs(stale_slug, jobs, num_recommendations=5):
+    """Find similar live jobs (job_records Jobs) based on the stale job's characteristics"""
     # Try to extract info from slug (company-title-hash format)
     parts = stale_slug.rsplit('-', 1)  # Split off hash
     if len(parts) < 2:
         # Can't parse, return random jobs
-        return current_jobs_df.head(num_recommendations).to_dict('records')
+        return jobs[:num_recommendations]
 
     slug_text = parts[0].lower()
+    wants_cro = 'cro' in slug_text or 'chief-revenue' in slug_text
+    wants_vp = 'vp' in slug_text or 'vice-president' in slug_text
+    wants_svp = 'svp' in slug_text or 'senior-vice' in slug_text
+    wants_director = 'director' in slug_text
+    wants_remote = 'remote' in slug_text
 
     # Score each current job by similarity
     scores = []
-    for idx, job in current_jobs_df.iterrows():
+    for pos, job in enumerate(jobs):
         score = 0
-        company = str(job.get('company', '')).lower()
-        title = str(job.get('title', '')).lower()
+        title = job.title.lower()
 
         # Company match (highest weight)
-        if company and slugify(company) in slug_text:
+        if job.company and company_slug(job.company) in slug_text:
             score += 50
 
         # Title/seniority match
-        if 'cro' in slug_text or 'chief-revenue' in slug_text:
-            if 'cro' in title or 'chief revenue' in title:
-                score += 30
-        if 'vp' in slug_text or 'vice-president' in slug_text:
-            if 'vp' in title or 'vice president' in title:
-                score += 30
-        if 'svp' in slug_text or 'senior-vice' in slug_text:
-            if 'svp' in title or 'senior vice' in title:
-                score += 30
-        if 'director' in slug_text:
-            if 'director' in title:
-                score += 20
+        if wants_cro and ('cro' in title or 'chief revenue' in title):
+            score += 30
+        if wants_vp and ('vp' in title or 'vice president' in title):
+            score += 30
+        if wants_svp and ('svp' in title or 'senior vice' in title):
+            score += 30
+        if wants_director and 'director' in title:
+            score += 20
 
         # Remote preference
-        is_remote = job.get('is_remote') == True or str(job.get('is_remote')).lower() == 'true'
-        if 'remote' in slug_text and is_remote:
+        if wants_remote and job.is_remote:
             score += 10
 
         # Has salary (prefer jobs with disclosed salary)
-        if pd.notna(job.get('max_amount')) and float(job.get('max_amount', 0)) > 0:
+        if job.max_amount > 0:
             score += 5
 
-        scores.append((idx, score))
+        scores.append((pos, score))
 
     # Sort by score descending, take top N
     scores.sort(key=lambda x: x[1], reverse=True)
-    top_indices = [s[0] for s in scores[:num_recommendations]]
-
-    return current_jobs_df.loc[top_indices].to_dict('records')
+    return [jobs[pos] for pos, _ in scores[:num_recommendations]]
 
 def create_stale_job_page(stale_slug, similar_jobs):
     """Generate a page for an expired job with similar job recommendations"""
@@ -844,31 +825,22 @@ def create_stale_job_page(stale_slug, similar_jobs):
     # Build similar jobs HTML
     similar_jobs_html = ""
     for job in similar_jobs:
-        company = escape_html(str(job.get('company', 'Unknown')))
-        title = escape_html(str(job.get('title', 'Sales Role')))
-        location = escape_html(str(job.get('location', ''))) if pd.notna(job.get('location')) else ''
-        is_remote = job.get('is_remote') == True or str(job.get('is_remote')).lower() == 'true'
-
-        min_sal = job.get('min_amount')
-        max_sal = job.get('max_amount')
-        if pd.notna(min_sal) and pd.notna(max_sal) and float(min_sal) > 0 and float(max_sal) > 0:
-            salary = f"${int(min_sal)//1000}K-${int(max_sal)//1000}K"
-        elif pd.notna(max_sal) and float(max_sal) > 0:
-            salary = f"Up to ${int(max_sal)//1000}K"
+        if job.max_amount > 0 and job.min_amount > 0:
+            salary = f"${job.min_amount//1000}K-${job.max_amount//1000}K"
+        elif job.max_amount > 0:
+            salary = f"Up to ${job.max_amount//1000}K"
         else:
             salary = ""
 
-        # Generate slug for this job
-        job_slug = f"{slugify(job.get('company', ''))}-{slugify(job.get('title', ''))}"
-        hash_suffix = hashlib.md5(f"{job.get('company','')}{job.get('title','')}{job.get('location','')}".encode()).hexdigest()[:6]
-        job_slug = f"{job_slug}-{hash_suffix}"
+        # Same slug as the job's own page
+        similar_slug = page_slug(job.company, job.title, job.location, job.index)
 
-        location_badge = '🏠 Remote' if is_remote else f'📍 {location}' if location else ''
+        location_badge = '🏠 Remote' if job.is_remote else f'📍 {job.location_html}' if job.location_html else ''
 
         similar_jobs_html += f'''
-            <a href="/jobs/{job_slug}/" class="similar-job-card">
-                <div class="job-title">{title}</div>
-                <div class="job-company">{company}</div>
+            <a href="/jobs/{similar_slug}/" class="similar-job-card">
+                <div class="job-title">{job.title_html or 'Sales Role'}</div>
+                <div class="job-company">{job.company_html or 'Unknown'}</div>
                 <div class="job-meta-row">
                     {f'<span class="salary-badge">{salary}</span>' if salary else ''}
                     {f'<span class="location-badge">{location_badge}</span>' if location_badge else ''}
@@ -1288,47 +1260,104 @@ def create_stale_job_page(stale_slug, similar_jobs):
     # Save the stale page
     page_dir = f'{JOBS_DIR}/{stale_slug}'
     os.makedirs(page_dir, exist_ok=True)
-    with open(f'{page_dir}/index.html', 'w') as f:
+    with stage('write'), open(f'{page_dir}/index.html', 'w') as f:
         f.write(html)
 
-# Find all existing job page directories
-existing_pages = set()
-for item in os.listdir(JOBS_DIR):
-    item_path = os.path.join(JOBS_DIR, item)
-    if os.path.isdir(item_path) and item != 'index.html':
-        existing_pages.add(item)
-
-# Convert current job slugs to a set for comparison
-current_slugs = set(job_slugs)
-
-# Find stale pages (exist on disk but not in current data)
-stale_slugs = existing_pages - current_slugs
-
-print(f"\n📊 Page Analysis:")
-print(f"   - Current live jobs: {len(current_slugs)}")
-print(f"   - Existing pages on disk: {len(existing_pages)}")
-print(f"   - Stale pages to update: {len(stale_slugs)}")
-
-if stale_slugs:
-    print(f"\n🔄 Updating {len(stale_slugs)} stale job pages with similar recommendations...")
-    stale_count = 0
-    for stale_slug in stale_slugs:
-        # Find similar jobs
-        similar_jobs = find_similar_jobs(stale_slug, df, num_recommendations=5)
-        # Create the stale page
-        create_stale_job_page(stale_slug, similar_jobs)
-        stale_count += 1
-        if stale_count % 50 == 0:
-            print(f"   Updated {stale_count} stale pages...")
-
-    print(f"\n✅ Updated {len(stale_slugs)} stale job pages with similar job recommendations")
-else:
-    print(f"\n✅ No stale job pages found - all pages are current")
-
-print(f"\n📊 SEO Features Added:")
-print(f"   - Correct canonical URLs ({BASE_URL})")
-print(f"   - Salary/location in title tags")
-print(f"   - Open Graph tags for social sharing")
-print(f"   - Twitter card tags")
-print(f"   - JobPosting JSON-LD schema")
-print(f"   - Stale page handling with similar job recommendations")
+
+def main():
+    print("="*70)
+    print("📄 GENERATING INDIVIDUAL JOB PAGES")
+    print("="*70)
+
+    os.makedirs(JOBS_DIR, exist_ok=True)
+
+    # Find most recent enriched data
+    phase('load')
+    files = snapshot_paths()
+    if not files:
+        print("❌ No enriched data found")
+        exit(1)
+
+    latest_file = files[-1]
+    df = load_jobs(latest_file, description=False)
+    print(f"📂 Loaded {len(df)} jobs from {latest_file}")
+
+    # Generate individual job pages
+    phase('render')
+    print(f"\nGenerating individual job pages...")
+    # Only jobs with a title and company get a page (and can be recommended)
+    jobs = [job for job in job_records(df) if job.title and job.company]
+    job_slugs = []
+    for job in jobs:
+        slug = create_job_page(job)
+        job_slugs.append(slug)
+        if len(job_slugs) % 50 == 0:
+            print(f"  Generated {len(job_slugs)} pages...")
+
+    print(f"\n✅ Generated {len(job_slugs)} individual job pages")
+
+    # Save job index for linking
+    with open(f'{DATA_DIR}/job_slugs.txt', 'w') as f:
+        f.write('\n'.join(job_slugs))
+
+    print(f"✅ Saved job slug index")
+
+    print("\n" + "="*70)
+    print("🔄 HANDLING STALE JOB PAGES")
+    print("="*70)
+
+    phase('stale_pages')
+    # Convert current job slugs to a set for comparison
+    current_slugs = set(job_slugs)
+
+    diff = load_diff(latest_file)
+    if diff and '--all-stale' not in sys.argv:
+        # Only roles that closed since the previous snapshot need a stale page;
+        # pages of roles that closed earlier were rewritten in earlier builds
+        closed_slugs = {job_slug(role, idx) for idx, role in enumerate(diff['removed'])
+                        if role.get('title') and role.get('company')}
+        stale_slugs = {slug for slug in closed_slugs - current_slugs if os.path.isdir(f'{JOBS_DIR}/{slug}')}
+        print(f"\n📊 Page Analysis (from {DIFF_FILE}):")
+        print(f"   - Current live jobs: {len(current_slugs)}")
+        print(f"   - Roles closed since {diff['old']}: {len(closed_slugs)}")
+    else:
+        # No diff for this snapshot (or --all-stale): every page on disk not in current data
+        existing_pages = set()
+        for item in os.listdir(JOBS_DIR):
+            item_path = os.path.join(JOBS_DIR, item)
+            if os.path.isdir(item_path) and item != 'index.html':
+                existing_pages.add(item)
+        stale_slugs = existing_pages - current_slugs
+        print(f"\n📊 Page Analysis:")
+        print(f"   - Current live jobs: {len(current_slugs)}")
+        print(f"   - Existing pages on disk: {len(existing_pages)}")
+    print(f"   - Stale pages to update: {len(stale_slugs)}")
+
+    if stale_slugs:
+        print(f"\n🔄 Updating {len(stale_slugs)} stale job pages with similar recommendations...")
+        stale_count = 0
+        for stale_slug in stale_slugs:
+            # Find similar jobs
+            with stage('recommend'):
+                similar_jobs = find_similar_jobs(stale_slug, jobs, num_recommendations=5)
+            # Create the stale page
+            create_stale_job_page(stale_slug, similar_jobs)
+            stale_count += 1
+            if stale_count % 50 == 0:
+                print(f"   Updated {stale_count} stale pages...")
+
+        print(f"\n✅ Updated {len(stale_slugs)} stale job pages with similar job recommendations")
+    else:
+        print(f"\n✅ No stale job pages found - all pages are current")
+
+    print(f"\n📊 SEO Features Added:")
+    print(f"   - Correct canonical URLs ({BASE_URL})")
+    print(f"   - Salary/location in title tags")
+    print(f"   - Open Graph tags for social sharing")
+    print(f"   - Twitter card tags")
+    print(f"   - JobPosting JSON-LD schema")
+    print(f"   - Stale page handling with similar job recommendations")
+
+
+if __name__ == "__main__":
+    main()
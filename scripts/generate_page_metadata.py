@@ -14,47 +14,270 @@ Each page entry includes:
 - content stats (word_count, faq_count)
 - last_modified
 
+Pages are read with a streaming html.parser extractor (no document tree)
+across a process pool, and related pages come from one parent_hub grouping.
+
 Run after all page generators to collect metadata.
+
+Usage:
+    python scripts/generate_page_metadata.py
+    python scripts/generate_page_metadata.py --benchmark   # vs. the BeautifulSoup extractor
 """
 
+import argparse
 import json
 import os
-import re
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from bs4 import BeautifulSoup
+from html import unescape
+from html.entities import html5
+from html.parser import HTMLParser
 from pathlib import Path
 
+SITE_DIR = 'site'
+SITE_URL = 'https://thecroreport.com'
+OUTPUT_PATH = 'data/page_metadata.json'
+MAX_WORKERS = os.cpu_count() or 1
+
+# Elements that never hold content; html.parser sends no end tag for them
+VOID_ELEMENTS = {
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'keygen', 'link',
+    'menuitem', 'meta', 'param', 'source', 'track', 'wbr', 'basefont', 'bgsound',
+    'command', 'frame', 'image', 'isindex', 'nextid', 'spacer',
+}
+
+# Text inside these is code or annotation, never page copy
+NON_TEXT_ELEMENTS = {'script', 'style', 'template', 'rt', 'rp'}
+
+# Word count regions in order of preference, and the subtrees each one drops
+CONTENT_REGIONS = ('main', 'container', 'body')
+EXCLUDED_ELEMENTS = (
+    {'script', 'style', 'nav'},
+    {'script', 'style', 'nav'},
+    {'script', 'style', 'nav', 'header', 'footer'},
+)
+
+# Whitespace-only text collapses to a single space or newline, except in these
+ASCII_SPACES = ' \n\t\x0c\r'
+PRESERVE_WHITESPACE_ELEMENTS = {'pre', 'textarea'}
+
+# State of an open element relative to a content region
+OUTSIDE, COUNTING, EXCLUDED = 0, 1, 2
+
+
+def class_values(attrs, name):
+    """Split a multi-valued attribute such as class or rel into its values."""
+    return attrs.get(name, '').split()
+
+
+class PageMetadataParser(HTMLParser):
+    """
+    Streaming extractor for the fields generate_metadata needs.
+
+    Keeps a stack of open element names instead of a document tree, nested
+    the way BeautifulSoup's html.parser builder nests them: void elements
+    never stay open, and an end tag closes the most recent open element of
+    that name (or is ignored). Head lookups stop once title, canonical and
+    description have been found; word and FAQ counts are kept for every
+    candidate content region and the first one present wins.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=False)
+        # (tag, state per content region, inside a non-text element, preserves whitespace)
+        self.stack = [('', (OUTSIDE,) * len(CONTENT_REGIONS), False, False)]
+        self.text = []
+        self.closed_void_elements = defaultdict(int)
+
+        self.head_pending = True
+        self.title_found = False
+        self.title_depth = None
+        self.title_parts = None
+        self.title = None
+        self.canonical = None
+        self.description = None
+
+        self.json_ld = None
+        self.schema_types = []
+
+        self.regions_found = [False] * len(CONTENT_REGIONS)
+        self.region_words = [0] * len(CONTENT_REGIONS)
+        self.faq_total = 0
+        self.faq_excluded = [0] * len(CONTENT_REGIONS)
+
+    # Text --------------------------------------------------------------------
+
+    def handle_data(self, data):
+        self.text.append(data)
+
+    def handle_entityref(self, name):
+        # Unknown entities stay literal, without their semicolon
+        self.text.append(html5.get(name + ';', '&' + name))
+
+    def handle_charref(self, name):
+        self.text.append(unescape(f'&#{name};'))
+
+    def flush_text(self, always_text=False):
+        """Close the current text node; tags, comments and declarations split text."""
+        if not self.text:
+            return
+        data = ''.join(self.text)
+        self.text = []
+        _, states, non_text, preserve = self.stack[-1]
+        if not preserve and not data.strip(ASCII_SPACES):
+            data = '\n' if '\n' in data else ' '
+
+        if self.json_ld is not None:
+            self.json_ld.append(data)
+        if non_text and not always_text:
+            return
+        if self.title_parts is not None:
+            self.title_parts.append(data)
+
+        words = len(data.split())
+        if words:
+            for i, state in enumerate(states):
+                if state == COUNTING:
+                    self.region_words[i] += words
+
+    def handle_comment(self, data):
+        self.flush_text()
+
+    def handle_decl(self, decl):
+        self.flush_text()
+
+    def handle_pi(self, data):
+        self.flush_text()
+
+    def unknown_decl(self, data):
+        self.flush_text()
+        if data.startswith('CDATA['):
+            self.text.append(data[len('CDATA['):])
+            self.flush_text(always_text=True)
+
+    # Tags --------------------------------------------------------------------
+
+    def handle_starttag(self, tag, attrs):
+        self.open_element(tag, attrs)
+        if tag in VOID_ELEMENTS:
+            self.pop_to(tag)
+            self.closed_void_elements[tag] += 1
+
+    def handle_startendtag(self, tag, attrs):
+        self.open_element(tag, attrs)
+        self.flush_text()
+        self.pop_to(tag)
+
+    def handle_endtag(self, tag):
+        if self.closed_void_elements.get(tag):
+            # Redundant end tag for a void element that is already closed
+            self.closed_void_elements[tag] -= 1
+            return
+        self.flush_text()
+        self.pop_to(tag)
+
+    def open_element(self, tag, attrs):
+        self.flush_text()
+        attrs = {key: '' if value is None else value for key, value in attrs}
+        if self.head_pending:
+            self.check_head(tag, attrs)
+
+        _, parent_states, parent_non_text, parent_preserve = self.stack[-1]
+        states = list(parent_states)
+        for i, region in enumerate(CONTENT_REGIONS):
+            if states[i] == COUNTING and tag in EXCLUDED_ELEMENTS[i]:
+                states[i] = EXCLUDED
+            elif not self.regions_found[i] and self.opens_region(region, tag, attrs):
+                self.regions_found[i] = True
+                states[i] = COUNTING
+
+        if tag == 'div' and 'faq-item' in class_values(attrs, 'class'):
+            self.faq_total += 1
+            for i, state in enumerate(states):
+                if state == EXCLUDED:
+                    self.faq_excluded[i] += 1
+
+        if tag == 'script' and attrs.get('type') == 'application/ld+json':
+            self.json_ld = []
+
+        self.stack.append((tag, tuple(states), parent_non_text or tag in NON_TEXT_ELEMENTS,
+                           parent_preserve or tag in PRESERVE_WHITESPACE_ELEMENTS))
+
+    @staticmethod
+    def opens_region(region, tag, attrs):
+        if region == 'container':
+            return tag == 'div' and 'container' in class_values(attrs, 'class')
+        return tag == region
+
+    def check_head(self, tag, attrs):
+        """Record the first title, canonical link and meta description."""
+        if tag == 'title' and not self.title_found:
+            self.title_found = True
+            self.title_depth = len(self.stack)
+            self.title_parts = []
+        elif tag == 'link' and self.canonical is None and 'canonical' in class_values(attrs, 'rel'):
+            self.canonical = attrs.get('href', '')
+        elif tag == 'meta' and self.description is None and attrs.get('name') == 'description':
+            self.description = attrs.get('content', '')
+        self.head_pending = not (self.title_found and self.canonical is not None
+                                 and self.description is not None)
+
+    def pop_to(self, tag):
+        """Close the most recent open element named tag and everything inside it."""
+        for depth in range(len(self.stack) - 1, 0, -1):
+            if self.stack[depth][0] == tag:
+                self.close_from(depth)
+                return
+
+    def close_from(self, depth):
+        if self.title_parts is not None and depth <= self.title_depth:
+            self.title = ''.join(self.title_parts)
+            self.title_parts = None
+        for name, *_ in self.stack[depth:]:
+            if name == 'script' and self.json_ld is not None:
+                self.add_schema(self.json_ld)
+                self.json_ld = None
+        del self.stack[depth:]
+
+    def add_schema(self, strings):
+        # Only a script holding exactly one text node has a string to parse
+        if len(strings) != 1:
+            return
+        try:
+            schema = json.loads(strings[0])
+            if '@type' in schema:
+                self.schema_types.append(schema['@type'])
+        except Exception:
+            pass
 
-def extract_page_metadata(html_path):
-    """Extract metadata from a generated HTML page."""
-    with open(html_path, 'r', encoding='utf-8') as f:
-        soup = BeautifulSoup(f.read(), 'html.parser')
+    def close(self):
+        super().close()
+        self.flush_text()
+        self.close_from(1)
 
-    metadata = {}
+    # Results -----------------------------------------------------------------
 
-    # Extract URL from canonical or path
-    canonical = soup.find('link', rel='canonical')
-    if canonical and canonical.get('href'):
-        url = canonical['href'].replace('https://thecroreport.com', '')
-        metadata['url'] = url
-    else:
-        # Derive from file path
-        rel_path = str(html_path).replace('site/', '/').replace('/index.html', '/')
-        metadata['url'] = rel_path
+    def content_region(self):
+        """Index of the region used for word and FAQ counts (None if no body)."""
+        for i, found in enumerate(self.regions_found):
+            if found:
+                return i
+        return None
 
-    # Extract slug from URL
-    metadata['slug'] = metadata['url'].strip('/').split('/')[-1] or 'home'
+    def word_count(self):
+        region = self.content_region()
+        return 0 if region is None else self.region_words[region]
 
-    # Extract title
-    title_tag = soup.find('title')
-    if title_tag:
-        metadata['title'] = title_tag.text.replace(' | The CRO Report', '').strip()
+    def faq_count(self):
+        # FAQ blocks inside the dropped subtrees of the counted region don't count
+        region = self.content_region()
+        return self.faq_total - (0 if region is None else self.faq_excluded[region])
 
-    # Extract meta description
-    meta_desc = soup.find('meta', attrs={'name': 'description'})
-    if meta_desc and meta_desc.get('content'):
-        metadata['description'] = meta_desc['content']
 
+def classify_page(metadata):
+    """Add intent, keywords and parent hub derived from the page URL and title."""
     # Determine intent based on URL patterns
     url = metadata.get('url', '')
     if '/salaries/' in url:
@@ -111,67 +334,93 @@ def extract_page_metadata(html_path):
         metadata['parent_hub'] = '/salaries/'
     else:
         metadata['parent_hub'] = '/'
+    return metadata
 
-    # Extract schema types from JSON-LD
-    schema_types = []
-    for script in soup.find_all('script', type='application/ld+json'):
-        try:
-            schema = json.loads(script.string)
-            if '@type' in schema:
-                schema_types.append(schema['@type'])
-        except:
-            pass
-    metadata['schema_types'] = schema_types
 
-    # Count content words (excluding nav, footer, scripts)
-    main_content = soup.find('main') or soup.find('div', class_='container')
-    if main_content:
-        # Remove script and style tags
-        for tag in main_content.find_all(['script', 'style', 'nav']):
-            tag.decompose()
-        text = main_content.get_text(separator=' ', strip=True)
-        metadata['word_count'] = len(text.split())
-    else:
-        body = soup.find('body')
-        if body:
-            for tag in body.find_all(['script', 'style', 'nav', 'header', 'footer']):
-                tag.decompose()
-            text = body.get_text(separator=' ', strip=True)
-            metadata['word_count'] = len(text.split())
-        else:
-            metadata['word_count'] = 0
+def page_url(canonical, html_path):
+    """Site-relative URL from the canonical link, or from the file path."""
+    if canonical:
+        return canonical.replace(SITE_URL, '')
+    # Derive from file path
+    return str(html_path).replace('site/', '/').replace('/index.html', '/')
 
-    # Count FAQs
-    faq_items = soup.find_all('div', class_='faq-item')
-    metadata['faq_count'] = len(faq_items)
 
-    # Last modified (use file modification time)
-    metadata['last_modified'] = datetime.fromtimestamp(
-        os.path.getmtime(html_path)
-    ).strftime('%Y-%m-%d')
+def last_modified(html_path):
+    """File modification date (YYYY-MM-DD)."""
+    return datetime.fromtimestamp(os.path.getmtime(html_path)).strftime('%Y-%m-%d')
+
+
+def extract_page_metadata(html_path):
+    """Extract metadata from a generated HTML page."""
+    parser = PageMetadataParser()
+    with open(html_path, 'r', encoding='utf-8') as f:
+        parser.feed(f.read())
+    parser.close()
 
+    metadata = {}
+    metadata['url'] = page_url(parser.canonical, html_path)
+    metadata['slug'] = metadata['url'].strip('/').split('/')[-1] or 'home'
+    if parser.title is not None:
+        metadata['title'] = parser.title.replace(' | The CRO Report', '').strip()
+    if parser.description:
+        metadata['description'] = parser.description
+
+    classify_page(metadata)
+    metadata['schema_types'] = parser.schema_types
+    metadata['word_count'] = parser.word_count()
+    metadata['faq_count'] = parser.faq_count()
+    metadata['last_modified'] = last_modified(html_path)
     return metadata
 
 
-def find_related_pages(page_metadata, all_pages):
+def _extract_worker(html_path):
+    """Process pool entry point: (metadata, error message)."""
+    try:
+        return extract_page_metadata(html_path), None
+    except Exception as e:
+        return None, f"Error processing {html_path}: {e}"
+
+
+def extract_all_pages(html_files, workers=MAX_WORKERS, extractor=_extract_worker):
+    """Extract metadata for every file, in file order."""
+    if workers > 1 and len(html_files) > 1:
+        chunksize = max(1, len(html_files) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(extractor, html_files, chunksize=chunksize))
+    else:
+        results = [extractor(html_path) for html_path in html_files]
+
+    all_pages = []
+    for metadata, error in results:
+        if error:
+            print(error)
+        else:
+            all_pages.append(metadata)
+    return all_pages
+
+
+def group_by_hub(all_pages):
+    """Pages per parent hub, largest first (ties keep discovery order)."""
+    hubs = defaultdict(list)
+    for page in all_pages:
+        hubs[page.get('parent_hub')].append(page)
+    for pages in hubs.values():
+        pages.sort(key=lambda x: x.get('word_count', 0), reverse=True)
+    return hubs
+
+
+def find_related_pages(page_metadata, hubs):
     """Find related pages based on type and keywords."""
     related = []
     current_url = page_metadata.get('url', '')
     current_hub = page_metadata.get('parent_hub', '')
 
-    # Find siblings (same parent hub)
-    siblings = [
-        p for p in all_pages
-        if p.get('parent_hub') == current_hub
-        and p.get('url') != current_url
-    ]
-
-    # Sort by word count (prefer more substantial pages)
-    siblings.sort(key=lambda x: x.get('word_count', 0), reverse=True)
-
-    # Add top 3 siblings
-    for sib in siblings[:3]:
-        related.append(sib.get('url'))
+    # Top 3 siblings (same parent hub), already sorted by word count
+    for sib in hubs.get(current_hub, []):
+        if len(related) == 3:
+            break
+        if sib.get('url') != current_url:
+            related.append(sib.get('url'))
 
     # Add parent hub if not root
     if current_hub and current_hub != '/':
@@ -180,26 +429,21 @@ def find_related_pages(page_metadata, all_pages):
     return related[:5]
 
 
-def generate_metadata():
+def generate_metadata(workers=MAX_WORKERS):
     """Generate metadata for all pages in site/."""
-    site_dir = Path('site')
-    all_pages = []
+    site_dir = Path(SITE_DIR)
 
     # Find all HTML files
     html_files = list(site_dir.rglob('*.html'))
     print(f"Found {len(html_files)} HTML files")
 
     # Extract metadata from each page
-    for html_path in html_files:
-        try:
-            metadata = extract_page_metadata(html_path)
-            all_pages.append(metadata)
-        except Exception as e:
-            print(f"Error processing {html_path}: {e}")
+    all_pages = extract_all_pages(html_files, workers)
 
     # Second pass: add related pages
+    hubs = group_by_hub(all_pages)
     for page in all_pages:
-        page['related_pages'] = find_related_pages(page, all_pages)
+        page['related_pages'] = find_related_pages(page, hubs)
 
     # Sort by URL for consistent output
     all_pages.sort(key=lambda x: x.get('url', ''))
@@ -222,7 +466,7 @@ def generate_metadata():
     }
 
     # Write to file
-    output_path = 'data/page_metadata.json'
+    output_path = OUTPUT_PATH
     os.makedirs('data', exist_ok=True)
     with open(output_path, 'w') as f:
         json.dump(output, f, indent=2)
@@ -238,5 +482,138 @@ def generate_metadata():
     return output
 
 
+# =============================================================================
+# BENCHMARK
+# =============================================================================
+
+def extract_page_metadata_soup(html_path):
+    """Previous BeautifulSoup extractor, kept as the benchmark reference."""
+    from bs4 import BeautifulSoup
+
+    with open(html_path, 'r', encoding='utf-8') as f:
+        soup = BeautifulSoup(f.read(), 'html.parser')
+
+    metadata = {}
+    canonical = soup.find('link', rel='canonical')
+    metadata['url'] = page_url(canonical.get('href') if canonical else None, html_path)
+    metadata['slug'] = metadata['url'].strip('/').split('/')[-1] or 'home'
+
+    title_tag = soup.find('title')
+    if title_tag:
+        metadata['title'] = title_tag.text.replace(' | The CRO Report', '').strip()
+
+    meta_desc = soup.find('meta', attrs={'name': 'description'})
+    if meta_desc and meta_desc.get('content'):
+        metadata['description'] = meta_desc['content']
+
+    classify_page(metadata)
+
+    schema_types = []
+    for script in soup.find_all('script', type='application/ld+json'):
+        try:
+            schema = json.loads(script.string)
+            if '@type' in schema:
+                schema_types.append(schema['@type'])
+        except Exception:
+            pass
+    metadata['schema_types'] = schema_types
+
+    main_content = soup.find('main') or soup.find('div', class_='container')
+    body = soup.find('body')
+    if main_content:
+        dropped = ['script', 'style', 'nav']
+    elif body:
+        main_content, dropped = body, ['script', 'style', 'nav', 'header', 'footer']
+    if main_content:
+        for tag in main_content.find_all(dropped):
+            tag.decompose()
+        metadata['word_count'] = len(main_content.get_text(separator=' ', strip=True).split())
+    else:
+        metadata['word_count'] = 0
+
+    metadata['faq_count'] = len(soup.find_all('div', class_='faq-item'))
+    metadata['last_modified'] = last_modified(html_path)
+    return metadata
+
+
+def _extract_worker_soup(html_path):
+    try:
+        return extract_page_metadata_soup(html_path), None
+    except Exception as e:
+        return None, f"Error processing {html_path}: {e}"
+
+
+def find_related_pages_scan(page_metadata, all_pages):
+    """Previous related-pages lookup: filters every page for every page."""
+    current_url = page_metadata.get('url', '')
+    current_hub = page_metadata.get('parent_hub', '')
+    siblings = [
+        p for p in all_pages
+        if p.get('parent_hub') == current_hub and p.get('url') != current_url
+    ]
+    siblings.sort(key=lambda x: x.get('word_count', 0), reverse=True)
+    related = [sib.get('url') for sib in siblings[:3]]
+    if current_hub and current_hub != '/':
+        related.append(current_hub)
+    return related[:5]
+
+
+def run_benchmark(workers=MAX_WORKERS):
+    """Time the BeautifulSoup and streaming extractors and check they agree."""
+    html_files = list(Path(SITE_DIR).rglob('*.html'))
+    print(f"Benchmarking metadata extraction on {len(html_files)} pages ({workers} workers)\n")
+
+    timings = {}
+    results = {}
+    runs = [('streaming', _extract_worker, 1)]
+    if workers > 1:
+        runs.append((f'streaming x{workers}', _extract_worker, workers))
+    try:
+        import bs4  # noqa: F401
+        runs.insert(0, ('beautifulsoup', _extract_worker_soup, 1))
+    except ImportError:
+        print("⚠️  bs4 not installed - skipping the BeautifulSoup reference run")
+
+    for name, extractor, n_workers in runs:
+        start = time.perf_counter()
+        results[name] = extract_all_pages(html_files, n_workers, extractor)
+        timings[name] = time.perf_counter() - start
+
+    pages = results['streaming']
+    start = time.perf_counter()
+    scanned = [find_related_pages_scan(page, pages) for page in pages]
+    scan_time = time.perf_counter() - start
+    start = time.perf_counter()
+    hubs = group_by_hub(pages)
+    grouped = [find_related_pages(page, hubs) for page in pages]
+    group_time = time.perf_counter() - start
+
+    print(f"{'Step':<28} {'Time':>9}")
+    for name, seconds in timings.items():
+        print(f"{'extract: ' + name:<28} {seconds:>8.2f}s")
+    print(f"{'related: scan all pages':<28} {scan_time:>8.3f}s")
+    print(f"{'related: group by hub':<28} {group_time:>8.3f}s")
+
+    print()
+    if 'beautifulsoup' in results:
+        same = results['beautifulsoup'] == results['streaming']
+        print(f"{'✓' if same else '✗'} Streaming metadata matches BeautifulSoup")
+    if workers > 1:
+        print(f"{'✓' if results[runs[-1][0]] == pages else '✗'} Pooled extraction matches serial")
+    print(f"{'✓' if scanned == grouped else '✗'} Grouped related pages match the full scan")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Collect page metadata from site/')
+    parser.add_argument('--benchmark', action='store_true', help='Compare with the BeautifulSoup extractor')
+    parser.add_argument('--workers', type=int, default=MAX_WORKERS, help='Extraction processes')
+    args = parser.parse_args()
+
+    if args.benchmark:
+        run_benchmark(args.workers)
+    else:
+        generate_metadata(args.workers)
+
+
 if __name__ == '__main__':
-    generate_metadata()
+    main()
@@ -14,6 +14,9 @@ import pandas as pd
 from datetime import datetime
 import os
 
+from job_data import load_jobs
+from job_dedupe import collapse_reposts
+from build_profiler import phase, stage
 from templates import (
     get_html_head,
     get_nav_html,
@@ -39,15 +42,19 @@ print("="*70)
 os.makedirs(SALARIES_DIR, exist_ok=True)
 
 # Load master database for comprehensive salary data
+phase('load')
 if not os.path.exists(MASTER_DB):
     print(f"Master database not found at {MASTER_DB}")
     exit(1)
 
-df = pd.read_csv(MASTER_DB)
+df = load_jobs(MASTER_DB, description=False)
 print(f"[FILE] Loaded {len(df)} jobs from {MASTER_DB}")
 
 # Filter to jobs with salary data
+phase('transform')
 df_salary = df[df['max_amount'].notna() & (df['max_amount'] > 0)].copy()
+# Reposts of one role would count its salary several times
+df_salary = collapse_reposts(df_salary)
 print(f"[DATA] {len(df_salary)} jobs with salary data")
 
 update_date = datetime.now().strftime('%B %d, %Y')
@@ -428,13 +435,14 @@ def create_salary_page(title, slug, df_subset, description, show_top_companies=T
     # Create directory and save
     page_dir = f'{SALARIES_DIR}/{slug}'
     os.makedirs(page_dir, exist_ok=True)
-    with open(f'{page_dir}/index.html', 'w') as f:
+    with stage('write'), open(f'{page_dir}/index.html', 'w') as f:
         f.write(html)
 
     return True
 
 
 # Generate pages by metro (if metro column exists)
+phase('render')
 metro_pages = []
 if 'metro' in df_salary.columns:
     metros = ['New York', 'San Francisco', 'Boston', 'Chicago', 'Los Angeles', 'Seattle', 'Austin', 'Denver', 'Atlanta', 'Remote', 'Texas']
@@ -490,11 +498,11 @@ if 'company_stage' in df_salary.columns:
         ('Enterprise/Public', 'enterprise-public')
     ]
 
-    for stage, slug in stages:
-        df_stage = df_salary[df_salary['company_stage'] == stage]
+    for stage_name, slug in stages:
+        df_stage = df_salary[df_salary['company_stage'] == stage_name]
         if len(df_stage) >= 3:
-            title = f"{stage} Company"
-            desc = f"VP Sales and CRO salary benchmarks at {stage} companies."
+            title = f"{stage_name} Company"
+            desc = f"VP Sales and CRO salary benchmarks at {stage_name} companies."
             # Company stage pages are gated - no top companies shown
             if create_salary_page(title, slug, df_stage, desc, show_top_companies=False):
                 stage_pages.append({
@@ -678,7 +686,7 @@ index_html += f'''
 </body>
 </html>'''
 
-with open(f'{SALARIES_DIR}/index.html', 'w') as f:
+with stage('write'), open(f'{SALARIES_DIR}/index.html', 'w') as f:
     f.write(index_html)
 
 print(f"\n  Created salary index: /salaries/")
@@ -5,14 +5,24 @@ Enhanced Salary Page Generator v2 with pSEO optimizations:
 - Data-driven FAQ sections
 - Internal linking engine
 - Content enrichment based on actual data
+- Combination pages (seniority x company stage x metro) from the salary
+  cube in comp_analysis.json, gated by sample size and uniqueness
+- Incremental, parallel rendering: pages whose inputs are unchanged are
+  skipped, and pages that no longer qualify are removed
 
 Uses templates.py for consistent site design.
 """
 
+import hashlib
 import json
 import os
+import shutil
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
+import pandas as pd
+
 # Import shared templates and utilities
 from templates import (
     get_html_head,
@@ -45,6 +55,21 @@ from seo_core import (
 
 # Minimum jobs required to create a page (avoid thin content)
 MIN_JOBS_FOR_PAGE = 5
+MIN_JOBS_FOR_COMBO_PAGE = 8
+
+SALARIES_DIR = 'site/salaries'
+PAGES_MANIFEST = 'data/salary_pages_manifest.json'
+MAX_WORKERS = os.cpu_count() or 1
+
+# Salary cube dimensions (see cro_comp_aggregator.build_salary_cube); '*' = all values
+DIMENSIONS = ['seniority', 'company_stage', 'metro']
+ALL = '*'
+SINGLE_PAGE_TYPES = {'metro': 'location', 'company_stage': 'stage', 'seniority': 'seniority'}
+# Catch-all buckets make poor combination pages
+COMBO_EXCLUDED_VALUES = {'Other', 'Unknown'}
+# Changes to these invalidate every rendered page
+ENGINE_SOURCES = [__file__, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates.py'),
+                  os.path.join(os.path.dirname(os.path.abspath(__file__)), 'seo_core.py')]
 
 
 def load_comp_data():
@@ -249,7 +274,7 @@ SALARY_PAGE_CSS = '''
     }
 '''
 
-def generate_salary_page_v2(page_type, identifier, stats, all_pages, data):
+def generate_salary_page_v2(page_type, identifier, stats, all_pages, data, related_pages=None):
     """Generate an enhanced salary page with full pSEO optimization."""
 
     count = stats.get('count', 0)
@@ -317,6 +342,31 @@ def generate_salary_page_v2(page_type, identifier, stats, all_pages, data):
             avg_max=avg_max,
             sample_count=count
         )
+    elif page_type == 'combo':
+        dims = identifier
+        role = f"{dims['seniority']} Sales" if dims['seniority'] != ALL else "Sales Leadership"
+        stage = dims['company_stage'] if dims['company_stage'] != ALL else None
+        metro = dims['metro'] if dims['metro'] != ALL else None
+        label = combo_label(dims)
+        title = combo_title(dims)
+        slug = combo_slug(dims)
+        page_path = f"salaries/{slug}/"
+        description = f"{title}: {fmt_salary(avg_min)} - {fmt_salary(avg_max)} base. Based on {count} job postings. Updated {datetime.now().strftime('%B %Y')}."
+        eyebrow = "Salary Benchmarks"
+        context_title = f"How {label} Pay Compares"
+        context_text = generate_combo_context(label, stats)
+        if stage:
+            context_extra = generate_stage_context(stage, data)[1]
+        breadcrumb_html = f'<a href="/">Home</a> → <a href="/salaries/">Salaries</a> → {label}'
+        identifier = label
+        faqs = generate_salary_faqs(
+            role_title=role,
+            location=metro,
+            stage=stage if not metro else None,
+            avg_min=avg_min,
+            avg_max=avg_max,
+            sample_count=count
+        )
     else:
         return None
 
@@ -330,8 +380,9 @@ def generate_salary_page_v2(page_type, identifier, stats, all_pages, data):
         'count': count
     }
 
-    # Generate related pages
-    related_pages = get_related_salary_pages(page_data, all_pages)
+    # Generate related pages (combination pages arrive with theirs precomputed)
+    if related_pages is None:
+        related_pages = get_related_salary_pages(page_data, all_pages)
 
     # Generate schema markup
     breadcrumbs_for_schema = [
@@ -370,7 +421,11 @@ def generate_salary_page_v2(page_type, identifier, stats, all_pages, data):
     ''' if related_pages else ''
 
     # Apply contextual auto-linking to context text
-    link_map = get_link_map_for_page(page_type, identifier)
+    if page_type == 'combo':
+        link_map = get_link_map_for_page('stage' if stage else 'location', stage or metro or '')
+        link_map = {term: url for term, url in link_map.items() if term not in dims.values()}
+    else:
+        link_map = get_link_map_for_page(page_type, identifier)
     linked_context_text = auto_link_content(context_text, link_map)
     linked_context_extra = auto_link_content(context_extra, link_map) if context_extra else ""
 
@@ -452,81 +507,279 @@ def generate_salary_page_v2(page_type, identifier, stats, all_pages, data):
 
     return {'slug': slug, 'html': html, 'title': title, 'count': count}
 
+# =============================================================================
+# COMBINATION PAGE ENGINE
+# =============================================================================
+
+def slugify(value):
+    return value.lower().replace('/', '-').replace(' ', '-')
+
+
+def single_page_slug(page_type, value):
+    """Slugs of the original one-dimension pages (unchanged so URLs stay stable)."""
+    if page_type == 'seniority':
+        return f"{value.lower()}-sales-salary"
+    return f"vp-sales-salary-{slugify(value)}"
+
+
+def combo_label(dims):
+    parts = []
+    if dims['seniority'] != ALL:
+        parts.append(dims['seniority'])
+    if dims['company_stage'] != ALL:
+        parts.append(dims['company_stage'])
+    if dims['metro'] != ALL:
+        parts.append(dims['metro'])
+    return ' / '.join(parts)
+
+
+def combo_title(dims):
+    role = f"{dims['seniority']} Sales" if dims['seniority'] != ALL else "Sales Leadership"
+    title = f"{role} Salary"
+    if dims['company_stage'] != ALL:
+        title += f" at {dims['company_stage']} Companies"
+    if dims['metro'] == 'Remote':
+        title += " (Remote)"
+    elif dims['metro'] != ALL:
+        title += f" in {dims['metro']}"
+    return title
+
+
+def combo_slug(dims):
+    """Distinct from single-dimension slugs ('-at-' / '-in-' / '-for-remote-roles')."""
+    role = f"{dims['seniority'].lower()}-sales" if dims['seniority'] != ALL else "sales-leadership"
+    slug = f"{role}-salary"
+    if dims['company_stage'] != ALL:
+        slug += f"-at-{slugify(dims['company_stage'])}"
+    if dims['metro'] == 'Remote':
+        slug += "-for-remote-roles"
+    elif dims['metro'] != ALL:
+        slug += f"-in-{slugify(dims['metro'])}"
+    return slug
+
+
+def generate_combo_context(label, stats):
+    """Data-driven comparison of a combination against each of its parent slices."""
+    midpoint = stats['midpoint_avg']
+    sentences = [
+        f"{label} roles post an average base range of {fmt_salary(stats['min_base_avg'])} - "
+        f"{fmt_salary(stats['max_base_avg'])} (median {fmt_salary(stats['min_base_median'])} - "
+        f"{fmt_salary(stats['max_base_median'])}) across {stats['count']} postings with disclosed pay."
+    ]
+    for parent_label, parent in stats.get('parents', []):
+        if not parent.get('midpoint_avg'):
+            continue
+        diff = (midpoint - parent['midpoint_avg']) / parent['midpoint_avg'] * 100
+        direction = 'above' if diff >= 0 else 'below'
+        parent_text = f"{parent_label} overall ({fmt_salary(parent['midpoint_avg'])}, {parent['count']} roles)"
+        if len(sentences) == 1:
+            sentences.append(f"The {fmt_salary(midpoint)} midpoint is {abs(diff):.0f}% {direction} {parent_text}.")
+        else:
+            sentences.append(f"Against {parent_text}, it is {abs(diff):.0f}% {direction}.")
+    return ' '.join(sentences)
+
+
+def load_cube(data):
+    """Salary cube cells from comp_analysis.json (flat breakdowns if no cube yet)."""
+    if data.get('salary_cube'):
+        return pd.DataFrame(data['salary_cube'])
+    rows = []
+    for dim, section in [('metro', 'by_metro'), ('company_stage', 'by_company_stage'), ('seniority', 'by_seniority')]:
+        for value, stats in data.get(section, {}).items():
+            row = {d: ALL for d in DIMENSIONS}
+            row[dim] = value
+            row.update({k: v for k, v in stats.items() if not isinstance(v, dict)})
+            rows.append(row)
+    return pd.DataFrame(rows, columns=DIMENSIONS + ['count', 'min_base_avg', 'max_base_avg'])
+
+
+def plan_pages(cube):
+    """
+    Enumerate every page the cube supports.
+
+    One-dimension cells become the original location/stage/seniority pages.
+    Combinations need MIN_JOBS_FOR_COMBO_PAGE roles, no catch-all values,
+    and fewer roles than every parent slice: a combination that matches the
+    same roles as a parent would duplicate that page.
+
+    Returns:
+        List of page specs (type, identifier, slug, title, stats, related)
+    """
+    cells = cube.to_dict('records')
+    index = {tuple(cell[d] for d in DIMENSIONS): cell for cell in cells}
+    pages = []
+    for cell in cells:
+        set_dims = [d for d in DIMENSIONS if cell[d] != ALL]
+        if len(set_dims) == 1:
+            dim = set_dims[0]
+            if cell['count'] >= MIN_JOBS_FOR_PAGE:
+                page_type = SINGLE_PAGE_TYPES[dim]
+                pages.append({'type': page_type, 'identifier': cell[dim], 'stats': cell, 'key': (dim,),
+                              'slug': single_page_slug(page_type, cell[dim]),
+                              'title': generate_single_title(page_type, cell[dim])})
+            continue
+        if len(set_dims) < 2 or cell['count'] < MIN_JOBS_FOR_COMBO_PAGE:
+            continue
+        if any(cell[d] in COMBO_EXCLUDED_VALUES for d in set_dims):
+            continue
+        parent_keys = [tuple(ALL if d == dropped else cell[d] for d in DIMENSIONS) for dropped in set_dims]
+        parents = [index.get(key) for key in parent_keys]
+        if any(parent is None or parent['count'] == cell['count'] for parent in parents):
+            continue
+        dims = {d: cell[d] for d in DIMENSIONS}
+        stats = dict(cell)
+        stats['parents'] = [(combo_label(parent) if sum(parent[d] != ALL for d in DIMENSIONS) > 1
+                             else next(parent[d] for d in DIMENSIONS if parent[d] != ALL), parent)
+                            for parent in parents]
+        pages.append({'type': 'combo', 'identifier': dims, 'stats': stats, 'parent_keys': parent_keys,
+                      'slug': combo_slug(dims), 'title': combo_title(dims)})
+    attach_related(pages)
+    return pages
+
+
+def generate_single_title(page_type, value):
+    if page_type == 'location':
+        return f"VP Sales Salary in {value}"
+    if page_type == 'stage':
+        return f"VP Sales Salary at {value} Companies"
+    return f"{value} Sales Salary Benchmarks"
+
+
+def attach_related(pages, max_links=6):
+    """Related links for combination pages: parent slices, then siblings under the same parents."""
+    by_key = {}
+    for page in pages:
+        if page['type'] == 'combo':
+            by_key[tuple(page['identifier'][d] for d in DIMENSIONS)] = page
+        else:
+            dim = page['key'][0]
+            by_key[tuple(page['identifier'] if d == dim else ALL for d in DIMENSIONS)] = page
+
+    children = defaultdict(list)
+    for page in pages:
+        for key in page.get('parent_keys', []):
+            children[key].append(page)
+    for siblings in children.values():
+        siblings.sort(key=lambda p: -p['stats']['count'])
+
+    for page in pages:
+        if page['type'] != 'combo':
+            continue
+        related = [{'title': 'All Salary Benchmarks', 'url': '/salaries/', 'context': 'View all salary data'}]
+        for key in page['parent_keys']:
+            parent = by_key.get(key)
+            if parent:
+                related.append({'title': parent['title'], 'url': f"/salaries/{parent['slug']}/",
+                                'context': f"{parent['stats']['count']} roles"})
+        for key in page['parent_keys']:
+            for sibling in children[key][:4]:
+                if len(related) >= max_links:
+                    break
+                if sibling is not page and all(r['url'] != f"/salaries/{sibling['slug']}/" for r in related):
+                    related.append({'title': sibling['title'], 'url': f"/salaries/{sibling['slug']}/",
+                                    'context': f"{sibling['stats']['count']} roles"})
+        page['related'] = related[:max_links]
+
+
+def engine_version():
+    """Hash of the code that renders pages, so template changes re-render everything."""
+    digest = hashlib.sha1()
+    for path in ENGINE_SOURCES:
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+    return digest.hexdigest()[:12]
+
+
+def page_fingerprint(page, version, national=None):
+    """Everything a page's HTML depends on (month, because descriptions say 'Updated <Month>').
+
+    Location pages' FAQ compares them with the national averages, which
+    come from every metro's stats, so those are part of their fingerprint.
+    """
+    payload = {k: page.get(k) for k in ['type', 'identifier', 'slug', 'title', 'stats', 'related']}
+    if page['type'] == 'location':
+        payload['national'] = national
+    payload['version'] = version
+    payload['month'] = datetime.now().strftime('%Y-%m')
+    return hashlib.sha1(json.dumps(payload, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+_WORKER = {}
+
+
+def _init_worker(data, single_pages):
+    _WORKER['data'] = data
+    _WORKER['single_pages'] = single_pages
+
+
+def render_page(page):
+    """Render and write one page (runs in a worker process)."""
+    result = generate_salary_page_v2(page['type'], page['identifier'], page['stats'], _WORKER['single_pages'],
+                                     _WORKER['data'], related_pages=page.get('related'))
+    if result is None:
+        return None
+    output_dir = f"{SALARIES_DIR}/{result['slug']}"
+    os.makedirs(output_dir, exist_ok=True)
+    with open(f"{output_dir}/index.html", 'w') as f:
+        f.write(result['html'])
+    return result['slug']
+
+
+def load_manifest(path=PAGES_MANIFEST):
+    if os.path.exists(path):
+        with open(path) as f:
+            return json.load(f)
+    return {}
+
+
 def main():
-    """Generate all enhanced salary pages."""
+    """Generate all enhanced salary pages (single-dimension and combinations)."""
     data = load_comp_data()
-
-    # Collect all page metadata for internal linking
-    all_pages = []
-
-    # Build page list for all categories
-    for location, stats in data.get('by_metro', {}).items():
-        if stats.get('count', 0) >= MIN_JOBS_FOR_PAGE:
-            all_pages.append({
-                'type': 'location',
-                'slug': f"vp-sales-salary-{location.lower().replace(' ', '-')}",
-                'title': f"VP Sales Salary in {location}",
-                'avg_max': stats.get('max_base_avg'),
-                'count': stats.get('count')
-            })
-
-    for stage, stats in data.get('by_company_stage', {}).items():
-        if stats.get('count', 0) >= MIN_JOBS_FOR_PAGE:
-            all_pages.append({
-                'type': 'stage',
-                'slug': f"vp-sales-salary-{stage.lower().replace('/', '-').replace(' ', '-')}",
-                'title': f"VP Sales Salary at {stage} Companies",
-                'avg_max': stats.get('max_base_avg'),
-                'count': stats.get('count')
-            })
-
-    for seniority, stats in data.get('by_seniority', {}).items():
-        if stats.get('count', 0) >= MIN_JOBS_FOR_PAGE:
-            all_pages.append({
-                'type': 'seniority',
-                'slug': f"{seniority.lower()}-sales-salary",
-                'title': f"{seniority} Sales Salary Benchmarks",
-                'avg_max': stats.get('max_base_avg'),
-                'count': stats.get('count')
-            })
-
-    generated = []
-
-    # Generate location pages
-    for location, stats in data.get('by_metro', {}).items():
-        result = generate_salary_page_v2('location', location, stats, all_pages, data)
-        if result:
-            output_dir = f"site/salaries/{result['slug']}"
-            os.makedirs(output_dir, exist_ok=True)
-            with open(f"{output_dir}/index.html", 'w') as f:
-                f.write(result['html'])
-            generated.append(result)
-            print(f"Generated: /salaries/{result['slug']}/ ({result['count']} jobs)")
-
-    # Generate company stage pages
-    for stage, stats in data.get('by_company_stage', {}).items():
-        result = generate_salary_page_v2('stage', stage, stats, all_pages, data)
-        if result:
-            output_dir = f"site/salaries/{result['slug']}"
-            os.makedirs(output_dir, exist_ok=True)
-            with open(f"{output_dir}/index.html", 'w') as f:
-                f.write(result['html'])
-            generated.append(result)
-            print(f"Generated: /salaries/{result['slug']}/ ({result['count']} jobs)")
-
-    # Generate seniority pages
-    for seniority, stats in data.get('by_seniority', {}).items():
-        result = generate_salary_page_v2('seniority', seniority, stats, all_pages, data)
-        if result:
-            output_dir = f"site/salaries/{result['slug']}"
-            os.makedirs(output_dir, exist_ok=True)
-            with open(f"{output_dir}/index.html", 'w') as f:
-                f.write(result['html'])
-            generated.append(result)
-            print(f"Generated: /salaries/{result['slug']}/ ({result['count']} jobs)")
-
-    print(f"\n✓ Generated {len(generated)} enhanced salary pages")
-    return generated
+    pages = plan_pages(load_cube(data))
+
+    # Link metadata for the original single-dimension pages
+    single_pages = [{'type': p['type'], 'slug': p['slug'], 'title': p['title'],
+                     'avg_max': p['stats'].get('max_base_avg'), 'count': p['stats'].get('count')}
+                    for p in pages if p['type'] != 'combo']
+
+    # Single pages link to their siblings (by avg_max, with role counts): resolve
+    # those links here so they are part of the fingerprint
+    for page in pages:
+        if page['type'] != 'combo':
+            page['related'] = get_related_salary_pages({'type': page['type'], 'slug': page['slug']}, single_pages)
+
+    manifest = load_manifest()
+    version = engine_version()
+    national = get_national_averages(data)
+    fingerprints = {page['slug']: page_fingerprint(page, version, national) for page in pages}
+    to_render = [page for page in pages
+                 if manifest.get(page['slug']) != fingerprints[page['slug']]
+                 or not os.path.exists(f"{SALARIES_DIR}/{page['slug']}/index.html")]
+
+    if to_render:
+        with ProcessPoolExecutor(max_workers=MAX_WORKERS, initializer=_init_worker,
+                                 initargs=(data, single_pages)) as executor:
+            written = [slug for slug in executor.map(render_page, to_render, chunksize=16) if slug]
+    else:
+        written = []
+
+    # Remove pages this engine generated before that no longer qualify
+    removed = 0
+    for slug in set(manifest) - set(fingerprints):
+        if os.path.isdir(f"{SALARIES_DIR}/{slug}"):
+            shutil.rmtree(f"{SALARIES_DIR}/{slug}")
+            removed += 1
+
+    with open(PAGES_MANIFEST, 'w') as f:
+        json.dump(fingerprints, f, indent=2, sort_keys=True)
+
+    counts = defaultdict(int)
+    for page in pages:
+        counts[page['type']] += 1
+    print(f"Planned {len(pages)} salary pages: " + ', '.join(f"{n} {t}" for t, n in sorted(counts.items())))
+    print(f"\n✓ Rendered {len(written)} pages, {len(pages) - len(to_render)} unchanged, {removed} removed")
+    return pages
 
 if __name__ == "__main__":
     main()
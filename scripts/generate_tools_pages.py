@@ -20,6 +20,7 @@ from templates import (
     get_footer_html,
     get_base_styles,
     get_cta_box,
+    picture_html,
     BASE_URL,
     CSS_VARIABLES,
     CSS_NAV,
@@ -33,6 +34,9 @@ DATA_DIR = 'data'
 SITE_DIR = 'site'
 TOOLS_DIR = f'{SITE_DIR}/tools'
 
+# Rendered width of .card-logo img (variants come from image_pipeline.py)
+LOGO_SIZES = '32px'
+
 print("="*70)
 print("GENERATING GTM TOOLS PAGES")
 print("="*70)
@@ -168,6 +172,10 @@ TOOLS_CSS = '''
         overflow: hidden;
     }
 
+    .card-logo picture {
+        display: contents;
+    }
+
     .card-logo img {
         max-width: 32px;
         max-height: 32px;
@@ -296,7 +304,7 @@ def generate_tool_card(tool, badge_type='soon', badge_text='Tool Review'):
     if tool.get('logo'):
         logo_html = f'''
             <div class="card-logos">
-                <div class="card-logo"><img src="{tool['logo']}" alt="{tool['name']}"></div>
+                <div class="card-logo">{picture_html(tool['logo'], tool['name'], sizes=LOGO_SIZES)}</div>
             </div>'''
 
     # Use different link text for in-depth reviews
@@ -337,9 +345,9 @@ def generate_comparison_card(comp, tools_dict, update_date):
     if logo_a or logo_b:
         logos_html = '<div class="card-logos">'
         if logo_a:
-            logos_html += f'<div class="card-logo"><img src="{logo_a}" alt="{comp["tool_a"]}"></div>'
+            logos_html += f'<div class="card-logo">{picture_html(logo_a, comp["tool_a"], sizes=LOGO_SIZES)}</div>'
         if logo_b:
-            logos_html += f'<div class="card-logo"><img src="{logo_b}" alt="{comp["tool_b"]}"></div>'
+            logos_html += f'<div class="card-logo">{picture_html(logo_b, comp["tool_b"], sizes=LOGO_SIZES)}</div>'
         logos_html += '</div>'
 
     return f'''
@@ -0,0 +1,450 @@
+#!/usr/bin/env python3
+"""
+Image pipeline for the CRO Report site.
+
+Charts (generate_graphs.py, cro_comp_aggregator.py, generate_insights_charts.py):
+- save_chart() replaces plt.savefig: the figure is rendered once in memory
+  and the original path gets a palette-quantized PNG (same URL, newsletters
+  keep working). Charts are only embedded by URL (newsletters, social
+  previews), never through picture_html(), so no responsive variants are
+  written; ones left by earlier builds are deleted
+
+Logos (site/assets/logos, referenced from data/tools.json):
+- Byte-identical logos are deduplicated by hash and share one set of variants
+- Raster logos are resized to the card display size (1x and 2x) as WebP plus
+  a fallback in the original format; SVGs are left alone
+
+Every processed image is recorded in site/assets/image-manifest.json, which
+templates.picture_html() reads to emit <picture>/srcset markup (charts have
+no sources there, so they fall back to a plain <img>). The CLI
+re-processes existing charts and logos and writes a per-asset byte report
+to data/image_size_report.json.
+
+Usage:
+    from image_pipeline import save_chart
+    save_chart(CHART_PATH, dpi=150, bbox_inches='tight')   # instead of plt.savefig
+
+    python scripts/image_pipeline.py              # charts + logos + report
+    python scripts/image_pipeline.py --no-logos
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import re
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import unquote
+
+from PIL import Image, features
+
+SITE_DIR = Path('site')
+ASSETS_DIR = SITE_DIR / 'assets'
+LOGO_DIR = ASSETS_DIR / 'logos'
+LOGO_VARIANT_DIR = LOGO_DIR / 'display'
+MANIFEST_PATH = ASSETS_DIR / 'image-manifest.json'
+REPORT_PATH = Path('data/image_size_report.json')
+
+CHART_PATTERNS = ('trend_*.png', 'comp_by_*.png', 'insights_*.png')
+# Flat chart colours survive a 256-colour palette with no visible banding
+CHART_PNG_COLORS = 256
+
+# .card-logo img is capped at 32x32 CSS px (generate_tools_pages.py)
+LOGO_DISPLAY_PX = 32
+LOGO_DENSITIES = (1, 2)
+LOGO_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.webp'}
+
+WEBP_QUALITY = 82
+AVIF_QUALITY = 60
+JPEG_QUALITY = 85
+
+HAS_WEBP = features.check('webp')
+HAS_AVIF = features.check('avif')
+
+# name-480w.webp, as written by this module
+VARIANT_RE = re.compile(r'-\d+w\.(?:png|webp|avif|jpe?g)$')
+
+MIME_TYPES = {'.avif': 'image/avif', '.webp': 'image/webp', '.png': 'image/png',
+              '.jpg': 'image/jpeg', '.jpeg': 'image/jpeg'}
+
+
+# =============================================================================
+# MANIFEST
+# =============================================================================
+
+def load_manifest(path=MANIFEST_PATH):
+    """Load the image manifest (URL -> entry), or an empty one."""
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_manifest(manifest, path=MANIFEST_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+
+def update_manifest(url, entry, path=MANIFEST_PATH):
+    """Record one image; generators call this one chart at a time."""
+    manifest = load_manifest(path)
+    manifest[url] = entry
+    save_manifest(manifest, path)
+
+
+def site_url(path):
+    """Root-relative URL for a file under site/, or None if it is outside."""
+    try:
+        return '/' + Path(path).resolve().relative_to(SITE_DIR.resolve()).as_posix()
+    except ValueError:
+        return None
+
+
+# =============================================================================
+# ENCODING
+# =============================================================================
+
+def _flatten(image):
+    """Drop the alpha channel when every pixel is opaque (matplotlib always writes RGBA)."""
+    if image.mode == 'RGBA' and image.getextrema()[3][0] == 255:
+        return image.convert('RGB')
+    if image.mode not in ('RGB', 'RGBA'):
+        return image.convert('RGBA' if 'A' in image.getbands() or 'transparency' in image.info else 'RGB')
+    return image
+
+
+def _resize(image, width):
+    if width >= image.width:
+        return image
+    return image.resize((width, max(1, round(image.height * width / image.width))), Image.LANCZOS)
+
+
+def encode(image, fmt, quantize=False):
+    """Encode a PIL image to bytes in one of png/webp/avif/jpeg."""
+    buffer = io.BytesIO()
+    if fmt == 'png':
+        if quantize:
+            method = Image.Quantize.FASTOCTREE if image.mode == 'RGBA' else Image.Quantize.MEDIANCUT
+            image = image.quantize(CHART_PNG_COLORS, method=method, dither=Image.Dither.NONE)
+        image.save(buffer, 'PNG', optimize=True)
+    elif fmt == 'webp':
+        image.save(buffer, 'WEBP', quality=WEBP_QUALITY, method=6)
+    elif fmt == 'avif':
+        image.save(buffer, 'AVIF', quality=AVIF_QUALITY)
+    elif fmt in ('jpg', 'jpeg'):
+        image.convert('RGB').save(buffer, 'JPEG', quality=JPEG_QUALITY, optimize=True, progressive=True)
+    else:
+        raise ValueError(f"Unsupported format: {fmt}")
+    return buffer.getvalue()
+
+
+def variant_formats(fallback):
+    """Modern formats first (browsers take the first <source> they support)."""
+    formats = []
+    if HAS_AVIF:
+        formats.append('avif')
+    if HAS_WEBP and fallback != 'webp':
+        formats.append('webp')
+    return formats + [fallback]
+
+
+def _write_if_changed(path, data):
+    """Skip rewrites of identical bytes so unchanged charts keep their mtime."""
+    path = Path(path)
+    if path.exists() and path.stat().st_size == len(data) and path.read_bytes() == data:
+        return
+    path.write_bytes(data)
+
+
+def write_variants(image, output_dir, stem, widths, fallback, quantize=False):
+    """
+    Write stem-{w}w.{fmt} for each width and format.
+
+    Returns:
+        List of {'type': MIME type, 'srcset': [[url, width], ...]}, modern
+        formats first and the fallback format last
+    """
+    sources = []
+    for fmt in variant_formats(fallback):
+        entries = []
+        for width in widths:
+            path = Path(output_dir) / f"{stem}-{width}w.{fmt}"
+            resized = _resize(image, width)
+            _write_if_changed(path, encode(resized, fmt, quantize=quantize and fmt == 'png'))
+            entries.append([site_url(path), resized.width])
+        sources.append({'type': MIME_TYPES[f'.{fmt}'], 'srcset': entries})
+    return sources
+
+
+def _remove_stale_variants(output_dir, stem, keep):
+    """Delete stem-{w}w.* files from earlier runs that are no longer produced."""
+    keep = {Path(unquote(url)).name for source in keep for url, _ in source['srcset']}
+    for path in Path(output_dir).glob(f"{stem}-*w.*"):
+        if VARIANT_RE.search(path.name) and path.name not in keep:
+            path.unlink()
+
+
+def is_fresh(path, entry):
+    """True if every variant in entry exists and is newer than path."""
+    if not entry or not entry.get('sources'):
+        return False
+    mtime = Path(path).stat().st_mtime
+    for source in entry['sources']:
+        for url, _ in source['srcset']:
+            variant = SITE_DIR / unquote(url).lstrip('/')
+            if not variant.exists() or variant.stat().st_mtime < mtime:
+                return False
+    return True
+
+
+# =============================================================================
+# CHARTS
+# =============================================================================
+
+def process_chart(png_bytes, output_path):
+    """
+    Write the optimized PNG at output_path (and delete variants of it that
+    earlier builds wrote).
+
+    Returns:
+        Manifest entry for the chart
+    """
+    output_path = Path(output_path)
+    image = _flatten(Image.open(io.BytesIO(png_bytes)))
+    image.load()
+
+    data = encode(image, 'png', quantize=True)
+    _write_if_changed(output_path, data)
+    _remove_stale_variants(output_path.parent, output_path.stem, [])
+
+    return {
+        'kind': 'chart',
+        'width': image.width,
+        'height': image.height,
+        'source_bytes': len(png_bytes),
+        'optimized_bytes': len(data),
+        'sources': [],
+    }
+
+
+def save_chart(output_path, fig=None, **savefig_kwargs):
+    """
+    Drop-in replacement for plt.savefig(output_path, ...) for site charts.
+
+    Args:
+        output_path: PNG path (normally under site/assets/)
+        fig: Figure to save (defaults to the current figure)
+        savefig_kwargs: Passed through to savefig (dpi, bbox_inches, facecolor, ...)
+    """
+    if fig is None:
+        import matplotlib.pyplot as plt
+        fig = plt.gcf()
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png', **savefig_kwargs)
+
+    entry = process_chart(buffer.getvalue(), output_path)
+    url = site_url(output_path)
+    if url:
+        update_manifest(url, entry)
+    return entry
+
+
+def optimize_charts(manifest, assets_dir=ASSETS_DIR, patterns=CHART_PATTERNS):
+    """Re-encode charts on disk that weren't written by save_chart (or changed since)."""
+    processed = 0
+    for pattern in patterns:
+        for path in sorted(Path(assets_dir).glob(pattern)):
+            if VARIANT_RE.search(path.name):
+                continue
+            url = site_url(path)
+            previous = manifest.get(url, {})
+            if previous.get('optimized_bytes') == path.stat().st_size:
+                continue
+            entry = process_chart(path.read_bytes(), path)
+            # Keep the size savefig produced, not the already-optimized size
+            entry['source_bytes'] = previous.get('source_bytes', entry['source_bytes'])
+            manifest[url] = entry
+            processed += 1
+    return processed
+
+
+# =============================================================================
+# LOGOS
+# =============================================================================
+
+def _variant_stem(path):
+    """Filesystem/URL-safe stem ('Clay Logo Dark' -> 'clay-logo-dark')."""
+    return re.sub(r'[^a-z0-9]+', '-', path.stem.lower()).strip('-')
+
+
+def optimize_logos(manifest, logo_dir=LOGO_DIR, variant_dir=LOGO_VARIANT_DIR,
+                   display_px=LOGO_DISPLAY_PX, densities=LOGO_DENSITIES):
+    """
+    Resize raster logos to display size and share variants between duplicates.
+
+    Originals stay in place (tools.json and external links point at them);
+    pages get the small variants through picture_html().
+
+    Returns:
+        (logos processed, duplicates found)
+    """
+    logo_dir, variant_dir = Path(logo_dir), Path(variant_dir)
+    if not logo_dir.exists():
+        return 0, 0
+    variant_dir.mkdir(parents=True, exist_ok=True)
+
+    canonical_by_hash = {}
+    processed = duplicates = 0
+    for path in sorted(logo_dir.iterdir()):
+        if not path.is_file() or path.suffix.lower() not in LOGO_EXTENSIONS:
+            continue
+        data = path.read_bytes()
+        url = site_url(path)
+        digest = hashlib.sha256(data).hexdigest()
+
+        if digest in canonical_by_hash:
+            canonical = canonical_by_hash[digest]
+            manifest[url] = dict(manifest[canonical], source_bytes=len(data), duplicate_of=canonical)
+            duplicates += 1
+            continue
+        canonical_by_hash[digest] = url
+        if is_fresh(path, manifest.get(url)) and not manifest[url].get('duplicate_of'):
+            continue
+
+        image = _flatten(Image.open(io.BytesIO(data)))
+        # Fit the longer side to the display box at each density
+        scale = min(1.0, display_px / max(image.width, image.height))
+        widths = sorted({max(1, round(image.width * scale * density)) for density in densities})
+        widths = sorted({min(width, image.width) for width in widths})
+
+        fallback = path.suffix.lower().lstrip('.')
+        stem = _variant_stem(path)
+        sources = write_variants(image, variant_dir, stem, widths, 'jpeg' if fallback == 'jpg' else fallback)
+        _remove_stale_variants(variant_dir, stem, sources)
+        manifest[url] = {
+            'kind': 'logo',
+            'width': max(1, round(image.width * scale)),
+            'height': max(1, round(image.height * scale)),
+            'source_bytes': len(data),
+            'sources': sources,
+        }
+        processed += 1
+    return processed, duplicates
+
+
+# =============================================================================
+# REPORT
+# =============================================================================
+
+def _file_size(url):
+    path = SITE_DIR / unquote(url).lstrip('/')
+    return path.stat().st_size if path.exists() else None
+
+
+def build_report(manifest):
+    """
+    Per-asset bytes: what the generator (or repo) produced vs what a browser
+    downloads at the largest width in each format.
+    """
+    assets = []
+    for url, entry in sorted(manifest.items()):
+        formats = {}
+        for source in entry['sources']:
+            sizes = [_file_size(variant_url) for variant_url, _ in source['srcset']]
+            formats[source['type']] = {
+                'variants': len(sizes),
+                'bytes': sum(size or 0 for size in sizes),
+                'largest': sizes[-1] if sizes else None,
+            }
+        served = [stats['largest'] for stats in formats.values() if stats['largest']]
+        if not entry['sources'] and _file_size(url):
+            served = [_file_size(url)]
+        assets.append({
+            'url': url,
+            'kind': entry['kind'],
+            'duplicate_of': entry.get('duplicate_of'),
+            'source_bytes': entry['source_bytes'],
+            'original_bytes': _file_size(url),
+            'formats': formats,
+            'smallest_served': min(served) if served else None,
+        })
+    return {
+        'generated_at': datetime.now().isoformat(),
+        'avif': HAS_AVIF,
+        'webp': HAS_WEBP,
+        'assets': assets,
+    }
+
+
+def print_report(report):
+    """Print one line per asset: source bytes -> best variant at full width."""
+    def kb(n):
+        return f"{n / 1024:,.1f} KB" if n is not None else '-'
+
+    print(f"\n🖼️  Image Report")
+    print(f"   {'Asset':<44} {'Source':>10} {'Original':>10} {'Best':>10} {'Saved':>6}")
+    total_source = total_best = 0
+    for asset in report['assets']:
+        name = asset['url'].replace('/assets/', '')
+        if asset['duplicate_of']:
+            print(f"   {name[:44]:<44} {kb(asset['source_bytes']):>10}   duplicate of {asset['duplicate_of']}")
+            continue
+        best = asset['smallest_served']
+        saved = f"{1 - best / asset['source_bytes']:.0%}" if best and asset['source_bytes'] else '-'
+        print(f"   {name[:44]:<44} {kb(asset['source_bytes']):>10} {kb(asset['original_bytes']):>10} "
+              f"{kb(best):>10} {saved:>6}")
+        total_source += asset['source_bytes']
+        total_best += best or 0
+    if total_source:
+        print(f"   {'total':<44} {kb(total_source):>10} {'':>10} {kb(total_best):>10} "
+              f"{1 - total_best / total_source:>6.0%}")
+
+
+def main():
+    global SITE_DIR, ASSETS_DIR, LOGO_DIR, LOGO_VARIANT_DIR, MANIFEST_PATH
+
+    parser = argparse.ArgumentParser(description='Optimize site charts and logos')
+    parser.add_argument('--site', default=str(SITE_DIR), help='Built site directory')
+    parser.add_argument('--no-charts', action='store_true', help='Skip re-encoding charts on disk')
+    parser.add_argument('--no-logos', action='store_true', help='Skip logo resizing')
+    args = parser.parse_args()
+
+    SITE_DIR = Path(args.site)
+    ASSETS_DIR = SITE_DIR / 'assets'
+    LOGO_DIR = ASSETS_DIR / 'logos'
+    LOGO_VARIANT_DIR = LOGO_DIR / 'display'
+    MANIFEST_PATH = ASSETS_DIR / 'image-manifest.json'
+
+    print("=" * 70)
+    print("[IMAGES] OPTIMIZING CHARTS AND LOGOS")
+    print("=" * 70)
+    formats = [name for name, ok in [('AVIF', HAS_AVIF), ('WebP', HAS_WEBP)] if ok]
+    print(f"Formats: {', '.join(formats + ['PNG/JPEG fallback'])}")
+
+    manifest = load_manifest(MANIFEST_PATH)
+    # Drop entries whose image was deleted
+    manifest = {url: entry for url, entry in manifest.items() if _file_size(url) is not None}
+
+    if not args.no_charts:
+        count = optimize_charts(manifest, ASSETS_DIR)
+        print(f"✓ Charts: {count} re-encoded as {CHART_PNG_COLORS}-colour PNGs (others up to date)")
+    if not args.no_logos:
+        count, duplicates = optimize_logos(manifest, LOGO_DIR, LOGO_VARIANT_DIR)
+        print(f"✓ Logos: {count} resized to {LOGO_DISPLAY_PX}px "
+              f"({', '.join(f'{d}x' for d in LOGO_DENSITIES)}), {duplicates} duplicates (others up to date)")
+
+    save_manifest(manifest, MANIFEST_PATH)
+    report = build_report(manifest)
+    os.makedirs(REPORT_PATH.parent, exist_ok=True)
+    with open(REPORT_PATH, 'w') as f:
+        json.dump(report, f, indent=2)
+    print_report(report)
+    print(f"\nManifest: {MANIFEST_PATH}")
+    print(f"Report: {REPORT_PATH}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Typed loader for the job CSVs (raw, enriched and master database).
+
+Every generator used to call bare pd.read_csv, which leaves low-cardinality
+labels as object strings, booleans as mixed 'True'/True/NaN values and comp
+columns to be re-coerced with pd.to_numeric in each script. load_jobs applies
+one schema instead:
+- Categoricals for seniority, metro, company stage, industry and other labels
+- float64 comp columns (NaN for missing or unparseable values)
+- Real booleans for is_remote/is_tech/has_* flags (missing -> False)
+- Optional skipped or lazily loaded description column
+- Snapshots pruned to the snapshot store (snapshot_store.py) load the same
+  as CSVs on disk; snapshot_paths() lists both
+
+Usage:
+    from job_data import load_jobs, load_descriptions, snapshot_paths
+    df = load_jobs(snapshot_paths()[-1], description=False)
+    df['description'] = load_descriptions(df)   # later, only if needed
+
+    python scripts/job_data.py --benchmark [csv]   # bare vs typed parse time/memory
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import Iterable, Optional, Union
+
+import pandas as pd
+
+from snapshot_store import csv_columns, open_csv, snapshot_paths
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+DATA_DIR = 'data'
+MASTER_CSV = f'{DATA_DIR}/master_jobs_database.csv'
+
+CATEGORY_COLUMNS = [
+    'seniority', 'seniority_original', 'metro', 'company_stage', 'company_stage_original',
+    'company_industry', 'company_num_employees', 'company_revenue', 'data_quality',
+    'site', 'job_type', 'interval', 'currency', 'import_date', 'import_week', 'week_added',
+]
+NUMERIC_COLUMNS = ['min_amount', 'max_amount', 'data_quality_score']
+BOOLEAN_COLUMNS = ['is_remote', 'is_tech', 'has_description', 'has_salary', 'comp_outlier', 'seen_before']
+DESCRIPTION_COLUMN = 'description'
+
+TRUE_VALUES = {'true', '1', '1.0', 'yes', 'y', 't'}
+
+# Rows parsed per chunk; bounds the CSV tokenizer's buffers on large files
+CHUNK_ROWS = 5000
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MB (None if unavailable)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS reports bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def to_bool(series: pd.Series) -> pd.Series:
+    """Coerce mixed True/'True'/1/NaN values to a plain bool column."""
+    if series.dtype == bool:
+        return series
+    return series.astype(str).str.strip().str.lower().isin(TRUE_VALUES)
+
+
+def _coerce_values(df: pd.DataFrame) -> pd.DataFrame:
+    """Coerce comp columns to float64 and flag columns to bool (in place)."""
+    for col in NUMERIC_COLUMNS:
+        if col in df.columns and df[col].dtype != 'float64':
+            df[col] = pd.to_numeric(df[col], errors='coerce').astype('float64')
+    for col in BOOLEAN_COLUMNS:
+        if col in df.columns:
+            df[col] = to_bool(df[col])
+    return df
+
+
+def apply_schema(df: pd.DataFrame) -> pd.DataFrame:
+    """Apply the job schema to an already-loaded DataFrame (in place)."""
+    _coerce_values(df)
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype('category')
+    return df
+
+
+def load_jobs(path: str, description: Union[bool, str] = True, columns: Iterable[str] = None,
+              verbose: bool = True) -> pd.DataFrame:
+    """
+    Load a job CSV with explicit dtypes.
+
+    Args:
+        path: CSV path (raw_jobs_*, executive_sales_jobs_* or master database)
+        description: True to load it, False to skip it, 'lazy' to skip it now
+            and fetch it later with load_descriptions(df)
+        columns: Optional subset of columns to load (missing ones are ignored)
+        verbose: Print rows, parse time and peak RSS
+
+    Returns:
+        DataFrame indexed by file row position (keep the index for lazy descriptions)
+    """
+    start = time.perf_counter()
+    header = csv_columns(path)
+    usecols = [col for col in header if columns is None or col in columns]
+    if description is not True:
+        usecols = [col for col in usecols if col != DESCRIPTION_COLUMN]
+
+    # Parse in chunks and coerce each one so peak memory tracks the typed frame,
+    # not the whole file's raw tokens; categoricals are built once at the end
+    chunks = [_coerce_values(chunk) for chunk in pd.read_csv(open_csv(path, usecols), usecols=usecols,
+                                                             chunksize=CHUNK_ROWS)]
+    df = pd.concat(chunks, ignore_index=True) if chunks else pd.read_csv(open_csv(path, usecols), usecols=usecols)
+    del chunks
+    df = apply_schema(df[usecols])
+    df.attrs['source_path'] = path
+
+    if verbose:
+        rss = peak_rss_mb()
+        rss_text = f", peak RSS {rss:.0f} MB" if rss is not None else ""
+        print(f"Loaded {len(df)} rows x {len(df.columns)} cols from {path} "
+              f"in {time.perf_counter() - start:.2f}s{rss_text}")
+    return df
+
+
+def load_descriptions(df: pd.DataFrame, path: str = None) -> pd.Series:
+    """
+    Read only the description column for the rows still in df.
+
+    Relies on df keeping the file-position index set by load_jobs.
+    """
+    path = path or df.attrs.get('source_path')
+    if path is None:
+        raise ValueError("No source path: pass path= or load df with load_jobs()")
+    descriptions = pd.read_csv(open_csv(path, [DESCRIPTION_COLUMN]), usecols=[DESCRIPTION_COLUMN])[DESCRIPTION_COLUMN]
+    return descriptions.reindex(df.index)
+
+
+# =============================================================================
+# BENCHMARK
+# =============================================================================
+
+def _measure(mode: str, path: str) -> dict:
+    """Load path one way and report time and memory (run in a fresh process)."""
+    start = time.perf_counter()
+    if mode == 'bare':
+        df = pd.read_csv(path)
+    elif mode == 'typed':
+        df = load_jobs(path, verbose=False)
+    else:
+        df = load_jobs(path, description=False, verbose=False)
+    return {
+        'mode': mode,
+        'rows': len(df),
+        'seconds': round(time.perf_counter() - start, 3),
+        'frame_mb': round(df.memory_usage(deep=True).sum() / (1024 * 1024), 1),
+        'peak_rss_mb': round(peak_rss_mb() or 0, 1),
+    }
+
+
+def run_benchmark(path: str):
+    """Compare bare read_csv with typed loading, each in its own process."""
+    print(f"Benchmarking loaders on {path}")
+    print(f"{'Mode':<16} {'Rows':>8} {'Parse (s)':>10} {'Frame (MB)':>11} {'Peak RSS (MB)':>14}")
+    for mode in ['bare', 'typed', 'typed-no-desc']:
+        output = subprocess.run(
+            [sys.executable, __file__, '--measure', mode, path],
+            capture_output=True, text=True, check=True
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        print(f"{mode:<16} {result['rows']:>8} {result['seconds']:>10.2f} "
+              f"{result['frame_mb']:>11.1f} {result['peak_rss_mb']:>14.1f}")
+
+
+def _default_path() -> Optional[str]:
+    if os.path.exists(MASTER_CSV):
+        return MASTER_CSV
+    files = snapshot_paths()
+    return files[-1] if files else None
+
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description='Typed job CSV loader')
+    parser.add_argument('--benchmark', nargs='?', const='', metavar='CSV',
+                        help='Compare bare vs typed loading (defaults to the master database)')
+    parser.add_argument('--measure', nargs=2, metavar=('MODE', 'CSV'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        print(json.dumps(_measure(*args.measure)))
+    elif args.benchmark is not None:
+        csv_path = args.benchmark or _default_path()
+        if not csv_path:
+            print("No job CSV found")
+            sys.exit(1)
+        run_benchmark(csv_path)
+    else:
+        parser.print_help()
@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""
+Near-duplicate detection for reposted executive roles.
+
+The same VP Sales search often shows up under several URLs (reposted, or
+listed once per city). Exact URL dedupe keeps all of them, which inflates
+weekly counts, salary pages and the comp analysis. This module gives every
+job a canonical_job_id shared by its reposts:
+
+1. Block by normalized company name (reposts never cross companies)
+2. MinHash signatures over title tokens and 5-word description shingles,
+   banded into LSH buckets, so only likely matches are compared
+3. Candidates must agree on estimated Jaccard similarity and, when both
+   post a salary, on comp range
+4. Titles naming different territories ('..., Mid-West Region' vs
+   '..., Northeast Region') are separate hires, never reposts
+
+State lives in the job index database (job_index.py): each job's signature,
+comp range and canonical id. New jobs are compared only against stored jobs
+at the same companies, and existing ids never change, so a cluster keeps the
+id of the first posting seen.
+
+Usage:
+    python scripts/job_dedupe.py                          # largest repost clusters in the master
+    python scripts/job_dedupe.py --check-synthetic 5000   # score against planted reposts
+
+    from job_index import open_index
+    from job_dedupe import assign_canonical_ids, collapse_reposts
+    conn = open_index()
+    df['canonical_job_id'] = assign_canonical_ids(conn, df, '2026-01-19')
+    df = collapse_reposts(df)        # one row per role
+"""
+
+import os
+import re
+import sqlite3
+import zlib
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from job_index import CHUNK_ROWS, LOOKUP_BATCH, key_hash, job_keys
+
+NUM_PERM = 64
+BANDS = 16                      # 16 bands x 4 rows: ~50% similar pairs become candidates
+ROWS_PER_BAND = NUM_PERM // BANDS
+SHINGLE_WORDS = 5
+SIMILARITY_THRESHOLD = 0.7      # Estimated Jaccard needed to call two postings one role
+COMP_TOLERANCE = 0.15           # Max relative gap between salary midpoints
+
+# Title words that name a territory (hyphens dropped: 'Mid-West' -> 'midwest').
+# Two postings whose titles name different ones are never the same role
+PLACE_WORDS = frozenset('''
+    north south east west northeast northwest southeast southwest midwest central midatlantic
+    atlantic pacific gulf mountain coast northern southern eastern western
+    emea apac apj latam americas amer nam anz dach nordics benelux europe asia africa uk us usa canada
+    alabama alaska arizona arkansas california colorado connecticut delaware florida georgia hawaii
+    idaho illinois indiana iowa kansas kentucky louisiana maine maryland massachusetts michigan
+    minnesota mississippi missouri montana nebraska nevada hampshire jersey york mexico carolina
+    dakota ohio oklahoma oregon pennsylvania rhode tennessee texas utah vermont virginia washington
+    wisconsin wyoming
+    boston chicago seattle austin dallas houston denver atlanta miami phoenix philadelphia pittsburgh
+    francisco angeles diego jose portland nashville charlotte raleigh minneapolis detroit baltimore
+    columbus tampa orlando toronto london
+'''.split())
+
+# Universal hash family h(x) = (a*x + b) mod p over 32-bit shingle hashes
+_PRIME = np.uint64(4294967311)
+_rng = np.random.default_rng(20260119)
+_A = _rng.integers(1, 2 ** 32, size=NUM_PERM, dtype=np.uint64)
+_B = _rng.integers(0, 2 ** 32, size=NUM_PERM, dtype=np.uint64)
+_EMPTY = np.full(NUM_PERM, np.iinfo(np.uint64).max, dtype=np.uint64)
+
+COMPANY_SUFFIXES = re.compile(
+    r'\b(inc|incorporated|llc|l\.l\.c|ltd|limited|corp|corporation|co|company|plc|gmbh|lp|llp)\b\.?'
+)
+
+
+def normalize_company(name) -> str:
+    """Lowercase company name without punctuation or legal suffixes."""
+    if pd.isna(name):
+        return ''
+    name = COMPANY_SUFFIXES.sub(' ', str(name).lower().replace('&', ' and '))
+    return ' '.join(re.findall(r'[a-z0-9]+', name))
+
+
+def shingles(title, description) -> set:
+    """Title tokens plus overlapping word n-grams of the description."""
+    title_tokens = re.findall(r'[a-z0-9]+', str(title).lower()) if pd.notna(title) else []
+    words = re.findall(r'[a-z0-9]+', str(description).lower()) if pd.notna(description) else []
+    result = {f"t:{token}" for token in title_tokens}
+    result.update(' '.join(words[i:i + SHINGLE_WORDS]) for i in range(max(1, len(words) - SHINGLE_WORDS + 1)))
+    result.discard('')
+    return result
+
+
+def title_places(title) -> str:
+    """Territory words in a title, sorted and space-separated ('' when there are none)."""
+    if pd.isna(title):
+        return ''
+    tokens = set(re.findall(r'[a-z0-9]+', str(title).lower().replace('-', '')))
+    return ' '.join(sorted(tokens & PLACE_WORDS))
+
+
+def minhash(shingle_set: set) -> np.ndarray:
+    """NUM_PERM-value MinHash signature (all-max for an empty set)."""
+    if not shingle_set:
+        return _EMPTY.copy()
+    hashes = np.fromiter((zlib.crc32(s.encode('utf-8')) for s in shingle_set), dtype=np.uint64,
+                         count=len(shingle_set))
+    return ((np.outer(hashes, _A) + _B) % _PRIME).min(axis=0)
+
+
+def comp_agrees(a_min, a_max, b_min, b_max) -> bool:
+    """True unless both postings list salaries whose midpoints differ by more than COMP_TOLERANCE."""
+    a_mid = np.nanmean([a_min, a_max]) if pd.notna(a_min) or pd.notna(a_max) else np.nan
+    b_mid = np.nanmean([b_min, b_max]) if pd.notna(b_min) or pd.notna(b_max) else np.nan
+    if np.isnan(a_mid) or np.isnan(b_mid) or max(a_mid, b_mid) <= 0:
+        return True
+    return abs(a_mid - b_mid) / max(a_mid, b_mid) <= COMP_TOLERANCE
+
+
+def _open_clusters(conn: sqlite3.Connection):
+    # Tables from before title_places can't apply the territory veto. The
+    # table is derived from the master CSV, so drop it: merge_to_master.py
+    # re-clusters the master when it is empty
+    columns = [row[1] for row in conn.execute('PRAGMA table_info(job_clusters)')]
+    if columns and 'title_places' not in columns:
+        conn.execute('DROP TABLE job_clusters')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS job_clusters (
+            job_key TEXT PRIMARY KEY,
+            company_key TEXT,
+            signature BLOB,
+            min_amount REAL,
+            max_amount REAL,
+            title_places TEXT,
+            canonical_job_id TEXT,
+            first_seen TEXT
+        ) WITHOUT ROWID
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_job_clusters_company ON job_clusters (company_key)')
+
+
+def cluster_count(conn: sqlite3.Connection) -> int:
+    _open_clusters(conn)
+    return conn.execute('SELECT COUNT(*) FROM job_clusters').fetchone()[0]
+
+
+def _row_keys(df: pd.DataFrame) -> pd.Series:
+    """Job key per row; rows without a URL are keyed by company, title and location."""
+    keys = job_keys(df)
+    for idx in keys.index[keys.isna()]:
+        row = df.loc[idx]
+        keys[idx] = key_hash(f"text:{row.get('company')}|{row.get('title')}|{row.get('location')}")
+    return keys
+
+
+def _band_keys(signature: np.ndarray) -> List[bytes]:
+    return [signature[i * ROWS_PER_BAND:(i + 1) * ROWS_PER_BAND].tobytes() for i in range(BANDS)]
+
+
+def _numeric(df: pd.DataFrame, col: str) -> pd.Series:
+    if col not in df.columns:
+        return pd.Series(np.nan, index=df.index)
+    return pd.to_numeric(df[col], errors='coerce')
+
+
+def assign_canonical_ids(conn: sqlite3.Connection, df: pd.DataFrame, seen_date: str) -> pd.Series:
+    """
+    canonical_job_id for every row of df, storing new jobs in the index.
+
+    Jobs already in the index keep their stored id. New jobs join the most
+    similar stored (or earlier new) job at the same company whose title names
+    the same territories, or start their own cluster with their own key as
+    the id.
+
+    Args:
+        conn: Job index connection (job_index.open_index)
+        df: Jobs with company, title, description and comp columns
+        seen_date: Import date recorded as first_seen for new jobs
+
+    Returns:
+        Series of canonical ids aligned to df.index
+    """
+    _open_clusters(conn)
+    keys = _row_keys(df)
+    stored = {}
+    unique_keys = list(dict.fromkeys(keys))
+    for start in range(0, len(unique_keys), LOOKUP_BATCH):
+        batch = unique_keys[start:start + LOOKUP_BATCH]
+        placeholders = ','.join('?' * len(batch))
+        stored.update(conn.execute(
+            f'SELECT job_key, canonical_job_id FROM job_clusters WHERE job_key IN ({placeholders})', batch))
+
+    is_new = ~keys.isin(stored.keys()) & ~keys.duplicated()
+    new_rows = df[is_new]
+    if len(new_rows):
+        companies = new_rows['company'].map(normalize_company) if 'company' in new_rows.columns \
+            else pd.Series('', index=new_rows.index)
+        min_amounts = _numeric(new_rows, 'min_amount')
+        max_amounts = _numeric(new_rows, 'max_amount')
+        titles = new_rows['title'] if 'title' in new_rows.columns else pd.Series(None, index=new_rows.index)
+        descriptions = new_rows['description'] if 'description' in new_rows.columns \
+            else pd.Series(None, index=new_rows.index)
+
+        # Blocking: load stored jobs only for the companies in this batch
+        buckets: Dict[tuple, List[dict]] = {}
+        company_keys = [c for c in companies.unique() if c]
+        for start in range(0, len(company_keys), LOOKUP_BATCH):
+            batch = company_keys[start:start + LOOKUP_BATCH]
+            placeholders = ','.join('?' * len(batch))
+            for company_key, signature, min_amount, max_amount, places, canonical in conn.execute(
+                    f'SELECT company_key, signature, min_amount, max_amount, title_places, canonical_job_id '
+                    f'FROM job_clusters WHERE company_key IN ({placeholders})', batch):
+                entry = {'signature': np.frombuffer(signature, dtype=np.uint64), 'min': min_amount,
+                         'max': max_amount, 'places': places, 'canonical': canonical}
+                for band, band_key in enumerate(_band_keys(entry['signature'])):
+                    buckets.setdefault((company_key, band, band_key), []).append(entry)
+
+        inserts = []
+        for idx, key in zip(new_rows.index, keys[is_new]):
+            company_key = companies[idx]
+            signature = minhash(shingles(titles[idx], descriptions[idx]))
+            entry = {'signature': signature, 'min': min_amounts[idx], 'max': max_amounts[idx],
+                     'places': title_places(titles[idx]), 'canonical': key}
+            has_text = not np.array_equal(signature, _EMPTY)
+
+            best, best_similarity = None, SIMILARITY_THRESHOLD
+            if company_key and has_text:
+                seen = set()
+                for band, band_key in enumerate(_band_keys(signature)):
+                    for candidate in buckets.get((company_key, band, band_key), []):
+                        if id(candidate) in seen:
+                            continue
+                        seen.add(id(candidate))
+                        if candidate['places'] != entry['places']:
+                            continue
+                        similarity = float(np.mean(candidate['signature'] == signature))
+                        if similarity >= best_similarity and comp_agrees(
+                                entry['min'], entry['max'], candidate['min'], candidate['max']):
+                            best, best_similarity = candidate, similarity
+            if best is not None:
+                entry['canonical'] = best['canonical']
+            if company_key and has_text:
+                for band, band_key in enumerate(_band_keys(signature)):
+                    buckets.setdefault((company_key, band, band_key), []).append(entry)
+
+            stored[key] = entry['canonical']
+            inserts.append((key, company_key, signature.tobytes(),
+                            None if pd.isna(entry['min']) else float(entry['min']),
+                            None if pd.isna(entry['max']) else float(entry['max']),
+                            entry['places'], entry['canonical'], seen_date))
+
+        conn.executemany(
+            'INSERT OR IGNORE INTO job_clusters (job_key, company_key, signature, min_amount, max_amount, '
+            'title_places, canonical_job_id, first_seen) VALUES (?, ?, ?, ?, ?, ?, ?, ?)', inserts)
+        conn.commit()
+
+    return keys.map(stored)
+
+
+def annotate_master(conn: sqlite3.Connection, master_file: str, default_date: str) -> Dict[str, int]:
+    """
+    (Re)build the cluster table from the master CSV in file order and write
+    canonical_job_id into it, streaming in chunks.
+
+    Returns:
+        {'jobs': rows processed, 'roles': distinct canonical ids}
+    """
+    _open_clusters(conn)
+    conn.execute('DELETE FROM job_clusters')
+    conn.commit()
+
+    tmp_file = f"{master_file}.tmp"
+    rows = 0
+    roles = set()
+    with open(tmp_file, 'w', newline='') as f:
+        for i, chunk in enumerate(pd.read_csv(master_file, chunksize=CHUNK_ROWS, dtype=str, keep_default_na=False)):
+            typed = chunk.replace('', np.nan)
+            dates = typed['import_date'] if 'import_date' in typed.columns else pd.Series(default_date, index=typed.index)
+            # Rows are stored under their own import date so first_seen stays historical
+            ids = pd.Series(index=chunk.index, dtype=object)
+            for date, group in typed.groupby(dates.fillna(default_date), sort=False):
+                ids[group.index] = assign_canonical_ids(conn, group, date)
+            chunk['canonical_job_id'] = ids
+            chunk.to_csv(f, header=(i == 0), index=False)
+            rows += len(chunk)
+            roles.update(ids)
+    os.replace(tmp_file, master_file)
+    return {'jobs': rows, 'roles': len(roles)}
+
+
+def collapse_reposts(df: pd.DataFrame, keep: str = 'last') -> pd.DataFrame:
+    """One row per canonical_job_id (rows without an id are kept as-is)."""
+    if 'canonical_job_id' not in df.columns:
+        return df
+    ids = df['canonical_job_id']
+    return df[ids.isna() | ~ids.duplicated(keep=keep)]
+
+
+def count_roles(df: pd.DataFrame) -> int:
+    """Distinct roles in df: canonical ids, plus rows without one."""
+    if 'canonical_job_id' not in df.columns:
+        return len(df)
+    ids = df['canonical_job_id']
+    return int(ids.nunique() + ids.isna().sum())
+
+
+def check_synthetic(n: int, seed: int = 7) -> Dict[str, int]:
+    """
+    Cluster synthetic jobs and score the ids against the planted roles.
+
+    Returns:
+        {'reposts': planted, 'found': joined their source's id,
+         'false_merges': rows sharing an id with another role,
+         'territory_merges': the same among territory-pair rows}
+    """
+    from synthetic_data import generate_enriched_jobs, planted_roles
+    df = generate_enriched_jobs(n, seed)
+    ids = assign_canonical_ids(sqlite3.connect(':memory:'), df, '2026-01-19')
+    roles = planted_roles(df)
+    reposts = roles.duplicated()
+    found = reposts & (ids == ids.groupby(roles).transform('first'))
+    merged = ids.map(roles.groupby(ids).nunique()) > 1
+    territory = df['title'].str.endswith(' Region')
+    return {'reposts': int(reposts.sum()), 'found': int(found.sum()),
+            'false_merges': int(merged.sum()), 'territory_merges': int((merged & territory).sum())}
+
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description='Report repost clusters in the master database')
+    parser.add_argument('--master', default='data/master_jobs_database.csv')
+    parser.add_argument('--top', type=int, default=10, help='Largest clusters to list')
+    parser.add_argument('--check-synthetic', type=int, metavar='ROWS',
+                        help='Score detection on synthetic jobs with planted reposts and territory pairs')
+    args = parser.parse_args()
+
+    if args.check_synthetic:
+        result = check_synthetic(args.check_synthetic)
+        print(f"{args.check_synthetic} synthetic postings: found {result['found']} of {result['reposts']} planted reposts, "
+              f"{result['false_merges']} rows merged across roles ({result['territory_merges']} territory hires)")
+        raise SystemExit(0 if result['false_merges'] == 0 and result['found'] == result['reposts'] else 1)
+
+    master = pd.read_csv(args.master, usecols=lambda c: c in ['canonical_job_id', 'company', 'title', 'location'])
+    if 'canonical_job_id' not in master.columns:
+        print("No canonical_job_id column yet - run merge_to_master.py first")
+    else:
+        sizes = master.groupby('canonical_job_id').size().sort_values(ascending=False)
+        print(f"{len(master)} postings, {count_roles(master)} roles, {int((sizes > 1).sum())} reposted roles")
+        for canonical, size in sizes[sizes > 1].head(args.top).items():
+            group = master[master['canonical_job_id'] == canonical]
+            print(f"  {size}x {group['company'].iloc[0]} - {group['title'].iloc[0]} "
+                  f"({', '.join(group['location'].dropna().astype(str).unique()[:4])})")
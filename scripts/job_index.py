@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Persistent job index for the master database.
+
+One SQLite row per job (a 64-bit hash of job_url_direct, falling back to
+job_url) with the first and last date it was imported. merge_to_master.py
+checks only the new week's rows against the index and appends them to
+master_jobs_database.csv without loading it; last_seen gives time-open
+metrics for any job.
+
+Usage:
+    from job_index import open_index, job_keys, lookup, record_seen
+    conn = open_index()
+    keys = job_keys(new_df)
+    known = lookup(conn, keys.dropna())
+
+    from job_index import seen_dates
+    df = df.join(seen_dates(df))     # first_seen, last_seen, days_open
+"""
+
+import csv
+import hashlib
+import os
+import sqlite3
+from typing import Dict, Iterable, List, Tuple
+
+import pandas as pd
+
+DATA_DIR = "data"
+INDEX_DB = f"{DATA_DIR}/job_index.db"
+MASTER_CSV = f"{DATA_DIR}/master_jobs_database.csv"
+
+# Columns tried in order for the job key (same order as the feature store)
+KEY_COLUMNS = ['job_url_direct', 'job_url']
+
+CHUNK_ROWS = 50_000
+# Parameters per IN (...) query, under SQLite's default limit
+LOOKUP_BATCH = 900
+
+
+def key_hash(url: str) -> str:
+    """Stable 64-bit hex key for a job URL."""
+    return hashlib.sha1(url.strip().encode('utf-8')).hexdigest()[:16]
+
+
+def job_keys(df: pd.DataFrame) -> pd.Series:
+    """Hashed job key per row; None where the row has no URL."""
+    urls = pd.Series([None] * len(df), index=df.index, dtype=object)
+    for col in KEY_COLUMNS:
+        if col in df.columns:
+            urls = urls.where(urls.notna(), df[col])
+    return pd.Series(
+        [key_hash(str(url)) if pd.notna(url) and str(url).strip() else None for url in urls],
+        index=df.index, dtype=object
+    )
+
+
+def open_index(db_path: str = INDEX_DB) -> sqlite3.Connection:
+    os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS jobs (
+            job_key TEXT PRIMARY KEY,
+            first_seen TEXT,
+            last_seen TEXT
+        ) WITHOUT ROWID
+    ''')
+    return conn
+
+
+def index_size(conn: sqlite3.Connection) -> int:
+    return conn.execute('SELECT COUNT(*) FROM jobs').fetchone()[0]
+
+
+def build_from_master(conn: sqlite3.Connection, master_file: str = MASTER_CSV,
+                      default_date: str = None) -> int:
+    """
+    (Re)build the index from the master CSV, streaming only the key and date columns.
+
+    Returns:
+        Number of distinct jobs indexed
+    """
+    header = pd.read_csv(master_file, nrows=0).columns
+    usecols = [col for col in KEY_COLUMNS + ['import_date'] if col in header]
+    seen = {}
+    if [col for col in usecols if col in KEY_COLUMNS]:
+        for chunk in pd.read_csv(master_file, usecols=usecols, chunksize=CHUNK_ROWS):
+            dates = chunk['import_date'] if 'import_date' in chunk.columns else pd.Series(default_date, index=chunk.index)
+            for key, date in zip(job_keys(chunk), dates):
+                if key is None:
+                    continue
+                date = date if isinstance(date, str) else default_date
+                first, last = seen.get(key, (date, date))
+                if date:
+                    first = min(first or date, date)
+                    last = max(last or date, date)
+                seen[key] = (first, last)
+
+    conn.execute('DELETE FROM jobs')
+    conn.executemany('INSERT INTO jobs (job_key, first_seen, last_seen) VALUES (?, ?, ?)',
+                     [(key, first, last) for key, (first, last) in seen.items()])
+    conn.commit()
+    return len(seen)
+
+
+def lookup(conn: sqlite3.Connection, keys: Iterable[str]) -> Dict[str, Tuple[str, str]]:
+    """Return {job_key: (first_seen, last_seen)} for the keys already indexed."""
+    keys = list(dict.fromkeys(key for key in keys if key))
+    found = {}
+    for start in range(0, len(keys), LOOKUP_BATCH):
+        batch = keys[start:start + LOOKUP_BATCH]
+        placeholders = ','.join('?' * len(batch))
+        for key, first, last in conn.execute(
+                f'SELECT job_key, first_seen, last_seen FROM jobs WHERE job_key IN ({placeholders})', batch):
+            found[key] = (first, last)
+    return found
+
+
+def record_seen(conn: sqlite3.Connection, keys: Iterable[str], seen_date: str) -> int:
+    """
+    Mark keys as seen on seen_date: insert new jobs, move last_seen forward on known ones.
+
+    Returns:
+        Number of keys that were not indexed before
+    """
+    keys = list(dict.fromkeys(key for key in keys if key))
+    before = index_size(conn)
+    conn.executemany('INSERT OR IGNORE INTO jobs (job_key, first_seen, last_seen) VALUES (?, ?, ?)',
+                     [(key, seen_date, seen_date) for key in keys])
+    conn.executemany('UPDATE jobs SET last_seen = ? WHERE job_key = ? AND last_seen < ?',
+                     [(seen_date, key, seen_date) for key in keys])
+    conn.commit()
+    return index_size(conn) - before
+
+
+def seen_dates(df: pd.DataFrame, db_path: str = INDEX_DB) -> pd.DataFrame:
+    """
+    first_seen, last_seen and days_open per row of df (NaN for unindexed jobs).
+
+    days_open counts from first to last import, so a job seen in one weekly
+    import only has 0 days.
+    """
+    result = pd.DataFrame(index=df.index, columns=['first_seen', 'last_seen'], dtype=object)
+    if os.path.exists(db_path):
+        conn = open_index(db_path)
+        keys = job_keys(df)
+        found = lookup(conn, keys.dropna())
+        conn.close()
+        result['first_seen'] = keys.map(lambda key: found.get(key, (None, None))[0])
+        result['last_seen'] = keys.map(lambda key: found.get(key, (None, None))[1])
+    first = pd.to_datetime(result['first_seen'], errors='coerce')
+    last = pd.to_datetime(result['last_seen'], errors='coerce')
+    result['days_open'] = (last - first).dt.days
+    return result
+
+
+def append_to_master(rows: pd.DataFrame, master_file: str = MASTER_CSV) -> List[str]:
+    """
+    Append rows to the master CSV without loading it.
+
+    Rows are aligned to the existing header. If they bring new columns, the
+    file is rewritten once in chunks with the widened header.
+
+    Returns:
+        Columns added to the header (empty when the file was only appended to)
+    """
+    if not os.path.exists(master_file) or os.path.getsize(master_file) == 0:
+        rows.to_csv(master_file, index=False)
+        return []
+
+    header = list(pd.read_csv(master_file, nrows=0).columns)
+    added = [col for col in rows.columns if col not in header]
+    if added:
+        columns = header + added
+        tmp_file = f"{master_file}.tmp"
+        with open(tmp_file, 'w', newline='') as f:
+            csv.writer(f).writerow(columns)
+            for chunk in pd.read_csv(master_file, chunksize=CHUNK_ROWS, dtype=str, keep_default_na=False):
+                chunk.reindex(columns=columns).to_csv(f, header=False, index=False)
+            rows.reindex(columns=columns).to_csv(f, header=False, index=False)
+        os.replace(tmp_file, master_file)
+        return added
+
+    with open(master_file, 'rb') as f:
+        f.seek(-1, os.SEEK_END)
+        ends_with_newline = f.read(1) == b'\n'
+    with open(master_file, 'a', newline='') as f:
+        if not ends_with_newline:
+            f.write('\n')
+        rows.reindex(columns=header).to_csv(f, header=False, index=False)
+    return []
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Compact per-job records for the page generators' render loops.
+
+The job board, category, company and job page generators used to walk
+df.iterrows() or to_dict('records') and re-normalize every field per row
+(row.get defaults, pd.notna checks, float() salary coercion, HTML escaping).
+job_records() does that once per dataset, column by column, and returns
+one Job NamedTuple per row:
+- Text fields as str ('' when missing), plus HTML-escaped display copies
+- Salaries as ints (0 when missing, unparseable or not positive)
+- is_remote (the flag) and remote (the flag, or 'remote' in the location)
+
+Generators apply their own display defaults ('Unknown Title' etc.) with
+`job.title or ...`.
+
+Usage:
+    from job_records import job_records
+    for job in job_records(df):
+        print(job.title_html, job.max_amount, job.remote)
+
+    python scripts/job_records.py --benchmark [csv]   # job/company page loops: per-row access vs records
+"""
+
+import os
+import sys
+import tempfile
+import time
+from typing import List, NamedTuple
+
+import pandas as pd
+
+from job_data import load_jobs, snapshot_paths, to_bool
+
+TEXT_FIELDS = ['id', 'title', 'company', 'location', 'seniority', 'metro']
+ESCAPED_FIELDS = ['title', 'company', 'location']
+
+# Job pages write one file per job, so the benchmark stays at site scale
+BENCHMARK_SCALES = (1, 10)
+BENCHMARK_REPEATS = 3
+
+
+class Job(NamedTuple):
+    index: int
+    id: str
+    title: str
+    company: str
+    location: str
+    seniority: str
+    metro: str
+    job_url_direct: str
+    job_url: str            # job_url_direct, falling back to job_url
+    min_amount: int
+    max_amount: int
+    is_remote: bool         # the is_remote flag
+    remote: bool            # flag set or 'remote' in the location
+    title_html: str
+    company_html: str
+    location_html: str
+
+
+def _text(df: pd.DataFrame, col: str) -> pd.Series:
+    if col not in df.columns:
+        return pd.Series('', index=df.index, dtype=object)
+    values = df[col].astype(object)
+    return values.where(values.notna(), '').astype(str)
+
+
+def _amount(df: pd.DataFrame, col: str) -> pd.Series:
+    if col not in df.columns:
+        return pd.Series(0, index=df.index, dtype='int64')
+    values = pd.to_numeric(df[col], errors='coerce')
+    return values.where(values > 0, 0).fillna(0).astype('int64')
+
+
+def escape_html(values: pd.Series) -> pd.Series:
+    """Escape & < > " ' in a column of strings"""
+    return (values.str.replace('&', '&amp;', regex=False).str.replace('<', '&lt;', regex=False)
+            .str.replace('>', '&gt;', regex=False).str.replace('"', '&quot;', regex=False)
+            .str.replace("'", '&#39;', regex=False))
+
+
+def job_records(df: pd.DataFrame) -> List[Job]:
+    """One Job per row of df, in row order."""
+    text = {col: _text(df, col) for col in TEXT_FIELDS}
+    direct = _text(df, 'job_url_direct')
+    listing = _text(df, 'job_url')
+    flag = to_bool(df['is_remote']) if 'is_remote' in df.columns else pd.Series(False, index=df.index)
+    remote = flag | text['location'].str.lower().str.contains('remote', regex=False)
+
+    columns = [
+        df.index,
+        *(text[col] for col in TEXT_FIELDS),
+        direct,
+        direct.where(direct != '', listing),
+        _amount(df, 'min_amount'),
+        _amount(df, 'max_amount'),
+        flag,
+        remote,
+        *(escape_html(text[col]) for col in ESCAPED_FIELDS),
+    ]
+    return list(map(Job._make, zip(*(column.tolist() for column in columns))))
+
+
+# =============================================================================
+# BENCHMARK
+# =============================================================================
+
+def _legacy_job(index, row) -> Job:
+    """A Job normalized per row (.get, pd.notna, float()), the way the render loops read rows before."""
+    def text(col):
+        return str(row.get(col)) if pd.notna(row.get(col)) else ''
+
+    def amount(col):
+        value = row.get(col)
+        return int(float(value)) if pd.notna(value) and float(value) > 0 else 0
+
+    title, company, location = text('title'), text('company'), text('location')
+    direct = text('job_url_direct')
+    is_remote = bool(row.get('is_remote'))
+    escaped = [value.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+               .replace('"', '&quot;').replace("'", '&#39;') for value in (title, company, location)]
+    return Job(index, text('id'), title, company, location, text('seniority'), text('metro'),
+               direct, direct or text('job_url'), amount('min_amount'), amount('max_amount'),
+               is_remote, is_remote or 'remote' in location.lower(), *escaped)
+
+
+def _job_pages(df: pd.DataFrame, legacy: bool) -> float:
+    """generate_job_pages' render loop: iterrows (before) or job_records."""
+    import generate_job_pages as pages
+    start = time.perf_counter()
+    jobs = (_legacy_job(idx, row) for idx, row in df.iterrows()) if legacy else job_records(df)
+    for job in jobs:
+        if job.title and job.company:
+            pages.create_job_page(job)
+    return time.perf_counter() - start
+
+
+def _company_pages(df: pd.DataFrame, legacy: bool) -> float:
+    """generate_company_pages' render loop: per-company to_dict('records') (before) or job_records."""
+    import generate_company_pages as companies
+    tasks = companies.build_company_tasks(df, {})
+    listed = df.sort_values('max_amount', ascending=False, na_position='last', kind='stable')
+    listed = listed[listed['company'].isin([name for name, _, _ in tasks])]
+
+    start = time.perf_counter()
+    if legacy:
+        groups = listed.groupby('company', sort=False)
+        for name, _, stats in tasks:
+            group = groups.get_group(name)
+            jobs = [_legacy_job(idx, row) for idx, row in zip(group.index, group.to_dict('records'))]
+            companies.generate_company_page(name, jobs, stats)
+    else:
+        by_company = {}
+        for job in job_records(listed):
+            by_company.setdefault(job.company, []).append(job)
+        for name, _, stats in tasks:
+            companies.generate_company_page(name, by_company[str(name)], stats)
+    return time.perf_counter() - start
+
+
+def run_benchmark(path: str, scales=BENCHMARK_SCALES):
+    """Time the job and company page render loops with per-row access and with job_records."""
+    import generate_company_pages as companies
+    import generate_job_pages as pages
+
+    df = load_jobs(path, description=False, verbose=False)
+    legacy = [_legacy_job(idx, row) for idx, row in df.iterrows()]
+    assert legacy == job_records(df), 'per-row normalization and job_records disagree'
+
+    print(f"Benchmarking page render loops on {path} ({len(df)} jobs)")
+    print(f"{'Loop':<14} {'Jobs':>8} {'Per-row (s)':>12} {'Records (s)':>12} {'Speedup':>8}")
+    with tempfile.TemporaryDirectory() as out_dir:
+        # Pages go to a scratch directory, not the site
+        pages.JOBS_DIR = os.path.join(out_dir, 'jobs')
+        companies.COMPANIES_DIR = os.path.join(out_dir, 'companies')
+        for scale in scales:
+            scaled = pd.concat([df] * scale, ignore_index=True)
+            for name, loop in (('job pages', _job_pages), ('company pages', _company_pages)):
+                # Alternate and keep the best run: page writes make single timings noisy
+                runs = [(loop(scaled, legacy=True), loop(scaled, legacy=False)) for _ in range(BENCHMARK_REPEATS)]
+                before, after = min(run[0] for run in runs), min(run[1] for run in runs)
+                print(f"{name:<14} {len(scaled):>8} {before:>12.3f} {after:>12.3f} {before / after:>7.2f}x")
+
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description='Compact job records for the render loops')
+    parser.add_argument('--benchmark', nargs='?', const='', metavar='CSV',
+                        help='Time the job and company page loops with per-row access and with '
+                             'job_records (defaults to the latest snapshot)')
+    args = parser.parse_args()
+
+    if args.benchmark is not None:
+        files = snapshot_paths()
+        csv_path = args.benchmark or (files[-1] if files else None)
+        if not csv_path:
+            print("No job CSV found")
+            sys.exit(1)
+        run_benchmark(csv_path)
+    else:
+        parser.print_help()
@@ -2,94 +2,134 @@
 """
 Merge weekly enriched data into master database.
 This ensures the master_jobs_database.csv is up to date for the website.
+
+Dedupe runs against data/job_index.db (see job_index.py), so only the new
+week's rows are read; new jobs are appended to the master CSV and known
+jobs get their last_seen date moved forward. Reposts of the same role get
+a shared canonical_job_id (job_dedupe.py); the trend file records both
+postings and distinct roles. Pass --rebuild-index to rebuild the index from the master CSV after
+editing it by hand.
 """
 
 import pandas as pd
 import os
-import glob
+import sys
 from datetime import datetime
 
+sys.path.insert(0, 'scripts')
+from build_profiler import phase
+from job_dedupe import annotate_master, assign_canonical_ids, cluster_count, count_roles
+from job_index import append_to_master, build_from_master, index_size, job_keys, lookup, open_index, record_seen
+from snapshot_stats import record_roles, snapshot_date
+from snapshot_store import open_csv, snapshot_paths
+
 DATA_DIR = "data"
+# Sales_Exec_Openings.csv column for postings with reposts collapsed
+ROLES_COLUMN = "Distinct Roles"
 
 print("="*70)
 print("📊 MERGE TO MASTER DATABASE")
 print("="*70)
 
 # Find most recent enriched file
-enriched_files = glob.glob(f"{DATA_DIR}/executive_sales_jobs_*.csv")
+enriched_files = snapshot_paths()
 if not enriched_files:
     print("❌ No enriched files found")
     exit(0)
 
-latest_enriched = max(enriched_files)
+latest_enriched = enriched_files[-1]
 print(f"\n📂 Latest enriched file: {latest_enriched}")
 
 # Load new data
-new_df = pd.read_csv(latest_enriched)
+phase('load')
+new_df = pd.read_csv(open_csv(latest_enriched))
 print(f"📊 New records: {len(new_df)}")
 
 # Add import metadata
-new_df['import_date'] = datetime.now().strftime('%Y-%m-%d')
+today = datetime.now().strftime('%Y-%m-%d')
+new_df['import_date'] = today
 new_df['import_week'] = datetime.now().strftime('%Y-W%W')
+# The job index dates jobs by the snapshot they were seen in, not the build:
+# merge re-runs on every push, and re-stamping would inflate days_open
+seen_date = snapshot_date(latest_enriched)
 
-# Load or create master database
+# Check the new week against the job index instead of loading the master
 master_file = f"{DATA_DIR}/master_jobs_database.csv"
 
+phase('transform')
+conn = open_index()
+if os.path.exists(master_file) and (index_size(conn) == 0 or '--rebuild-index' in sys.argv):
+    indexed = build_from_master(conn, master_file, default_date=today)
+    print(f"🗂️  Built job index from {master_file}: {indexed} jobs")
+else:
+    print(f"🗂️  Job index: {index_size(conn)} jobs")
+if os.path.exists(master_file) and (cluster_count(conn) == 0 or '--rebuild-index' in sys.argv):
+    clustered = annotate_master(conn, master_file, default_date=today)
+    print(f"🧬 Clustered master reposts: {clustered['jobs']} jobs → {clustered['roles']} roles")
+
+# Reposts of the same role (new URL, other city) share a canonical_job_id
+new_df['canonical_job_id'] = assign_canonical_ids(conn, new_df, seen_date)
+print(f"🧬 Reposts this week: {len(new_df) - count_roles(new_df)}")
+
+# Rows without a URL can't be matched and are always added (as before)
+keys = job_keys(new_df)
+known = lookup(conn, keys.dropna())
+seen_before = keys.isin(known.keys())
+repeated = keys.notna() & keys.duplicated()
+new_records = new_df[~seen_before & ~repeated]
+print(f"✅ New unique records: {len(new_records)}")
+print(f"🔁 Already in master (last_seen updated): {keys[seen_before].nunique()}")
+
+# Save master database
+phase('write')
 if os.path.exists(master_file):
-    master_df = pd.read_csv(master_file)
-    print(f"📂 Existing master database: {len(master_df)} records")
-    
-    # Deduplicate based on job_url
-    if 'job_url_direct' in new_df.columns and 'job_url_direct' in master_df.columns:
-        existing_urls = set(master_df['job_url_direct'].dropna().unique())
-        new_records = new_df[~new_df['job_url_direct'].isin(existing_urls)]
-        print(f"✅ New unique records: {len(new_records)}")
-        
-        if len(new_records) > 0:
-            combined_df = pd.concat([master_df, new_records], ignore_index=True)
-        else:
-            combined_df = master_df
-    else:
-        # No job_url column, just replace
-        combined_df = new_df
+    added_columns = append_to_master(new_records, master_file)
+    if added_columns:
+        print(f"📐 Rewrote master with new columns: {', '.join(added_columns)}")
+    print(f"\n✅ Master database saved: appended {len(new_records)} records")
 else:
     print("📂 Creating new master database")
-    combined_df = new_df
+    new_records.to_csv(master_file, index=False)
+    print(f"\n✅ Master database saved: {len(new_records)} total records")
 
-# Save master database
-combined_df.to_csv(master_file, index=False)
-print(f"\n✅ Master database saved: {len(combined_df)} total records")
+# Index after the master is written, so a failed write doesn't hide rows next run
+first_seen_now = record_seen(conn, keys.dropna(), seen_date)
+print(f"🗂️  Job index updated: {first_seen_now} new, {index_size(conn)} total")
+conn.close()
+
+# Store the distinct-role count alongside the snapshot's other stats
+snapshot = record_roles(latest_enriched, count_roles(new_df))
 
-# Update historical tracking file for trend charts
+# Update historical tracking file for trend charts. The series stays a
+# posting count, comparable with its history; distinct roles (reposts
+# collapsed) get their own column, blank for dates before dedupe
 tracking_file = f"{DATA_DIR}/Sales_Exec_Openings.csv"
 if os.path.exists(tracking_file):
     tracking_df = pd.read_csv(tracking_file)
-    job_count = len(new_df)
-
-    # Extract date from filename (executive_sales_jobs_YYYYMMDD.csv)
-    import re
-    filename = os.path.basename(latest_enriched)
-    date_match = re.search(r'(\d{8})', filename)
-    if date_match:
-        date_str = date_match.group(1)
-        file_date = f"{date_str[:4]}-{date_str[4:6]}-{date_str[6:8]}"
-    else:
-        file_date = datetime.now().strftime('%Y-%m-%d')
+    job_count = snapshot['rows']
+    role_count = snapshot['roles']
+    file_date = snapshot['date']
+    if ROLES_COLUMN not in tracking_df.columns:
+        tracking_df[ROLES_COLUMN] = pd.NA
+    tracking_df[ROLES_COLUMN] = tracking_df[ROLES_COLUMN].astype('Int64')
 
     # Check if this date exists and needs updating
-    if file_date in tracking_df['Date'].values:
-        existing_count = tracking_df.loc[tracking_df['Date'] == file_date, 'Sales Exec Openings'].values[0]
-        if existing_count != job_count:
+    on_date = tracking_df['Date'] == file_date
+    if on_date.any():
+        existing_count = tracking_df.loc[on_date, 'Sales Exec Openings'].values[0]
+        existing_roles = tracking_df.loc[on_date, ROLES_COLUMN].values[0]
+        if existing_count != job_count or pd.isna(existing_roles) or existing_roles != role_count:
             # Update existing entry with correct count
-            tracking_df.loc[tracking_df['Date'] == file_date, 'Sales Exec Openings'] = job_count
+            tracking_df.loc[on_date, ['Sales Exec Openings', ROLES_COLUMN]] = [job_count, role_count]
             tracking_df.to_csv(tracking_file, index=False)
-            print(f"📈 Updated trend tracking: {file_date} → {job_count} jobs (was {existing_count})")
+            print(f"📈 Updated trend tracking: {file_date} → {job_count} jobs, {role_count} roles (was {existing_count})")
         else:
-            print(f"📈 Trend tracking already correct for {file_date}: {job_count} jobs")
+            print(f"📈 Trend tracking already correct for {file_date}: {job_count} jobs, {role_count} roles")
     else:
         # Add new entry
-        with open(tracking_file, 'a') as f:
-            f.write(f"\n{file_date},{job_count}")
-        print(f"📈 Added trend tracking: {file_date} → {job_count} jobs")
+        entry = pd.DataFrame({'Date': [file_date], 'Sales Exec Openings': [job_count], ROLES_COLUMN: [role_count]})
+        tracking_df = pd.concat([tracking_df, entry.astype({ROLES_COLUMN: 'Int64'})], ignore_index=True)
+        tracking_df.to_csv(tracking_file, index=False)
+        print(f"📈 Added trend tracking: {file_date} → {job_count} jobs, {role_count} roles")
 
 print(f"{'='*70}")
@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+Post-build asset stage for the CRO Report site.
+
+Runs after every page generator (and after update_nav_footer.py):
+- Fingerprints files under site/assets/ (trend_90_days.png -> trend_90_days.<hash>.png)
+  and rewrites references to them in HTML, XML, JSON, CSS and JS
+- Writes site/assets/asset-manifest.json (original URL -> fingerprinted URL)
+  for anything outside the site that wants the cache-safe URL
+- Emits precompressed .gz and .br siblings for text output
+- Prints a size report and saves it to data/asset_size_report.json
+
+Originals are kept, so stable URLs (newsletter embeds, old social shares)
+keep working. A fingerprinted URL never changes content, so it can be
+cached for a year; a new chart gets a new URL.
+
+Usage:
+    python scripts/optimize_assets.py
+    python scripts/optimize_assets.py --no-compress      # fingerprint only
+    python scripts/optimize_assets.py --no-fingerprint   # compress only
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import re
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import quote
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+SITE_DIR = 'site'
+ASSETS_DIR = 'assets'
+SITE_URL = 'https://thecroreport.com'
+MANIFEST_NAME = 'asset-manifest.json'
+# Read by the generators (templates.picture_html), so it keeps stable URLs
+IMAGE_MANIFEST_NAME = 'image-manifest.json'
+REPORT_PATH = 'data/asset_size_report.json'
+MAX_WORKERS = os.cpu_count() or 1
+
+HASH_LENGTH = 10
+# Static files are compressed once per build, so spend the time on the smallest output
+BROTLI_QUALITY = 11
+FINGERPRINT_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.webp', '.avif', '.gif', '.svg', '.ico', '.css', '.js'}
+REWRITE_EXTENSIONS = {'.html', '.xml', '.json', '.css', '.js', '.webmanifest'}
+COMPRESS_EXTENSIONS = {'.html', '.xml', '.json', '.css', '.js', '.svg', '.txt', '.webmanifest'}
+
+# Compressing tiny files saves nothing once headers are counted
+MIN_COMPRESS_BYTES = 256
+
+# name.<hex hash>.ext, as written by fingerprint_assets
+FINGERPRINTED_RE = re.compile(rf'^(?P<stem>.+)\.(?P<hash>[0-9a-f]{{{HASH_LENGTH}}})(?P<ext>\.[^.]+)$')
+
+
+# =============================================================================
+# FINGERPRINTING
+# =============================================================================
+
+def content_hash(path):
+    """Short SHA-256 of a file's bytes."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()[:HASH_LENGTH]
+
+
+def site_url(site_dir, path):
+    """Root-relative URL for a file under site_dir."""
+    return '/' + path.relative_to(site_dir).as_posix()
+
+
+def fingerprint_assets(site_dir):
+    """
+    Copy each asset to a content-hashed name and prune stale copies.
+
+    Returns:
+        Dict mapping URLs to fingerprinted URLs. Includes the percent-encoded
+        form of names with spaces, and stale fingerprinted URLs from earlier
+        runs (so pages rewritten then still resolve).
+    """
+    assets_root = site_dir / ASSETS_DIR
+    if not assets_root.exists():
+        return {}
+
+    originals = {}
+    fingerprinted = {}
+    for path in sorted(assets_root.rglob('*')):
+        if not path.is_file() or path.suffix.lower() not in FINGERPRINT_EXTENSIONS:
+            continue
+        match = FINGERPRINTED_RE.match(path.name)
+        if match:
+            original = path.with_name(match['stem'] + match['ext'])
+            fingerprinted.setdefault(original, []).append(path)
+        else:
+            originals[path] = None
+
+    manifest = {}
+    for path in originals:
+        hashed = path.with_name(f"{path.stem}.{content_hash(path)}{path.suffix}")
+        if not hashed.exists():
+            shutil.copy2(path, hashed)
+        url, hashed_url = site_url(site_dir, path), site_url(site_dir, hashed)
+        manifest[url] = hashed_url
+        if quote(url) != url:
+            manifest[quote(url)] = quote(hashed_url)
+
+        for stale in fingerprinted.get(path, []):
+            if stale != hashed:
+                manifest[site_url(site_dir, stale)] = hashed_url
+                stale.unlink()
+
+    # Fingerprinted copies whose original is gone
+    for original, copies in fingerprinted.items():
+        if original not in originals:
+            for stale in copies:
+                stale.unlink()
+    return manifest
+
+
+def build_reference_pattern(manifest):
+    """One regex matching any manifest URL, bare or on the site's own domain."""
+    alternation = '|'.join(re.escape(url) for url in sorted(manifest, key=len, reverse=True))
+    return re.compile(rf'(?<![\w.-])(?P<domain>{re.escape(SITE_URL)})?(?P<url>{alternation})(?![\w.%-])')
+
+
+def rewrite_file(path, pattern, manifest):
+    """Point asset references in one text file at fingerprinted URLs; True if changed."""
+    try:
+        content = path.read_text(encoding='utf-8')
+    except UnicodeDecodeError:
+        return False
+    rewritten = pattern.sub(lambda m: (m['domain'] or '') + manifest[m['url']], content)
+    if rewritten == content:
+        return False
+    path.write_text(rewritten, encoding='utf-8')
+    return True
+
+
+def rewrite_references(site_dir, manifest):
+    """Rewrite asset references across the site; returns the number of files changed."""
+    if not manifest:
+        return 0
+    pattern = build_reference_pattern(manifest)
+    changed = 0
+    for path in site_dir.rglob('*'):
+        if path.is_file() and path.suffix in REWRITE_EXTENSIONS and path.name not in (MANIFEST_NAME, IMAGE_MANIFEST_NAME):
+            changed += rewrite_file(path, pattern, manifest)
+    return changed
+
+
+def count_assets(manifest):
+    """Assets in a manifest, not counting encoded aliases or stale fingerprints."""
+    return len([
+        url for url in manifest
+        if '%' not in url and not FINGERPRINTED_RE.match(url.rsplit('/', 1)[-1])
+    ])
+
+
+def write_manifest(site_dir, manifest):
+    """Save original -> fingerprinted URLs (current assets only)."""
+    current = {
+        url: hashed for url, hashed in manifest.items()
+        if not FINGERPRINTED_RE.match(url.rsplit('/', 1)[-1])
+    }
+    with open(site_dir / ASSETS_DIR / MANIFEST_NAME, 'w') as f:
+        json.dump(current, f, indent=2, sort_keys=True)
+    return current
+
+
+# =============================================================================
+# COMPRESSION
+# =============================================================================
+
+def compress_file(path):
+    """
+    Write .gz (and .br when brotli is installed) next to a file.
+
+    Skips siblings that are already newer than the source.
+
+    Returns:
+        (path, raw bytes, gzip bytes, brotli bytes or None)
+    """
+    data = None
+    mtime = os.path.getmtime(path)
+    sizes = {}
+    for suffix, compress in [('.gz', _gzip), ('.br', _brotli if brotli else None)]:
+        if compress is None:
+            continue
+        target = f"{path}{suffix}"
+        if not os.path.exists(target) or os.path.getmtime(target) < mtime:
+            if data is None:
+                with open(path, 'rb') as f:
+                    data = f.read()
+            with open(target, 'wb') as f:
+                f.write(compress(data))
+        sizes[suffix] = os.path.getsize(target)
+    return str(path), os.path.getsize(path), sizes.get('.gz'), sizes.get('.br')
+
+
+def _gzip(data):
+    # mtime=0 keeps the output byte-identical across builds
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def _brotli(data):
+    return brotli.compress(data, quality=BROTLI_QUALITY)
+
+
+def compress_site(site_dir, workers=MAX_WORKERS):
+    """Precompress every text file in the site and drop orphaned siblings."""
+    for sibling in list(site_dir.rglob('*.gz')) + list(site_dir.rglob('*.br')):
+        if not sibling.with_suffix('').exists():
+            sibling.unlink()
+
+    paths = [
+        path for path in site_dir.rglob('*')
+        if path.is_file() and path.suffix in COMPRESS_EXTENSIONS
+        and path.stat().st_size >= MIN_COMPRESS_BYTES
+    ]
+    if workers > 1 and len(paths) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(compress_file, paths, chunksize=max(1, len(paths) // (workers * 4))))
+    return [compress_file(path) for path in paths]
+
+
+# =============================================================================
+# SIZE REPORT
+# =============================================================================
+
+def build_size_report(site_dir, compressed, manifest):
+    """Raw vs compressed bytes by file type."""
+    by_type = {}
+    for path in site_dir.rglob('*'):
+        if not path.is_file() or path.suffix in ('.gz', '.br'):
+            continue
+        if FINGERPRINTED_RE.match(path.name):
+            continue  # counted once, under its original
+        stats = by_type.setdefault(path.suffix.lower() or '(none)', {'files': 0, 'raw': 0, 'gzip': 0, 'brotli': 0})
+        stats['files'] += 1
+        stats['raw'] += path.stat().st_size
+
+    for path, _, gz, br in compressed:
+        if FINGERPRINTED_RE.match(Path(path).name):
+            continue
+        stats = by_type[Path(path).suffix.lower()]
+        stats['gzip'] += gz or 0
+        stats['brotli'] += br or 0
+
+    return {
+        'generated_at': datetime.now().isoformat(),
+        'brotli': brotli is not None,
+        'fingerprinted_assets': count_assets(manifest),
+        'by_type': dict(sorted(by_type.items(), key=lambda item: -item[1]['raw'])),
+    }
+
+
+def print_size_report(report):
+    """Print transfer sizes per file type."""
+    def kb(n):
+        return f"{n / 1024:,.0f} KB"
+
+    print(f"\n📦 Size Report")
+    print(f"   {'Type':<13} {'Files':>6} {'Raw':>12} {'Gzip':>12} {'Brotli':>12}")
+    totals = {'files': 0, 'raw': 0, 'gzip': 0, 'brotli': 0}
+    for ext, stats in report['by_type'].items():
+        for key in totals:
+            totals[key] += stats[key]
+        if stats['gzip']:
+            print(f"   {ext:<13} {stats['files']:>6} {kb(stats['raw']):>12} {kb(stats['gzip']):>12} "
+                  f"{kb(stats['brotli']) if stats['brotli'] else '-':>12}")
+        else:
+            print(f"   {ext:<13} {stats['files']:>6} {kb(stats['raw']):>12} {'-':>12} {'-':>12}")
+    print(f"   {'total':<13} {totals['files']:>6} {kb(totals['raw']):>12}")
+
+    text_raw = sum(s['raw'] for s in report['by_type'].values() if s['gzip'])
+    text_gz = sum(s['gzip'] for s in report['by_type'].values())
+    text_br = sum(s['brotli'] for s in report['by_type'].values())
+    if text_raw:
+        print(f"\n   Text output: {kb(text_raw)} raw -> {kb(text_gz)} gzip ({text_gz / text_raw:.0%})"
+              + (f", {kb(text_br)} brotli ({text_br / text_raw:.0%})" if text_br else ''))
+    print(f"   Fingerprinted assets: {report['fingerprinted_assets']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Fingerprint and precompress site output')
+    parser.add_argument('--site', default=SITE_DIR, help='Built site directory')
+    parser.add_argument('--no-fingerprint', action='store_true', help='Skip content-hashed asset URLs')
+    parser.add_argument('--no-compress', action='store_true', help='Skip .gz/.br siblings')
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("[ASSETS] OPTIMIZING SITE OUTPUT")
+    print("=" * 70)
+
+    site_dir = Path(args.site)
+    manifest = {}
+    if not args.no_fingerprint:
+        manifest = fingerprint_assets(site_dir)
+        changed = rewrite_references(site_dir, manifest)
+        current = write_manifest(site_dir, manifest)
+        print(f"✓ Fingerprinted {count_assets(current)} assets, rewrote references in {changed} files")
+
+    compressed = []
+    if not args.no_compress:
+        if brotli is None:
+            print("⚠️  brotli not installed - writing .gz only (pip install brotli)")
+        compressed = compress_site(site_dir)
+        print(f"✓ Precompressed {len(compressed)} files")
+
+    report = build_size_report(site_dir, compressed, manifest)
+    os.makedirs(os.path.dirname(REPORT_PATH), exist_ok=True)
+    with open(REPORT_PATH, 'w') as f:
+        json.dump(report, f, indent=2)
+    print_size_report(report)
+    print(f"\nReport: {REPORT_PATH}")
+
+
+if __name__ == '__main__':
+    main()
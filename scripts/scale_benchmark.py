@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Scale benchmark for the weekly pipeline.
+
+Generates synthetic data (synthetic_data.py) at several multiples of today's
+volume, runs each pipeline stage against it in a throwaway workspace and
+reports wall time, throughput and peak memory per stage, plus how each
+stage's time grows relative to its input (1.0 = linear, 2.0 = quadratic).
+
+Stages run as separate processes exactly as CI runs them (cwd = workspace
+root, `python scripts/X.py`), so peak RSS is per stage, not cumulative.
+
+Usage:
+    python scripts/scale_benchmark.py                    # 1x and 10x
+    python scripts/scale_benchmark.py --scales 1,10,100  # 100x needs ~5 GB disk
+    python scripts/scale_benchmark.py --stages enrich,job_pages --keep
+"""
+
+import argparse
+import json
+import math
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, 'scripts')
+from synthetic_data import DEFAULT_SEED, TARGET_DESCRIPTION_CHARS, write_dataset
+
+REPORT_PATH = 'data/scale_benchmark.json'
+DEFAULT_SCALES = (1, 10)
+STAGE_TIMEOUT = 3600
+
+# Small inputs the generators read besides the job CSVs
+SUPPORT_FILES = ['signal_config.json', 'tools.json', 'discovered_tools.json', 'moves.json',
+                 'metadata.json', 'market_intelligence.json', 'market_stats.json']
+
+# (name, command, input) - input names the dataset whose row count is the
+# stage's throughput denominator. Order matters: enrich feeds the rest.
+STAGES = [
+    ('enrich', ['scripts/enrich_and_analyze.py'], 'raw'),
+    ('merge_to_master', ['scripts/merge_to_master.py'], 'enriched'),
+    ('comp_add', ['scripts/cro_comp_aggregator.py', '--add', '{enriched_file}'], 'enriched'),
+    ('comp_analyze', ['scripts/cro_comp_aggregator.py', '--analyze'], 'master'),
+    ('company_intel', ['scripts/generate_company_intel.py'], 'master'),
+    ('salary_pages', ['scripts/generate_salary_pages.py'], 'master'),
+    ('job_pages', ['scripts/generate_job_pages.py'], 'enriched'),
+    ('company_pages', ['scripts/generate_company_pages.py'], 'enriched'),
+    ('category_pages', ['scripts/generate_category_pages.py'], 'enriched'),
+    ('job_board', ['scripts/generate_job_board.py'], 'enriched'),
+]
+
+
+def prepare_workspace(root, scale, seed, description_chars):
+    """Copy code and config into root and generate the synthetic CSVs."""
+    shutil.copytree('scripts', os.path.join(root, 'scripts'),
+                    ignore=shutil.ignore_patterns('__pycache__'))
+    if os.path.isdir('templates'):
+        shutil.copytree('templates', os.path.join(root, 'templates'))
+    data_dir = os.path.join(root, 'data')
+    os.makedirs(data_dir)
+    os.makedirs(os.path.join(root, 'site'))
+    for name in SUPPORT_FILES:
+        if os.path.exists(f"data/{name}"):
+            shutil.copy(f"data/{name}", data_dir)
+    write_dataset(data_dir, scale, seed, description_chars=description_chars, verbose=False)
+
+
+def count_rows(path):
+    """Data rows in a CSV (descriptions contain newlines, so parse rather than count lines)."""
+    import pandas as pd
+    if not os.path.exists(path):
+        return 0
+    return sum(len(chunk) for chunk in pd.read_csv(path, usecols=[0], chunksize=200_000))
+
+
+def dataset_rows(root):
+    data_dir = os.path.join(root, 'data')
+    files = sorted(os.listdir(data_dir))
+    raw = [f for f in files if f.startswith('raw_jobs_')]
+    enriched = [f for f in files if f.startswith('executive_sales_jobs_')]
+    return {
+        'raw': count_rows(os.path.join(data_dir, raw[-1])) if raw else 0,
+        'enriched': count_rows(os.path.join(data_dir, enriched[-1])) if enriched else 0,
+        'master': count_rows(os.path.join(data_dir, 'master_jobs_database.csv')),
+        'enriched_file': f"data/{enriched[-1]}" if enriched else '',
+    }
+
+
+def run_stage(root, command, log_path):
+    """
+    Run one stage in the workspace.
+
+    Returns:
+        (exit code, wall seconds, peak RSS in MB or None)
+    """
+    env = dict(os.environ, MPLBACKEND='Agg', PYTHONUNBUFFERED='1')
+    with open(log_path, 'w') as log:
+        start = time.perf_counter()
+        proc = subprocess.Popen([sys.executable] + command, cwd=root, stdout=log, stderr=subprocess.STDOUT, env=env)
+        if hasattr(os, 'wait4'):
+            _, status, usage = os.wait4(proc.pid, 0)
+            elapsed = time.perf_counter() - start
+            # ru_maxrss is KB on Linux, bytes on macOS
+            divisor = 1024 * 1024 if sys.platform == 'darwin' else 1024
+            return os.waitstatus_to_exitcode(status), elapsed, usage.ru_maxrss / divisor
+        returncode = proc.wait(timeout=STAGE_TIMEOUT)
+        return returncode, time.perf_counter() - start, None
+
+
+def benchmark_scale(scale, stages, seed, description_chars, keep=False):
+    """Generate data and run every stage at one scale."""
+    root = tempfile.mkdtemp(prefix=f'scale_bench_{scale}x_')
+    results = []
+    try:
+        print(f"\n📦 {scale}x: generating synthetic data in {root}")
+        start = time.perf_counter()
+        prepare_workspace(root, scale, seed, description_chars)
+        rows = dataset_rows(root)
+        print(f"   {rows['raw']:,} raw / {rows['enriched']:,} enriched / {rows['master']:,} master rows "
+              f"({time.perf_counter() - start:.1f}s)")
+
+        for name, command, source in STAGES:
+            if stages and name not in stages:
+                continue
+            if name != 'enrich':
+                rows = dataset_rows(root)
+            command = [part.format(enriched_file=rows['enriched_file']) for part in command]
+            log_path = os.path.join(root, f"{name}.log")
+            code, seconds, peak_mb = run_stage(root, command, log_path)
+            result = {
+                'stage': name, 'scale': scale, 'rows': rows[source], 'seconds': round(seconds, 3),
+                'rows_per_sec': round(rows[source] / seconds, 1) if seconds else None,
+                'peak_mb': round(peak_mb, 1) if peak_mb is not None else None, 'exit_code': code,
+            }
+            results.append(result)
+            status = '✅' if code == 0 else f'❌ exit {code}'
+            print(f"   {status} {name:<16} {seconds:>8.2f}s  "
+                  f"{result['rows_per_sec'] or 0:>10,.0f} rows/s  {result['peak_mb'] or 0:>7,.0f} MB")
+            if code != 0:
+                with open(log_path) as f:
+                    print('      ' + '\n      '.join(f.read().strip().splitlines()[-5:]))
+    finally:
+        if keep:
+            print(f"   Workspace kept: {root}")
+        else:
+            shutil.rmtree(root, ignore_errors=True)
+    return results
+
+
+def scaling_exponents(results):
+    """
+    Per stage, log(time ratio) / log(row ratio) between consecutive scales.
+
+    1.0 means time grows with input; 2.0 means it grows with input squared.
+    """
+    by_stage = {}
+    for r in results:
+        by_stage.setdefault(r['stage'], []).append(r)
+    exponents = {}
+    for stage, runs in by_stage.items():
+        runs = sorted((r for r in runs if r['exit_code'] == 0), key=lambda r: r['scale'])
+        steps = []
+        for a, b in zip(runs, runs[1:]):
+            if a['rows'] and b['rows'] > a['rows'] and a['seconds'] > 0:
+                steps.append({
+                    'from': a['scale'], 'to': b['scale'],
+                    'time_ratio': round(b['seconds'] / a['seconds'], 2),
+                    'row_ratio': round(b['rows'] / a['rows'], 2),
+                    'exponent': round(math.log(b['seconds'] / a['seconds']) / math.log(b['rows'] / a['rows']), 2),
+                    'memory_ratio': round(b['peak_mb'] / a['peak_mb'], 2) if a['peak_mb'] and b['peak_mb'] else None,
+                })
+        exponents[stage] = steps
+    return exponents
+
+
+def print_report(results, exponents):
+    print(f"\n{'SCALE BENCHMARK':-^78}")
+    print(f"{'Stage':<16} {'Scale':>6} {'Rows':>10} {'Time':>9} {'Rows/s':>10} {'Peak MB':>9}")
+    for r in sorted(results, key=lambda r: ([s[0] for s in STAGES].index(r['stage']), r['scale'])):
+        failed = '' if r['exit_code'] == 0 else '  (failed)'
+        print(f"{r['stage']:<16} {r['scale']:>5}x {r['rows']:>10,} {r['seconds']:>8.2f}s "
+              f"{r['rows_per_sec'] or 0:>10,.0f} {r['peak_mb'] or 0:>9,.0f}{failed}")
+
+    print(f"\n{'SCALING (time vs input growth)':-^78}")
+    for stage, steps in exponents.items():
+        for step in steps:
+            flag = '  ⚠️  superlinear' if step['exponent'] > 1.3 else ''
+            memory = f", memory x{step['memory_ratio']}" if step['memory_ratio'] else ''
+            print(f"{stage:<16} {step['from']}x→{step['to']}x: rows x{step['row_ratio']}, "
+                  f"time x{step['time_ratio']} (exponent {step['exponent']}{memory}){flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark pipeline stages on synthetic data at several scales')
+    parser.add_argument('--scales', default=','.join(str(s) for s in DEFAULT_SCALES),
+                        help='Comma-separated multiples of today\'s volume (default: 1,10)')
+    parser.add_argument('--stages', default='', help='Comma-separated stage names (default: all)')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    parser.add_argument('--description-chars', type=int, default=TARGET_DESCRIPTION_CHARS,
+                        help='Average description length of synthetic jobs')
+    parser.add_argument('--output', default=REPORT_PATH, help='Where to write the JSON results')
+    parser.add_argument('--keep', action='store_true', help='Keep the workspaces for inspection')
+    args = parser.parse_args()
+
+    scales = [float(s) if '.' in s else int(s) for s in args.scales.split(',') if s]
+    stages = {s for s in args.stages.split(',') if s}
+    unknown = stages - {name for name, _, _ in STAGES}
+    if unknown:
+        parser.error(f"unknown stages: {', '.join(sorted(unknown))}")
+
+    print("=" * 70)
+    print("📈 PIPELINE SCALE BENCHMARK")
+    print("=" * 70)
+
+    results = []
+    for scale in scales:
+        results.extend(benchmark_scale(scale, stages, args.seed, args.description_chars, args.keep))
+
+    exponents = scaling_exponents(results)
+    print_report(results, exponents)
+
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump({'generated_at': datetime.now().isoformat(timespec='seconds'), 'seed': args.seed,
+                   'scales': scales, 'results': results, 'scaling': exponents}, f, indent=2)
+    print(f"\n💾 Results saved to {args.output}")
+
+    if any(r['exit_code'] != 0 for r in results):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
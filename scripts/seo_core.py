@@ -7,11 +7,19 @@ Centralized SEO logic including:
 - FAQ content generators with data-driven answers
 - Internal linking engine
 - Content enrichment utilities
+- Content validation (thin content, duplicate and near-duplicate pages)
 """
 
 import json
+import os
+import re
+import zlib
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Tuple
+
+import numpy as np
 
 
 def generate_breadcrumb_schema(breadcrumbs: List[Dict[str, str]]) -> str:
@@ -215,27 +223,69 @@ def get_related_salary_pages(current_page: Dict[str, Any], all_pages: List[Dict[
 MIN_WORD_COUNT = 300
 MIN_FAQ_COUNT = 3
 
+TAG_RE = re.compile(r'<[^>]+>')
+
+# Near-duplicate detection: MinHash over word shingles, LSH banding for candidates.
+# 16 bands x 4 rows puts pairs at 0.9 similarity in a shared bucket >99.9% of the time.
+SHINGLE_SIZE = 5
+MINHASH_PERMUTATIONS = 64
+LSH_BANDS = 16
+NEAR_DUPLICATE_THRESHOLD = 0.9
+# Hash permutations h -> a*h + b (mod 2**32, a odd), fixed so results are reproducible
+_rng = np.random.default_rng(20260119)
+_MINHASH_A = (_rng.integers(0, 2**32, MINHASH_PERMUTATIONS, dtype=np.uint64) | 1).astype(np.uint32)
+_MINHASH_B = _rng.integers(0, 2**32, MINHASH_PERMUTATIONS, dtype=np.uint64).astype(np.uint32)
+_SHINGLE_MULTIPLIER = np.uint32(0x9E3779B1)
+
+# Below this many pages a process pool costs more than it saves
+PARALLEL_MIN_PAGES = 2000
+MAX_WORKERS = os.cpu_count() or 1
+
+
+def page_text(page_data: Dict[str, Any]) -> str:
+    """Body text of a page with HTML tags stripped."""
+    content = page_data.get('content', '') or page_data.get('html', '')
+    return TAG_RE.sub(' ', content)
+
+
+class PageIndex:
+    """Title and description counts across a page set, built once per validation run."""
+
+    def __init__(self, pages: List[Dict[str, Any]]):
+        self.titles = Counter(p.get('title') for p in pages if p.get('title'))
+        self.descriptions = Counter(p.get('description') for p in pages if p.get('description'))
+        self.page_ids = {id(p) for p in pages}
 
-def validate_page_content(page_data: Dict[str, Any], all_pages: List[Dict[str, Any]] = None) -> List[str]:
+    def __getstate__(self):
+        # Worker processes only validate copies of indexed pages, so identities
+        # don't carry over; None means every page checked is in the index
+        return {'titles': self.titles, 'descriptions': self.descriptions, 'page_ids': None}
+
+    def others(self, counts: Counter, value: Optional[str], page_data: Dict[str, Any]) -> int:
+        """How many other indexed pages share value."""
+        if not value:
+            return 0
+        indexed = self.page_ids is None or id(page_data) in self.page_ids
+        return counts.get(value, 0) - (1 if indexed else 0)
+
+
+def validate_page_content(page_data: Dict[str, Any], all_pages: List[Dict[str, Any]] = None,
+                          index: PageIndex = None) -> List[str]:
     """
     Validate page meets quality thresholds for pSEO.
 
     Args:
         page_data: Dict containing title, content/html, faqs, etc.
         all_pages: List of all pages for uniqueness checking
+        index: Prebuilt PageIndex (saves rebuilding it from all_pages per call)
 
     Returns:
         List of validation issues (empty if valid)
     """
     issues = []
 
-    # 1. Word count check
-    content = page_data.get('content', '') or page_data.get('html', '')
-    # Strip HTML tags for word count
-    import re
-    text_only = re.sub(r'<[^>]+>', ' ', content)
-    text_only = re.sub(r'\s+', ' ', text_only).strip()
-    word_count = len(text_only.split())
+    # 1. Word count check (HTML tags stripped)
+    word_count = len(page_text(page_data).split())
 
     if word_count < MIN_WORD_COUNT:
         issues.append(f"Thin content: {word_count} words (minimum: {MIN_WORD_COUNT})")
@@ -264,11 +314,14 @@ def validate_page_content(page_data: Dict[str, Any], all_pages: List[Dict[str, A
     elif len(description) < 50:
         issues.append(f"Description too short: {len(description)} chars (min: 50)")
 
-    # 5. Title uniqueness check
-    if all_pages:
-        existing_titles = [p.get('title') for p in all_pages if p.get('title') != title]
-        if title in existing_titles:
+    # 5. Title and description uniqueness checks
+    if index is None and all_pages:
+        index = PageIndex(all_pages)
+    if index is not None:
+        if index.others(index.titles, title, page_data) > 0:
             issues.append(f"Duplicate title found: {title}")
+        if index.others(index.descriptions, description, page_data) > 0:
+            issues.append(f"Duplicate description found: {description}")
 
     # 6. Slug/URL present
     if not page_data.get('slug') and not page_data.get('url'):
@@ -277,13 +330,80 @@ def validate_page_content(page_data: Dict[str, Any], all_pages: List[Dict[str, A
     return issues
 
 
-def validate_all_pages(pages: List[Dict[str, Any]], strict: bool = False) -> Dict[str, Any]:
+def minhash_signature(text: str) -> Optional[np.ndarray]:
+    """MinHash signature of a text's word shingles (None for empty text)."""
+    words = text.lower().split()
+    if not words:
+        return None
+    word_hashes = np.fromiter((zlib.crc32(word.encode('utf-8')) for word in words),
+                              dtype=np.uint32, count=len(words))
+    # Shingle hashes roll up SHINGLE_SIZE consecutive word hashes (uint32 math wraps)
+    n_shingles = max(len(words) - SHINGLE_SIZE + 1, 1)
+    shingles = np.zeros(n_shingles, dtype=np.uint32)
+    for offset in range(min(SHINGLE_SIZE, len(words))):
+        shingles = shingles * _SHINGLE_MULTIPLIER + word_hashes[offset:offset + n_shingles]
+    shingles = np.unique(shingles)
+    return (_MINHASH_A[:, None] * shingles[None, :] + _MINHASH_B[:, None]).min(axis=1)
+
+
+def find_near_duplicates(signatures: List[Optional[np.ndarray]]) -> Dict[int, Tuple[int, float]]:
+    """
+    Find near-duplicate pages from their MinHash signatures.
+
+    Pages sharing an LSH band bucket are compared with the first page in
+    that bucket only, so a large group of templated copies stays linear.
+
+    Returns:
+        Dict mapping page position to (most similar page position, estimated similarity)
+    """
+    rows = MINHASH_PERMUTATIONS // LSH_BANDS
+    matches = {}
+
+    def record(i, j, similarity):
+        if similarity > matches.get(i, (None, -1.0))[1]:
+            matches[i] = (j, similarity)
+
+    for band in range(LSH_BANDS):
+        buckets = defaultdict(list)
+        for pos, signature in enumerate(signatures):
+            if signature is not None:
+                buckets[signature[band * rows:(band + 1) * rows].tobytes()].append(pos)
+        for members in buckets.values():
+            first = members[0]
+            for other in members[1:]:
+                similarity = float(np.mean(signatures[first] == signatures[other]))
+                if similarity >= NEAR_DUPLICATE_THRESHOLD:
+                    record(first, other, similarity)
+                    record(other, first, similarity)
+    return matches
+
+
+_worker_index = None
+
+
+def _init_validation_worker(index: PageIndex):
+    global _worker_index
+    _worker_index = index
+
+
+def _check_page(page: Dict[str, Any], index: PageIndex) -> Tuple[List[str], Optional[np.ndarray]]:
+    """Per-page checks plus the page's MinHash signature."""
+    issues = validate_page_content(page, index=index)
+    return issues, minhash_signature(page_text(page))
+
+
+def _check_pages(pages: List[Dict[str, Any]]) -> List[Tuple[List[str], Optional[np.ndarray]]]:
+    return [_check_page(page, _worker_index) for page in pages]
+
+
+def validate_all_pages(pages: List[Dict[str, Any]], strict: bool = False, workers: int = None) -> Dict[str, Any]:
     """
     Validate all pages and return summary report.
 
     Args:
         pages: List of page data dicts
         strict: If True, raise exception on any issues
+        workers: Validation processes (defaults to the CPU count for large page sets)
 
     Returns:
         Dict with validation summary and issues by page
@@ -296,9 +416,28 @@ def validate_all_pages(pages: List[Dict[str, Any]], strict: bool = False) -> Dic
         'issue_summary': {}
     }
 
-    for page in pages:
+    index = PageIndex(pages)
+    if workers is None:
+        workers = MAX_WORKERS if len(pages) >= PARALLEL_MIN_PAGES else 1
+
+    if workers > 1:
+        chunk_size = max(1, len(pages) // (workers * 4))
+        chunks = [pages[i:i + chunk_size] for i in range(0, len(pages), chunk_size)]
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_validation_worker,
+                                 initargs=(index,)) as executor:
+            checked = [result for chunk in executor.map(_check_pages, chunks) for result in chunk]
+    else:
+        checked = [_check_page(page, index) for page in pages]
+
+    # Near-duplicate body text across the whole set
+    near_duplicates = find_near_duplicates([signature for _, signature in checked])
+
+    for pos, (page, (issues, _)) in enumerate(zip(pages, checked)):
         slug = page.get('slug', page.get('url', 'unknown'))
-        issues = validate_page_content(page, pages)
+        if pos in near_duplicates:
+            other, similarity = near_duplicates[pos]
+            other_slug = pages[other].get('slug', pages[other].get('url', 'unknown'))
+            issues.append(f"Near-duplicate content: {similarity:.0%} similar to {other_slug}")
 
         if issues:
             results['pages_with_issues'] += 1
@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+Local dev server for the CRO Report site.
+
+Serves site/ on localhost. With --watch it also polls data/, newsletters/,
+templates/includes/ and scripts/ and, on a change, re-runs only the build
+stages that read what changed (plus the stages downstream of them), using
+the read/write declarations in build_scheduler.py:
+- a newsletter edit re-runs the moves sync, newsletter archive and homepage
+- a templates/includes edit re-runs the nav/footer pass
+- a script edit re-runs the stages whose script imports it
+
+Stages run in this process, so pandas and matplotlib stay imported and
+job_data.load_jobs() results are cached between edits (keyed on the
+file's size and mtime; callers get a copy). Repo modules are re-imported
+before each stage so script edits take effect. The nav/footer pass only
+touches pages written during the rebuild unless the includes changed.
+Open pages reload themselves once a rebuild finishes.
+
+Stages that rewrite the data (enrichment, merge, comp aggregator, snapshot
+store) never run here; use build_scheduler.py for a full build.
+
+Usage:
+    python scripts/serve.py                  # serve site/ on :8000
+    python scripts/serve.py --watch          # serve and re-render on change
+    python scripts/serve.py --watch --build  # full in-process build first
+"""
+
+import argparse
+import contextlib
+import fnmatch
+import functools
+import io
+import os
+import re
+import runpy
+import sys
+import threading
+import time
+import traceback
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, 'scripts')
+from build_scheduler import STAGES, _overlaps
+
+SITE_DIR = 'site'
+SCRIPTS_DIR = 'scripts'
+INCLUDES_DIR = 'templates/includes'
+WATCH_PATHS = ['data', 'newsletters', INCLUDES_DIR, SCRIPTS_DIR]
+POLL_SECONDS = 0.25
+DEFAULT_PORT = 8000
+
+# Pipeline stages that rewrite data; the dev loop never re-runs them
+SKIP_STAGES = {'enrich', 'merge_to_master', 'comp_aggregator', 'snapshot_store'}
+# Run separately, on just the pages a rebuild wrote
+NAV_STAGE = 'nav_footer'
+
+RELOAD_SCRIPT = '''<script>(function(){var v=null;setInterval(function(){
+fetch('/__dev/version').then(function(r){return r.text()}).then(function(t){
+if(v!==null&&t!==v){location.reload()}v=t}).catch(function(){})},500)})();</script>'''
+
+_version = 0
+_frames = {}
+
+
+# =============================================================================
+# WATCHING
+# =============================================================================
+
+def scan(paths=WATCH_PATHS):
+    """Relative path -> mtime for every watched file."""
+    mtimes = {}
+    for root in paths:
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = [d for d in dirnames if d != '__pycache__']
+            for filename in filenames:
+                path = os.path.join(dirpath, filename).replace(os.sep, '/')
+                try:
+                    mtimes[path] = os.stat(path).st_mtime_ns
+                except OSError:
+                    pass
+    return mtimes
+
+
+def changed(before, after):
+    return {path for path in set(before) | set(after) if before.get(path) != after.get(path)}
+
+
+def _touches(path, resource):
+    return fnmatch.fnmatch(path, resource) or _overlaps(path, resource)
+
+
+@functools.lru_cache(maxsize=None)
+def _imports(script):
+    """Repo modules a script imports, directly or through other repo modules."""
+    found, queue = set(), [script]
+    while queue:
+        with open(queue.pop()) as f:
+            source = f.read()
+        for name in re.findall(r'^\s*(?:from|import)\s+([A-Za-z_]\w*)', source, re.MULTILINE):
+            module = f'{SCRIPTS_DIR}/{name}.py'
+            if module not in found and os.path.exists(module):
+                found.add(module)
+                queue.append(module)
+    return frozenset(found)
+
+
+def affected_stages(paths, stages=STAGES):
+    """Stages to re-run for changed paths, in workflow order, with everything downstream."""
+    if any(path.endswith('.py') for path in paths):
+        _imports.cache_clear()
+    runnable = [stage for stage in stages if stage['name'] not in SKIP_STAGES and not callable(stage['run'])]
+    hit = []
+    for stage in runnable:
+        scripts = {command[0] for command in stage['run']}
+        code = scripts.union(*(_imports(script) for script in scripts))
+        direct = any(path in code if path.endswith('.py') else
+                     any(_touches(path, resource) for resource in stage['reads'])
+                     for path in paths)
+        downstream = any(_overlaps(written, read) for earlier in hit
+                         for written in earlier['writes'] for read in stage['reads'])
+        if direct or downstream:
+            hit.append(stage)
+    return hit
+
+
+# =============================================================================
+# IN-PROCESS STAGES
+# =============================================================================
+
+def _signature(path):
+    """Size and mtime of a snapshot's CSV, or of its stored manifest once pruned."""
+    name = os.path.splitext(os.path.basename(path))[0]
+    for candidate in (path, f'data/snapshots/{name}.json'):
+        if os.path.exists(candidate):
+            stat = os.stat(candidate)
+            return candidate, stat.st_size, stat.st_mtime_ns
+    return None
+
+
+def _cached_load_jobs(load_jobs):
+    @functools.wraps(load_jobs)
+    def cached(path, description=True, columns=None, verbose=True):
+        signature = _signature(path)
+        if signature is None:
+            return load_jobs(path, description=description, columns=columns, verbose=verbose)
+        key = (signature, description, tuple(columns) if columns is not None else None)
+        if key not in _frames:
+            _frames[key] = load_jobs(path, description=description, columns=columns, verbose=verbose)
+        return _frames[key].copy()
+    return cached
+
+
+def _fresh_modules():
+    """Drop repo modules so the next run imports current code; re-wrap load_jobs."""
+    scripts_dir = os.path.abspath(SCRIPTS_DIR)
+    keep = {'build_scheduler', 'serve', '__main__'}
+    for name, module in list(sys.modules.items()):
+        path = getattr(module, '__file__', None) or ''
+        if name not in keep and os.path.abspath(path).startswith(scripts_dir + os.sep):
+            del sys.modules[name]
+    import job_data
+    job_data.load_jobs = _cached_load_jobs(job_data.load_jobs)
+
+
+def run_script(command):
+    """Run one script in this process. Returns (ok, captured output)."""
+    _fresh_modules()
+    output = io.StringIO()
+    argv = sys.argv
+    sys.argv = list(command)
+    ok = True
+    try:
+        with contextlib.redirect_stdout(output), contextlib.redirect_stderr(output):
+            runpy.run_path(command[0], run_name='__main__')
+    except SystemExit as e:
+        ok = e.code in (None, 0)
+    except Exception:
+        output.write(traceback.format_exc())
+        ok = False
+    finally:
+        sys.argv = argv
+    return ok, output.getvalue()
+
+
+def update_nav(html_files=None):
+    _fresh_modules()
+    import update_nav_footer
+    with contextlib.redirect_stdout(io.StringIO()):
+        update_nav_footer.main(html_files)
+
+
+def _written_pages(since):
+    pages = []
+    for dirpath, _, filenames in os.walk(SITE_DIR):
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            if filename.endswith('.html') and os.stat(path).st_mtime >= since:
+                pages.append(path)
+    return pages
+
+
+def rebuild(paths, stages=None):
+    """Re-run the stages affected by paths. Returns the stages that ran."""
+    global _version
+    started = time.time()
+    clock = time.perf_counter()
+    stages = affected_stages(paths) if stages is None else stages
+    page_stages = [stage for stage in stages if stage['name'] != NAV_STAGE]
+    includes_changed = any(path.startswith(INCLUDES_DIR + '/') for path in paths)
+    shown = ', '.join(sorted(paths)[:3]) + (f' (+{len(paths) - 3})' if len(paths) > 3 else '')
+    print(f"\n🔁 {shown}")
+
+    ran = []
+    for stage in page_stages:
+        stage_clock = time.perf_counter()
+        for command in stage['run']:
+            ok, output = run_script(command)
+            if not ok:
+                print(f"   ❌ {stage['name']} failed:")
+                print(''.join('      ' + line for line in output.splitlines(True)[-20:]), end='')
+                return ran
+        ran.append(stage)
+        print(f"   ✓ {stage['name']} ({time.perf_counter() - stage_clock:.2f}s)")
+
+    if includes_changed or ran:
+        nav_clock = time.perf_counter()
+        pages = None if includes_changed else _written_pages(started)
+        if pages is None or pages:
+            update_nav(pages)
+            ran.append(next(stage for stage in STAGES if stage['name'] == NAV_STAGE))
+            print(f"   ✓ {NAV_STAGE} ({'all pages' if pages is None else f'{len(pages)} pages'}, "
+                  f"{time.perf_counter() - nav_clock:.2f}s)")
+
+    _version += 1
+    if ran:
+        print(f"✅ Rebuilt in {time.perf_counter() - clock:.2f}s")
+    else:
+        print("   (nothing to re-render)")
+    return ran
+
+
+def watch(poll=POLL_SECONDS):
+    baseline = scan()
+    print(f"👀 Watching {', '.join(WATCH_PATHS)} ({len(baseline)} files)")
+    while True:
+        time.sleep(poll)
+        current = scan()
+        paths = changed(baseline, current)
+        if not paths:
+            continue
+        ran = rebuild(paths)
+        # Files the stages wrote are outputs, not edits; anything else that
+        # changed during the rebuild is picked up on the next poll
+        after = scan()
+        outputs = [written for stage in ran for written in stage['writes']]
+        edits = {path for path in changed(current, after) if not any(_touches(path, w) for w in outputs)}
+        baseline = {path: mtime for path, mtime in after.items() if path not in edits}
+
+
+# =============================================================================
+# SERVER
+# =============================================================================
+
+class DevHandler(SimpleHTTPRequestHandler):
+    """Static files from site/, with a reload hook injected into HTML pages."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, directory=SITE_DIR, **kwargs)
+
+    def do_GET(self):
+        if self.path == '/__dev/version':
+            return self._send(str(_version).encode(), 'text/plain')
+        path = self.translate_path(self.path)
+        if os.path.isdir(path):
+            if not self.path.split('?')[0].endswith('/'):
+                return super().do_GET()  # redirect to the trailing-slash URL
+            path = os.path.join(path, 'index.html')
+        if path.endswith('.html') and os.path.isfile(path):
+            with open(path, 'rb') as f:
+                body = f.read()
+            marker = b'</body>'
+            script = RELOAD_SCRIPT.encode()
+            body = body.replace(marker, script + marker, 1) if marker in body else body + script
+            return self._send(body, 'text/html; charset=utf-8')
+        return super().do_GET()
+
+    def _send(self, body, content_type):
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(port=DEFAULT_PORT):
+    server = ThreadingHTTPServer(('127.0.0.1', port), DevHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"🌐 Serving {SITE_DIR}/ at http://localhost:{port}/")
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve site/ locally, optionally re-rendering on change')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--watch', action='store_true', help='Re-render affected pages when inputs change')
+    parser.add_argument('--build', action='store_true', help='Run every page stage once before serving')
+    args = parser.parse_args()
+
+    os.environ.setdefault('MPLBACKEND', 'Agg')
+    print("="*70)
+    print("🛠️  CRO REPORT DEV SERVER")
+    print("="*70)
+    if args.build:
+        rebuild({'(full build)'}, [stage for stage in STAGES
+                                   if stage['name'] not in SKIP_STAGES and not callable(stage['run'])])
+    server = serve(args.port)
+    try:
+        if args.watch:
+            watch()
+        else:
+            threading.Event().wait()
+    except KeyboardInterrupt:
+        print("\n👋 Stopped")
+    finally:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Diff two weekly snapshots: which roles opened, closed or changed.
+
+Both snapshots are hash-joined on the job key from job_index.py (a hash of
+job_url_direct, falling back to job_url; company/title/location for rows
+without a URL), so the cost is linear in snapshot size. Rows present in
+both are compared field by field on title and comp.
+
+The result is written to data/snapshot_diff.json and feeds:
+- The homepage "new this week" count
+- Time-to-fill stats for closed roles (first to last import, from the job index)
+- generate_job_pages.py's stale page set (pages of roles that just closed)
+
+Usage:
+    python scripts/snapshot_diff.py                 # two most recent snapshots
+    python scripts/snapshot_diff.py OLD.csv NEW.csv
+
+    from snapshot_diff import diff_snapshots
+    diff = diff_snapshots(old_df, new_df)           # added/removed/changed frames
+"""
+
+import json
+import os
+import sys
+from datetime import datetime
+from typing import Dict
+
+import pandas as pd
+
+sys.path.insert(0, 'scripts')
+from job_data import load_jobs, snapshot_paths
+from job_index import job_keys, key_hash, seen_dates
+from snapshot_stats import snapshot_date
+
+DATA_DIR = 'data'
+DIFF_FILE = f'{DATA_DIR}/snapshot_diff.json'
+
+# Fields compared for rows present in both snapshots
+CHANGE_FIELDS = ['title', 'min_amount', 'max_amount', 'interval']
+# Carried into the JSON for each added/removed/changed role
+ROLE_FIELDS = ['title', 'company', 'location', 'job_url', 'min_amount', 'max_amount']
+DIFF_COLUMNS = list(dict.fromkeys(['job_url_direct', 'job_url'] + ROLE_FIELDS + CHANGE_FIELDS))
+
+
+def stable_keys(df: pd.DataFrame) -> pd.Series:
+    """job_index key per row; company/title/location hash where there is no URL."""
+    keys = job_keys(df)
+    missing = keys.isna()
+    if missing.any():
+        fallback = df.loc[missing].reindex(columns=['company', 'title', 'location']).astype(object).fillna('')
+        keys[missing] = [key_hash('|'.join(map(str, values))) for values in fallback.itertuples(index=False)]
+    return keys
+
+
+def _keyed(df: pd.DataFrame) -> pd.DataFrame:
+    keyed = df.assign(job_key=stable_keys(df).values)
+    return keyed.drop_duplicates('job_key', keep='first').set_index('job_key')
+
+
+def _differs(old: pd.Series, new: pd.Series) -> pd.Series:
+    """Elementwise inequality where two missing values count as equal."""
+    old, new = old.astype(object), new.astype(object)
+    both_missing = old.isna() & new.isna()
+    return (old != new) & ~both_missing
+
+
+def diff_snapshots(old_df: pd.DataFrame, new_df: pd.DataFrame) -> Dict:
+    """
+    Hash-join two snapshots on the job key.
+
+    Returns:
+        {'added': new rows, 'removed': old rows, 'changed': new rows whose
+         CHANGE_FIELDS differ, 'changes': long frame (job_key, field, old, new),
+         'unchanged': count}; frames are indexed by job_key
+    """
+    old, new = _keyed(old_df), _keyed(new_df)
+    common = old.index.intersection(new.index)
+    added = new[~new.index.isin(old.index)]
+    removed = old[~old.index.isin(new.index)]
+
+    changes = []
+    changed_mask = pd.Series(False, index=common)
+    for field in CHANGE_FIELDS:
+        if field not in old.columns or field not in new.columns:
+            continue
+        before, after = old.loc[common, field], new.loc[common, field]
+        differs = _differs(before, after)
+        changed_mask |= differs
+        if differs.any():
+            changes.append(pd.DataFrame({
+                'job_key': common[differs.values], 'field': field,
+                'old': before[differs].astype(object).values, 'new': after[differs].astype(object).values,
+            }))
+    changes = pd.concat(changes, ignore_index=True) if changes else \
+        pd.DataFrame(columns=['job_key', 'field', 'old', 'new'])
+
+    return {
+        'added': added,
+        'removed': removed,
+        'changed': new.loc[common[changed_mask.values]],
+        'changes': changes,
+        'unchanged': int(len(common) - changed_mask.sum()),
+    }
+
+
+def _value(value):
+    """JSON-safe scalar (NaN -> None, whole floats -> int)."""
+    if pd.isna(value):
+        return None
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value if isinstance(value, (int, float, bool)) else str(value)
+
+
+def _roles(df: pd.DataFrame, extra=()) -> list:
+    columns = [col for col in list(ROLE_FIELDS) + list(extra) if col in df.columns]
+    return [dict({'job_key': key}, **{col: _value(value) for col, value in zip(columns, values)})
+            for key, values in zip(df.index, df[columns].itertuples(index=False, name=None))]
+
+
+def time_to_fill(removed: pd.DataFrame) -> Dict:
+    """Days from first to last import for closed roles the job index has seen."""
+    days = removed['days_open'].dropna() if 'days_open' in removed.columns else pd.Series(dtype=float)
+    if days.empty:
+        return {'roles': 0, 'median_days': None, 'mean_days': None}
+    return {'roles': int(len(days)), 'median_days': float(days.median()), 'mean_days': round(float(days.mean()), 1)}
+
+
+def build_report(old_path: str, new_path: str) -> Dict:
+    old_df = load_jobs(old_path, description=False, columns=DIFF_COLUMNS, verbose=False)
+    new_df = load_jobs(new_path, description=False, columns=DIFF_COLUMNS, verbose=False)
+    diff = diff_snapshots(old_df, new_df)
+
+    removed = diff['removed']
+    removed = removed.join(seen_dates(removed)[['first_seen', 'last_seen', 'days_open']])
+    changes = diff['changes']
+    by_key = {}
+    for key, field, before, after in changes.itertuples(index=False, name=None):
+        by_key.setdefault(key, {})[field] = [_value(before), _value(after)]
+    changed = _roles(diff['changed'])
+    for role in changed:
+        role['changes'] = by_key.get(role['job_key'], {})
+
+    return {
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'old': os.path.basename(old_path),
+        'new': os.path.basename(new_path),
+        'old_date': snapshot_date(old_path),
+        'new_date': snapshot_date(new_path),
+        'counts': {
+            'old_rows': len(old_df),
+            'new_rows': len(new_df),
+            'added': len(diff['added']),
+            'removed': len(removed),
+            'changed': len(diff['changed']),
+            'unchanged': diff['unchanged'],
+        },
+        'field_changes': {field: int(count) for field, count in changes['field'].value_counts().items()},
+        'time_to_fill': time_to_fill(removed),
+        'added': _roles(diff['added']),
+        'removed': _roles(removed, extra=['first_seen', 'last_seen', 'days_open']),
+        'changed': changed,
+    }
+
+
+def load_diff(new_path: str = None, diff_file: str = DIFF_FILE) -> Dict:
+    """The saved diff, or None if missing or for a different latest snapshot."""
+    if not os.path.exists(diff_file):
+        return None
+    with open(diff_file) as f:
+        diff = json.load(f)
+    if new_path and diff.get('new') != os.path.basename(new_path):
+        return None
+    return diff
+
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description='Diff two job snapshots')
+    parser.add_argument('snapshots', nargs='*', metavar='CSV', help='OLD and NEW snapshot (default: two most recent)')
+    parser.add_argument('--output', default=DIFF_FILE)
+    args = parser.parse_args()
+
+    print("="*70)
+    print("🔀 SNAPSHOT DIFF")
+    print("="*70)
+
+    if len(args.snapshots) == 2:
+        old_path, new_path = args.snapshots
+    elif args.snapshots:
+        parser.error('pass both OLD and NEW, or neither')
+    else:
+        paths = snapshot_paths()
+        if len(paths) < 2:
+            print("⚠️  Need two snapshots to diff - skipping")
+            sys.exit(0)
+        old_path, new_path = paths[-2], paths[-1]
+
+    report = build_report(old_path, new_path)
+    counts = report['counts']
+    print(f"📂 {report['old']} ({counts['old_rows']}) → {report['new']} ({counts['new_rows']})")
+    print(f"   New roles:      {counts['added']:>6}")
+    print(f"   Closed roles:   {counts['removed']:>6}")
+    print(f"   Changed roles:  {counts['changed']:>6}  {report['field_changes']}")
+    print(f"   Unchanged:      {counts['unchanged']:>6}")
+    fill = report['time_to_fill']
+    if fill['roles']:
+        print(f"   Time to fill:   median {fill['median_days']:.0f} days over {fill['roles']} closed roles")
+
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n💾 Saved {args.output}")
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Per-snapshot stats manifest for the weekly executive_sales_jobs_*.csv files.
+
+The enrichment step records a small summary of each snapshot it writes
+(counts by seniority, metro and remote, salary sums, disclosure rate and the
+top-paying role) in data/snapshot_stats.json. The homepage, social preview
+and trend tracking read those entries instead of re-reading whole CSVs, so
+their cost no longer grows with snapshot size.
+
+Salary figures are stored as sums and counts rather than averages so entries
+stay exact when combined. Snapshots missing from the manifest (or whose file
+size changed since they were recorded) are backfilled on first read, loading
+only the stats columns.
+
+Usage:
+    from snapshot_stats import record_snapshot, latest_snapshots
+    record_snapshot(enriched_filename, df_executive)    # enrichment step
+    current, previous = latest_snapshots(2)             # readers
+
+    python scripts/snapshot_stats.py              # backfill and list snapshots
+    python scripts/snapshot_stats.py --rebuild    # recompute every entry
+"""
+
+import json
+import os
+import re
+import sys
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+sys.path.insert(0, 'scripts')
+from cro_comp_aggregator import extract_metro
+from job_data import load_jobs, snapshot_paths, to_bool
+from snapshot_store import source_bytes
+
+DATA_DIR = 'data'
+MANIFEST = f'{DATA_DIR}/snapshot_stats.json'
+
+# Everything compute_stats reads; backfills never load descriptions
+STATS_COLUMNS = ['title', 'company', 'location', 'seniority', 'is_remote', 'min_amount', 'max_amount']
+
+
+def snapshot_date(path: str) -> str:
+    """ISO date of a snapshot from its filename (executive_sales_jobs_YYYYMMDD.csv)."""
+    match = re.search(r'(\d{8})', os.path.basename(path))
+    if not match:
+        return datetime.now().strftime('%Y-%m-%d')
+    stamp = match.group(1)
+    return f"{stamp[:4]}-{stamp[4:6]}-{stamp[6:8]}"
+
+
+def _counts(values: pd.Series) -> Dict[str, int]:
+    counts = values.dropna().astype(object).value_counts()
+    return {str(name): int(count) for name, count in counts.items()}
+
+
+def compute_stats(df: pd.DataFrame, path: str) -> Dict:
+    """Summary of one snapshot; df needs only the STATS_COLUMNS it has."""
+    rows = len(df)
+    if 'is_remote' in df.columns:
+        remote = int(to_bool(df['is_remote']).sum())
+    elif 'location' in df.columns:
+        remote = int(df['location'].astype(str).str.lower().str.contains('remote', na=False).sum())
+    else:
+        remote = 0
+
+    min_amount = pd.to_numeric(df['min_amount'], errors='coerce') if 'min_amount' in df.columns \
+        else pd.Series(float('nan'), index=df.index)
+    max_amount = pd.to_numeric(df['max_amount'], errors='coerce') if 'max_amount' in df.columns \
+        else pd.Series(float('nan'), index=df.index)
+    min_valid = min_amount[min_amount > 0]
+    max_valid = max_amount[max_amount > 0]
+    disclosed = int(((min_amount > 0) | (max_amount > 0)).sum())
+
+    top_salary = None
+    if len(max_valid):
+        top = df.loc[max_valid.idxmax()]
+        top_salary = {
+            'title': str(top.get('title', '')),
+            'company': str(top.get('company', '')),
+            'max_amount': int(max_valid.max()),
+        }
+
+    metros = df['location'].map(extract_metro) if 'location' in df.columns else pd.Series(dtype=object)
+    return {
+        'file': os.path.basename(path),
+        'bytes': source_bytes(path),
+        'date': snapshot_date(path),
+        'rows': rows,
+        'unique_companies': int(df['company'].nunique()) if 'company' in df.columns else 0,
+        'by_seniority': _counts(df['seniority']) if 'seniority' in df.columns else {},
+        'by_metro': _counts(metros),
+        'remote': remote,
+        'salary': {
+            'disclosed': disclosed,
+            'min_sum': float(min_valid.sum()),
+            'min_count': int(len(min_valid)),
+            'max_sum': float(max_valid.sum()),
+            'max_count': int(len(max_valid)),
+        },
+        'disclosure_rate': round(disclosed / rows * 100, 1) if rows else 0.0,
+        'top_salary': top_salary,
+    }
+
+
+def load_manifest(path: str = MANIFEST) -> Dict:
+    if os.path.exists(path):
+        with open(path) as f:
+            return json.load(f)
+    return {'snapshots': {}}
+
+
+def save_manifest(manifest: Dict, path: str = MANIFEST):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    manifest['updated_at'] = datetime.now().isoformat(timespec='seconds')
+    manifest['snapshots'] = dict(sorted(manifest['snapshots'].items()))
+    with open(path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+
+def _is_current(entry: Optional[Dict], path: str) -> bool:
+    return bool(entry) and entry.get('bytes') == source_bytes(path)
+
+
+def record_snapshot(path: str, df: pd.DataFrame = None, manifest_path: str = MANIFEST) -> Dict:
+    """
+    Compute and store the stats entry for one snapshot file.
+
+    Pass the DataFrame that was just written to skip re-reading the file.
+    A 'roles' count recorded by merge_to_master.py survives only if the
+    file is unchanged.
+    """
+    if df is None:
+        df = load_jobs(path, description=False, columns=STATS_COLUMNS, verbose=False)
+    manifest = load_manifest(manifest_path)
+    previous = manifest['snapshots'].get(os.path.basename(path))
+    stats = compute_stats(df, path)
+    if _is_current(previous, path) and 'roles' in previous:
+        stats['roles'] = previous['roles']
+    manifest['snapshots'][stats['file']] = stats
+    save_manifest(manifest, manifest_path)
+    return stats
+
+
+def record_roles(path: str, roles: int, manifest_path: str = MANIFEST) -> Dict:
+    """Store the distinct-role count (reposts collapsed) for a snapshot."""
+    stats = snapshot(path, manifest_path)
+    manifest = load_manifest(manifest_path)
+    stats['roles'] = int(roles)
+    manifest['snapshots'][stats['file']] = stats
+    save_manifest(manifest, manifest_path)
+    return stats
+
+
+def snapshot(path: str, manifest_path: str = MANIFEST) -> Dict:
+    """Stats entry for one snapshot, backfilling it if missing or stale."""
+    entry = load_manifest(manifest_path)['snapshots'].get(os.path.basename(path))
+    if _is_current(entry, path):
+        return entry
+    return record_snapshot(path, manifest_path=manifest_path)
+
+
+def latest_snapshots(n: int = 2, manifest_path: str = MANIFEST) -> List[Dict]:
+    """Stats for the n most recent snapshots, newest first (fewer if there are fewer files)."""
+    return [snapshot(path, manifest_path) for path in reversed(snapshot_paths()[-n:])]
+
+
+def avg_min_salary(stats: Dict) -> int:
+    salary = stats['salary']
+    return int(salary['min_sum'] / salary['min_count']) if salary['min_count'] else 0
+
+
+def avg_max_salary(stats: Dict) -> int:
+    salary = stats['salary']
+    return int(salary['max_sum'] / salary['max_count']) if salary['max_count'] else 0
+
+
+def remote_pct(stats: Dict) -> float:
+    return stats['remote'] / stats['rows'] * 100 if stats['rows'] else 0
+
+
+def wow_change_pct(current: Dict, previous: Optional[Dict], key: str = 'rows') -> float:
+    """Week-over-week change in percent (0 without a previous snapshot)."""
+    if not previous or not previous.get(key):
+        return 0
+    return (current.get(key, 0) - previous[key]) / previous[key] * 100
+
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description='Backfill and list per-snapshot stats')
+    parser.add_argument('--rebuild', action='store_true', help='Recompute every entry')
+    args = parser.parse_args()
+
+    files = snapshot_paths()
+    print(f"{'Snapshot':<34} {'Rows':>6} {'Remote':>7} {'Salary':>7} {'Avg max':>10}")
+    for path in files:
+        stats = record_snapshot(path) if args.rebuild else snapshot(path)
+        print(f"{stats['file']:<34} {stats['rows']:>6} {remote_pct(stats):>6.1f}% "
+              f"{stats['disclosure_rate']:>6.1f}% ${avg_max_salary(stats):>9,}")
+    print(f"\n💾 {len(files)} snapshots in {MANIFEST}")
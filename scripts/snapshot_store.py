@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+"""
+Content-addressed storage for the weekly executive_sales_jobs_*.csv snapshots.
+
+Consecutive snapshots share most of their rows, and each row repeats its
+multi-KB description. The store keeps every distinct row once:
+- Row objects: the row's CSV line, keyed by a hash of the line and column
+  layout, with the description replaced by a reference to a separately
+  stored description object
+- Objects packed per snapshot that introduced them (gzipped CSV), split into
+  rows and descriptions so reading without descriptions never decompresses
+  them
+- One manifest per snapshot: ordered membership list, the rows added and
+  removed since the previous snapshot, and per-snapshot stamp columns
+  (week_added) stored once
+
+Packs and index.tsv are append-only and manifests are written once per
+snapshot, so each week adds only its new objects to the repository.
+
+open_csv() is the compatibility layer for existing readers: it returns the
+CSV path when the file is on disk, and otherwise the stored snapshot as
+in-memory CSV text that pd.read_csv parses to the same frame (stamp columns
+come last). job_data.load_jobs and job_data.snapshot_paths use it, so
+readers work the same after old CSVs are pruned.
+
+Usage:
+    python scripts/snapshot_store.py --ingest              # store every snapshot CSV
+    python scripts/snapshot_store.py --ingest --prune      # ...and drop verified old CSVs
+    python scripts/snapshot_store.py --materialize data/executive_sales_jobs_20260103.csv
+    python scripts/snapshot_store.py --report              # size and load time vs CSVs
+
+    from snapshot_store import open_csv
+    df = pd.read_csv(open_csv(path, usecols=['title', 'company']), usecols=['title', 'company'])
+"""
+
+import csv
+import glob
+import hashlib
+import io
+import json
+import os
+import re
+import sys
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Union
+
+import pandas as pd
+
+DATA_DIR = 'data'
+STORE_DIR = f'{DATA_DIR}/snapshots'
+PACK_DIR = f'{STORE_DIR}/packs'
+INDEX_FILE = f'{STORE_DIR}/index.tsv'
+SNAPSHOT_PATTERN = f'{DATA_DIR}/executive_sales_jobs_*.csv'
+
+DESCRIPTION_COLUMN = 'description'
+# Per-snapshot stamps; stored once in the manifest when constant so that an
+# unchanged job hashes the same in every snapshot
+STAMP_COLUMNS = ['week_added', 'import_date', 'import_week']
+# Marks a description reference inside a stored line (never parsed as a number)
+DESCRIPTION_REF = '@'
+DESCRIPTION_REF_PATTERN = re.compile(r'@([0-9a-f]{16})')
+
+# Newest snapshot CSVs kept on disk by --prune (CI passes the latest to cro_comp_aggregator.py)
+KEEP_CSVS = 2
+
+
+def _hash(text: str) -> str:
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()[:16]
+
+
+def _quote(text: str) -> str:
+    return '"' + text.replace('"', '""') + '"'
+
+
+def snapshot_name(path: str) -> str:
+    """Store name of a snapshot path (file stem)."""
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+def _manifest_path(name: str) -> str:
+    return f'{STORE_DIR}/{name}.json'
+
+
+def _pack_path(pack: str, kind: str) -> str:
+    return f'{PACK_DIR}/{pack}.{kind}.csv.gz'
+
+
+def has_snapshot(path: str) -> bool:
+    return os.path.exists(_manifest_path(snapshot_name(path)))
+
+
+def stored_names() -> List[str]:
+    """Snapshot names in the store, oldest first."""
+    return sorted(snapshot_name(path) for path in glob.glob(f'{STORE_DIR}/*.json'))
+
+
+def snapshot_paths() -> List[str]:
+    """Snapshot CSV paths on disk or in the store, oldest first (YYYYMMDD names sort by date)."""
+    paths = set(glob.glob(SNAPSHOT_PATTERN))
+    paths.update(f'{DATA_DIR}/{name}.csv' for name in stored_names())
+    return sorted(paths)
+
+
+def load_manifest(name: str) -> Dict:
+    with open(_manifest_path(name)) as f:
+        return json.load(f)
+
+
+def load_index() -> Dict[str, Dict[str, str]]:
+    """{'row': {hash: pack}, 'description': {hash: pack}}"""
+    index = {'row': {}, 'description': {}}
+    if os.path.exists(INDEX_FILE):
+        with open(INDEX_FILE) as f:
+            for line in f:
+                kind, key, pack = line.rstrip('\n').split('\t')
+                index[kind][key] = pack
+    return index
+
+
+def _read_pack(pack: str, kind: str) -> pd.Series:
+    """Objects in one pack as a string Series indexed by hash."""
+    path = _pack_path(pack, kind)
+    if not os.path.exists(path):
+        return pd.Series(dtype=object)
+    return pd.read_csv(path, dtype=str, keep_default_na=False, index_col='h')['v']
+
+
+def _write_pack(pack: str, kind: str, objects: Dict[str, str]):
+    """Write (or extend) a pack; mtime=0 keeps the gzip bytes reproducible."""
+    merged = {**_read_pack(pack, kind).to_dict(), **objects}
+    frame = pd.DataFrame({'v': list(merged.values())}, index=pd.Index(list(merged), name='h'))
+    frame.to_csv(_pack_path(pack, kind), compression={'method': 'gzip', 'compresslevel': 9, 'mtime': 0})
+
+
+def _encode_rows(df: pd.DataFrame):
+    """
+    Turn string-typed rows into row and description objects.
+
+    Returns:
+        (row hashes in order, {row hash: CSV line}, {description hash: text})
+    """
+    layout = ','.join(df.columns)
+    description_at = list(df.columns).index(DESCRIPTION_COLUMN) if DESCRIPTION_COLUMN in df.columns else None
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='')
+    members, rows, descriptions = [], {}, {}
+    for values in df.itertuples(index=False, name=None):
+        values = list(values)
+        if description_at is not None and values[description_at] != '':
+            desc_hash = _hash(values[description_at])
+            descriptions[desc_hash] = values[description_at]
+            values[description_at] = DESCRIPTION_REF + desc_hash
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerow(values)
+        line = buffer.getvalue()
+        row_hash = _hash(f'{layout}\n{line}')
+        members.append(row_hash)
+        rows[row_hash] = line
+    return members, rows, descriptions
+
+
+def store_snapshot(path: str, verbose: bool = True) -> Dict:
+    """
+    Add (or refresh) one snapshot CSV in the store.
+
+    Returns:
+        The snapshot's manifest
+    """
+    os.makedirs(PACK_DIR, exist_ok=True)
+    name = snapshot_name(path)
+    df = pd.read_csv(path, dtype=str, keep_default_na=False)
+    constants = {col: df[col].iloc[0] for col in STAMP_COLUMNS
+                 if col in df.columns and len(df) and df[col].nunique() == 1}
+    stored = df.drop(columns=list(constants))
+    members, rows, descriptions = _encode_rows(stored)
+
+    index = load_index()
+    new_rows = {key: line for key, line in rows.items() if key not in index['row']}
+    new_descriptions = {key: text for key, text in descriptions.items() if key not in index['description']}
+    if new_rows:
+        _write_pack(name, 'rows', new_rows)
+    if new_descriptions:
+        _write_pack(name, 'descriptions', new_descriptions)
+    with open(INDEX_FILE, 'a') as f:
+        for key in new_rows:
+            f.write(f'row\t{key}\t{name}\n')
+        for key in new_descriptions:
+            f.write(f'description\t{key}\t{name}\n')
+    index['row'].update(dict.fromkeys(new_rows, name))
+    index['description'].update(dict.fromkeys(new_descriptions, name))
+
+    earlier = [other for other in stored_names() if other < name]
+    parent = earlier[-1] if earlier else None
+    parent_members = set(load_manifest(parent)['members']) if parent else set()
+    member_set = set(members)
+
+    manifest = {
+        'snapshot': name,
+        'parent': parent,
+        'columns': list(df.columns),
+        'layout': list(stored.columns),
+        'constants': constants,
+        'rows': len(members),
+        'source_bytes': os.path.getsize(path),
+        'stored_at': datetime.now().isoformat(timespec='seconds'),
+        'row_packs': sorted({index['row'][key] for key in member_set}),
+        'description_packs': sorted({index['description'][key] for key in descriptions}),
+        'added': sorted(member_set - parent_members),
+        'removed': sorted(parent_members - member_set),
+        'members': members,
+    }
+    with open(_manifest_path(name), 'w') as f:
+        json.dump(manifest, f, indent=1)
+
+    if verbose:
+        print(f"🗄️  Stored {name}: {len(members)} rows, +{len(manifest['added'])} / "
+              f"-{len(manifest['removed'])} vs {parent or 'empty store'}, "
+              f"{len(new_rows)} new row objects, {len(new_descriptions)} new descriptions")
+    return manifest
+
+
+def _snapshot_text(manifest: Dict, descriptions: bool) -> str:
+    """
+    The snapshot as CSV text: stored columns, then stamp columns.
+
+    Without descriptions the description column keeps its @hash references,
+    so callers must leave it out of usecols.
+    """
+    needed = set(manifest['members'])
+    lines = {}
+    for pack in manifest['row_packs']:
+        found = _read_pack(pack, 'rows')
+        lines.update(found[found.index.isin(needed)].to_dict())
+    constants = manifest.get('constants', {})
+    suffix = ''.join(',' + _quote(value) for value in constants.values())
+    header = ','.join(_quote(col) for col in manifest['layout'] + list(constants))
+    text = header + '\n' + ''.join(lines[key] + suffix + '\n' for key in manifest['members'])
+
+    if descriptions:
+        texts = {}
+        for pack in manifest['description_packs']:
+            texts.update(_read_pack(pack, 'descriptions').to_dict())
+        text = DESCRIPTION_REF_PATTERN.sub(lambda match: _quote(texts[match.group(1)]), text)
+    return text
+
+
+def open_csv(path: str, usecols: Iterable[str] = None) -> Union[str, io.StringIO]:
+    """
+    CSV source for pd.read_csv: the path itself when the file is on disk,
+    otherwise the stored snapshot as in-memory CSV. Descriptions are only
+    decompressed when usecols is None or includes them.
+    """
+    if os.path.exists(path) or not has_snapshot(path):
+        return path
+    descriptions = usecols is None or DESCRIPTION_COLUMN in usecols
+    return io.StringIO(_snapshot_text(load_manifest(snapshot_name(path)), descriptions))
+
+
+def read_snapshot(path: str, usecols: Iterable[str] = None) -> pd.DataFrame:
+    """A stored snapshot as pd.read_csv(path, usecols=usecols) would return it."""
+    manifest = load_manifest(snapshot_name(path))
+    wanted = [col for col in manifest['columns'] if usecols is None or col in usecols]
+    df = pd.read_csv(open_csv(path, wanted), usecols=wanted)
+    return df[wanted]
+
+
+def csv_columns(path: str) -> List[str]:
+    """Header of a snapshot CSV, on disk or in the store."""
+    if os.path.exists(path) or not has_snapshot(path):
+        return list(pd.read_csv(path, nrows=0).columns)
+    return load_manifest(snapshot_name(path))['columns']
+
+
+def source_bytes(path: str) -> Optional[int]:
+    """Size of the snapshot CSV, on disk or as it was when stored."""
+    if os.path.exists(path):
+        return os.path.getsize(path)
+    if has_snapshot(path):
+        return load_manifest(snapshot_name(path))['source_bytes']
+    return None
+
+
+def verify(path: str) -> bool:
+    """True when the store reproduces the on-disk CSV exactly (as pd.read_csv sees it)."""
+    original = pd.read_csv(path)
+    stored = pd.read_csv(io.StringIO(_snapshot_text(load_manifest(snapshot_name(path)), descriptions=True)))
+    stored = stored[[col for col in original.columns if col in stored.columns]]
+    return original.columns.tolist() == stored.columns.tolist() and original.equals(stored) \
+        and (original.dtypes == stored.dtypes).all()
+
+
+def materialize(path: str) -> str:
+    """Write a stored snapshot back out as its CSV."""
+    read_snapshot(path).to_csv(path, index=False)
+    return path
+
+
+def _is_stored(path: str) -> bool:
+    return has_snapshot(path) and load_manifest(snapshot_name(path))['source_bytes'] == os.path.getsize(path)
+
+
+def prune(keep: int = KEEP_CSVS, verbose: bool = True) -> List[str]:
+    """
+    Delete snapshot CSVs older than the newest `keep`, once the store
+    reproduces them exactly.
+
+    Returns:
+        Deleted paths
+    """
+    files = sorted(glob.glob(SNAPSHOT_PATTERN))
+    deleted = []
+    for path in files[:-keep] if keep else files:
+        if not _is_stored(path):
+            store_snapshot(path, verbose=verbose)
+        if verify(path):
+            os.remove(path)
+            deleted.append(path)
+        elif verbose:
+            print(f"⚠️  {path} does not round-trip through the store; keeping the CSV")
+    return deleted
+
+
+def ingest(paths: Optional[List[str]] = None, verbose: bool = True) -> int:
+    """Store every snapshot CSV that is new or changed since it was stored."""
+    count = 0
+    for path in paths or sorted(glob.glob(SNAPSHOT_PATTERN)):
+        if not _is_stored(path):
+            store_snapshot(path, verbose=verbose)
+            count += 1
+    return count
+
+
+def _dir_bytes(path: str) -> int:
+    return sum(os.path.getsize(os.path.join(root, f)) for root, _, files in os.walk(path) for f in files)
+
+
+def report():
+    """Store size vs the CSVs it replaces, and load time without descriptions."""
+    names = stored_names()
+    if not names:
+        print("Snapshot store is empty")
+        return
+    csv_bytes = sum(load_manifest(name)['source_bytes'] for name in names)
+    store_bytes = _dir_bytes(STORE_DIR)
+    print(f"Snapshots stored: {len(names)}")
+    print(f"CSV bytes:        {csv_bytes / 1024:>10,.0f} KB")
+    print(f"Store bytes:      {store_bytes / 1024:>10,.0f} KB ({store_bytes / csv_bytes * 100:.0f}%)")
+
+    latest = f'{DATA_DIR}/{names[-1]}.csv'
+    manifest = load_manifest(names[-1])
+    columns = [col for col in manifest['columns'] if col != DESCRIPTION_COLUMN]
+    start = time.perf_counter()
+    pd.read_csv(io.StringIO(_snapshot_text(manifest, descriptions=False)), usecols=columns)
+    print(f"Load {names[-1]} without descriptions from store: {(time.perf_counter() - start) * 1000:.0f} ms")
+    if os.path.exists(latest):
+        start = time.perf_counter()
+        pd.read_csv(latest, usecols=columns)
+        print(f"Load {names[-1]} without descriptions from CSV:   {(time.perf_counter() - start) * 1000:.0f} ms")
+
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description='Content-addressed snapshot storage')
+    parser.add_argument('--ingest', action='store_true', help='Store new or changed snapshot CSVs')
+    parser.add_argument('--prune', action='store_true', help='Delete verified CSVs except the newest --keep')
+    parser.add_argument('--keep', type=int, default=KEEP_CSVS, help=f'CSVs kept by --prune (default: {KEEP_CSVS})')
+    parser.add_argument('--materialize', metavar='CSV', help='Write a stored snapshot back to its CSV path')
+    parser.add_argument('--report', action='store_true', help='Compare store size and load time with the CSVs')
+    args = parser.parse_args()
+
+    print("="*70)
+    print("🗄️  SNAPSHOT STORE")
+    print("="*70)
+
+    if args.materialize:
+        if not has_snapshot(args.materialize):
+            print(f"❌ {args.materialize} is not in the store")
+            sys.exit(1)
+        print(f"✅ Wrote {materialize(args.materialize)}")
+    if args.ingest:
+        print(f"✅ Stored {ingest()} new or changed snapshots ({len(stored_names())} total)")
+    if args.prune:
+        deleted = prune(args.keep)
+        print(f"🧹 Removed {len(deleted)} CSVs now served from the store")
+    if args.report or not (args.ingest or args.prune or args.materialize):
+        report()
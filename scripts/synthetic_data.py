@@ -0,0 +1,476 @@
+#!/usr/bin/env python3
+"""
+Deterministic synthetic job data for scale testing.
+
+Produces the three CSV shapes the pipeline reads, at any size:
+- raw_jobs_YYYYMMDD_HHMM.csv         jobspy columns, with cross-search duplicates
+                                     and non-executive titles for enrichment to drop
+- executive_sales_jobs_YYYYMMDD.csv  enriched executive roles (enrich_and_analyze.py output)
+- master_jobs_database.csv           several weeks of enriched rows plus import and
+                                     comp aggregator columns (metro, company_stage)
+
+Distributions follow the real data: ~90% VP titles, salary on about a quarter
+of postings, Zipf-like postings per company, 5-6K character descriptions, and
+a share of roles reposted under a new URL in another city, and pairs of
+territory hires (one company, same description, titles naming different
+regions) that are separate roles. planted_roles() gives the true role of
+every row, to check repost detection against.
+Descriptions mention tools and signals from signal_config.json (and the
+market intel patterns), so feature scans do real work. The same seed and
+sizes always give byte-identical files.
+
+Usage:
+    from synthetic_data import generate_raw_jobs, generate_enriched_jobs
+    df = generate_enriched_jobs(10_000, seed=7)
+
+    python scripts/synthetic_data.py --out /tmp/synth/data --scale 10
+"""
+
+import argparse
+import json
+import os
+import re
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from data_quality import assess_quality
+
+DATA_DIR = 'data'
+CONFIG_FILE = f'{DATA_DIR}/signal_config.json'
+
+# 1x is a few times today's volume: one weekly scrape (about half survives
+# enrichment), earlier enriched weeks, and a month of weekly master imports
+BASE_RAW_ROWS = 1_000
+BASE_ENRICHED_ROWS = 500
+BASE_MASTER_WEEKS = 4
+
+DEFAULT_SEED = 20260119
+DEFAULT_WEEK = '2026-01-19'
+
+# Columns scrape_jobs() returns, in order
+RAW_COLUMNS = [
+    'id', 'site', 'job_url', 'job_url_direct', 'title', 'company', 'location', 'date_posted',
+    'job_type', 'salary_source', 'interval', 'min_amount', 'max_amount', 'currency', 'is_remote',
+    'job_level', 'job_function', 'listing_type', 'emails', 'description', 'company_industry',
+    'company_url', 'company_logo', 'company_url_direct', 'company_addresses', 'company_num_employees',
+    'company_revenue', 'company_description', 'skills', 'experience_range', 'company_rating',
+    'company_reviews_count', 'vacancy_count', 'work_from_home_type',
+]
+ENRICHMENT_COLUMNS = ['seniority', 'is_tech', 'data_quality_score', 'data_quality',
+                      'has_description', 'has_salary', 'comp_outlier', 'week_added']
+
+# (title, seniority, weight). Seniority None = rejected by enrichment's title filter
+EXECUTIVE_TITLES = [
+    ('VP of Sales', 'VP', 30), ('Vice President, Sales', 'VP', 18), ('VP Sales', 'VP', 12),
+    ('Regional Vice President, Sales', 'VP', 8), ('Area Vice President, Enterprise Sales', 'VP', 6),
+    ('VP, Enterprise Sales', 'VP', 5), ('VP of Sales & Marketing', 'VP', 3),
+    ('VP Business Development', 'VP', 3), ('Vice President of Revenue', 'VP', 2),
+    ('SVP Sales', 'SVP', 2), ('Senior Vice President of Sales', 'SVP', 2),
+    ('EVP Sales', 'EVP', 1), ('Executive Vice President, Commercial', 'EVP', 1),
+    ('Chief Revenue Officer', 'C-Level', 4), ('Chief Revenue Officer (CRO)', 'C-Level', 2),
+    ('CRO / Head of Revenue', 'C-Level', 1),
+]
+NON_EXECUTIVE_TITLES = [
+    ('Account Executive', None, 12), ('Sales Development Representative', None, 8),
+    ('Director of Sales', None, 8), ('Regional Sales Manager', None, 6), ('Sales Manager', None, 6),
+    ('VP of Engineering', None, 3), ('VP Finance', None, 2), ('VP Product', None, 2),
+    ('Head of Sales', None, 4), ('Inside Sales Representative', None, 3),
+]
+# Share of raw rows whose title is not an executive sales role
+RAW_NON_EXECUTIVE_SHARE = 0.45
+# Share of raw rows that repeat an earlier URL (same job found by another search)
+RAW_DUPLICATE_SHARE = 0.12
+# Share of postings that repost an earlier role under a new URL and city
+REPOST_SHARE = 0.08
+# Share of postings in territory pairs: the same role hired once per region
+TERRITORY_SHARE = 0.02
+TERRITORIES = ['Northeast', 'Mid-West', 'Southeast', 'West', 'Central', 'Mid-Atlantic']
+# Sentence _add_reposts appends to a repost's description
+REPOST_SENTENCE = re.compile(r'\n\nThis position can be based in [^\n]*\.$')
+
+# (location, weight)
+LOCATIONS = [
+    ('Remote, US', 10), ('New York, NY, US', 9), ('San Francisco, CA, US', 7), ('Chicago, IL, US', 4),
+    ('Boston, MA, US', 4), ('Seattle, WA, US', 3), ('Austin, TX, US', 3), ('Dallas, TX, US', 3),
+    ('Houston, TX, US', 2), ('Denver, CO, US', 2), ('Atlanta, GA, US', 3), ('Los Angeles, CA, US', 4),
+    ('Santa Monica, CA, US', 1), ('Miami, FL, US', 2), ('Jacksonville, FL, US', 1), ('Phoenix, AZ, US', 1),
+    ('Columbus, OH, US', 1), ('Nashville, TN, US', 1), ('Charlotte, NC, US', 1), ('Raleigh, NC, US', 1),
+    ('Minneapolis, MN, US', 1), ('Philadelphia, PA, US', 2), ('Pittsburgh, PA, US', 1),
+    ('Salt Lake City, UT, US', 1), ('Tulsa, OK, US', 1), ('Baltimore, MD, US', 1), ('US', 2),
+]
+
+# (employees, revenue, weight) - jobspy's Indeed buckets
+COMPANY_SIZES = [
+    ('2 to 10', 'less than $1M (USD)', 4), ('11 to 50', '$1M to $5M (USD)', 10),
+    ('11 to 50', '$5M to $25M (USD)', 22), ('51 to 200', '$5M to $25M (USD)', 12),
+    ('201 to 500', '$25M to $100M (USD)', 10), ('501 to 1,000', '$100M to $500M (USD)', 8),
+    ('1,001 to 5,000', '$100M to $500M (USD)', 8), ('1,001 to 5,000', '$500M to $1B (USD)', 5),
+    ('5,001 to 10,000', '$1B to $5B (USD)', 6), ('10,000+', 'more than $10B (USD)', 10),
+]
+INDUSTRIES = [
+    'Information Technology', 'Health Care', 'Financial Services', 'Manufacturing', 'Retail',
+    'Telecommunications', 'Computers And Electronics', 'Education And Schools', 'Media',
+    'Energy, Mining And Utilities', 'Transport And Freight', 'Real Estate',
+]
+NAME_PREFIXES = [
+    'Acme', 'Blue', 'Bright', 'Cedar', 'Clear', 'Crest', 'Delta', 'Echo', 'Forge', 'Granite', 'Harbor',
+    'Iron', 'Juniper', 'Keystone', 'Lumen', 'Maple', 'Nimbus', 'North', 'Orbit', 'Pioneer', 'Quartz',
+    'Redwood', 'Summit', 'Tandem', 'Union', 'Vertex', 'Willow', 'Zenith', 'Atlas', 'Beacon',
+]
+# Some contain enrichment's tech keywords, so is_tech is exercised
+NAME_SUFFIXES = [
+    'Software', 'Data', 'Cloud', 'Analytics', 'Health', 'Logistics', 'Labs', 'Systems', 'Partners',
+    'Group', 'Financial', 'Platform', 'AI', 'Networks', 'Foods', 'Manufacturing', 'Media', 'Energy',
+]
+
+# Base comp by seniority: (median min_amount, spread)
+COMP_BY_SENIORITY = {'VP': (180_000, 45_000), 'SVP': (230_000, 50_000), 'EVP': (260_000, 60_000),
+                     'C-Level': (240_000, 70_000), None: (110_000, 30_000)}
+SALARY_SHARE = 0.25
+TECH_KEYWORDS = ['software', 'saas', 'tech', 'ai', 'cloud', 'data', 'platform', 'digital', 'cyber', 'fintech',
+                 'analytics', 'enterprise software', 'machine learning', 'automation', 'api', 'infrastructure']
+REMOTE_SHARE = 0.7
+TARGET_DESCRIPTION_CHARS = 5_700
+
+# Phrases the market intel patterns look for (feature_store.INSIGHT_PATTERNS)
+MARKET_PHRASES = [
+    'Salesforce', 'HubSpot', 'Gong', 'Outreach', 'ZoomInfo', 'Clari', 'Tableau', 'LinkedIn Sales Navigator',
+    'enterprise sales', 'consultative selling', 'channel partners', 'value selling', 'MEDDPICC', 'MEDDIC',
+    'product-led growth', 'Challenger', 'account-based marketing', 'AI', 'machine learning',
+    'go-to-market', 'GTM', 'scalable', 'SaaS', 'data-driven', 'cloud', 'Series B', 'customer success',
+    'recurring revenue', 'ARR', 'generative AI', 'healthcare', 'fintech', 'cybersecurity', 'e-commerce',
+    'competitive compensation', 'fast-paced environment', 'self-starter', 'wear many hats', 'scrappy',
+    '50% travel',
+]
+
+SENTENCES = [
+    "You will own the {phrase} strategy and report directly to the CEO.",
+    "Build and lead a team of account executives focused on {phrase}.",
+    "Partner with marketing and product on {phrase} initiatives across North America.",
+    "Experience with {phrase} and {phrase2} is strongly preferred.",
+    "Drive forecasting discipline using {phrase} and weekly pipeline reviews.",
+    "We are a {phrase} company growing revenue more than 80% year over year.",
+    "Proven track record of exceeding quota in {phrase} environments.",
+    "Hands-on experience rolling out {phrase} across a distributed sales organization.",
+    "Comfortable operating in a {phrase} where priorities change quickly.",
+    "Compensation includes base, uncapped commission and equity; {phrase} is a plus.",
+]
+# Most of a real posting is boilerplate without tool or signal mentions
+FILLER = [
+    "We are an equal opportunity employer and value diversity at our company.",
+    "This role will recruit, coach and retain a high-performing team of sellers and managers.",
+    "The ideal candidate has ten or more years of quota-carrying experience and at least five in leadership.",
+    "You will set territory plans, quotas and compensation plans in partnership with finance.",
+    "Our benefits include medical, dental and vision coverage, a 401(k) match and flexible paid time off.",
+    "Travel to customer sites and company offsites is expected several times per quarter.",
+    "You will present the sales plan and results to the executive team and the board each quarter.",
+    "We believe in hiring curious people who care about customers and about each other.",
+]
+MENTION_SHARE = 0.35
+
+
+def _weighted(items):
+    weights = np.array([item[-1] for item in items], dtype=float)
+    return weights / weights.sum()
+
+
+def _tool_phrases(config: Dict) -> List[str]:
+    """A literal phrase each signal_config pattern matches (regex-derived, then verified)."""
+    phrases = []
+    for groups in (config.get('technographics', {}), config.get('signals', {})):
+        for entries in groups.values():
+            for key, pattern in entries.items():
+                first = pattern.split('|')[0]
+                literal = first.replace('\\b', '').replace('\\s*', ' ').replace('\\s+', ' ').replace('\\.', '.')
+                candidate = literal if not re.search(r'[()\[\]?*+{}\\]', literal) else key.replace('_', ' ')
+                try:
+                    if re.search(pattern, candidate, re.IGNORECASE):
+                        phrases.append(candidate)
+                except re.error:
+                    continue
+    return phrases
+
+
+def load_phrases(config_file: str = CONFIG_FILE) -> List[str]:
+    config = {}
+    if os.path.exists(config_file):
+        with open(config_file) as f:
+            config = json.load(f)
+    return MARKET_PHRASES + _tool_phrases(config)
+
+
+def _paragraph_pool(rng: np.random.Generator, phrases: List[str], size: int = 512) -> List[str]:
+    """Reusable description paragraphs (about 400 chars each)."""
+    pool = []
+    for _ in range(size):
+        sentences = []
+        for _ in range(4):
+            if rng.random() < MENTION_SHARE:
+                a, b = rng.choice(phrases, size=2)
+                sentences.append(rng.choice(SENTENCES).format(phrase=a, phrase2=b))
+            else:
+                sentences.append(rng.choice(FILLER))
+        pool.append(' '.join(sentences))
+    return pool
+
+
+def _companies(rng: np.random.Generator, count: int) -> pd.DataFrame:
+    """Company pool with sizes, industries and Zipf-like posting weights."""
+    names = [f"{NAME_PREFIXES[i % len(NAME_PREFIXES)]} {NAME_SUFFIXES[(i // len(NAME_PREFIXES)) % len(NAME_SUFFIXES)]}"
+             + (f" {i // (len(NAME_PREFIXES) * len(NAME_SUFFIXES)) + 1}" if i >= len(NAME_PREFIXES) * len(NAME_SUFFIXES) else '')
+             for i in rng.permutation(count)]
+    size_idx = rng.choice(len(COMPANY_SIZES), size=count, p=_weighted(COMPANY_SIZES))
+    domains = [re.sub(r'[^a-z0-9]', '', name.lower()) + '.com' for name in names]
+    weights = 1.0 / np.arange(1, count + 1) ** 0.6
+    return pd.DataFrame({
+        'company': names,
+        'company_num_employees': [COMPANY_SIZES[i][0] for i in size_idx],
+        'company_revenue': [COMPANY_SIZES[i][1] for i in size_idx],
+        'company_industry': rng.choice(INDUSTRIES, size=count),
+        'company_url_direct': [f"https://www.{domain}" for domain in domains],
+        'weight': weights / weights.sum(),
+    })
+
+
+def _rows(rng: np.random.Generator, n: int, titles, week: datetime, phrases: List[str],
+          description_chars: int, companies: pd.DataFrame, id_offset: int = 0) -> pd.DataFrame:
+    """n postings (scrape_jobs columns plus a private _seniority column)."""
+    title_idx = rng.choice(len(titles), size=n, p=_weighted(titles))
+    seniority = [titles[i][1] for i in title_idx]
+    company_idx = rng.choice(len(companies), size=n, p=companies['weight'].to_numpy())
+    company = companies.iloc[company_idx].reset_index(drop=True)
+    location = rng.choice([loc for loc, _ in LOCATIONS], size=n, p=_weighted(LOCATIONS))
+
+    # Salary: log-normal-ish around the seniority median, max 15-50% above min
+    has_salary = rng.random(n) < SALARY_SHARE
+    medians = np.array([COMP_BY_SENIORITY[s][0] for s in seniority], dtype=float)
+    spreads = np.array([COMP_BY_SENIORITY[s][1] for s in seniority], dtype=float)
+    min_amount = np.round(np.maximum(60_000, rng.normal(medians, spreads)), -3)
+    max_amount = np.round(min_amount * rng.uniform(1.15, 1.5, size=n), -3)
+    min_amount = np.where(has_salary, min_amount, np.nan)
+    max_amount = np.where(has_salary, max_amount, np.nan)
+
+    keys = rng.integers(0, 2 ** 63, size=n, dtype=np.int64)
+    ids = [f"{key:016x}" for key in keys]
+    days_back = rng.integers(0, 7, size=n)
+    date_posted = [(week - timedelta(days=int(d))).strftime('%Y-%m-%d') for d in days_back]
+
+    pool = _paragraph_pool(rng, phrases)
+    paragraphs = max(1, round(description_chars / (len(pool[0]) + 2)))
+    counts = rng.integers(max(1, paragraphs - 3), paragraphs + 4, size=n)
+    titles_text = [titles[i][0] for i in title_idx]
+    descriptions = [
+        f"**{title}**\n\n**About {name}**\n\n" + '\n\n'.join(pool[i] for i in rng.choice(len(pool), size=count, replace=False))
+        for title, name, count in zip(titles_text, company['company'], counts)
+    ]
+
+    return _add_reposts(rng, _add_territory_hires(rng, pd.DataFrame({
+        'id': [f"in-{key}" for key in ids],
+        'site': 'indeed',
+        'job_url': [f"https://www.indeed.com/viewjob?jk={key}" for key in ids],
+        'job_url_direct': [f"https://careers.{url.split('www.', 1)[1]}/jobs/{key[:10]}"
+                           for url, key in zip(company['company_url_direct'], ids)],
+        'title': titles_text,
+        'company': company['company'],
+        'location': location,
+        'date_posted': date_posted,
+        'job_type': 'fulltime',
+        'salary_source': np.where(has_salary, 'direct_data', None),
+        'interval': np.where(has_salary, 'yearly', None),
+        'min_amount': min_amount,
+        'max_amount': max_amount,
+        'currency': np.where(has_salary, 'USD', None),
+        'is_remote': (location == 'Remote, US') | (rng.random(n) < REMOTE_SHARE),
+        'job_level': None, 'job_function': None, 'listing_type': None, 'emails': None,
+        'description': descriptions,
+        'company_industry': company['company_industry'],
+        'company_url': [f"https://www.indeed.com/cmp/{name.replace(' ', '-')}" for name in company['company']],
+        'company_logo': None,
+        'company_url_direct': company['company_url_direct'],
+        'company_addresses': None,
+        'company_num_employees': company['company_num_employees'],
+        'company_revenue': company['company_revenue'],
+        'company_description': None, 'skills': None, 'experience_range': None,
+        'company_rating': np.round(rng.uniform(2.5, 4.8, size=n), 1),
+        'company_reviews_count': rng.integers(0, 2_000, size=n),
+        'vacancy_count': None, 'work_from_home_type': None,
+        '_seniority': seniority,
+    })))
+
+
+def _copy_role(df: pd.DataFrame, sources, targets) -> pd.DataFrame:
+    """Copy the role at sources over targets, keeping the targets' own posting (URL, city, date)."""
+    keep = ['id', 'job_url', 'job_url_direct', 'location', 'is_remote', 'date_posted']
+    copies = df.iloc[sources].drop(columns=keep).set_axis(targets)
+    df = df.copy()
+    df.loc[targets, copies.columns] = copies
+    df.loc[targets, 'job_url_direct'] = [
+        f"https://careers.{url.split('www.', 1)[1]}/jobs/{job_id[3:13]}"
+        for url, job_id in zip(df.loc[targets, 'company_url_direct'], df.loc[targets, 'id'])
+    ]
+    return df
+
+
+def _add_territory_hires(rng: np.random.Generator, df: pd.DataFrame, share: float = TERRITORY_SHARE) -> pd.DataFrame:
+    """Turn the first rows into pairs of one role hired for two regions ('..., Northeast Region')."""
+    pairs = int(len(df) * share) // 2
+    if pairs == 0:
+        return df
+    sources = np.arange(0, 2 * pairs, 2)
+    df = _copy_role(df, sources, sources + 1)
+    regions = [rng.choice(TERRITORIES, size=2, replace=False) for _ in range(pairs)]
+    for rows, names in zip(zip(sources, sources + 1), regions):
+        for row, region in zip(rows, names):
+            title = f"{df.at[row, 'title']}, {region} Region"
+            header = f"**{df.at[row, 'title']}**"
+            df.at[row, 'description'] = f"**{title}**" + df.at[row, 'description'][len(header):]
+            df.at[row, 'title'] = title
+    return df
+
+
+def _add_reposts(rng: np.random.Generator, df: pd.DataFrame, share: float = REPOST_SHARE) -> pd.DataFrame:
+    """Overwrite the last rows with reposts of earlier ones: new URL and city, same role."""
+    count = int(len(df) * share)
+    if count == 0 or len(df) - count < 1:
+        return df
+    targets = np.arange(len(df) - count, len(df))
+    sources = rng.integers(0, len(df) - count, size=count)
+    df = _copy_role(df, sources, targets)
+    df.loc[targets, 'description'] = df.loc[targets, 'description'] + '\n\nThis position can be based in ' \
+        + df.loc[targets, 'location'].str.replace(', US', '', regex=False) + '.'
+    return df
+
+
+def planted_roles(df: pd.DataFrame) -> pd.Series:
+    """
+    True role of each generated row: reposts share their source's role,
+    territory pairs are two roles. Compare with canonical_job_id to score
+    repost detection.
+    """
+    descriptions = df['description'].astype(str).str.replace(REPOST_SENTENCE, '', regex=True)
+    return pd.Series(pd.factorize(df['company'].astype(str) + '|' + df['title'].astype(str) + '|' + descriptions)[0],
+                     index=df.index)
+
+
+def _company_count(rows: int) -> int:
+    # Real weekly files average about 1.3 postings per company, with a long tail
+    return max(50, rows * 3 // 4)
+
+
+def generate_raw_jobs(n: int, seed: int = DEFAULT_SEED, week: str = DEFAULT_WEEK,
+                      phrases: Optional[List[str]] = None, description_chars: int = TARGET_DESCRIPTION_CHARS) -> pd.DataFrame:
+    """A weekly scrape: n rows, including duplicates and non-executive titles."""
+    rng = np.random.default_rng(seed)
+    phrases = phrases or load_phrases()
+    unique = max(1, round(n * (1 - RAW_DUPLICATE_SHARE)))
+    titles = EXECUTIVE_TITLES + [
+        (title, seniority, weight * RAW_NON_EXECUTIVE_SHARE / (1 - RAW_NON_EXECUTIVE_SHARE)
+         * sum(w for *_, w in EXECUTIVE_TITLES) / sum(w for *_, w in NON_EXECUTIVE_TITLES))
+        for title, seniority, weight in NON_EXECUTIVE_TITLES
+    ]
+    df = _rows(rng, unique, titles, datetime.fromisoformat(week), phrases, description_chars,
+               _companies(rng, _company_count(unique)))
+    duplicates = df.iloc[rng.integers(0, unique, size=n - unique)]
+    df = pd.concat([df, duplicates], ignore_index=True).iloc[rng.permutation(n)].reset_index(drop=True)
+    return df[RAW_COLUMNS]
+
+
+def enrich(df: pd.DataFrame, seniority: pd.Series, week: str) -> pd.DataFrame:
+    """Add enrich_and_analyze.py's columns (same rules and quality scoring)."""
+    df = df.copy()
+    df['seniority'] = seniority.to_numpy()
+    df['is_tech'] = df['company'].str.lower().str.contains('|'.join(TECH_KEYWORDS), na=False)
+    quality, _ = assess_quality(df)
+    df[quality.columns] = quality
+    df['week_added'] = week
+    return df
+
+
+def generate_enriched_jobs(n: int, seed: int = DEFAULT_SEED, week: str = DEFAULT_WEEK,
+                           phrases: Optional[List[str]] = None,
+                           description_chars: int = TARGET_DESCRIPTION_CHARS) -> pd.DataFrame:
+    """A weekly executive_sales_jobs file: n unique executive sales roles."""
+    rng = np.random.default_rng(seed)
+    phrases = phrases or load_phrases()
+    df = _rows(rng, n, EXECUTIVE_TITLES, datetime.fromisoformat(week), phrases, description_chars,
+               _companies(rng, _company_count(n)))
+    return enrich(df[RAW_COLUMNS], df['_seniority'], week)
+
+
+def generate_master(rows_per_week: int, weeks: int = BASE_MASTER_WEEKS, seed: int = DEFAULT_SEED,
+                    end_week: str = DEFAULT_WEEK, phrases: Optional[List[str]] = None,
+                    description_chars: int = TARGET_DESCRIPTION_CHARS) -> pd.DataFrame:
+    """The master database after `weeks` weekly imports (merge_to_master + comp aggregator columns)."""
+    from cro_comp_aggregator import classify_company_stage, extract_metro
+
+    phrases = phrases or load_phrases()
+    end = datetime.fromisoformat(end_week)
+    frames = []
+    for i in range(weeks):
+        week = end - timedelta(weeks=weeks - 1 - i)
+        df = generate_enriched_jobs(rows_per_week, seed + i + 1, week.strftime('%Y-%m-%d'), phrases,
+                                    description_chars)
+        df['import_date'] = week.strftime('%Y-%m-%d')
+        df['import_week'] = week.strftime('%Y-W%W')
+        frames.append(df)
+    master = pd.concat(frames, ignore_index=True)
+
+    # Derived per distinct value, not per row
+    metros = {loc: extract_metro(loc) for loc in master['location'].unique()}
+    master['metro'] = master['location'].map(metros)
+    companies = master.drop_duplicates('company')[['company', 'company_revenue', 'company_num_employees', 'max_amount']]
+    stages = dict(zip(companies['company'], companies.apply(classify_company_stage, axis=1)))
+    master['company_stage'] = master['company'].map(stages)
+    master['seniority_original'] = master['seniority']
+    return master
+
+
+def write_dataset(out_dir: str, scale: float = 1.0, seed: int = DEFAULT_SEED, week: str = DEFAULT_WEEK,
+                  description_chars: int = TARGET_DESCRIPTION_CHARS, verbose: bool = True) -> Dict[str, int]:
+    """
+    Write raw, enriched (this week and last) and master CSVs for one scale.
+
+    Returns:
+        Row counts by file
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    phrases = load_phrases()
+    stamp = week.replace('-', '')
+    last_week = (datetime.fromisoformat(week) - timedelta(weeks=1)).strftime('%Y-%m-%d')
+    raw_rows = max(1, round(BASE_RAW_ROWS * scale))
+    enriched_rows = max(1, round(BASE_ENRICHED_ROWS * scale))
+
+    outputs = {
+        f"raw_jobs_{stamp}_0000.csv": lambda: generate_raw_jobs(raw_rows, seed, week, phrases, description_chars),
+        f"executive_sales_jobs_{last_week.replace('-', '')}.csv":
+            lambda: generate_enriched_jobs(enriched_rows, seed - 1, last_week, phrases, description_chars),
+        f"executive_sales_jobs_{stamp}.csv":
+            lambda: generate_enriched_jobs(enriched_rows, seed, week, phrases, description_chars),
+        'master_jobs_database.csv':
+            lambda: generate_master(enriched_rows, BASE_MASTER_WEEKS, seed, last_week, phrases, description_chars),
+    }
+    counts = {}
+    for name, build in outputs.items():
+        df = build()
+        df.to_csv(os.path.join(out_dir, name), index=False)
+        counts[name] = len(df)
+        if verbose:
+            size_mb = os.path.getsize(os.path.join(out_dir, name)) / (1024 * 1024)
+            print(f"  {name}: {len(df):,} rows, {size_mb:,.1f} MB")
+    return counts
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Generate synthetic job CSVs')
+    parser.add_argument('--out', required=True, help='Output data directory')
+    parser.add_argument('--scale', type=float, default=1.0, help=f'1 = {BASE_RAW_ROWS:,} raw rows/week')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    parser.add_argument('--week', default=DEFAULT_WEEK, help='Scrape week (YYYY-MM-DD)')
+    parser.add_argument('--description-chars', type=int, default=TARGET_DESCRIPTION_CHARS)
+    args = parser.parse_args()
+
+    print(f"Generating {args.scale}x synthetic data in {args.out}")
+    write_dataset(args.out, args.scale, args.seed, args.week, args.description_chars)
@@ -8,6 +8,9 @@ multiple page generators to eliminate duplication and centralize maintenance.
 
 import re
 import json
+from functools import lru_cache
+from html import escape
+from urllib.parse import quote, unquote
 import pandas as pd
 import sys
 
@@ -233,25 +236,54 @@ DEFAULT_LINK_MAP = {
 }
 
 
-def auto_link_content(text, link_map=None, exclude_terms=None, max_links_per_term=1):
-    """
-    Auto-link mentions of terms to relevant internal pages.
+# Characters that block a link when they sit right before a term (inside a tag or URL)
+_LINK_BLOCKING_PREFIXES = '>"\'/'
 
-    Args:
-        text: HTML content string to process
-        link_map: Dict mapping terms to URLs (uses DEFAULT_LINK_MAP if None)
-        exclude_terms: List of terms to skip (e.g., current page's topic)
-        max_links_per_term: Max times to link each term (1 = first mention only)
 
-    Returns:
-        Text with auto-linked terms
+def _terms_link_independently(terms):
     """
-    if link_map is None:
-        link_map = DEFAULT_LINK_MAP
+    True if linking one term can never change where another term links.
+
+    Holds when every term starts and ends with a word character, contains
+    no tag brackets, and no term overlaps another (substring or shared
+    prefix/suffix). Then each mention can be judged against the original HTML.
+    """
+    for term in terms:
+        if not term or '<' in term or '>' in term or not re.match(r'\w', term) or not re.search(r'\w$', term):
+            return False
+    for a in terms:
+        for b in terms:
+            if a != b and _mentions_can_overlap(a, b):
+                return False
+    return True
+
+
+def _mentions_can_overlap(a, b):
+    """True if a mention of b can start inside a mention of a (at a word boundary)."""
+    for i in range(len(a)):
+        if i and re.match(r'\w', a[i - 1]):
+            continue  # b starts with a word character, so no boundary here
+        end = i + len(b)
+        if end <= len(a):
+            if a[i:end] == b and (end == len(a) or not re.match(r'\w', a[end])):
+                return True
+        elif b.startswith(a[i:]) and not re.match(r'\w', b[len(a) - i]):
+            # a's closing boundary falls inside b
+            return True
+    return False
 
-    if exclude_terms is None:
-        exclude_terms = []
 
+@lru_cache(maxsize=64)
+def _link_matcher(terms):
+    """Compiled alternation over terms (cached per exclusion set), or None if terms overlap."""
+    if not _terms_link_independently(terms):
+        return None
+    alternation = '|'.join(re.escape(term) for term in sorted(terms, key=len, reverse=True))
+    return re.compile(rf'(?<![{re.escape(_LINK_BLOCKING_PREFIXES)}])\b(?:{alternation})\b')
+
+
+def _auto_link_sequential(text, link_map, exclude_terms, max_links_per_term):
+    """One regex pass per term; used when terms overlap and link order matters."""
     # Track how many times each term has been linked
     link_counts = {term: 0 for term in link_map}
 
@@ -279,6 +311,75 @@ def auto_link_content(text, link_map=None, exclude_terms=None, max_links_per_ter
     return text
 
 
+def auto_link_content(text, link_map=None, exclude_terms=None, max_links_per_term=1):
+    """
+    Auto-link mentions of terms to relevant internal pages.
+
+    Splits the HTML at each '<' once and matches every term with a single
+    compiled alternation, only over text outside tags and outside a
+    trailing </a>. Terms link the same mentions as linking them one at a
+    time in link_map order.
+
+    Args:
+        text: HTML content string to process
+        link_map: Dict mapping terms to URLs (uses DEFAULT_LINK_MAP if None)
+        exclude_terms: List of terms to skip (e.g., current page's topic)
+        max_links_per_term: Max times to link each term (1 = first mention only)
+
+    Returns:
+        Text with auto-linked terms
+    """
+    if link_map is None:
+        link_map = DEFAULT_LINK_MAP
+
+    if exclude_terms is None:
+        exclude_terms = []
+
+    terms = tuple(term for term in link_map if term not in exclude_terms)
+    if not terms or max_links_per_term < 1:
+        return text
+
+    matcher = _link_matcher(terms)
+    if matcher is None:
+        return _auto_link_sequential(text, link_map, exclude_terms, max_links_per_term)
+
+    link_counts = dict.fromkeys(terms, 0)
+    unfinished = len(terms)
+    pieces = []
+    copied_to = 0
+    segment_start = 0
+    text_length = len(text)
+
+    while unfinished:
+        segment_end = text.find('<', segment_start)
+        if segment_end == -1:
+            segment_end = text_length
+
+        # Only text after the segment's last '>' is outside a tag, and none of
+        # it is linkable if the next tag closes a link
+        if not text.startswith('</a>', segment_end):
+            region_start = max(text.rfind('>', segment_start, segment_end) + 1, segment_start)
+            for match in matcher.finditer(text, region_start, segment_end):
+                term = match.group(0)
+                if link_counts[term] >= max_links_per_term:
+                    continue
+                link_counts[term] += 1
+                if link_counts[term] == max_links_per_term:
+                    unfinished -= 1
+                pieces.append(text[copied_to:match.start()])
+                pieces.append(f'<a href="{link_map[term]}" class="auto-link">{term}</a>')
+                copied_to = match.end()
+                if not unfinished:
+                    break
+
+        if segment_end == text_length:
+            break
+        segment_start = segment_end + 1
+
+    pieces.append(text[copied_to:])
+    return ''.join(pieces)
+
+
 def get_link_map_for_page(current_page_type, current_identifier):
     """
     Get a link map excluding the current page's terms.
@@ -1068,3 +1169,107 @@ def get_cta_box(title="Get Weekly Market Intelligence",
         <a href="{button_url}" class="btn btn-gold">{button_text} →</a>
     </div>
 '''
+
+
+# =============================================================================
+# IMAGES
+# =============================================================================
+
+IMAGE_MANIFEST = 'site/assets/image-manifest.json'
+
+
+@lru_cache(maxsize=1)
+def _image_manifest():
+    """Variants written by image_pipeline.py (URL -> entry); empty if never run."""
+    try:
+        with open(IMAGE_MANIFEST, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _srcset(entries):
+    return ', '.join(f'{quote(url)} {width}w' for url, width in entries)
+
+
+def picture_html(src, alt, sizes='100vw', width=None, height=None, css_class='', loading='lazy'):
+    """Generate <picture> markup with AVIF/WebP sources and a srcset fallback.
+
+    Falls back to a plain <img> for images image_pipeline.py hasn't processed
+    (SVGs, external URLs, or before the pipeline has run).
+
+    Args:
+        src: Image URL as used today (e.g. '/assets/comp_by_stage.png')
+        alt: Alt text
+        sizes: sizes attribute, e.g. '(max-width: 900px) 100vw, 860px' or '32px'
+        width, height: Override the intrinsic size recorded in the manifest
+        css_class: Optional class for the <img>
+        loading: 'lazy' (default) or 'eager' for above-the-fold images
+
+    Returns:
+        HTML string
+    """
+    entry = _image_manifest().get(unquote(src))
+    width = width or (entry or {}).get('width')
+    height = height or (entry or {}).get('height')
+
+    attrs = f' alt="{escape(alt)}"'
+    if css_class:
+        attrs += f' class="{css_class}"'
+    if width and height:
+        attrs += f' width="{width}" height="{height}"'
+    attrs += f' loading="{loading}" decoding="async"'
+
+    if not entry or not entry.get('sources'):
+        return f'<img src="{src}"{attrs}>'
+
+    # The last source is the fallback (same type as the original); the rest
+    # become <source> elements, modern formats first
+    *modern, fallback = entry['sources']
+    sources = ''.join(
+        f'<source type="{source["type"]}" srcset="{_srcset(source["srcset"])}" sizes="{sizes}">'
+        for source in modern
+    )
+    largest_url = fallback['srcset'][-1][0]
+    img = f'<img src="{quote(largest_url)}" srcset="{_srcset(fallback["srcset"])}" sizes="{sizes}"{attrs}>'
+    return f'<picture>{sources}{img}</picture>'
+
+
+# =============================================================================
+# BENCHMARK
+# =============================================================================
+
+def benchmark_auto_link(sizes=(10, 100, 1000, 5000)):
+    """Time per-term and single-pass auto-linking as page length grows."""
+    import time
+
+    paragraph = ('<p>VP Sales roles in <b>Boston</b> and Chicago pay more at Series B '
+                 'companies than at Seed startups; see <a href="/x/">Remote roles</a> '
+                 'and the CRO benchmarks for Late Stage firms.</p>\n')
+    # Mentions inside one long link are never linkable, so every one is re-checked
+    sentence = 'Boston and Chicago roles at Series B companies. '
+    pages = {
+        'paragraphs': lambda size: paragraph * size,
+        'long link text': lambda size: '<a href="/all/">' + sentence * size + '</a>',
+    }
+    link_map = get_link_map_for_page('location', 'Boston')
+
+    print(f"{'Page':<16} {'Units':>6} {'KB':>6} {'Per-term':>10} {'Single pass':>12} {'Same':>5}")
+    for name, build in pages.items():
+        for size in sizes:
+            html = build(size)
+            start = time.perf_counter()
+            expected = _auto_link_sequential(html, link_map, [], 3)
+            sequential_time = time.perf_counter() - start
+            start = time.perf_counter()
+            linked = auto_link_content(html, link_map, max_links_per_term=3)
+            single_time = time.perf_counter() - start
+            print(f"{name:<16} {size:>6} {len(html) / 1024:>6.0f} {sequential_time * 1000:>8.1f}ms "
+                  f"{single_time * 1000:>10.1f}ms {'✓' if linked == expected else '✗':>5}")
+
+
+if __name__ == '__main__':
+    if '--benchmark' in sys.argv:
+        benchmark_auto_link()
+    else:
+        print("Usage: python scripts/templates.py --benchmark   # auto-link timing by page length")
@@ -12,6 +12,10 @@ have the latest nav/footer.
 import os
 import re
 import glob
+import sys
+
+sys.path.insert(0, 'scripts')
+from build_profiler import phase, stage
 
 SITE_DIR = 'site'
 TEMPLATES_DIR = 'templates/includes'
@@ -79,7 +83,7 @@ def update_nav_css(content):
 
 def update_html_file(filepath, nav_html, footer_html):
     """Update nav and footer in a single HTML file."""
-    with open(filepath, 'r', encoding='utf-8') as f:
+    with stage('read'), open(filepath, 'r', encoding='utf-8') as f:
         content = f.read()
 
     original_content = content
@@ -130,12 +134,13 @@ def update_html_file(filepath, nav_html, footer_html):
 
     # Only write if content changed
     if content != original_content:
-        with open(filepath, 'w', encoding='utf-8') as f:
+        with stage('write'), open(filepath, 'w', encoding='utf-8') as f:
             f.write(content)
         return True
     return False
 
-def main():
+def main(html_files=None):
+    """Rewrite nav and footer in html_files (default: every page under site/)."""
     print("=" * 70)
     print("🔄 UPDATING NAV & FOOTER ACROSS ALL PAGES")
     print("=" * 70)
@@ -149,15 +154,18 @@ def main():
         return
 
     # Find all HTML files
-    html_files = glob.glob(f'{SITE_DIR}/**/*.html', recursive=True)
-    html_files += glob.glob(f'{SITE_DIR}/*.html')
-    html_files = list(set(html_files))  # Remove duplicates
+    phase('discover')
+    if html_files is None:
+        html_files = glob.glob(f'{SITE_DIR}/**/*.html', recursive=True)
+        html_files += glob.glob(f'{SITE_DIR}/*.html')
+        html_files = list(set(html_files))  # Remove duplicates
 
     print(f"📁 Found {len(html_files)} HTML files")
 
     updated = 0
     skipped = 0
 
+    phase('rewrite')
     for filepath in html_files:
         try:
             if update_html_file(filepath, nav_html, footer_html):